@@ -0,0 +1,131 @@
+"""Benchmark webhook alert delivery during a burst of job failures.
+
+Raises ``--alerts`` job-failure alerts spread over ``--job-names`` job names
+and delivers them to a local HTTP server. It does this once with the
+previous dispatch, where every alert is posted at once on a new
+``httpx.AsyncClient``, and once through a started ``AlertManager``, which
+batches alerts and posts them over one pooled client, first without and
+then with coalescing of repeated alerts.
+Reports wall time, webhook requests and TCP connections opened.
+
+    python benchmarks/bench_alerting.py --alerts 5000 --job-names 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import httpx
+from prometheus_client import CollectorRegistry
+
+from repository_after import (
+    AlertManager,
+    Job,
+    TaskQueuePrometheusMetrics,
+    WebhookAlertHandler,
+)
+
+
+class LegacyWebhookAlertHandler(WebhookAlertHandler):
+    """The previous handler: a new client, and connection, per alert."""
+
+    async def send(self, alert):
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                self._webhook_url, json=self._payload(alert), headers=self._headers, timeout=10.0
+            )
+            return response.status_code < 300
+
+
+class WebhookServer:
+    """Minimal keep-alive HTTP server that counts connections and requests."""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                self.requests += 1
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return f"http://127.0.0.1:{self._server.sockets[0].getsockname()[1]}/hook"
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def run(label, args, handler_factory, pipeline, coalesce_window=None):
+    server = WebhookServer()
+    url = await server.start()
+    registry = CollectorRegistry()
+    manager = AlertManager(
+        coalesce_window=coalesce_window,
+        metrics=TaskQueuePrometheusMetrics(registry=registry),
+    )
+    manager.add_handler(handler_factory(url))
+    jobs = [Job(name=f"job_{i}", payload={}) for i in range(args.job_names)]
+
+    started = time.perf_counter()
+    if pipeline:
+        await manager.start()
+        await asyncio.gather(*(
+            manager.alert_job_failed(jobs[i % len(jobs)], error=f"error {i}")
+            for i in range(args.alerts)
+        ))
+    else:
+        await asyncio.gather(*(
+            manager.alert_job_failed(jobs[i % len(jobs)], error=f"error {i}")
+            for i in range(args.alerts)
+        ), return_exceptions=True)
+    await manager.close()
+    elapsed = time.perf_counter() - started
+    await server.stop()
+    dropped = registry.get_sample_value(
+        "taskqueue_alerts_dropped_total", {"reason": "delivery_failed"}
+    ) or 0
+
+    print(
+        f"{label:<10} {elapsed:7.2f}s  requests={server.requests:<6} "
+        f"connections={server.connections:<6} failed={dropped:.0f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=1000)
+    parser.add_argument("--job-names", type=int, default=20)
+    args = parser.parse_args()
+
+    # Keep per-alert logging out of the measurement.
+    import logging
+    logging.getLogger().setLevel(logging.ERROR)
+
+    print(f"{args.alerts} failure alerts over {args.job_names} job names")
+    await run("legacy", args, LegacyWebhookAlertHandler, pipeline=False)
+    pooled = lambda url: WebhookAlertHandler(url, batch_payloads=True)
+    await run("batched", args, pooled, pipeline=True)
+    await run("coalesced", args, pooled, pipeline=True, coalesce_window=60.0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
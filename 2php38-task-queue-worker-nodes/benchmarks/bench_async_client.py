@@ -0,0 +1,152 @@
+"""Benchmark event-loop lag of the asyncio client under load.
+
+Runs ``--consumers`` coroutines that each take a job, await ``--work-ms`` of
+simulated I/O and complete it, until ``--jobs`` jobs are done, while a probe
+coroutine measures how late its ``--tick-ms`` sleeps wake up. This is done
+once with the previous wrapper (sync ``TaskQueue`` calls made directly from
+coroutines) and once with the native ``AsyncTaskQueue``.
+
+Runs against fakeredis unless ``--host`` is given. fakeredis answers
+blocking reads without waiting, so the wrapper's worst case (a consumer
+blocking the loop in XREADGROUP while the queue is empty) only shows up
+against a real server.
+
+    python benchmarks/bench_async_client.py --host localhost --jobs 20000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import (
+    AsyncTaskQueue,
+    JobResult,
+    Priority,
+    RedisConfig,
+    RedisConnection,
+    TaskQueue,
+)
+
+
+class WrapperAsyncTaskQueue:
+    """The previous AsyncTaskQueue: coroutines around the sync client."""
+
+    def __init__(self, queue):
+        self._queue = queue
+
+    async def submit(self, name, payload, priority=Priority.NORMAL, **kwargs):
+        return self._queue.submit(name, payload, priority, **kwargs)
+
+    async def get_next_job(self, timeout=None):
+        return self._queue.get_next_job(timeout)
+
+    async def complete_job(self, job_id, result):
+        self._queue.complete_job(job_id, result)
+
+    async def close(self):
+        pass
+
+
+def make_clients(host, port):
+    """Create a sync and an asyncio client for the same server."""
+    if host:
+        import redis
+        import redis.asyncio as aioredis
+        return (
+            redis.Redis(host=host, port=port, decode_responses=True),
+            aioredis.Redis(host=host, port=port, decode_responses=True),
+        )
+
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("fakeredis is required without --host: pip install fakeredis")
+    server = fakeredis.FakeServer()
+    return (
+        fakeredis.FakeRedis(server=server, decode_responses=True),
+        fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+
+
+async def run(label, make_queue, args):
+    queue = make_queue()
+    lags = []
+    done = 0
+    stop = asyncio.Event()
+
+    async def probe():
+        interval = args.tick_ms / 1000
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append((time.perf_counter() - start - interval) * 1000)
+
+    async def consumer():
+        nonlocal done
+        while done < args.jobs:
+            job = await queue.get_next_job(timeout=0.5)
+            if job is None:
+                # The wrapper never suspends, so yield or other consumers
+                # holding jobs would never get to finish them.
+                await asyncio.sleep(0)
+                continue
+            await asyncio.sleep(args.work_ms / 1000)
+            await queue.complete_job(job.id, JobResult(job_id=job.id, success=True))
+            done += 1
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    for i in range(args.jobs):
+        await queue.submit("bench", {"i": i})
+    await asyncio.gather(*(consumer() for _ in range(args.consumers)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+    await queue.close()
+
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    print(
+        f"{label:<10} {done / elapsed:10,.0f} {statistics.median(lags):9.2f} "
+        f"{p99:9.2f} {lags[-1]:9.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--consumers", type=int, default=200)
+    parser.add_argument("--prefetch", type=int, default=256)
+    parser.add_argument("--work-ms", type=float, default=5.0)
+    parser.add_argument("--tick-ms", type=float, default=5.0)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    # Keep per-job logging out of the measurement.
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+    sync_client, async_client = make_clients(args.host, args.port)
+    RedisConnection._instance = sync_client
+    config = RedisConfig(host=args.host or "localhost", port=args.port)
+
+    def fresh_queue():
+        sync_client.flushdb()
+        return TaskQueue(redis_config=config)
+
+    print(f"{'client':<10} {'jobs/sec':>10} {'lag p50':>9} {'lag p99':>9} {'lag max':>9}  (ms)")
+    asyncio.run(run("wrapper", lambda: WrapperAsyncTaskQueue(fresh_queue()), args))
+    asyncio.run(run(
+        "native",
+        lambda: AsyncTaskQueue(fresh_queue(), prefetch=args.prefetch, redis_client=async_client),
+        args,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark cron next-run computation and recurring scheduler polling.
+
+Times ``CronExpression.next_run`` for a few typical expressions against the
+previous minute-by-minute scan, then times ``RecurringJobScheduler`` polls
+with ``--jobs`` registered jobs of which none are due.
+
+    python benchmarks/bench_cron.py --jobs 10000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import CronExpression, Job, RecurringJobScheduler
+
+EXPRESSIONS = ["*/5 * * * *", "0 9 * * 0-4", "0 0 1 * *", "30 2 29 2 *"]
+
+
+def scan_next_run(cron, after):
+    """The previous implementation: test every minute for up to a year."""
+    dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(366 * 24 * 60):
+        if cron.matches(dt):
+            return dt
+        dt += timedelta(minutes=1)
+    return None
+
+
+def per_call_us(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=10_000)
+    parser.add_argument("--calls", type=int, default=2_000)
+    args = parser.parse_args()
+
+    after = datetime(2024, 3, 9, 12, 0, tzinfo=ZoneInfo("America/New_York"))
+    print(f"{'expression':<16} {'compiled us':>12} {'scan us':>12}")
+    for expr in EXPRESSIONS:
+        cron = CronExpression(expr)
+        compiled = per_call_us(lambda: cron.next_run(after), args.calls)
+        scan = per_call_us(lambda: scan_next_run(cron, after), max(1, args.calls // 1000))
+        print(f"{expr:<16} {compiled:12.2f} {scan:12.1f}")
+
+    scheduler = RecurringJobScheduler()
+    for i in range(args.jobs):
+        scheduler.register(Job(name=f"job{i}", payload={}, cron_expression="0 0 1 1 *"))
+    poll = per_call_us(scheduler.get_due_jobs, args.calls)
+    print(f"\npoll with {args.jobs} registered, none due: {poll:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Benchmark promotion of due delayed jobs from Redis into the priority streams.
+
+Loads ``--entries`` delayed jobs with ``RedisDelayedJobScheduler.schedule_many``
+(all already due), then moves them into the streams either with the scripted
+``promote_due`` or client-side with ``get_due_jobs`` + ``enqueue_many``, and
+reports jobs/sec for each. Runs against fakeredis unless ``--host`` is given;
+fakeredis interprets Lua in-process, so use a real server for 1M entries.
+
+    python benchmarks/bench_delayed_promotion.py --host localhost --entries 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import Job, Priority, RedisDelayedJobScheduler, RedisStreamsQueue
+from bench_redis_batching import make_client
+
+LOAD_BATCH = 1000
+
+
+def load(client, entries):
+    """Flush the database and schedule ``entries`` due jobs, return the scheduler."""
+    client.flushdb()
+    queue = RedisStreamsQueue(client)
+    scheduler = RedisDelayedJobScheduler(queue)
+    priorities = list(Priority)
+    for offset in range(0, entries, LOAD_BATCH):
+        jobs = [
+            Job(name="bench", payload={"i": i}, priority=priorities[i % len(priorities)])
+            for i in range(offset, min(offset + LOAD_BATCH, entries))
+        ]
+        scheduler.schedule_many(jobs, delay_ms=-1000)
+    return queue, scheduler
+
+
+def promote_scripted(queue, scheduler, batch_size):
+    return scheduler.promote_due(batch_size)
+
+
+def promote_client_side(queue, scheduler, batch_size):
+    promoted = 0
+    while True:
+        jobs = scheduler.get_due_jobs(batch_size)
+        if not jobs:
+            return promoted
+        queue.enqueue_many(jobs)
+        promoted += len(jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    # Keep per-job logging out of the measurement.
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+    client = make_client(args.host, args.port)
+    print(f"{'method':<28} {'jobs/sec':>12}")
+    for label, promote in (
+        ("promote_due (scripted)", promote_scripted),
+        ("get_due_jobs + enqueue_many", promote_client_side),
+    ):
+        queue, scheduler = load(client, args.entries)
+        start = time.perf_counter()
+        promoted = promote(queue, scheduler, args.batch)
+        elapsed = time.perf_counter() - start
+        assert promoted == args.entries, (label, promoted)
+        assert queue.size() == args.entries
+        print(f"{label:<28} {promoted / elapsed:12.0f}")
+    client.flushdb()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark DelayedJobScheduler schedule/cancel/reschedule/drain throughput.
+
+Schedules ``--jobs`` delayed jobs, cancels ``--cancel`` of them, reschedules
+the same number again and drains everything in ``--batch`` sized batches.
+For reference it also times cancellation with the previous list-rebuild +
+``heapify`` approach on a small sample, since that is O(n) per call.
+
+    python benchmarks/bench_delayed_scheduler.py --jobs 1000000
+"""
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import DelayedJobScheduler, Job
+
+
+def timed(label, count, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed:8.2f}s  {elapsed / max(count, 1) * 1e6:8.2f} us/op")
+    return result
+
+
+def rebuild_cancel(heap, job_ids):
+    """Cancel by rebuilding the heap, as the scheduler used to."""
+    for job_id in job_ids:
+        heap = [item for item in heap if item[1] != job_id]
+        heapq.heapify(heap)
+    return heap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--cancel", type=float, default=0.10)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [Job(name="delayed", payload={}) for _ in range(args.jobs)]
+    delays = [rng.randint(1, 60_000) for _ in range(args.jobs)]
+    cancelled = rng.sample(jobs, int(args.jobs * args.cancel))
+    live = set(job.id for job in jobs) - set(job.id for job in cancelled)
+    rescheduled = rng.sample(sorted(live), len(cancelled))
+
+    scheduler = DelayedJobScheduler()
+    timed("schedule", args.jobs, lambda: [scheduler.schedule(j, d) for j, d in zip(jobs, delays)])
+    timed("cancel", len(cancelled), lambda: [scheduler.cancel(j.id) for j in cancelled])
+    timed("reschedule", len(rescheduled), lambda: [scheduler.reschedule(i, 0) for i in rescheduled])
+
+    # Make everything due without waiting a minute.
+    scheduler._heap = [(0.0, seq, job_id) for _, seq, job_id in scheduler._heap]
+
+    def drain():
+        drained = 0
+        while True:
+            batch = scheduler.get_due_jobs(max_jobs=args.batch)
+            if not batch:
+                return drained
+            drained += len(batch)
+
+    drained = timed("drain", len(live), drain)
+    assert drained == len(live), (drained, len(live))
+
+    sample = min(20, len(cancelled))
+    heap = [(time.time() + d / 1000, j.id) for j, d in zip(jobs, delays)]
+    heapq.heapify(heap)
+    timed("cancel (rebuild, old)", sample, lambda: rebuild_cancel(heap, [j.id for j in cancelled[:sample]]))
+    print(f"\njobs={args.jobs} cancelled={len(cancelled)} rescheduled={len(rescheduled)} drained={drained}")
+
+
+if __name__ == "__main__":
+    main()
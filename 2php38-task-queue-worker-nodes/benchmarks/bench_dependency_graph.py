@@ -0,0 +1,72 @@
+"""Benchmark DependencyGraph batch submission, completion and ready lookups.
+
+Builds a layered DAG of ``--nodes`` jobs where each job depends on up to
+``--fanin`` jobs of the previous layer, submits it with
+``DependencyResolver.submit_batch``, then completes jobs layer by layer
+while polling ``get_ready_jobs`` after each layer.
+
+    python benchmarks/bench_dependency_graph.py --nodes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import DependencyResolver, Job
+
+
+def build_jobs(nodes, width, fanin, rng):
+    jobs = []
+    previous = []
+    for start in range(0, nodes, width):
+        layer = []
+        for i in range(start, min(start + width, nodes)):
+            deps = rng.sample(previous, min(fanin, len(previous))) if previous else []
+            layer.append(Job(id=f"j{i}", name="dag", payload={}, depends_on=deps))
+        jobs.append(layer)
+        previous = [job.id for job in layer]
+    return jobs
+
+
+def run(nodes, width, fanin, seed):
+    layers = build_jobs(nodes, width, fanin, random.Random(seed))
+    jobs = [job for layer in layers for job in layer]
+    resolver = DependencyResolver()
+    graph = resolver.graph
+
+    start = time.perf_counter()
+    successful, failed = resolver.submit_batch(jobs)
+    submit = time.perf_counter() - start
+    assert len(successful) == nodes and not failed
+
+    start = time.perf_counter()
+    ready_total = 0
+    for layer in layers:
+        ready_total += len(graph.get_ready_jobs())
+        for job in layer:
+            graph.mark_completed(job.id)
+    complete = time.perf_counter() - start
+
+    print(
+        f"nodes={nodes:>9,}  submit_batch {submit:7.2f}s ({submit / nodes * 1e6:5.2f} us/job)  "
+        f"complete+ready {complete:7.2f}s ({complete / nodes * 1e6:5.2f} us/job)  ready_seen={ready_total:,}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--width", type=int, default=1000, help="jobs per layer")
+    parser.add_argument("--fanin", type=int, default=3, help="dependencies per job")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for nodes in args.nodes:
+        run(nodes, args.width, args.fanin, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Benchmark time-to-claim per priority under a mixed-priority load.
+
+A generator enqueues jobs with a skewed priority mix slightly faster than one
+consumer can drain them, in discrete ticks of virtual time. It reports p50/p99
+ticks from enqueue to claim per priority, plus jobs never claimed, for strict
+and weighted-fair dequeueing. Runs against fakeredis unless ``--host`` is given.
+
+    python benchmarks/bench_dequeue_latency.py --ticks 500
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import Job, Priority, RedisStreamsQueue
+from bench_redis_batching import make_client
+
+PRIORITY_MIX = {
+    Priority.CRITICAL: 0.10,
+    Priority.HIGH: 0.20,
+    Priority.NORMAL: 0.40,
+    Priority.LOW: 0.20,
+    Priority.BATCH: 0.10,
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(client, priority_weights, ticks, arrivals, capacity, seed):
+    """Run the load generator, return ({priority: [latencies]}, {priority: unclaimed})."""
+    client.flushdb()
+    queue = RedisStreamsQueue(client, priority_weights=priority_weights)
+    rng = random.Random(seed)
+    priorities = list(PRIORITY_MIX)
+    weights = list(PRIORITY_MIX.values())
+    
+    submitted = {p: 0 for p in Priority}
+    latencies = {p: [] for p in Priority}
+    
+    for tick in range(ticks):
+        jobs = []
+        for _ in range(arrivals):
+            priority = rng.choices(priorities, weights)[0]
+            submitted[priority] += 1
+            jobs.append(Job(name="load", payload={"tick": tick}, priority=priority))
+        queue.enqueue_many(jobs)
+        
+        claimed = queue.dequeue("latency-consumer", timeout_ms=0, count=capacity)
+        for _, job in claimed:
+            latencies[Priority(job.priority)].append(tick - job.payload["tick"])
+        queue.acknowledge_many(claimed)
+    
+    unclaimed = {p: submitted[p] - len(latencies[p]) for p in Priority}
+    return latencies, unclaimed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--arrivals", type=int, default=11, help="jobs enqueued per tick")
+    parser.add_argument("--capacity", type=int, default=10, help="jobs claimed per tick")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    
+    client = make_client(args.host, args.port)
+    
+    modes = {
+        "strict": None,
+        "weighted": RedisStreamsQueue.DEFAULT_PRIORITY_WEIGHTS,
+    }
+    for mode, priority_weights in modes.items():
+        latencies, unclaimed = run(
+            client, priority_weights, args.ticks, args.arrivals, args.capacity, args.seed,
+        )
+        print(f"\n{mode} (ticks from enqueue to claim)")
+        print(f"{'priority':>9} {'p50':>6} {'p99':>6} {'claimed':>8} {'unclaimed':>10}")
+        for priority in Priority:
+            values = latencies[priority]
+            print(
+                f"{priority.name:>9} {percentile(values, 50):>6} {percentile(values, 99):>6} "
+                f"{len(values):>8} {unclaimed[priority]:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark per-job encode/decode/update cost of the Redis job wire format.
+
+Compares the previous JSON body (``model_dump_json``/``model_validate_json``
+and a full SET on every update) with ``JobCodec`` envelopes, validated and
+trusted decodes, and state-only HSET updates. Update costs run against
+fakeredis unless ``--host`` is given.
+
+    python benchmarks/bench_job_codec.py --jobs 20000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import Job, JobCodec, JobStatus, Priority, RetryConfig
+from bench_redis_batching import make_client
+
+
+def make_jobs(count):
+    return [
+        Job(
+            name="send_email",
+            payload={"user_id": i, "template": "welcome", "tags": ["a", "b"]},
+            priority=Priority.NORMAL,
+            depends_on=[f"dep-{i}"],
+            retry_config=RetryConfig(max_attempts=5),
+        )
+        for i in range(count)
+    ]
+
+
+def per_job_us(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    
+    codec = JobCodec()
+    jobs = make_jobs(args.jobs)
+    json_bodies = [job.model_dump_json() for job in jobs]
+    binary_bodies = [codec.encode(job) for job in jobs]
+    
+    rows = [
+        ("encode  json", per_job_us(lambda j: j.model_dump_json(), jobs)),
+        ("encode  codec", per_job_us(codec.encode, jobs)),
+        ("decode  json (validated)", per_job_us(Job.model_validate_json, json_bodies)),
+        ("decode  codec (validated)", per_job_us(codec.decode, binary_bodies)),
+        ("decode  codec (trusted)", per_job_us(
+            lambda b: codec.decode(b, validate=False), binary_bodies,
+        )),
+    ]
+    
+    client = make_client(args.host, args.port)
+    client.flushdb()
+    for job in jobs:
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.utcnow()
+    
+    rows.append(("update  SET full json", per_job_us(
+        lambda j: client.set(f"bench:job:{j.id}", j.model_dump_json()), jobs,
+    )))
+    rows.append(("update  HSET state", per_job_us(
+        lambda j: client.hset(f"bench:job:{j.id}:state", mapping=codec.encode_state(j)), jobs,
+    )))
+    rows.append(("update  HSET status only", per_job_us(
+        lambda j: client.hset(
+            f"bench:job:{j.id}:state", mapping=codec.encode_state(j, ["status"]),
+        ),
+        jobs,
+    )))
+    client.flushdb()
+    
+    json_size = sum(len(b) for b in json_bodies) / len(jobs)
+    binary_size = sum(len(b) for b in binary_bodies) / len(jobs)
+    
+    print(f"{'operation':<28} {'us/job':>8}")
+    for label, cost in rows:
+        print(f"{label:<28} {cost:>8.2f}")
+    print(f"\nbody size: json {json_size:.0f} B, codec {binary_size:.0f} B")
+
+
+if __name__ == "__main__":
+    main()
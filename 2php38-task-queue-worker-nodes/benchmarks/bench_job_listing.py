@@ -0,0 +1,99 @@
+"""Benchmark job listing response times against the number of retained jobs.
+
+Fills a ``JobStore`` with ``--sizes`` jobs (70% completed, 20% pending, 10%
+dead, spread over 1000 job names and four priorities) and times one
+50-job page: the newest page, a page resumed from a cursor halfway down,
+and pages filtered by status, name and both. For comparison it times the
+previous listing, which filtered every retained job into a list and
+sliced it, and the rate at which ``iter_jobs`` streams jobs for export.
+
+Jobs are slim stand-ins carrying only the fields the store indexes, so
+the numbers measure listing cost rather than job model construction.
+Ten million jobs need about 5 GB of memory.
+
+    python benchmarks/bench_job_listing.py --sizes 10000,1000000,10000000
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import JobStatus, JobStore, Priority
+
+PRIORITIES = tuple(Priority)
+STATUSES = (JobStatus.COMPLETED,) * 7 + (JobStatus.PENDING,) * 2 + (JobStatus.DEAD,)
+NAMES = tuple(f"job_{i}" for i in range(1000))
+
+
+class SlimJob:
+    __slots__ = ("id", "name", "status", "priority")
+
+    def __init__(self, i):
+        self.id = f"{i:012x}"
+        self.name = NAMES[i % len(NAMES)]
+        self.status = STATUSES[i % len(STATUSES)]
+        self.priority = PRIORITIES[i % len(PRIORITIES)]
+
+
+def timed_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def legacy_list(store, status, limit):
+    """The previous approach: materialise every match, then slice."""
+    matches = [job for job in store.jobs() if job.status == status]
+    matches.reverse()
+    return matches[:limit]
+
+
+def run(size, args):
+    store = JobStore(max_terminal_jobs=None)
+    started = time.perf_counter()
+    for i in range(size):
+        store.add(SlimJob(i))
+    fill = time.perf_counter() - started
+    middle = str(size // 2)
+
+    rows = [
+        ("newest page", lambda: store.page(limit=50)),
+        ("page from cursor", lambda: store.page(limit=50, cursor=middle)),
+        ("status=pending", lambda: store.page(status=JobStatus.PENDING, limit=50, cursor=middle)),
+        ("name=job_7", lambda: store.page(name="job_7", limit=50, cursor=middle)),
+        ("status+name", lambda: store.page(status=JobStatus.DEAD, name="job_9", limit=50)),
+    ]
+    print(f"\n{size:,} retained jobs (filled in {fill:.1f}s)")
+    for label, fn in rows:
+        print(f"  {label:<20} {timed_ms(fn, args.repeat):9.3f} ms")
+    legacy = timed_ms(lambda: legacy_list(store, JobStatus.PENDING, 50), 1)
+    print(f"  {'legacy list+slice':<20} {legacy:9.3f} ms")
+
+    exported = min(size, args.export)
+    started = time.perf_counter()
+    for n, _ in enumerate(store.iter_jobs(), 1):
+        if n >= exported:
+            break
+    elapsed = time.perf_counter() - started
+    print(f"  {'export':<20} {exported / elapsed / 1e6:9.2f} M jobs/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,1000000")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--export", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        run(size, args)
+
+
+if __name__ == "__main__":
+    main()
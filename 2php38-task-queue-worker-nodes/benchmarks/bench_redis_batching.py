@@ -0,0 +1,79 @@
+"""Benchmark batched RedisStreamsQueue enqueue/dequeue round-trips.
+
+Runs against fakeredis by default so it needs no server; pass ``--host`` to
+measure a real Redis instance instead.
+
+    python benchmarks/bench_redis_batching.py --jobs 5000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import Job, Priority, RedisStreamsQueue
+
+BATCH_SIZES = (1, 10, 100, 1000)
+
+
+def make_client(host=None, port=6379):
+    """Create a Redis client, falling back to fakeredis."""
+    if host:
+        import redis
+        return redis.Redis(host=host, port=port, decode_responses=True)
+    
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("fakeredis is required without --host: pip install fakeredis")
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+def run_batch_size(client, batch_size: int, total_jobs: int) -> float:
+    """Push total_jobs through enqueue_many/dequeue/acknowledge_many, return jobs/sec."""
+    client.flushdb()
+    queue = RedisStreamsQueue(client)
+    
+    jobs = [
+        Job(name="bench", payload={"i": i}, priority=Priority.NORMAL)
+        for i in range(total_jobs)
+    ]
+    
+    start = time.perf_counter()
+    for offset in range(0, total_jobs, batch_size):
+        queue.enqueue_many(jobs[offset:offset + batch_size])
+    
+    processed = 0
+    while processed < total_jobs:
+        batch = queue.dequeue("bench-consumer", timeout_ms=0, count=batch_size)
+        if not batch:
+            break
+        queue.acknowledge_many(batch)
+        processed += len(batch)
+    elapsed = time.perf_counter() - start
+    
+    return processed / elapsed if elapsed > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    
+    # Keep per-job logging out of the measurement.
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+    
+    client = make_client(args.host, args.port)
+    
+    print(f"{'batch':>6} {'jobs/sec':>12}")
+    for batch_size in BATCH_SIZES:
+        rate = run_batch_size(client, batch_size, args.jobs)
+        print(f"{batch_size:>6} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
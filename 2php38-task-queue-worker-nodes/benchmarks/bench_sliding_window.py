@@ -0,0 +1,76 @@
+"""Benchmark the sliding-window completion statistics.
+
+Measures how many completions per second ``SlidingWindowStats.record`` takes,
+from one thread and from ``--threads`` threads sharing one window. It then
+times a ``snapshot`` over a full ring, which is what a ``/metrics`` scrape
+or ``get_stats`` call pays, and one over a ring whose completions have all
+left the window.
+
+    python benchmarks/bench_sliding_window.py --updates 2000000 --threads 4
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import SlidingWindowStats
+
+PRIORITIES = ("critical", "high", "normal", "low")
+JOB_NAMES = tuple(f"job_{i}" for i in range(50))
+
+
+def fill(record, n, offset=0):
+    for i in range(offset, offset + n):
+        record(PRIORITIES[i & 3], JOB_NAMES[i % 50], 0.01, 0.002)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=2_000_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--capacity", type=int, default=65536)
+    args = parser.parse_args()
+
+    window = SlidingWindowStats(capacity=args.capacity)
+    started = time.perf_counter()
+    fill(window.record, args.updates)
+    elapsed = time.perf_counter() - started
+    print(f"record, 1 thread     {args.updates / elapsed / 1e6:6.2f}M updates/s")
+
+    window = SlidingWindowStats(capacity=args.capacity)
+    per_thread = args.updates // args.threads
+    threads = [
+        threading.Thread(target=fill, args=(window.record, per_thread, t * per_thread))
+        for t in range(args.threads)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    print(f"record, {args.threads} threads    {per_thread * args.threads / elapsed / 1e6:6.2f}M updates/s")
+
+    started = time.perf_counter()
+    snapshot = window.snapshot()
+    elapsed = time.perf_counter() - started
+    print(
+        f"snapshot             {elapsed * 1000:6.1f}ms over {snapshot.overall.count} completions, "
+        f"{len(snapshot.by_job_name)} job names"
+    )
+
+    window = SlidingWindowStats(window_seconds=0.01, capacity=args.capacity)
+    fill(window.record, args.capacity)
+    time.sleep(0.02)
+    started = time.perf_counter()
+    for _ in range(100):
+        snapshot = window.snapshot()
+    elapsed = (time.perf_counter() - started) / 100
+    print(f"snapshot, idle       {elapsed * 1000:6.3f}ms over {snapshot.overall.count} completions")
+
+
+if __name__ == "__main__":
+    main()
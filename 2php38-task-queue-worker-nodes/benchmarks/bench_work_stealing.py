@@ -0,0 +1,147 @@
+"""Benchmark makespan and worker utilization with and without work stealing.
+
+Enqueues ``--jobs`` jobs with heavy-tailed (Pareto) durations, so a few
+jobs take up to ``--max-ms`` while most take about ``--short-ms``, and runs ``--workers`` worker threads that
+each claim up to ``--prefetch`` jobs at a time and work through them in
+order, publishing their backlog through registry heartbeats. With stealing
+enabled an idle worker takes unstarted jobs from the most loaded worker's
+pending entries with ``WorkStealing.steal_for``. Reports the makespan and
+each worker's utilization (busy time / makespan).
+
+Runs against fakeredis unless ``--host`` is given.
+
+    python benchmarks/bench_work_stealing.py --workers 8 --jobs 200
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import (
+    Job,
+    RedisStreamsQueue,
+    WorkerNode,
+    WorkerRegistry,
+    WorkStealing,
+)
+from repository_after.models import WorkerInfo
+
+
+def client_factory(host, port):
+    """Return a function creating one client per thread for the same server."""
+    if host:
+        import redis
+        return lambda: redis.Redis(host=host, port=port, decode_responses=True)
+
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("fakeredis is required without --host: pip install fakeredis")
+    server = fakeredis.FakeServer()
+    return lambda: fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+def run(new_client, args, steal):
+    client = new_client()
+    client.flushdb()
+    queue = RedisStreamsQueue(client)
+    rng = random.Random(args.seed)
+    durations = {}
+    jobs = []
+    for i in range(args.jobs):
+        job = Job(name="skewed", payload={"i": i})
+        duration_ms = min(args.short_ms * rng.paretovariate(args.alpha), args.max_ms)
+        durations[job.id] = duration_ms / 1000
+        jobs.append(job)
+    queue.enqueue_many(jobs)
+
+    registry = WorkerRegistry()
+    worker_ids = [f"worker-{i}" for i in range(args.workers)]
+    for worker_id in worker_ids:
+        registry.register(WorkerNode(info=WorkerInfo(
+            id=worker_id, name=worker_id, host="localhost", port=0,
+            max_concurrent_jobs=args.prefetch,
+        )))
+
+    done = [0]
+    done_lock = threading.Lock()
+    busy = {worker_id: 0.0 for worker_id in worker_ids}
+
+    def worker(worker_id):
+        queue = RedisStreamsQueue(new_client())
+        stealing = WorkStealing(registry, threshold=args.threshold, queue=queue)
+        node = registry.get_worker(worker_id)
+        backlog = []
+        while True:
+            if not backlog:
+                backlog = queue.claim(worker_id, count=args.prefetch)
+            if not backlog and steal:
+                backlog = stealing.steal_for(worker_id, count=max(1, args.prefetch // 2))
+            if not backlog:
+                with done_lock:
+                    if done[0] >= args.jobs:
+                        return
+                time.sleep(0.001)
+                continue
+
+            node.info.current_jobs = [job.id for _, job in backlog]
+            registry.heartbeat(worker_id)
+            message_id, job = backlog.pop(0)
+            if steal and not queue.begin(job, message_id, worker_id):
+                continue
+            start = time.perf_counter()
+            time.sleep(durations[job.id])
+            busy[worker_id] += time.perf_counter() - start
+            queue.acknowledge(job, message_id)
+            with done_lock:
+                done[0] += 1
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in worker_ids]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    makespan = time.perf_counter() - start
+
+    utilization = [busy[w] / makespan for w in worker_ids]
+    ideal = sum(durations.values()) / args.workers
+    label = "stealing" if steal else "no stealing"
+    print(
+        f"{label:<12} makespan {makespan:6.2f}s (ideal {ideal:5.2f}s)  "
+        f"utilization min {min(utilization):4.0%} mean {sum(utilization) / len(utilization):4.0%} "
+        f"max {max(utilization):4.0%}"
+    )
+    print("             per worker: " + " ".join(f"{u:4.0%}" for u in utilization))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--prefetch", type=int, default=16)
+    parser.add_argument("--short-ms", type=float, default=10.0)
+    parser.add_argument("--max-ms", type=float, default=1000.0)
+    parser.add_argument("--alpha", type=float, default=1.2, help="Pareto shape; lower is more skewed")
+    parser.add_argument("--threshold", type=float, default=0.9,
+                        help="workers with more than 1 - threshold of their prefetch waiting are donors")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+
+    # Keep per-job logging out of the measurement.
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+    new_client = client_factory(args.host, args.port)
+    run(new_client, args, steal=False)
+    run(new_client, args, steal=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark MultiprocessWorkerPool throughput against worker count.
+
+Pushes ``--jobs`` small CPU-bound jobs through the pool for each worker
+count, once with one task per message and no in-flight limit (the previous
+dispatch) and once with chunked dispatch, and reports jobs/sec.
+
+    python benchmarks/bench_worker_pool.py --jobs 20000 --workers 1 2 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from repository_after import Job, MultiprocessWorkerPool
+
+
+def small_cpu_job(payload):
+    return sum(i * i for i in range(payload["n"]))
+
+
+def run(workers, chunk_size, jobs, max_in_flight=None):
+    pool = MultiprocessWorkerPool(
+        num_workers=workers,
+        handlers={"cpu": small_cpu_job},
+        chunk_size=chunk_size,
+        max_in_flight=max_in_flight,
+    )
+    pool.start()
+    try:
+        start = time.perf_counter()
+        pool.submit_many(jobs, "cpu")
+        done = 0
+        while done < len(jobs):
+            done += len(pool.get_results(timeout=1.0))
+        return len(jobs) / (time.perf_counter() - start)
+    finally:
+        pool.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk", type=int, default=64)
+    parser.add_argument("--work", type=int, default=100, help="loop size per job")
+    args = parser.parse_args()
+
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+    jobs = [Job(name="cpu", payload={"n": args.work}) for _ in range(args.jobs)]
+    print(f"{'workers':>7} {'chunk=1 jobs/s':>15} {f'chunk={args.chunk} jobs/s':>16}")
+    for workers in args.workers:
+        # Unbounded in-flight, like the previous one-put-per-task dispatch.
+        single = run(workers, 1, jobs, max_in_flight=len(jobs))
+        chunked = run(workers, args.chunk, jobs)
+        print(f"{workers:>7} {single:15,.0f} {chunked:16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ and Prometheus client for metrics exposition.
 """
 from .client import AsyncTaskQueue, TaskQueue
 from .dependencies import CircularDependencyError, DependencyGraph, DependencyResolver
+from .job_store import JobStore
 from .models import (
     Job,
     JobPayload,
@@ -18,6 +19,7 @@ from .models import (
     RetryConfig,
     RetryStrategy,
     TypedJob,
+    WindowLatencyStats,
     WorkerInfo,
 )
 from .retry import (
@@ -38,6 +40,7 @@ from .scheduler import (
 )
 from .serialization import (
     CompressedSerializer,
+    JobCodec,
     JSONSerializer,
     MessagePackSerializer,
     PayloadEncoder,
@@ -57,11 +60,17 @@ from .worker import (
 )
 
 from .redis_backend import (
+    AsyncRedisConnection,
+    AsyncRedisStreamsQueue,
     RedisConfig,
     RedisConnection,
     RedisStreamsQueue,
     RedisDistributedLock,
     RedisLeaderElection,
+    RedisDelayedJobScheduler,
+    RedisRetryScheduler,
+    RedisUniquenessConstraint,
+    PendingReclaimer,
 )
 from .logging_config import (
     configure_logging,
@@ -73,6 +82,7 @@ from .prometheus_metrics import (
     TaskQueuePrometheusMetrics,
     get_metrics,
 )
+from .sliding_window import SlidingWindowStats
 from .multiprocess_worker import (
     MultiprocessWorkerPool,
     AsyncWorkerPool,
@@ -94,6 +104,7 @@ __all__ = [
     # Client
     "TaskQueue",
     "AsyncTaskQueue",
+    "JobStore",
     # Models
     "Job",
     "JobPayload",
@@ -101,6 +112,7 @@ __all__ = [
     "JobStatus",
     "Priority",
     "QueueStats",
+    "WindowLatencyStats",
     "RetryConfig",
     "RetryStrategy",
     "WorkerInfo",
@@ -140,12 +152,19 @@ __all__ = [
     "PickleSerializer",
     "CompressedSerializer",
     "PayloadEncoder",
+    "JobCodec",
     # Redis Backend (distributed queue)
     "RedisConfig",
     "RedisConnection",
     "RedisStreamsQueue",
+    "AsyncRedisConnection",
+    "AsyncRedisStreamsQueue",
     "RedisDistributedLock",
     "RedisLeaderElection",
+    "RedisDelayedJobScheduler",
+    "RedisRetryScheduler",
+    "RedisUniquenessConstraint",
+    "PendingReclaimer",
     # Logging (structlog)
     "configure_logging",
     "get_logger",
@@ -154,6 +173,7 @@ __all__ = [
     # Prometheus Metrics (official client)
     "TaskQueuePrometheusMetrics",
     "get_metrics",
+    "SlidingWindowStats",
     # Multiprocessing Workers
     "MultiprocessWorkerPool",
     "AsyncWorkerPool",
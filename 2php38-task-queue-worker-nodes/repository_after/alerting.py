@@ -2,14 +2,18 @@
 from __future__ import annotations
 
 import asyncio
+import time
+import uuid
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from .logging_config import get_logger
 from .models import Job, Priority
+from .prometheus_metrics import TaskQueuePrometheusMetrics, get_metrics
 
 logger = get_logger(__name__)
 
@@ -44,6 +48,16 @@ class AlertHandler(ABC):
     async def send(self, alert: Alert) -> bool:
         """Send an alert. Returns True if successful."""
         pass
+    
+    async def send_batch(self, alerts: List[Alert]) -> bool:
+        """Send several alerts. Returns True if all of them were sent."""
+        results = await asyncio.gather(
+            *(self.send(alert) for alert in alerts), return_exceptions=True
+        )
+        return all(result is True for result in results)
+    
+    async def close(self):
+        """Release any resources held by the handler."""
 
 
 class LogAlertHandler(AlertHandler):
@@ -72,52 +86,108 @@ class LogAlertHandler(AlertHandler):
 
 
 class WebhookAlertHandler(AlertHandler):
-    """Alert handler that sends to a webhook URL."""
+    """Alert handler that sends to a webhook URL.
+    
+    Requests share one pooled ``httpx.AsyncClient`` per event loop, so
+    connections are kept alive between alerts instead of being opened for
+    each one. With ``batch_payloads`` a batch is posted as a single
+    ``{"alerts": [...]}`` request rather than one request per alert.
+    """
     
-    def __init__(self, webhook_url: str, headers: Optional[Dict[str, str]] = None):
+    def __init__(
+        self,
+        webhook_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        batch_payloads: bool = False,
+        client: Optional[Any] = None,
+    ):
         self._webhook_url = webhook_url
         self._headers = headers or {"Content-Type": "application/json"}
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._batch_payloads = batch_payloads
+        self._client = client
+        self._owns_client = client is None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
     
-    async def send(self, alert: Alert) -> bool:
-        """Send alert to webhook."""
-        try:
+    def _get_client(self):
+        """Return the pooled client, creating it for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._owns_client and (self._client is None or self._client_loop is not loop):
             import httpx
             
-            payload = {
-                "id": alert.id,
-                "severity": alert.severity.value,
-                "title": alert.title,
-                "message": alert.message,
-                "job_id": alert.job_id,
-                "job_name": alert.job_name,
-                "worker_id": alert.worker_id,
-                "error": alert.error,
-                "timestamp": alert.timestamp.isoformat(),
-                "metadata": alert.metadata,
-            }
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+    
+    @staticmethod
+    def _payload(alert: Alert) -> Dict[str, Any]:
+        return {
+            "id": alert.id,
+            "severity": alert.severity.value,
+            "title": alert.title,
+            "message": alert.message,
+            "job_id": alert.job_id,
+            "job_name": alert.job_name,
+            "worker_id": alert.worker_id,
+            "error": alert.error,
+            "timestamp": alert.timestamp.isoformat(),
+            "metadata": alert.metadata,
+        }
+    
+    async def _post(self, payload: Dict[str, Any], **log_fields) -> bool:
+        try:
+            response = await self._get_client().post(
+                self._webhook_url,
+                json=payload,
+                headers=self._headers,
+                timeout=self._timeout,
+            )
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self._webhook_url,
-                    json=payload,
-                    headers=self._headers,
-                    timeout=10.0,
+            if response.status_code < 300:
+                logger.debug("webhook_alert_sent", **log_fields)
+                return True
+            else:
+                logger.warning(
+                    "webhook_alert_failed",
+                    status_code=response.status_code,
+                    **log_fields,
                 )
+                return False
                 
-                if response.status_code < 300:
-                    logger.debug("webhook_alert_sent", alert_id=alert.id)
-                    return True
-                else:
-                    logger.warning(
-                        "webhook_alert_failed",
-                        alert_id=alert.id,
-                        status_code=response.status_code,
-                    )
-                    return False
-                    
         except Exception as e:
-            logger.error("webhook_alert_error", alert_id=alert.id, error=str(e))
+            logger.error("webhook_alert_error", error=str(e), **log_fields)
             return False
+    
+    async def send(self, alert: Alert) -> bool:
+        """Send alert to webhook."""
+        return await self._post(self._payload(alert), alert_id=alert.id)
+    
+    async def send_batch(self, alerts: List[Alert]) -> bool:
+        """Send alerts to the webhook, in one request with ``batch_payloads``."""
+        if not self._batch_payloads:
+            return await super().send_batch(alerts)
+        return await self._post(
+            {"alerts": [self._payload(alert) for alert in alerts]},
+            alert_ids=[alert.id for alert in alerts],
+        )
+    
+    async def close(self):
+        """Close the pooled client if this handler created it."""
+        if not self._owns_client or self._client is None:
+            return
+        client, self._client = self._client, None
+        # A client bound to a loop that has since closed cannot be awaited.
+        if self._client_loop is asyncio.get_running_loop():
+            await client.aclose()
 
 
 class CallbackAlertHandler(AlertHandler):
@@ -139,13 +209,67 @@ class CallbackAlertHandler(AlertHandler):
             return False
 
 
+@dataclass
+class _CoalesceWindow:
+    """Alerts folded into the first alert with the same key."""
+    first: Alert
+    opened_at: float
+    suppressed: int = 0
+    last: Optional[Alert] = None
+    job_ids: List[str] = field(default_factory=list)
+
+
 class AlertManager:
-    """Manages alert handlers and dispatches alerts."""
+    """Manages alert handlers and dispatches alerts.
+    
+    Coalescing is off unless ``coalesce_window`` is given. With it, alerts
+    with the same (title, job name, severity) as one sent less than
+    ``coalesce_window`` seconds earlier are suppressed; when the window
+    closes a single summary alert carrying their count is sent instead.
+    
+    Until ``start`` is called alerts are delivered inline by ``send_alert``.
+    Inline mode has no timer, so summaries of closed windows only go out
+    with the next alert or on ``close``: call ``start`` when coalescing,
+    and the background task sends them as windows expire.
+    
+    Once started, alerts go through a queue of at most ``max_queue_size``
+    entries that a background task delivers to every handler in batches of
+    up to ``batch_size``. When the queue is full
+    ``send_alert`` waits for room, or drops the alert if ``block_when_full``
+    is False. Delivery latency, drops and coalesced alerts are recorded in
+    the Prometheus metrics.
+    """
     
-    def __init__(self):
+    MAX_SUMMARY_JOB_IDS = 20
+    
+    def __init__(
+        self,
+        coalesce_window: Optional[float] = None,
+        max_queue_size: int = 10_000,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        block_when_full: bool = True,
+        metrics: Optional[TaskQueuePrometheusMetrics] = None,
+    ):
         self._handlers: List[AlertHandler] = []
         self._alert_count = 0
         self._default_handler = LogAlertHandler()
+        self._coalesce_window = coalesce_window
+        self._max_queue_size = max_queue_size
+        self._batch_size = max(1, batch_size)
+        self._flush_interval = flush_interval
+        self._block_when_full = block_when_full
+        self._metrics = metrics or get_metrics()
+        self._windows: OrderedDict[Tuple[str, Optional[str], AlertSeverity], _CoalesceWindow] = OrderedDict()
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+    
+    async def __aenter__(self) -> "AlertManager":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
     
     def add_handler(self, handler: AlertHandler):
         """Add an alert handler."""
@@ -157,6 +281,34 @@ class AlertManager:
         if handler in self._handlers:
             self._handlers.remove(handler)
     
+    async def start(self):
+        """Start delivering alerts from a bounded queue in the background."""
+        if self._dispatcher is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._dispatcher = asyncio.create_task(self._dispatch_loop())
+    
+    async def flush(self):
+        """Wait until every queued alert has been delivered."""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def close(self):
+        """Deliver queued alerts and pending summaries, then close the handlers."""
+        if self._dispatcher is not None:
+            # Alerts raised from here on are delivered inline.
+            dispatcher, self._dispatcher = self._dispatcher, None
+            await self._queue.put(None)
+            await dispatcher
+            self._queue = None
+        
+        now = time.monotonic()
+        summaries = self._close_windows()
+        if summaries:
+            await self._deliver([(summary, now) for summary in summaries])
+        handlers = self._handlers if self._handlers else [self._default_handler]
+        await asyncio.gather(*(handler.close() for handler in handlers), return_exceptions=True)
+    
     async def send_alert(
         self,
         severity: AlertSeverity,
@@ -167,9 +319,7 @@ class AlertManager:
         error: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> str:
-        """Create and send an alert to all handlers."""
-        import uuid
-        
+        """Create an alert and send it to all handlers, unless it is coalesced."""
         self._alert_count += 1
         alert_id = f"alert-{uuid.uuid4().hex[:8]}"
         
@@ -185,13 +335,137 @@ class AlertManager:
             metadata=metadata or {},
         )
         
-        handlers = self._handlers if self._handlers else [self._default_handler]
+        now = time.monotonic()
+        alerts = self._close_windows(now)
+        if self._admit(alert, now):
+            alerts.append(alert)
         
-        tasks = [handler.send(alert) for handler in handlers]
-        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._dispatcher is None:
+            if alerts:
+                await self._deliver([(a, now) for a in alerts])
+        else:
+            for a in alerts:
+                await self._enqueue(a, now)
         
         return alert_id
     
+    def _admit(self, alert: Alert, now: float) -> bool:
+        """Open a coalescing window for the alert, or fold it into an open one."""
+        if not self._coalesce_window:
+            return True
+        key = (alert.title, alert.job_name, alert.severity)
+        window = self._windows.get(key)
+        if window is None:
+            self._windows[key] = _CoalesceWindow(first=alert, opened_at=now)
+            return True
+        
+        window.suppressed += 1
+        window.last = alert
+        if alert.job_id and len(window.job_ids) < self.MAX_SUMMARY_JOB_IDS:
+            window.job_ids.append(alert.job_id)
+        self._metrics.record_alerts_coalesced()
+        return False
+    
+    def _close_windows(self, now: Optional[float] = None) -> List[Alert]:
+        """Close windows older than ``coalesce_window`` (all without ``now``).
+        
+        Windows are opened in time order, so expired ones are always at the
+        front. Returns a summary alert for each closed window that
+        suppressed anything.
+        """
+        summaries = []
+        while self._windows:
+            key, window = next(iter(self._windows.items()))
+            if now is not None and now - window.opened_at < self._coalesce_window:
+                break
+            del self._windows[key]
+            if window.suppressed:
+                summaries.append(self._summarize(window))
+        return summaries
+    
+    def _summarize(self, window: _CoalesceWindow) -> Alert:
+        first, last = window.first, window.last
+        return Alert(
+            id=f"alert-{uuid.uuid4().hex[:8]}",
+            severity=first.severity,
+            title=first.title,
+            message=(
+                f"{window.suppressed} more alerts like {first.id} were suppressed "
+                f"within {self._coalesce_window:g}s"
+            ),
+            job_id=last.job_id,
+            job_name=first.job_name,
+            worker_id=last.worker_id,
+            error=last.error,
+            metadata={
+                "coalesced_count": window.suppressed,
+                "first_alert_id": first.id,
+                "job_ids": window.job_ids,
+                "first_seen": first.timestamp.isoformat(),
+                "last_seen": last.timestamp.isoformat(),
+            },
+        )
+    
+    async def _enqueue(self, alert: Alert, raised_at: float):
+        if self._block_when_full:
+            await self._queue.put((alert, raised_at))
+        else:
+            try:
+                self._queue.put_nowait((alert, raised_at))
+            except asyncio.QueueFull:
+                self._metrics.record_alert_dropped("queue_full")
+                logger.debug("alert_dropped", alert_id=alert.id, reason="queue_full")
+                return
+        self._metrics.set_alert_queue_depth(self._queue.qsize())
+    
+    async def _dispatch_loop(self):
+        """Deliver queued alerts in batches and summaries of expired windows."""
+        queue = self._queue
+        while True:
+            batch = []
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), self._flush_interval))
+            except asyncio.TimeoutError:
+                pass
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            now = time.monotonic()
+            entries = [(summary, now) for summary in self._close_windows(now)]
+            entries.extend(entry for entry in batch if entry is not None)
+            if entries:
+                await self._deliver(entries)
+            for _ in batch:
+                queue.task_done()
+            self._metrics.set_alert_queue_depth(queue.qsize())
+            
+            if None in batch:
+                return
+    
+    async def _deliver(self, entries: List[Tuple[Alert, float]]):
+        """Send a batch to every handler, recording latency or drops per handler."""
+        alerts = [alert for alert, _ in entries]
+        handlers = self._handlers if self._handlers else [self._default_handler]
+        results = await asyncio.gather(
+            *(handler.send_batch(alerts) for handler in handlers), return_exceptions=True
+        )
+        
+        delivered_at = time.monotonic()
+        for handler, result in zip(handlers, results):
+            handler_type = type(handler).__name__
+            if result is True:
+                self._metrics.record_alerts_delivered(
+                    handler_type, [delivered_at - raised_at for _, raised_at in entries]
+                )
+            else:
+                self._metrics.record_alert_dropped("delivery_failed", len(alerts))
+                logger.warning(
+                    "alert_batch_failed",
+                    handler_type=handler_type,
+                    count=len(alerts),
+                    error=str(result) if isinstance(result, Exception) else None,
+                )
+    
     async def alert_job_failed(
         self,
         job: Job,
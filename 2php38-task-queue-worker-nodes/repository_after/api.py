@@ -5,15 +5,18 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException, Query, BackgroundTasks
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel, Field
 
 from .logging_config import get_logger
-from .models import Job, JobStatus, Priority, RetryConfig, QueueStats
+from .models import Job, JobStatus, Priority, RetryConfig, QueueStats, WindowLatencyStats
 from .prometheus_metrics import get_metrics
 
 logger = get_logger(__name__)
 
+# Jobs per chunk written by the streaming export.
+EXPORT_CHUNK_SIZE = 500
+
 app = FastAPI(
     title="Task Queue API",
     description="REST API for distributed task queue management",
@@ -72,6 +75,10 @@ class QueueStatsResponse(BaseModel):
     dead_jobs: int
     avg_processing_time_ms: float
     throughput_per_second: float
+    processing_time_ms: Dict[str, float] = Field(default_factory=dict)
+    wait_time_ms: Dict[str, float] = Field(default_factory=dict)
+    by_priority: Dict[str, WindowLatencyStats] = Field(default_factory=dict)
+    by_job_name: Dict[str, WindowLatencyStats] = Field(default_factory=dict)
     queue_depths: Dict[str, int]
     worker_count: int
 
@@ -151,15 +158,8 @@ async def submit_job(request: JobSubmitRequest):
         raise HTTPException(status_code=500, detail="Failed to submit job")
 
 
-@app.get("/jobs/{job_id}", response_model=JobResponse)
-async def get_job(job_id: str):
-    """Get job details by ID."""
-    queue = get_task_queue()
-    
-    job = queue.get_job(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
-    
+def _job_response(job: Job) -> JobResponse:
+    """Build the API representation of a job."""
     priority = Priority(job.priority) if isinstance(job.priority, int) else job.priority
     
     return JobResponse(
@@ -177,6 +177,44 @@ async def get_job(job_id: str):
     )
 
 
+@app.get("/jobs/export")
+async def export_jobs(
+    status: Optional[str] = Query(None, description="Filter by status"),
+    priority: Optional[str] = Query(None, description="Filter by priority"),
+    name: Optional[str] = Query(None, description="Filter by job name"),
+):
+    """Stream every matching job as newline-delimited JSON, newest first.
+    
+    Jobs are read from the store in batches and written out as they are
+    read, so memory use does not grow with the number of jobs exported.
+    """
+    queue = get_task_queue()
+    
+    def lines():
+        buffer = []
+        for job in queue.export_jobs(status=status, priority=priority, name=name):
+            buffer.append(_job_response(job).model_dump_json())
+            if len(buffer) >= EXPORT_CHUNK_SIZE:
+                yield "\n".join(buffer) + "\n"
+                buffer.clear()
+        if buffer:
+            yield "\n".join(buffer) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Get job details by ID."""
+    queue = get_task_queue()
+    
+    job = queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    
+    return _job_response(job)
+
+
 @app.delete("/jobs/{job_id}", status_code=204)
 async def cancel_job(job_id: str):
     """Cancel a pending job."""
@@ -208,37 +246,25 @@ async def update_job_priority(job_id: str, priority: str):
 async def list_jobs(
     status: Optional[str] = Query(None, description="Filter by status"),
     priority: Optional[str] = Query(None, description="Filter by priority"),
+    name: Optional[str] = Query(None, description="Filter by job name"),
     limit: int = Query(50, ge=1, le=100, description="Max results"),
     cursor: Optional[str] = Query(None, description="Pagination cursor"),
 ):
-    """List jobs with optional filters."""
+    """List jobs with optional filters, newest first.
+    
+    Pass the returned ``cursor`` to fetch the next page; it is null on the
+    last page.
+    """
     queue = get_task_queue()
     
-    jobs = queue.list_jobs(
+    jobs, next_cursor = queue.list_jobs_page(
         status=status,
         priority=priority,
+        name=name,
         limit=limit,
         cursor=cursor,
     )
-    
-    job_responses = []
-    for job in jobs:
-        p = Priority(job.priority) if isinstance(job.priority, int) else job.priority
-        job_responses.append(JobResponse(
-            id=job.id,
-            name=job.name,
-            status=job.status.value if isinstance(job.status, JobStatus) else job.status,
-            priority=p.name,
-            payload=job.payload,
-            attempt=job.attempt,
-            created_at=job.created_at.isoformat() if job.created_at else "",
-            started_at=job.started_at.isoformat() if job.started_at else None,
-            completed_at=job.completed_at.isoformat() if job.completed_at else None,
-            last_error=job.last_error,
-            depends_on=job.depends_on or [],
-        ))
-    
-    next_cursor = jobs[-1].id if len(jobs) == limit else None
+    job_responses = [_job_response(job) for job in jobs]
     
     return JobListResponse(
         jobs=job_responses,
@@ -288,7 +314,11 @@ async def get_stats():
         failed_jobs=stats.failed_jobs,
         dead_jobs=stats.dead_jobs,
         avg_processing_time_ms=stats.avg_processing_time_ms,
-        throughput_per_second=getattr(stats, 'throughput_per_second', 0.0),
+        throughput_per_second=stats.throughput_per_second,
+        processing_time_ms=stats.processing_time_ms,
+        wait_time_ms=stats.wait_time_ms,
+        by_priority=stats.by_priority,
+        by_job_name=stats.by_job_name,
         queue_depths={p.name: d for p, d in depths.items()},
         worker_count=queue.get_worker_count(),
     )
@@ -323,11 +353,16 @@ async def list_workers():
 @app.get("/dlq")
 async def list_dead_letter_queue(
     limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Pagination cursor"),
+    name: Optional[str] = Query(None, description="Filter by job name"),
+    priority: Optional[str] = Query(None, description="Filter by priority"),
 ):
-    """List jobs in dead letter queue."""
+    """List jobs in dead letter queue, most recently dead-lettered first."""
     queue = get_task_queue()
     
-    dlq_jobs = queue.get_dlq_jobs(limit=limit)
+    dlq_jobs, next_cursor = queue.list_dlq_page(
+        limit=limit, cursor=cursor, name=name, priority=priority
+    )
     
     return {
         "jobs": [
@@ -340,6 +375,7 @@ async def list_dead_letter_queue(
             for job in dlq_jobs
         ],
         "total": len(dlq_jobs),
+        "cursor": next_cursor,
     }
 
 
@@ -9,13 +9,33 @@ import asyncio
 import os
 import threading
 import time
-from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, TypeVar
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from redis.exceptions import RedisError
 
 from .dependencies import CircularDependencyError, DependencyGraph, DependencyResolver
-from .models import Job, JobResult, JobStatus, Priority, QueueStats, RetryConfig
+from .job_store import JobStore
+from .models import (
+    Job,
+    JobResult,
+    JobStatus,
+    Priority,
+    QueueStats,
+    RetryConfig,
+    WindowLatencyStats,
+)
 from .prometheus_metrics import TaskQueuePrometheusMetrics, get_metrics
-from .redis_backend import RedisConfig, RedisConnection, RedisStreamsQueue
+from .redis_backend import (
+    AsyncRedisConnection,
+    AsyncRedisStreamsQueue,
+    RedisConfig,
+    RedisConnection,
+    RedisDelayedJobScheduler,
+    RedisRetryScheduler,
+    RedisStreamsQueue,
+    RedisUniquenessConstraint,
+)
 from .retry import RetryDecision, RetryManager, RetryScheduler
 from .scheduler import (
     BulkJobSubmitter,
@@ -23,13 +43,36 @@ from .scheduler import (
     RecurringJobScheduler,
     UniquenessConstraint,
 )
+from .sliding_window import SlidingWindowStats
 from .worker import WorkerNode, WorkerProcess, WorkerRegistry, WorkStealing
 from .logging_config import get_logger
 
 logger = get_logger(__name__)
+
 T = TypeVar("T")
 
 
+def _queue_wait_seconds(job: Job) -> Optional[float]:
+    """Seconds between a job becoming due and starting, if it has started."""
+    if job.started_at is None:
+        return None
+    due = job.scheduled_at or job.created_at
+    if due.tzinfo is not None:
+        due = due.astimezone(timezone.utc).replace(tzinfo=None)
+    return max(0.0, (job.started_at - due).total_seconds())
+
+
+def _window_latency(stats) -> WindowLatencyStats:
+    """Convert sliding-window stats in seconds to the millisecond stats model."""
+    return WindowLatencyStats(
+        completed=stats.count,
+        throughput_per_second=stats.throughput_per_second,
+        avg_processing_time_ms=stats.avg_run_seconds * 1000,
+        processing_time_ms={f"p{p}": v * 1000 for p, v in stats.run_seconds.items()},
+        wait_time_ms={f"p{p}": v * 1000 for p, v in stats.wait_seconds.items()},
+    )
+
+
 class TaskQueue:
     """Main task queue client for submitting and managing jobs.
     
@@ -37,10 +80,14 @@ class TaskQueue:
     client for metrics exposition.
     """
     
+    DUE_BATCH_SIZE = 1000
+    
     def __init__(
         self,
         redis_config: Optional[RedisConfig] = None,
         heartbeat_timeout: float = 30.0,
+        max_terminal_jobs: Optional[int] = 10_000,
+        terminal_job_ttl_seconds: Optional[float] = None,
     ):
         # Redis configuration with environment variable support
         self._redis_config = redis_config or RedisConfig(
@@ -60,27 +107,38 @@ class TaskQueue:
             self._queue = None
             self._use_redis = False
         
-        # In-memory job storage for tracking
-        self._jobs: Dict[str, Job] = {}
-        self._jobs_lock = threading.RLock()
+        # In-memory job tracking, indexed by status/priority/name. Finished
+        # jobs are evicted past max_terminal_jobs or terminal_job_ttl_seconds.
+        self._store = JobStore(max_terminal_jobs, terminal_job_ttl_seconds)
         
-        self._delayed_scheduler = DelayedJobScheduler()
+        # Delayed jobs, retries and unique keys are shared through Redis so
+        # they survive restarts and apply across every node.
+        if self._use_redis:
+            self._delayed_scheduler = RedisDelayedJobScheduler(self._queue)
+            self._uniqueness = RedisUniquenessConstraint(self._redis_conn)
+        else:
+            self._delayed_scheduler = DelayedJobScheduler()
+            self._uniqueness = UniquenessConstraint()
         self._recurring_scheduler = RecurringJobScheduler()
         self._dependency_resolver = DependencyResolver()
-        self._uniqueness = UniquenessConstraint()
         
-        # Prometheus metrics
+        # Prometheus metrics are process-wide; get_stats reads this queue's
+        # own sliding window so other queues' completions don't leak in.
         self._metrics = get_metrics()
+        self._window = SlidingWindowStats()
         
         self._retry_manager = RetryManager(
             on_retry=self._on_job_retry,
             on_dlq=self._on_job_dlq,
             on_failure=self._on_job_failure,
         )
-        self._retry_scheduler = RetryScheduler(self._retry_manager)
+        if self._use_redis:
+            self._retry_scheduler = RedisRetryScheduler(self._retry_manager, self._queue)
+        else:
+            self._retry_scheduler = RetryScheduler(self._retry_manager)
         
         self._worker_registry = WorkerRegistry(heartbeat_timeout)
-        self._work_stealing = WorkStealing(self._worker_registry)
+        self._work_stealing = WorkStealing(self._worker_registry, queue=self._queue)
         
         self._bulk_submitter = BulkJobSubmitter(
             self._delayed_scheduler,
@@ -90,35 +148,61 @@ class TaskQueue:
         self._handlers: Dict[str, Callable[[Job], JobResult]] = {}
         self._running = False
         self._lock = threading.RLock()
+        # Stream entries of dequeued jobs, acknowledged when the job finishes
+        self._message_ids: Dict[str, str] = {}
+        # Consumer name in the stream group; the registered worker's id once
+        # there is one, so work stealing and recovery address this consumer.
+        self._default_consumer = f"worker_{id(self)}"
+        self._consumer_name = self._default_consumer
     
     def _register_job(self, job: Job):
         """Register a job in the local tracking store."""
-        with self._jobs_lock:
-            self._jobs[job.id] = job
+        self._store.add(job)
     
     def _get_job(self, job_id: str) -> Optional[Job]:
         """Get a job from local tracking store."""
-        with self._jobs_lock:
-            return self._jobs.get(job_id)
+        return self._store.get(job_id)
+    
+    def _release_unique(self, job: Job):
+        """Release a job's uniqueness constraint.
+        
+        In Redis the key is released only if this job still holds it, so a
+        key since taken over by another job is left alone.
+        """
+        if self._use_redis and self._queue:
+            self._queue.release_unique(job.unique_key, job.id)
+        else:
+            self._uniqueness.release(job.unique_key)
     
-    def _enqueue(self, job: Job):
-        """Enqueue a job to Redis or in-memory fallback."""
+    def _enqueue(self, job: Job) -> bool:
+        """Enqueue a job to Redis or in-memory fallback.
+        
+        Returns False if Redis rejected the job because another job already
+        holds its unique key.
+        """
         if self._use_redis and self._queue:
-            self._queue.enqueue(job)
+            if self._queue.enqueue_atomic(job) is None:
+                return False
         self._register_job(job)
+        return True
     
     def _dequeue(self, timeout: Optional[float] = None) -> Optional[Job]:
         """Dequeue a job from Redis or in-memory fallback."""
         if self._use_redis and self._queue:
             # Redis dequeue returns list of (message_id, job) tuples
             timeout_ms = int(timeout * 1000) if timeout else 1000
+            # Mark the job as started in the same call, so it cannot be
+            # stolen from under this consumer.
             results = self._queue.dequeue(
-                consumer_name=f"worker_{id(self)}",
+                consumer_name=self._consumer_name,
                 timeout_ms=timeout_ms,
                 count=1,
+                begin=True,
             )
             if results:
                 message_id, job = results[0]
+                self._message_ids[job.id] = message_id
+                self._register_job(job)
                 return job
         return None
     
@@ -126,19 +210,13 @@ class TaskQueue:
         """Get total queue size."""
         if self._use_redis and self._queue:
             return self._queue.size()
-        with self._jobs_lock:
-            return len([j for j in self._jobs.values() if j.status == JobStatus.PENDING])
+        return self._store.count(JobStatus.PENDING)
     
     def size_by_priority(self) -> Dict[Priority, int]:
         """Get queue size by priority level."""
         if self._use_redis and self._queue:
             return self._queue.size_by_priority()
-        result = {p: 0 for p in Priority}
-        with self._jobs_lock:
-            for job in self._jobs.values():
-                if job.status == JobStatus.PENDING:
-                    result[Priority(job.priority)] += 1
-        return result
+        return self._store.count_by_priority(JobStatus.PENDING)
     
     def register_handler(self, job_name: str, handler: Callable[[Job], JobResult]):
         """Register a handler function for a job type."""
@@ -182,7 +260,7 @@ class TaskQueue:
             success, error = self._dependency_resolver.submit_job(job)
             if not success:
                 if job.unique_key:
-                    self._uniqueness.release(job.unique_key)
+                    self._release_unique(job)
                 raise CircularDependencyError([error or "Unknown dependency error"])
         
         if job.cron_expression:
@@ -203,7 +281,10 @@ class TaskQueue:
             self._metrics.record_job_submitted(Priority(job.priority).name.lower())
             return job.id
         
-        self._enqueue(job)
+        if not self._enqueue(job):
+            if job.unique_key:
+                self._release_unique(job)
+            raise ValueError(f"Duplicate job with unique key: {job.unique_key}")
         self._metrics.record_job_submitted(Priority(job.priority).name.lower())
         self._update_metrics()
         
@@ -231,8 +312,15 @@ class TaskQueue:
         return self._bulk_submitter.submit_batch(job_objects, atomic)
     
     def get_job(self, job_id: str) -> Optional[Job]:
-        """Get a job by its ID."""
-        return self._get_job(job_id)
+        """Get a job by its ID.
+        
+        Jobs submitted by other client processes are not tracked locally and
+        are looked up in Redis instead.
+        """
+        job = self._get_job(job_id)
+        if job is None and self._use_redis and self._queue:
+            job = self._queue.get_job(job_id)
+        return job
     
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a pending or scheduled job."""
@@ -249,10 +337,11 @@ class TaskQueue:
             return False
         
         if job.unique_key:
-            self._uniqueness.release(job.unique_key)
+            self._release_unique(job)
         
         job.status = JobStatus.FAILED
         job.last_error = "Cancelled by user"
+        self._store.update(job)
         return True
     
     def update_priority(self, job_id: str, new_priority: Priority) -> bool:
@@ -260,16 +349,28 @@ class TaskQueue:
         job = self._get_job(job_id)
         if job:
             job.priority = new_priority.value
+            self._store.update(job)
             return True
         return False
     
     def get_next_job(self, timeout: Optional[float] = None) -> Optional[Job]:
         """Get the next job to process from the queue."""
-        due_delayed = self._delayed_scheduler.get_due_jobs()
-        for job in due_delayed:
-            if not self._dependency_resolver.graph.has_unmet_dependencies(job.id):
-                return job
-            self._enqueue(job)
+        if self._use_redis and self._queue:
+            # Delayed jobs and retries are shared by every node, so a due one
+            # may have been submitted elsewhere. They are moved into the
+            # streams, and the node that claims one tracks, acknowledges and
+            # completes it.
+            self._delayed_scheduler.promote_due(self.DUE_BATCH_SIZE)
+            self._retry_scheduler.promote_due(self.DUE_BATCH_SIZE)
+        else:
+            ready = None
+            for job in self._delayed_scheduler.get_due_jobs(self.DUE_BATCH_SIZE):
+                if ready is None and not self._dependency_resolver.graph.has_unmet_dependencies(job.id):
+                    ready = job
+                else:
+                    self._enqueue(job)
+            if ready:
+                return ready
         
         due_recurring = self._recurring_scheduler.get_due_jobs()
         for job in due_recurring:
@@ -280,13 +381,14 @@ class TaskQueue:
             )
             self._enqueue(new_job)
         
-        due_retries = self._retry_scheduler.get_due_retries()
-        for job_id in due_retries:
-            self._retry_scheduler.pop_retry(job_id)
-            job = self._get_job(job_id)
-            if job:
-                job.status = JobStatus.PENDING
-                self._enqueue(job)
+        if not self._use_redis:
+            for job_id in self._retry_scheduler.get_due_retries():
+                if self._retry_scheduler.pop_retry(job_id) is None:
+                    continue
+                job = self.get_job(job_id)
+                if job:
+                    job.status = JobStatus.PENDING
+                    self._enqueue(job)
         
         job = self._dequeue(timeout)
         if job:
@@ -307,10 +409,7 @@ class TaskQueue:
             for dep_job in runnable:
                 self._enqueue(dep_job)
             
-            self._metrics.record_job_completed(
-                result.duration_ms / 1000,
-                Priority(job.priority).name.lower(),
-            )
+            self._record_completed(job, result)
         else:
             decision = self._retry_manager.handle_failure(job, result.error or "Unknown error")
             
@@ -321,17 +420,54 @@ class TaskQueue:
                 self._metrics.record_job_failed(Priority(job.priority).name.lower())
         
         if job.unique_key and job.status in (JobStatus.COMPLETED, JobStatus.DEAD):
-            self._uniqueness.release(job.unique_key)
+            self._release_unique(job)
         
+        if self._use_redis and self._queue:
+            # Acknowledge with the new state, or the entry stays pending as
+            # RUNNING and the reclaimer hands the job out again.
+            message_id = self._message_ids.pop(job_id, None)
+            if message_id:
+                self._queue.acknowledge(job, message_id, update_state=True)
+            else:
+                self._queue.update_job(job)
+        self._store.update(job)
         self._update_metrics()
     
+    def _record_completed(self, job: Job, result: JobResult):
+        """Record a successful completion in the metrics and this queue's window."""
+        priority = Priority(job.priority).name.lower()
+        duration = result.duration_ms / 1000
+        wait = _queue_wait_seconds(job)
+        self._metrics.record_job_completed(
+            duration, priority, job_name=job.name, wait_seconds=wait
+        )
+        self._window.record(priority, job.name, duration, wait)
+    
     def get_stats(self) -> QueueStats:
         """Get queue statistics."""
+        store = self._store
+        window = self._window.snapshot()
+        overall = _window_latency(window.overall)
         return QueueStats(
-            total_jobs=len(self._jobs),
-            pending_jobs=len([j for j in self._jobs.values() if j.status == JobStatus.PENDING]),
-            completed_jobs=len([j for j in self._jobs.values() if j.status == JobStatus.COMPLETED]),
-            failed_jobs=len([j for j in self._jobs.values() if j.status == JobStatus.FAILED]),
+            total_jobs=store.total(),
+            pending_jobs=store.count(JobStatus.PENDING),
+            running_jobs=store.count(JobStatus.RUNNING),
+            completed_jobs=store.total(JobStatus.COMPLETED),
+            failed_jobs=store.total(JobStatus.FAILED),
+            dead_jobs=store.total(JobStatus.DEAD),
+            jobs_by_priority={
+                p.name: count for p, count in store.count_by_priority().items()
+            },
+            avg_processing_time_ms=overall.avg_processing_time_ms,
+            throughput_per_second=overall.throughput_per_second,
+            processing_time_ms=overall.processing_time_ms,
+            wait_time_ms=overall.wait_time_ms,
+            by_priority={
+                p.upper(): _window_latency(stats) for p, stats in window.by_priority.items()
+            },
+            by_job_name={
+                name: _window_latency(stats) for name, stats in window.by_job_name.items()
+            },
             queue_depth=self.size(),
         )
     
@@ -371,25 +507,33 @@ class TaskQueue:
     
     def _update_metrics(self):
         """Update queue metrics."""
-        size_by_priority = self.size_by_priority()
-        total_size = self.size()
-        self._metrics.set_queue_depth(total_size)
+        self._metrics.set_queue_depth(self.size())
         self._metrics.set_dlq_depth(self._retry_manager.get_dlq_size())
         self._metrics.set_worker_count(self._worker_registry.get_worker_count())
     
     def register_worker(self, worker: WorkerProcess) -> bool:
-        """Register a worker with the queue."""
+        """Register a worker with the queue.
+        
+        The first registered worker's id becomes this queue's consumer name,
+        so jobs it dequeues are pending under the id that work stealing and
+        consumer recovery look up.
+        """
         node = WorkerNode(info=worker.info)
-        return self._worker_registry.register(node)
+        registered = self._worker_registry.register(node)
+        if registered and self._consumer_name == self._default_consumer:
+            self._consumer_name = worker.info.id
+        return registered
     
     def unregister_worker(self, worker_id: str):
         """Unregister a worker."""
         self._worker_registry.unregister(worker_id)
+        if self._consumer_name == worker_id:
+            self._consumer_name = self._default_consumer
         self._update_metrics()
     
-    def worker_heartbeat(self, worker_id: str) -> bool:
-        """Update worker heartbeat."""
-        return self._worker_registry.heartbeat(worker_id)
+    def worker_heartbeat(self, worker_id: str, running_jobs: Optional[int] = None) -> bool:
+        """Update worker heartbeat and publish its load."""
+        return self._worker_registry.heartbeat(worker_id, running_jobs)
     
     def get_queue_size(self) -> int:
         """Get total queue size."""
@@ -403,8 +547,8 @@ class TaskQueue:
         """Clear all jobs from the queue."""
         if self._use_redis and self._queue:
             self._queue.clear()
-        with self._jobs_lock:
-            self._jobs.clear()
+        self._message_ids.clear()
+        self._store.clear()
         self._update_metrics()
     
     def list_jobs(
@@ -413,29 +557,53 @@ class TaskQueue:
         priority: Optional[str] = None,
         limit: int = 50,
         cursor: Optional[str] = None,
+        name: Optional[str] = None,
     ) -> List[Job]:
-        """List jobs with optional filters."""
-        with self._jobs_lock:
-            jobs = list(self._jobs.values())
-            
-            jobs.sort(key=lambda j: j.created_at, reverse=True)
-            
-            if status:
-                target_status = status.upper()
-                jobs = [j for j in jobs if j.status.value.upper() == target_status]
-            if priority:
-                target_priority = priority.upper()
-                jobs = [j for j in jobs if Priority(j.priority).name == target_priority]
-            
-            if cursor:
-                start_idx = 0
-                for i, job in enumerate(jobs):
-                    if job.id == cursor:
-                        start_idx = i + 1
-                        break
-                jobs = jobs[start_idx:]
-            
-            return jobs[:limit]
+        """List jobs with optional filters, newest first.
+        
+        ``cursor`` is the ID of the last job of the previous page, or a
+        cursor returned by ``list_jobs_page``.
+        """
+        return self.list_jobs_page(status, priority, limit, cursor, name)[0]
+    
+    def list_jobs_page(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> Tuple[List[Job], Optional[str]]:
+        """List a page of jobs newest first, with the cursor of the next page."""
+        filters = self._job_filters(status, priority)
+        if filters is None:
+            return [], None
+        return self._store.page(*filters, name=name, limit=limit, cursor=cursor)
+    
+    def export_jobs(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        name: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Job]:
+        """Yield every matching job newest first, reading ``batch_size`` at a time."""
+        filters = self._job_filters(status, priority)
+        if filters is None:
+            return iter(())
+        return self._store.iter_jobs(*filters, name=name, batch_size=batch_size)
+    
+    @staticmethod
+    def _job_filters(
+        status: Optional[str], priority: Optional[str]
+    ) -> Optional[Tuple[Optional[JobStatus], Optional[Priority]]]:
+        """Parse status and priority filter names, or None if either is unknown."""
+        try:
+            target_status = JobStatus(status.lower()) if status else None
+            target_priority = Priority[priority.upper()] if priority else None
+        except (KeyError, ValueError):
+            return None
+        return target_status, target_priority
     
     def get_queue_depths(self) -> Dict[Priority, int]:
         """Get queue depths per priority level."""
@@ -450,8 +618,21 @@ class TaskQueue:
         return self._worker_registry.get_worker_count()
     
     def get_dlq_jobs(self, limit: int = 50) -> List[Job]:
-        """Get jobs from dead-letter queue."""
-        return self._retry_manager.get_dlq()[:limit]
+        """Get the most recently dead-lettered jobs."""
+        return self._retry_manager.list_dlq(limit=limit)[0]
+    
+    def list_dlq_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        name: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> Tuple[List[Job], Optional[str]]:
+        """List a page of dead-lettered jobs, with the cursor of the next page."""
+        filters = self._job_filters(None, priority)
+        if filters is None:
+            return [], None
+        return self._retry_manager.list_dlq(limit, cursor, name, filters[1])
     
     def retry_job(self, job_id: str) -> Optional[Job]:
         """Retry a failed job from DLQ."""
@@ -463,10 +644,128 @@ class TaskQueue:
 
 
 class AsyncTaskQueue:
-    """Async wrapper for TaskQueue using Redis Streams."""
+    """asyncio task queue client using Redis Streams.
+    
+    Submission, dequeueing and acknowledgement run on a redis.asyncio
+    connection pool, so waiting for work suspends only the calling
+    coroutine. A background task keeps up to ``prefetch`` claimed jobs
+    buffered locally and ``get_next_job`` is served from that buffer, so
+    many coroutines can share one process without a round-trip per job.
+    Local bookkeeping (job tracking, dependencies, retries, metrics) is
+    shared with the wrapped ``TaskQueue``; jobs with dependencies, delays
+    or cron schedules are submitted through it in a worker thread. Without
+    Redis every call delegates to the in-memory ``TaskQueue``.
+    """
     
-    def __init__(self, queue: Optional[TaskQueue] = None):
+    BLOCK_MS = 1000
+    PROMOTE_INTERVAL = 1.0
+    
+    def __init__(
+        self,
+        queue: Optional[TaskQueue] = None,
+        prefetch: int = 16,
+        consumer_name: Optional[str] = None,
+        priority_weights: Optional[Dict[Priority, int]] = None,
+        redis_client: Optional[Any] = None,
+        max_connections: Optional[int] = None,
+    ):
         self._queue = queue or TaskQueue()
+        self._prefetch = max(1, prefetch)
+        self._consumer_name = consumer_name or f"async_worker_{os.getpid()}_{id(self)}"
+        self._streams: Optional[AsyncRedisStreamsQueue] = None
+        if self._queue._use_redis:
+            client = redis_client or AsyncRedisConnection.get_connection(
+                self._queue._redis_config, max_connections
+            )
+            self._streams = AsyncRedisStreamsQueue(client, priority_weights)
+        
+        self._buffer: Optional[asyncio.Queue] = None
+        self._slot_freed: Optional[asyncio.Event] = None
+        self._prefetcher: Optional[asyncio.Task] = None
+        self._closing = False
+        self._message_ids: Dict[str, str] = {}
+        self._last_promote = 0.0
+        self._pending_acks: List[tuple[str, Job]] = []
+        self._acks_flushed: Optional[asyncio.Future] = None
+    
+    async def __aenter__(self) -> "AsyncTaskQueue":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
+    async def start(self):
+        """Create consumer groups and start prefetching jobs."""
+        if self._streams is None or self._prefetcher is not None:
+            return
+        await self._streams.initialize()
+        self._closing = False
+        self._buffer = asyncio.Queue(maxsize=self._prefetch)
+        self._slot_freed = asyncio.Event()
+        self._prefetcher = asyncio.create_task(self._prefetch_loop())
+    
+    async def close(self):
+        """Stop prefetching and hand buffered, unstarted jobs back to the queue."""
+        if self._prefetcher is None:
+            return
+        self._closing = True
+        self._slot_freed.set()
+        self._prefetcher.cancel()
+        try:
+            await self._prefetcher
+        except asyncio.CancelledError:
+            pass
+        self._prefetcher = None
+        
+        buffered = []
+        while not self._buffer.empty():
+            buffered.append(self._buffer.get_nowait())
+        if buffered:
+            await self._streams.release(buffered)
+            logger.info("prefetched_jobs_released", count=len(buffered))
+    
+    async def _prefetch_loop(self):
+        """Keep the local buffer topped up with claimed jobs."""
+        while not self._closing:
+            free = self._buffer.maxsize - self._buffer.qsize()
+            if free <= 0:
+                self._slot_freed.clear()
+                await self._slot_freed.wait()
+                continue
+            try:
+                await self._promote_due()
+                entries = await self._streams.dequeue(
+                    self._consumer_name,
+                    timeout_ms=self.BLOCK_MS,
+                    count=free,
+                )
+            except RedisError as e:
+                logger.error("prefetch_error", error=str(e), consumer=self._consumer_name)
+                await asyncio.sleep(self.BLOCK_MS / 1000)
+                continue
+            for entry in entries:
+                self._buffer.put_nowait(entry)
+    
+    async def _promote_due(self):
+        """Move due delayed jobs, retries and recurring runs into the streams."""
+        now = time.time()
+        if now - self._last_promote < self.PROMOTE_INTERVAL:
+            return
+        self._last_promote = now
+        
+        await self._streams.promote_due(
+            RedisDelayedJobScheduler.SCHEDULE_KEY, RedisDelayedJobScheduler.STREAMS_KEY
+        )
+        await self._streams.promote_due(
+            RedisRetryScheduler.SCHEDULE_KEY, RedisRetryScheduler.STREAMS_KEY
+        )
+        recurring = [
+            Job(name=job.name, payload=job.payload, priority=job.priority)
+            for job in self._queue._recurring_scheduler.get_due_jobs()
+        ]
+        if recurring:
+            await self._streams.enqueue_many(recurring)
     
     async def submit(
         self,
@@ -475,13 +774,133 @@ class AsyncTaskQueue:
         priority: Priority = Priority.NORMAL,
         **kwargs,
     ) -> str:
-        return self._queue.submit(name, payload, priority, **kwargs)
+        """Submit a new job to the queue.
+        
+        Takes the same keyword arguments as ``TaskQueue.submit``.
+        """
+        if self._streams is None:
+            return self._queue.submit(name, payload, priority, **kwargs)
+        
+        job = Job(
+            name=name,
+            payload=payload,
+            priority=priority,
+            delay_ms=kwargs.pop("delay_ms", 0),
+            depends_on=kwargs.pop("depends_on", None) or [],
+            retry_config=kwargs.pop("retry_config", None) or RetryConfig(),
+            **kwargs,
+        )
+        if job.depends_on or job.cron_expression or job.delay_ms > 0 or job.scheduled_at:
+            return await asyncio.to_thread(self._queue._submit_job, job)
+        
+        await self._streams.initialize()
+        if await self._streams.enqueue_atomic(job) is None:
+            raise ValueError(f"Duplicate job with unique key: {job.unique_key}")
+        self._queue._register_job(job)
+        self._queue._metrics.record_job_submitted(Priority(job.priority).name.lower())
+        return job.id
     
     async def get_next_job(self, timeout: Optional[float] = None) -> Optional[Job]:
-        return self._queue.get_next_job(timeout)
+        """Get the next prefetched job, waiting up to ``timeout`` seconds (default 1)."""
+        if self._streams is None:
+            return self._queue.get_next_job(timeout)
+        
+        await self.start()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (timeout or 1.0)
+        while True:
+            try:
+                message_id, job = await asyncio.wait_for(
+                    self._buffer.get(), max(0.0, deadline - loop.time())
+                )
+            except asyncio.TimeoutError:
+                return None
+            self._slot_freed.set()
+            # Buffered jobs are still stealable until they are marked as started.
+            if await self._streams.begin(job, message_id, self._consumer_name):
+                break
+            logger.info("prefetched_job_stolen", job_id=job.id, consumer=self._consumer_name)
+        
+        self._message_ids[job.id] = message_id
+        self._queue._register_job(job)
+        return job
     
     async def complete_job(self, job_id: str, result: JobResult):
-        self._queue.complete_job(job_id, result)
+        """Mark a job as complete, acknowledging it with its new state in one round-trip."""
+        if self._streams is None:
+            self._queue.complete_job(job_id, result)
+            return
+        
+        queue = self._queue
+        job = queue._get_job(job_id)
+        if not job:
+            return
+        
+        if result.success:
+            job.status = JobStatus.COMPLETED
+            job.completed_at = datetime.utcnow()
+            
+            runnable = queue._dependency_resolver.complete_job(job_id)
+            for dep_job in runnable:
+                if await self._streams.enqueue_atomic(dep_job) is not None:
+                    queue._register_job(dep_job)
+            
+            queue._record_completed(job, result)
+        else:
+            decision = queue._retry_manager.handle_failure(job, result.error or "Unknown error")
+            
+            if decision.should_retry:
+                await self._streams.schedule_retry(job, decision.delay_ms)
+            else:
+                queue._dependency_resolver.fail_job(job_id)
+                queue._metrics.record_job_failed(Priority(job.priority).name.lower())
+        
+        if job.unique_key and job.status in (JobStatus.COMPLETED, JobStatus.DEAD):
+            await self._streams.release_unique(job.unique_key, job.id)
+        
+        message_id = self._message_ids.pop(job_id, None)
+        if message_id:
+            await self._acknowledge(message_id, job)
+        else:
+            await self._streams.update_job(job)
+        queue._store.update(job)
+    
+    async def _acknowledge(self, message_id: str, job: Job):
+        """Acknowledge a job together with every other job completed this loop turn.
+        
+        Completions are group-committed: the first one schedules a flush and
+        the rest join its batch, so any number of concurrent completions
+        cost one pipelined round-trip and one pooled connection.
+        """
+        self._pending_acks.append((message_id, job))
+        if self._acks_flushed is None:
+            self._acks_flushed = asyncio.get_running_loop().create_future()
+            asyncio.create_task(self._flush_acks())
+        await asyncio.shield(self._acks_flushed)
+    
+    async def _flush_acks(self):
+        await asyncio.sleep(0)
+        batch, flushed = self._pending_acks, self._acks_flushed
+        self._pending_acks, self._acks_flushed = [], None
+        try:
+            await self._streams.acknowledge_many(batch, update_state=True)
+        except Exception as e:
+            flushed.set_exception(e)
+        else:
+            flushed.set_result(len(batch))
+    
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        """Get a job by its ID, looking it up in Redis if not tracked locally."""
+        job = self._queue._get_job(job_id)
+        if job is None and self._streams is not None:
+            job = await self._streams.get_job(job_id)
+        return job
+    
+    async def size(self) -> int:
+        """Get total queue size."""
+        if self._streams is None:
+            return self._queue.size()
+        return await self._streams.size()
     
     def get_stats(self) -> QueueStats:
         return self._queue.get_stats()
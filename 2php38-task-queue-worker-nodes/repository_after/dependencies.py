@@ -15,35 +15,55 @@ class CircularDependencyError(Exception):
 
 
 class DependencyGraph:
-    """Graph-based dependency management for jobs."""
+    """Graph-based dependency management for jobs.
+    
+    Each job keeps a counter of dependencies that are not yet completed, and
+    the set of pending jobs whose counter is zero is maintained as statuses
+    change, so completing a job costs O(number of dependents) and listing
+    ready jobs never rescans the graph.
+    """
     
     def __init__(self):
         self._dependencies: Dict[str, Set[str]] = defaultdict(set)
         self._dependents: Dict[str, Set[str]] = defaultdict(set)
         self._job_status: Dict[str, JobStatus] = {}
         self._jobs: Dict[str, Job] = {}
+        self._unmet: Dict[str, int] = defaultdict(int)
+        self._ready: Dict[str, None] = {}
     
     def add_job(self, job: Job) -> None:
         """Add a job and its dependencies to the graph."""
         self._jobs[job.id] = job
-        self._job_status[job.id] = job.status
         
+        deps = self._dependencies[job.id]
         for dep_id in job.depends_on:
-            self._dependencies[job.id].add(dep_id)
+            if dep_id in deps:
+                continue
+            deps.add(dep_id)
             self._dependents[dep_id].add(job.id)
+            if self._job_status.get(dep_id) != JobStatus.COMPLETED:
+                self._unmet[job.id] += 1
+        
+        self._set_status(job.id, job.status)
     
     def remove_job(self, job_id: str) -> None:
         """Remove a job from the graph."""
         for dep_id in self._dependencies.get(job_id, set()):
             self._dependents[dep_id].discard(job_id)
         
+        completed = self._job_status.get(job_id) == JobStatus.COMPLETED
         for dependent_id in self._dependents.get(job_id, set()):
             self._dependencies[dependent_id].discard(job_id)
+            if not completed:
+                self._unmet[dependent_id] -= 1
+                self._refresh_ready(dependent_id)
         
         self._dependencies.pop(job_id, None)
         self._dependents.pop(job_id, None)
         self._job_status.pop(job_id, None)
         self._jobs.pop(job_id, None)
+        self._unmet.pop(job_id, None)
+        self._ready.pop(job_id, None)
     
     def get_dependencies(self, job_id: str) -> Set[str]:
         """Get all jobs that this job depends on."""
@@ -53,13 +73,13 @@ class DependencyGraph:
         """Get all jobs that depend on this job."""
         return self._dependents.get(job_id, set()).copy()
     
+    def has_dependents(self, job_id: str) -> bool:
+        """Check if any job depends on this job."""
+        return bool(self._dependents.get(job_id))
+    
     def has_unmet_dependencies(self, job_id: str) -> bool:
         """Check if job has any incomplete dependencies."""
-        for dep_id in self._dependencies.get(job_id, set()):
-            status = self._job_status.get(dep_id)
-            if status != JobStatus.COMPLETED:
-                return True
-        return False
+        return self._unmet.get(job_id, 0) > 0
     
     def get_unmet_dependencies(self, job_id: str) -> Set[str]:
         """Get IDs of incomplete dependencies."""
@@ -72,56 +92,71 @@ class DependencyGraph:
     
     def mark_completed(self, job_id: str) -> List[str]:
         """Mark job as completed and return newly runnable dependent jobs."""
-        self._job_status[job_id] = JobStatus.COMPLETED
+        self._set_status(job_id, JobStatus.COMPLETED)
         
-        runnable = []
-        for dependent_id in self._dependents.get(job_id, set()):
-            if not self.has_unmet_dependencies(dependent_id):
-                runnable.append(dependent_id)
-        
-        return runnable
+        unmet = self._unmet
+        return [
+            dependent_id
+            for dependent_id in self._dependents.get(job_id, set())
+            if unmet.get(dependent_id, 0) == 0
+        ]
     
     def mark_failed(self, job_id: str) -> List[str]:
         """Mark job as failed and return affected dependent jobs."""
-        self._job_status[job_id] = JobStatus.FAILED
+        self._set_status(job_id, JobStatus.FAILED)
         return list(self._dependents.get(job_id, set()))
     
     def update_status(self, job_id: str, status: JobStatus) -> None:
         """Update job status."""
+        self._set_status(job_id, status)
+    
+    def _set_status(self, job_id: str, status: JobStatus) -> None:
+        """Record a status and move dependents' unmet counters across COMPLETED."""
+        was_completed = self._job_status.get(job_id) == JobStatus.COMPLETED
         self._job_status[job_id] = status
+        is_completed = status == JobStatus.COMPLETED
+        
+        if was_completed != is_completed:
+            delta = -1 if is_completed else 1
+            for dependent_id in self._dependents.get(job_id, set()):
+                self._unmet[dependent_id] += delta
+                self._refresh_ready(dependent_id)
+        self._refresh_ready(job_id)
+    
+    def _refresh_ready(self, job_id: str) -> None:
+        if self._job_status.get(job_id) == JobStatus.PENDING and self._unmet.get(job_id, 0) == 0:
+            self._ready[job_id] = None
+        else:
+            self._ready.pop(job_id, None)
     
     def detect_cycle(self, job_id: str, new_dependencies: List[str]) -> Optional[List[str]]:
-        """Detect if adding dependencies would create a cycle."""
-        temp_deps = self._dependencies.copy()
-        temp_deps[job_id] = set(new_dependencies)
-        
-        visited = set()
-        rec_stack = set()
-        path = []
-        
-        def dfs(node: str) -> Optional[List[str]]:
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-            
-            for neighbor in temp_deps.get(node, set()):
-                if neighbor not in visited:
-                    result = dfs(neighbor)
-                    if result:
-                        return result
-                elif neighbor in rec_stack:
-                    cycle_start = path.index(neighbor)
-                    return path[cycle_start:] + [neighbor]
-            
-            path.pop()
-            rec_stack.remove(node)
-            return None
+        """Detect if adding dependencies would create a cycle.
         
-        for node in list(temp_deps.keys()):
-            if node not in visited:
-                cycle = dfs(node)
-                if cycle:
-                    return cycle
+        The graph is assumed acyclic already, so only a path from one of the
+        new dependencies back to ``job_id`` can close a cycle. The search
+        only explores what those dependencies can reach.
+        """
+        parent: Dict[str, Optional[str]] = {}
+        stack = []
+        for dep_id in new_dependencies:
+            if dep_id not in parent:
+                parent[dep_id] = None
+                stack.append(dep_id)
+        
+        while stack:
+            node = stack.pop()
+            if node == job_id:
+                path = [job_id]
+                while node is not None:
+                    path.append(node)
+                    node = parent[node]
+                # path is job_id, then back from the end of the chain to the
+                # new dependency; flip it so it reads job -> dep -> ... -> job.
+                return [job_id] + path[:0:-1]
+            for neighbor in self._dependencies.get(node, ()):
+                if neighbor not in parent:
+                    parent[neighbor] = node
+                    stack.append(neighbor)
         
         return None
     
@@ -134,6 +169,37 @@ class DependencyGraph:
         if cycle:
             raise CircularDependencyError(cycle)
     
+    def sort_batch(self, jobs: List[Job]) -> List[Job]:
+        """Order a batch so dependencies come first, in one topological pass.
+        
+        Only edges between jobs of the batch are considered. Raises
+        CircularDependencyError listing the jobs left on a cycle.
+        """
+        batch = {job.id: job for job in jobs}
+        in_degree = {job_id: 0 for job_id in batch}
+        children: Dict[str, List[str]] = defaultdict(list)
+        for job in batch.values():
+            for dep_id in set(job.depends_on):
+                if dep_id in batch:
+                    in_degree[job.id] += 1
+                    children[dep_id].append(job.id)
+        
+        queue = deque(job_id for job_id, degree in in_degree.items() if degree == 0)
+        order = []
+        while queue:
+            job_id = queue.popleft()
+            order.append(batch[job_id])
+            for child_id in children.get(job_id, ()):
+                in_degree[child_id] -= 1
+                if in_degree[child_id] == 0:
+                    queue.append(child_id)
+        
+        if len(order) != len(batch):
+            raise CircularDependencyError(
+                [job_id for job_id, degree in in_degree.items() if degree > 0]
+            )
+        return order
+    
     def topological_sort(self) -> List[str]:
         """Return jobs in topological order (dependencies first)."""
         in_degree = defaultdict(int)
@@ -163,11 +229,7 @@ class DependencyGraph:
     
     def get_ready_jobs(self) -> List[str]:
         """Get all jobs that are ready to run (no unmet dependencies)."""
-        ready = []
-        for job_id, status in self._job_status.items():
-            if status == JobStatus.PENDING and not self.has_unmet_dependencies(job_id):
-                ready.append(job_id)
-        return ready
+        return list(self._ready)
     
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get job by ID."""
@@ -183,6 +245,8 @@ class DependencyGraph:
         self._dependents.clear()
         self._job_status.clear()
         self._jobs.clear()
+        self._unmet.clear()
+        self._ready.clear()
 
 
 class DependencyResolver:
@@ -205,27 +269,31 @@ class DependencyResolver:
             return False, str(e)
     
     def submit_batch(self, jobs: List[Job]) -> Tuple[List[str], List[Tuple[str, str]]]:
-        """Submit multiple jobs, returning (successful_ids, failed_pairs)."""
-        temp_graph = DependencyGraph()
-        
-        for job in jobs:
-            temp_graph.add_job(job)
+        """Submit multiple jobs, returning (successful_ids, failed_pairs).
         
+        The batch is validated with a single topological pass. A cycle can
+        only also run through jobs already in the graph if one of them
+        depends on a job of this batch; only then is each job checked
+        individually as it is added.
+        """
         try:
-            temp_graph.topological_sort()
+            ordered = self._graph.sort_batch(jobs)
         except CircularDependencyError as e:
             return [], [(j.id, str(e)) for j in jobs]
         
-        successful = []
-        failed = []
+        if not any(self._graph.has_dependents(job.id) for job in ordered):
+            for job in ordered:
+                self._graph.add_job(job)
+            return [job.id for job in jobs], []
         
-        for job in jobs:
+        errors = {}
+        for job in ordered:
             success, error = self.submit_job(job)
-            if success:
-                successful.append(job.id)
-            else:
-                failed.append((job.id, error))
+            if not success:
+                errors[job.id] = error
         
+        successful = [job.id for job in jobs if job.id not in errors]
+        failed = [(job.id, errors[job.id]) for job in jobs if job.id in errors]
         return successful, failed
     
     def complete_job(self, job_id: str) -> List[Job]:
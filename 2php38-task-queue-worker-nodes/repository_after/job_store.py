@@ -0,0 +1,348 @@
+"""In-memory job store with secondary indexes and terminal-job eviction."""
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .models import Job, JobStatus, Priority
+
+TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.DEAD})
+
+
+class _OrderedIndex:
+    """Job IDs sorted by store sequence number, kept in bounded chunks.
+    
+    Each chunk holds parallel ``seqs`` (an ``array('q')``) and ``ids``
+    lists, so an entry costs 16 bytes. New jobs carry the highest sequence
+    and append to the last chunk; a job re-entering an index (say on a
+    status change) is inserted at its original position, and removals
+    cost a bisect over chunk maxima plus an O(CHUNK) shift. Seeking to a
+    cursor is the same bisect, so a page never depends on the index size.
+    """
+    
+    CHUNK = 1024
+    
+    __slots__ = ("chunks", "maxes", "size")
+    
+    def __init__(self):
+        self.chunks: List[Tuple[array, List[str]]] = []
+        self.maxes: List[int] = []
+        self.size = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def add(self, job_id: str, seq: int):
+        chunks, maxes = self.chunks, self.maxes
+        self.size += 1
+        if not chunks or seq > maxes[-1]:
+            if chunks and len(chunks[-1][1]) < self.CHUNK:
+                seqs, ids = chunks[-1]
+                seqs.append(seq)
+                ids.append(job_id)
+                maxes[-1] = seq
+            else:
+                chunks.append((array("q", (seq,)), [job_id]))
+                maxes.append(seq)
+            return
+        
+        i = bisect_left(maxes, seq)
+        seqs, ids = chunks[i]
+        j = bisect_left(seqs, seq)
+        seqs.insert(j, seq)
+        ids.insert(j, job_id)
+        if len(ids) > 2 * self.CHUNK:
+            half = len(ids) // 2
+            chunks[i:i + 1] = [(seqs[:half], ids[:half]), (seqs[half:], ids[half:])]
+            maxes[i:i + 1] = [seqs[half - 1], seqs[-1]]
+    
+    def discard(self, seq: int):
+        maxes = self.maxes
+        i = bisect_left(maxes, seq)
+        if i == len(maxes):
+            return
+        seqs, ids = self.chunks[i]
+        j = bisect_left(seqs, seq)
+        if j == len(seqs) or seqs[j] != seq:
+            return
+        del seqs[j]
+        del ids[j]
+        self.size -= 1
+        if not ids:
+            del self.chunks[i]
+            del maxes[i]
+        else:
+            maxes[i] = seqs[-1]
+    
+    def iter_newest(self, before: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (seq, job_id) newest first, starting below sequence ``before``."""
+        chunks = self.chunks
+        if not chunks:
+            return
+        i = len(chunks) - 1
+        j = len(chunks[i][1])
+        if before is not None:
+            i = bisect_left(self.maxes, before)
+            if i == len(chunks):
+                i -= 1
+                j = len(chunks[i][1])
+            else:
+                j = bisect_left(chunks[i][0], before)
+        while i >= 0:
+            seqs, ids = chunks[i]
+            for k in range(j - 1, -1, -1):
+                yield seqs[k], ids[k]
+            i -= 1
+            if i >= 0:
+                j = len(chunks[i][1])
+
+
+class JobStore:
+    """Job tracking store with status/priority/name indexes and O(1) counters.
+    
+    Status and priority are read from the job when it is added, so callers
+    must call ``update`` after changing either on a tracked job. Every
+    index is ordered by a sequence number assigned when the store first
+    sees a job, so listings page through jobs in creation order. Terminal
+    jobs (completed, failed, dead) are evicted oldest first once there are
+    more than ``max_terminal_jobs`` of them or they are older than
+    ``terminal_ttl_seconds``; evicted jobs are still counted in ``total``.
+    """
+    
+    def __init__(
+        self,
+        max_terminal_jobs: Optional[int] = 10_000,
+        terminal_ttl_seconds: Optional[float] = None,
+    ):
+        self._max_terminal_jobs = max_terminal_jobs
+        self._terminal_ttl_seconds = terminal_ttl_seconds
+        self._lock = threading.RLock()
+        self._reset()
+    
+    def _reset(self):
+        self._jobs: Dict[str, Job] = {}
+        self._indexed: Dict[str, Tuple[JobStatus, Priority, str, int]] = {}
+        self._all = _OrderedIndex()
+        self._by_status: Dict[JobStatus, _OrderedIndex] = defaultdict(_OrderedIndex)
+        self._by_priority: Dict[Priority, _OrderedIndex] = defaultdict(_OrderedIndex)
+        self._by_name: Dict[str, _OrderedIndex] = defaultdict(_OrderedIndex)
+        self._counts: Dict[Tuple[JobStatus, Priority], int] = defaultdict(int)
+        self._terminal: OrderedDict[str, float] = OrderedDict()
+        self._evicted: Dict[JobStatus, int] = defaultdict(int)
+        self._seq = itertools.count()
+    
+    def __len__(self) -> int:
+        return len(self._jobs)
+    
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def add(self, job: Job):
+        """Track a job, replacing any tracked job with the same ID."""
+        with self._lock:
+            if job.id not in self._jobs:
+                seq = next(self._seq)
+                self._all.add(job.id, seq)
+                self._indexed[job.id] = (None, None, None, seq)
+            self._jobs[job.id] = job
+            self._reindex(job)
+    
+    def update(self, job: Job):
+        """Re-index a tracked job after its status or priority changed."""
+        with self._lock:
+            if job.id in self._jobs:
+                self._jobs[job.id] = job
+                self._reindex(job)
+    
+    def remove(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is None:
+                return None
+            status, priority, name, seq = self._indexed.pop(job_id)
+            self._all.discard(seq)
+            self._by_status[status].discard(seq)
+            self._by_priority[priority].discard(seq)
+            self._discard_name(name, seq)
+            self._counts[(status, priority)] -= 1
+            self._terminal.pop(job_id, None)
+            return job
+    
+    def clear(self):
+        with self._lock:
+            self._reset()
+    
+    def count(self, status: Optional[JobStatus] = None) -> int:
+        """Number of tracked jobs, optionally with the given status."""
+        if status is None:
+            return len(self._jobs)
+        return len(self._by_status.get(status, ()))
+    
+    def count_by_priority(self, status: Optional[JobStatus] = None) -> Dict[Priority, int]:
+        """Number of tracked jobs per priority, optionally for one status."""
+        with self._lock:
+            if status is None:
+                return {p: len(self._by_priority.get(p, ())) for p in Priority}
+            return {p: self._counts.get((status, p), 0) for p in Priority}
+    
+    def total(self, status: Optional[JobStatus] = None) -> int:
+        """Like ``count`` but including jobs that were evicted."""
+        with self._lock:
+            if status is None:
+                return len(self._jobs) + sum(self._evicted.values())
+            return self.count(status) + self._evicted.get(status, 0)
+    
+    def list(
+        self,
+        status: Optional[JobStatus] = None,
+        priority: Optional[Priority] = None,
+        name: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> List[Job]:
+        """List jobs newest first, continuing after ``cursor``."""
+        return self.page(status, priority, name, limit, cursor)[0]
+    
+    def page(
+        self,
+        status: Optional[JobStatus] = None,
+        priority: Optional[Priority] = None,
+        name: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Job], Optional[str]]:
+        """Return a page of jobs newest first and the cursor for the next one.
+        
+        ``cursor`` is either a cursor returned by a previous page or the ID
+        of a tracked job. Returned cursors are positions in creation order,
+        so they stay valid after that job changes status or is evicted.
+        The most selective filter's index is walked and the other filters
+        are checked per job, so a page costs O(limit) plus any skipped
+        non-matching entries, whatever the number of retained jobs. The
+        next cursor is None once no jobs are left.
+        """
+        with self._lock:
+            candidates = [self._all]
+            if status is not None:
+                candidates.append(self._by_status.get(status, _OrderedIndex()))
+            if priority is not None:
+                candidates.append(self._by_priority.get(priority, _OrderedIndex()))
+            if name is not None:
+                candidates.append(self._by_name.get(name, _OrderedIndex()))
+            index = min(candidates[1:] or candidates, key=len)
+            
+            jobs = []
+            for seq, job_id in index.iter_newest(self._cursor_seq(cursor)):
+                indexed_status, indexed_priority, indexed_name, _ = self._indexed[job_id]
+                if status is not None and indexed_status != status:
+                    continue
+                if priority is not None and indexed_priority != priority:
+                    continue
+                if name is not None and indexed_name != name:
+                    continue
+                jobs.append(self._jobs[job_id])
+                if len(jobs) >= limit:
+                    return jobs, str(seq)
+            return jobs, None
+    
+    def iter_jobs(
+        self,
+        status: Optional[JobStatus] = None,
+        priority: Optional[Priority] = None,
+        name: Optional[str] = None,
+        batch_size: int = 1000,
+    ) -> Iterator[Job]:
+        """Yield every matching job newest first, ``batch_size`` at a time.
+        
+        The lock is only held while a batch is read, so memory stays
+        bounded by ``batch_size`` and writers are not blocked for the whole
+        walk. Jobs added during the walk are not included.
+        """
+        jobs, cursor = self.page(status, priority, name, batch_size)
+        while True:
+            yield from jobs
+            if cursor is None:
+                return
+            jobs, cursor = self.page(status, priority, name, batch_size, cursor)
+    
+    def jobs(self) -> List[Job]:
+        """All tracked jobs, oldest first."""
+        with self._lock:
+            return list(self._jobs.values())
+    
+    def _cursor_seq(self, cursor: Optional[str]) -> Optional[int]:
+        if cursor is None:
+            return None
+        indexed = self._indexed.get(cursor)
+        if indexed is not None:
+            return indexed[3]
+        try:
+            return int(cursor)
+        except ValueError:
+            return None
+    
+    def _discard_name(self, name: str, seq: int):
+        index = self._by_name.get(name)
+        if index is not None:
+            index.discard(seq)
+            if not index:
+                del self._by_name[name]
+    
+    def _reindex(self, job: Job):
+        status = JobStatus(job.status)
+        priority = Priority(job.priority)
+        old_status, old_priority, old_name, seq = self._indexed[job.id]
+        if (old_status, old_priority, old_name) == (status, priority, job.name):
+            return
+        
+        if old_status is not None:
+            self._counts[(old_status, old_priority)] -= 1
+        
+        if status != old_status:
+            if old_status is not None:
+                self._by_status[old_status].discard(seq)
+            self._by_status[status].add(job.id, seq)
+        if priority != old_priority:
+            if old_priority is not None:
+                self._by_priority[old_priority].discard(seq)
+            self._by_priority[priority].add(job.id, seq)
+        if job.name != old_name:
+            if old_name is not None:
+                self._discard_name(old_name, seq)
+            self._by_name[job.name].add(job.id, seq)
+        
+        self._indexed[job.id] = (status, priority, job.name, seq)
+        self._counts[(status, priority)] += 1
+        
+        if status in TERMINAL_STATUSES:
+            if old_status not in TERMINAL_STATUSES:
+                self._terminal[job.id] = time.time()
+                self._evict()
+        elif old_status in TERMINAL_STATUSES:
+            self._terminal.pop(job.id, None)
+    
+    def _evict(self):
+        """Drop the oldest terminal jobs beyond the count or age limit."""
+        cutoff = None
+        if self._terminal_ttl_seconds is not None:
+            cutoff = time.time() - self._terminal_ttl_seconds
+        while self._terminal:
+            job_id, finished_at = next(iter(self._terminal.items()))
+            over_count = (
+                self._max_terminal_jobs is not None
+                and len(self._terminal) > self._max_terminal_jobs
+            )
+            if not over_count and (cutoff is None or finished_at > cutoff):
+                break
+            status = self._indexed[job_id][0]
+            self.remove(job_id)
+            self._evicted[status] += 1
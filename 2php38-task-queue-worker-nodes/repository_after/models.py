@@ -161,8 +161,21 @@ class WorkerInfo(BaseModel):
     is_leader: bool = False
 
 
+class WindowLatencyStats(BaseModel):
+    """Throughput and latency percentiles over the recent sliding window."""
+    completed: int = 0
+    throughput_per_second: float = 0
+    avg_processing_time_ms: float = 0
+    processing_time_ms: Dict[str, float] = Field(default_factory=dict)
+    wait_time_ms: Dict[str, float] = Field(default_factory=dict)
+
+
 class QueueStats(BaseModel):
-    """Queue statistics for monitoring."""
+    """Queue statistics for monitoring.
+    
+    Processing time, throughput and the per-priority and per-job-name
+    breakdowns cover jobs completed in the recent sliding window.
+    """
     total_jobs: int = 0
     pending_jobs: int = 0
     running_jobs: int = 0
@@ -172,3 +185,7 @@ class QueueStats(BaseModel):
     jobs_by_priority: Dict[str, int] = Field(default_factory=dict)
     avg_processing_time_ms: float = 0
     throughput_per_second: float = 0
+    processing_time_ms: Dict[str, float] = Field(default_factory=dict)
+    wait_time_ms: Dict[str, float] = Field(default_factory=dict)
+    by_priority: Dict[str, WindowLatencyStats] = Field(default_factory=dict)
+    by_job_name: Dict[str, WindowLatencyStats] = Field(default_factory=dict)
@@ -4,12 +4,16 @@ from __future__ import annotations
 import asyncio
 import multiprocessing as mp
 import os
+import pickle
+import queue
 import signal
+import threading
 import time
+from collections import deque
 from concurrent.futures import ProcessPoolExecutor, Future
 from dataclasses import dataclass
-from multiprocessing import Queue, Process
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from multiprocessing import Queue, Process, resource_tracker, shared_memory
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from .logging_config import get_logger
 from .models import Job, JobResult, JobStatus, WorkerInfo
@@ -20,11 +24,16 @@ logger = get_logger(__name__)
 
 @dataclass
 class WorkerTask:
-    """Task to be executed by worker process."""
+    """Task to be executed by worker process.
+    
+    Large payloads are passed through shared memory: ``payload`` is then
+    None and ``payload_ref`` holds the block name and pickled size.
+    """
     job_id: str
     job_name: str
-    payload: Dict[str, Any]
+    payload: Optional[Dict[str, Any]]
     handler_name: str
+    payload_ref: Optional[Tuple[str, int]] = None
 
 
 @dataclass
@@ -37,13 +46,84 @@ class WorkerResult:
     duration_seconds: float = 0.0
 
 
+def _load_payload(task: WorkerTask) -> Dict[str, Any]:
+    """Return the task payload, reading it from shared memory if needed."""
+    if task.payload_ref is None:
+        return task.payload
+    name, size = task.payload_ref
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return pickle.loads(block.buf[:size])
+    finally:
+        block.close()
+
+
+def _run_task(task: WorkerTask, handlers: Dict[str, Callable]) -> WorkerResult:
+    handler = handlers.get(task.handler_name)
+    if not handler:
+        return WorkerResult(
+            job_id=task.job_id,
+            success=False,
+            error=f"Handler not found: {task.handler_name}",
+        )
+    
+    start_time = time.time()
+    try:
+        result = handler(_load_payload(task))
+        return WorkerResult(
+            job_id=task.job_id,
+            success=True,
+            result=result,
+            duration_seconds=time.time() - start_time,
+        )
+    except Exception as e:
+        return WorkerResult(
+            job_id=task.job_id,
+            success=False,
+            error=str(e),
+            duration_seconds=time.time() - start_time,
+        )
+
+
+def _pickle_results(results: List[WorkerResult]) -> bytes:
+    """Pickle a chunk's results, turning any that cannot be pickled into errors.
+    
+    A message the result queue fails to pickle is dropped whole, which would
+    lose every result of the chunk, so results are pickled here first.
+    """
+    try:
+        return pickle.dumps(results, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        pass
+    
+    checked = []
+    for result in results:
+        try:
+            pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            result = WorkerResult(
+                job_id=result.job_id,
+                success=False,
+                error=f"Result could not be pickled: {e}",
+                duration_seconds=result.duration_seconds,
+            )
+        checked.append(result)
+    return pickle.dumps(checked, protocol=pickle.HIGHEST_PROTOCOL)
+
+
 def _worker_process_entry(
     task_queue: Queue,
     result_queue: Queue,
     handlers: Dict[str, Callable],
     worker_id: str,
+    worker_index: int,
 ):
-    """Entry point for worker subprocess."""
+    """Entry point for worker subprocess.
+    
+    Tasks arrive in chunks (lists of ``WorkerTask``) on this worker's own
+    queue, and each chunk is answered with one ``(worker_index, results)``
+    message on the shared result queue, the results already pickled.
+    """
     import signal
     
     signal.signal(signal.SIGINT, signal.SIG_IGN)
@@ -51,59 +131,48 @@ def _worker_process_entry(
     logger.info("worker_process_started", worker_id=worker_id, pid=os.getpid())
     
     while True:
-        try:
-            task: Optional[WorkerTask] = task_queue.get(timeout=1.0)
-            
-            if task is None:
-                logger.info("worker_process_shutdown", worker_id=worker_id)
-                break
-            
-            handler = handlers.get(task.handler_name)
-            if not handler:
-                result_queue.put(WorkerResult(
-                    job_id=task.job_id,
-                    success=False,
-                    error=f"Handler not found: {task.handler_name}",
-                ))
-                continue
-            
-            start_time = time.time()
-            try:
-                result = handler(task.payload)
-                duration = time.time() - start_time
-                
-                result_queue.put(WorkerResult(
-                    job_id=task.job_id,
-                    success=True,
-                    result=result,
-                    duration_seconds=duration,
-                ))
-                
-            except Exception as e:
-                duration = time.time() - start_time
-                result_queue.put(WorkerResult(
-                    job_id=task.job_id,
-                    success=False,
-                    error=str(e),
-                    duration_seconds=duration,
-                ))
-                
-        except Exception:
-            continue
+        chunk: Optional[List[WorkerTask]] = task_queue.get()
+        if chunk is None:
+            logger.info("worker_process_shutdown", worker_id=worker_id)
+            break
+        results = [_run_task(task, handlers) for task in chunk]
+        result_queue.put((worker_index, _pickle_results(results)))
 
 
 class MultiprocessWorkerPool:
-    """Pool of worker processes for CPU-bound tasks."""
+    """Pool of worker processes for CPU-bound tasks.
+    
+    Submitted tasks go to a local backlog and are sent to the least loaded
+    worker in chunks of up to ``chunk_size`` tasks per message, never
+    exceeding ``max_in_flight`` unfinished tasks per worker. Payloads whose
+    pickled size exceeds ``shared_memory_threshold`` bytes are passed
+    through shared memory instead of the pipe.
+    
+    A worker process that dies is replaced: the chunk it was running is
+    reported as failed and its later chunks go back to the backlog.
+    """
     
     def __init__(
         self,
         num_workers: int = None,
         handlers: Optional[Dict[str, Callable]] = None,
+        chunk_size: int = 64,
+        max_in_flight: Optional[int] = None,
+        shared_memory_threshold: Optional[int] = None,
     ):
         self._num_workers = num_workers or mp.cpu_count()
         self._handlers = handlers or {}
-        self._task_queue: Queue = mp.Queue()
+        self._chunk_size = chunk_size
+        self._max_in_flight = max_in_flight or 2 * chunk_size
+        self._shared_memory_threshold = shared_memory_threshold
+        self._task_queues: List[Queue] = []
         self._result_queue: Queue = mp.Queue()
+        self._in_flight: List[int] = []
+        # Chunks sent to each worker and not answered yet, oldest first
+        self._outstanding: List[Deque[List[WorkerTask]]] = []
+        self._backlog: Deque[WorkerTask] = deque()
+        self._shared_blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self._lock = threading.Lock()
         self._processes: List[Process] = []
         self._running = False
         self._metrics = get_metrics()
@@ -120,24 +189,40 @@ class MultiprocessWorkerPool:
         
         self._running = True
         
+        if self._shared_memory_threshold is not None:
+            # Workers must share the parent's resource tracker, otherwise each
+            # one starts its own and "cleans up" blocks the parent unlinked.
+            resource_tracker.ensure_running()
+        
         for i in range(self._num_workers):
-            worker_id = f"worker-{i}"
-            p = Process(
-                target=_worker_process_entry,
-                args=(
-                    self._task_queue,
-                    self._result_queue,
-                    self._handlers,
-                    worker_id,
-                ),
-                daemon=True,
-            )
-            p.start()
-            self._processes.append(p)
-            logger.info("worker_process_spawned", worker_id=worker_id, pid=p.pid)
+            self._task_queues.append(None)
+            self._processes.append(None)
+            self._in_flight.append(0)
+            self._outstanding.append(deque())
+            self._spawn(i)
         
         self._metrics.update_worker_count(len(self._processes))
     
+    def _spawn(self, index: int):
+        """Start the worker process for slot ``index`` with a fresh task queue."""
+        worker_id = f"worker-{index}"
+        task_queue: Queue = mp.Queue()
+        p = Process(
+            target=_worker_process_entry,
+            args=(
+                task_queue,
+                self._result_queue,
+                self._handlers,
+                worker_id,
+                index,
+            ),
+            daemon=True,
+        )
+        p.start()
+        self._task_queues[index] = task_queue
+        self._processes[index] = p
+        logger.info("worker_process_spawned", worker_id=worker_id, pid=p.pid)
+    
     def stop(self, timeout: float = 5.0):
         """Stop all worker processes gracefully."""
         if not self._running:
@@ -145,8 +230,8 @@ class MultiprocessWorkerPool:
         
         self._running = False
         
-        for _ in self._processes:
-            self._task_queue.put(None)
+        for task_queue in self._task_queues:
+            task_queue.put(None)
         
         for p in self._processes:
             p.join(timeout=timeout)
@@ -154,39 +239,160 @@ class MultiprocessWorkerPool:
                 logger.warning("worker_process_forceful_kill", pid=p.pid)
                 p.terminate()
         
+        with self._lock:
+            for block in self._shared_blocks.values():
+                block.close()
+                block.unlink()
+            self._shared_blocks.clear()
+            self._backlog.clear()
+        
         self._processes.clear()
+        self._task_queues.clear()
+        self._in_flight.clear()
+        self._outstanding.clear()
         self._metrics.update_worker_count(0)
         logger.info("worker_pool_stopped")
     
     def submit(self, job: Job, handler_name: str) -> bool:
         """Submit a job for processing."""
+        return self.submit_many([job], handler_name) == 1
+    
+    def submit_many(self, jobs: List[Job], handler_name: str) -> int:
+        """Submit a batch of jobs, dispatched in chunks. Returns the number accepted."""
         if not self._running:
-            return False
+            return 0
         
+        tasks = [self._make_task(job, handler_name) for job in jobs]
+        with self._lock:
+            self._backlog.extend(tasks)
+            self._dispatch()
+        logger.debug("jobs_submitted_to_pool", count=len(tasks))
+        return len(tasks)
+    
+    def _make_task(self, job: Job, handler_name: str) -> WorkerTask:
         task = WorkerTask(
             job_id=job.id,
             job_name=job.name,
             payload=job.payload,
             handler_name=handler_name,
         )
+        if self._shared_memory_threshold is None:
+            return task
+        
+        data = pickle.dumps(job.payload, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) <= self._shared_memory_threshold:
+            return task
         
-        self._task_queue.put(task)
-        logger.debug("job_submitted_to_pool", job_id=job.id)
-        return True
+        block = shared_memory.SharedMemory(create=True, size=len(data))
+        block.buf[:len(data)] = data
+        with self._lock:
+            self._shared_blocks[job.id] = block
+        task.payload = None
+        task.payload_ref = (block.name, len(data))
+        return task
+    
+    def _dispatch(self):
+        """Send backlog chunks to the least loaded workers with spare capacity."""
+        while self._backlog:
+            worker = min(range(len(self._in_flight)), key=self._in_flight.__getitem__)
+            capacity = self._max_in_flight - self._in_flight[worker]
+            if capacity <= 0:
+                return
+            size = min(self._chunk_size, capacity, len(self._backlog))
+            chunk = [self._backlog.popleft() for _ in range(size)]
+            self._in_flight[worker] += size
+            self._outstanding[worker].append(chunk)
+            self._task_queues[worker].put(chunk)
     
     def get_results(self, timeout: float = 0.1) -> List[WorkerResult]:
-        """Get completed job results."""
+        """Get completed job results.
+        
+        Waits up to ``timeout`` for the first result chunk, then drains
+        whatever else is already available without waiting. Dead workers
+        are replaced and their running chunk is returned as failed.
+        """
         results = []
+        try:
+            results.extend(self._collect(self._result_queue.get(timeout=timeout)))
+        except queue.Empty:
+            pass
+        else:
+            self._drain_results(results)
         
+        results.extend(self._replace_dead_workers())
+        return results
+    
+    def _drain_results(self, results: List[WorkerResult]):
         while True:
             try:
-                result = self._result_queue.get(timeout=timeout)
-                results.append(result)
-            except Exception:
-                break
+                message = self._result_queue.get_nowait()
+            except queue.Empty:
+                return
+            results.extend(self._collect(message))
+    
+    def _collect(self, message: Tuple[int, bytes]) -> List[WorkerResult]:
+        """Account for one answered chunk and refill its worker."""
+        worker, data = message
+        chunk = pickle.loads(data)
+        with self._lock:
+            self._outstanding[worker].popleft()
+            self._in_flight[worker] -= len(chunk)
+            self._release_blocks(result.job_id for result in chunk)
+            self._dispatch()
+        return chunk
+    
+    def _release_blocks(self, job_ids):
+        for job_id in job_ids:
+            block = self._shared_blocks.pop(job_id, None)
+            if block is not None:
+                block.close()
+                block.unlink()
+    
+    def _replace_dead_workers(self) -> List[WorkerResult]:
+        """Respawn dead workers, failing the chunk each was running.
         
+        A process flushes its result queue before it exits, so everything a
+        worker seen dead had sent is collected first. Its other unanswered
+        chunks never started and are put back at the front of the backlog.
+        """
+        if not self._running:
+            return []
+        dead = [i for i, p in enumerate(self._processes) if not p.is_alive()]
+        if not dead:
+            return []
+        
+        results: List[WorkerResult] = []
+        self._drain_results(results)
+        with self._lock:
+            for worker in dead:
+                exitcode = self._processes[worker].exitcode
+                logger.warning("worker_process_died", worker_index=worker, exitcode=exitcode)
+                outstanding = self._outstanding[worker]
+                if outstanding:
+                    running = outstanding.popleft()
+                    results.extend(
+                        WorkerResult(
+                            job_id=task.job_id,
+                            success=False,
+                            error=f"Worker process exited with code {exitcode}",
+                        )
+                        for task in running
+                    )
+                    self._release_blocks(task.job_id for task in running)
+                    for chunk in reversed(outstanding):
+                        self._backlog.extendleft(reversed(chunk))
+                    outstanding.clear()
+                self._in_flight[worker] = 0
+                self._spawn(worker)
+            self._dispatch()
         return results
     
+    @property
+    def pending_count(self) -> int:
+        """Tasks submitted but not yet returned by a worker."""
+        with self._lock:
+            return len(self._backlog) + sum(self._in_flight)
+    
     @property
     def worker_count(self) -> int:
         return len(self._processes)
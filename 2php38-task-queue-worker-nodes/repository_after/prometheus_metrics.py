@@ -1,7 +1,7 @@
 """Prometheus metrics using the official prometheus-client library."""
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from prometheus_client import (
     REGISTRY,
@@ -12,14 +12,76 @@ from prometheus_client import (
     generate_latest,
     CollectorRegistry,
 )
+from prometheus_client.core import GaugeMetricFamily
 
 from .models import Priority
+from .sliding_window import PERCENTILES, SlidingWindowStats, WindowSnapshot
+
+
+class SlidingWindowCollector:
+    """Exposes sliding-window throughput and latency percentiles at scrape time.
+    
+    Series are labelled by priority and job name, with ``all`` standing for
+    every value of the other label.
+    """
+    
+    def __init__(self, window: SlidingWindowStats):
+        self._window = window
+    
+    def describe(self):
+        return self._families()
+    
+    def collect(self):
+        snapshot = self._window.snapshot()
+        overall, throughput, run, wait = self._families()
+        overall.add_metric([], snapshot.overall.throughput_per_second)
+        
+        series = [(("all", "all"), snapshot.overall)]
+        series += [((p, "all"), stats) for p, stats in snapshot.by_priority.items()]
+        series += [(("all", n), stats) for n, stats in snapshot.by_job_name.items()]
+        for labels, stats in series:
+            throughput.add_metric(list(labels), stats.throughput_per_second)
+            for p in PERCENTILES:
+                quantile = str(p / 100)
+                if p in stats.run_seconds:
+                    run.add_metric([*labels, quantile], stats.run_seconds[p])
+                if p in stats.wait_seconds:
+                    wait.add_metric([*labels, quantile], stats.wait_seconds[p])
+        return [overall, throughput, run, wait]
+    
+    @staticmethod
+    def _families():
+        return [
+            GaugeMetricFamily(
+                "taskqueue_throughput_jobs_per_second",
+                "Jobs completed per second over the sliding window",
+            ),
+            GaugeMetricFamily(
+                "taskqueue_window_throughput_jobs_per_second",
+                "Jobs completed per second over the sliding window, by priority and job name",
+                labels=["priority", "job_name"],
+            ),
+            GaugeMetricFamily(
+                "taskqueue_window_run_seconds",
+                "Job run time percentiles over the sliding window",
+                labels=["priority", "job_name", "quantile"],
+            ),
+            GaugeMetricFamily(
+                "taskqueue_window_wait_seconds",
+                "Queue wait time percentiles over the sliding window",
+                labels=["priority", "job_name", "quantile"],
+            ),
+        ]
 
 
 class TaskQueuePrometheusMetrics:
     """Prometheus metrics for the task queue system."""
     
-    def __init__(self, registry: Optional[CollectorRegistry] = None):
+    def __init__(
+        self,
+        registry: Optional[CollectorRegistry] = None,
+        window_seconds: float = 60.0,
+    ):
         self._registry = registry or REGISTRY
         
         self.jobs_submitted = Counter(
@@ -93,26 +155,63 @@ class TaskQueuePrometheusMetrics:
             registry=self._registry,
         )
         
-        self.throughput = Gauge(
-            "taskqueue_throughput_jobs_per_second",
-            "Current job throughput (jobs/sec)",
-            registry=self._registry,
-        )
-        
         self.dlq_depth = Gauge(
             "taskqueue_dlq_depth",
             "Number of jobs in dead letter queue",
             registry=self._registry,
         )
         
+        self.jobs_reclaimed = Counter(
+            "taskqueue_jobs_reclaimed_total",
+            "Total number of stuck pending jobs requeued from dead or idle consumers",
+            ["priority"],
+            registry=self._registry,
+        )
+        
+        self.stream_entries_trimmed = Counter(
+            "taskqueue_stream_entries_trimmed_total",
+            "Total number of acknowledged stream entries trimmed",
+            ["priority"],
+            registry=self._registry,
+        )
+        
+        self.alert_delivery_latency = Histogram(
+            "taskqueue_alert_delivery_latency_seconds",
+            "Time from an alert being raised to a handler delivering it",
+            ["handler"],
+            buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+            registry=self._registry,
+        )
+        
+        self.alerts_dropped = Counter(
+            "taskqueue_alerts_dropped_total",
+            "Total number of alerts dropped before delivery",
+            ["reason"],
+            registry=self._registry,
+        )
+        
+        self.alerts_coalesced = Counter(
+            "taskqueue_alerts_coalesced_total",
+            "Total number of alerts folded into a summary alert",
+            registry=self._registry,
+        )
+        
+        self.alert_queue_depth = Gauge(
+            "taskqueue_alert_queue_depth",
+            "Number of alerts waiting to be delivered",
+            registry=self._registry,
+        )
+        
         self.worker_info = Info(
             "taskqueue_worker",
             "Worker information",
             registry=self._registry,
         )
         
-        self._jobs_completed_count = 0
-        self._jobs_completed_window_start = 0
+        # Recent completions for throughput and percentiles, aggregated only
+        # when scraped or read through window_stats.
+        self.window = SlidingWindowStats(window_seconds)
+        self._registry.register(SlidingWindowCollector(self.window))
     
     def record_job_submitted(self, priority):
         """Record a job submission."""
@@ -124,7 +223,7 @@ class TaskQueuePrometheusMetrics:
         duration_seconds: float,
         priority = "normal",
         job_name: str = "unknown",
-        wait_seconds: float = 0,
+        wait_seconds: Optional[float] = None,
     ):
         """Record successful job completion."""
         priority_name = priority if isinstance(priority, str) else priority.name
@@ -134,10 +233,10 @@ class TaskQueuePrometheusMetrics:
             job_name=job_name,
         ).observe(duration_seconds)
         
-        if wait_seconds > 0:
+        if wait_seconds is not None:
             self.job_wait_duration.labels(priority=priority_name).observe(wait_seconds)
         
-        self._update_throughput()
+        self.window.record(priority_name, job_name, duration_seconds, wait_seconds)
     
     def record_job_failed(
         self, 
@@ -158,6 +257,34 @@ class TaskQueuePrometheusMetrics:
         priority_name = priority if isinstance(priority, str) else priority.name
         self.jobs_dead_lettered.labels(priority=priority_name).inc()
     
+    def record_jobs_reclaimed(self, count: int, priority = "normal"):
+        """Record jobs requeued from dead or idle consumers."""
+        priority_name = priority if isinstance(priority, str) else priority.name
+        self.jobs_reclaimed.labels(priority=priority_name).inc(count)
+    
+    def record_stream_trimmed(self, count: int, priority = "normal"):
+        """Record acknowledged stream entries trimmed."""
+        priority_name = priority if isinstance(priority, str) else priority.name
+        self.stream_entries_trimmed.labels(priority=priority_name).inc(count)
+    
+    def record_alerts_delivered(self, handler: str, latencies: List[float]):
+        """Record alerts delivered by a handler with their latency since being raised."""
+        histogram = self.alert_delivery_latency.labels(handler=handler)
+        for latency in latencies:
+            histogram.observe(latency)
+    
+    def record_alert_dropped(self, reason: str, count: int = 1):
+        """Record alerts dropped because the queue was full or delivery failed."""
+        self.alerts_dropped.labels(reason=reason).inc(count)
+    
+    def record_alerts_coalesced(self, count: int = 1):
+        """Record alerts suppressed by a coalescing window."""
+        self.alerts_coalesced.inc(count)
+    
+    def set_alert_queue_depth(self, depth: int):
+        """Set the number of alerts waiting to be delivered."""
+        self.alert_queue_depth.set(depth)
+    
     def record_dlq_added(self):
         """Record job added to DLQ (simplified)."""
         self.dlq_depth.inc()
@@ -192,22 +319,9 @@ class TaskQueuePrometheusMetrics:
         """Set worker information."""
         self.worker_info.info(info)
     
-    def _update_throughput(self):
-        """Update throughput calculation."""
-        import time
-        current_time = time.time()
-        
-        if self._jobs_completed_window_start == 0:
-            self._jobs_completed_window_start = current_time
-        
-        self._jobs_completed_count += 1
-        
-        window_duration = current_time - self._jobs_completed_window_start
-        if window_duration >= 1.0:
-            throughput = self._jobs_completed_count / window_duration
-            self.throughput.set(throughput)
-            self._jobs_completed_count = 0
-            self._jobs_completed_window_start = current_time
+    def window_stats(self) -> WindowSnapshot:
+        """Throughput and latency percentiles over the sliding window."""
+        return self.window.snapshot()
     
     def export(self) -> bytes:
         """Export metrics in Prometheus format."""
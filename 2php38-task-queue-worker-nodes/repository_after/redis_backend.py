@@ -2,16 +2,22 @@
 from __future__ import annotations
 
 import json
+import threading
 import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import redis
+import redis.asyncio as aioredis
 from redis import Redis
-from redis.exceptions import RedisError
+from redis.client import NEVER_DECODE
+from redis.exceptions import NoScriptError, RedisError
 
 from .logging_config import get_logger
 from .models import Job, JobStatus, Priority
+from .retry import RetryManager
+from .scheduler import UniquenessConstraint
+from .serialization import JobCodec
 
 logger = get_logger(__name__)
 
@@ -74,16 +80,563 @@ class RedisConnection:
             logger.info("redis_connection_closed")
 
 
-class RedisStreamsQueue:
-    """Priority queue implementation using Redis Streams."""
+class AsyncRedisConnection:
+    """redis.asyncio connection manager with connection pooling.
+    
+    Commands on these connections are awaited, so blocking stream reads
+    only suspend the calling coroutine. The pool is bound to the event loop
+    that first uses it.
+    """
+    
+    _instance: Optional[aioredis.Redis] = None
+    _pool: Optional[aioredis.ConnectionPool] = None
+    
+    @classmethod
+    def get_connection(
+        cls,
+        config: Optional[RedisConfig] = None,
+        max_connections: Optional[int] = None,
+    ) -> aioredis.Redis:
+        """Get or create an asyncio Redis connection with pooling."""
+        if cls._instance is None:
+            config = config or RedisConfig()
+            cls._pool = aioredis.ConnectionPool(
+                host=config.host,
+                port=config.port,
+                db=config.db,
+                password=config.password,
+                decode_responses=config.decode_responses,
+                socket_timeout=config.socket_timeout,
+                socket_connect_timeout=config.socket_connect_timeout,
+                max_connections=max_connections,
+            )
+            cls._instance = aioredis.Redis(connection_pool=cls._pool)
+            logger.info("async_redis_connection_established", host=config.host, port=config.port)
+        return cls._instance
+    
+    @classmethod
+    async def close(cls):
+        """Close the asyncio Redis connection."""
+        if cls._instance:
+            await cls._instance.aclose()
+            cls._instance = None
+        if cls._pool:
+            await cls._pool.disconnect()
+            cls._pool = None
+            logger.info("async_redis_connection_closed")
+
+
+# KEYS: job body, job state, stream[, unique key]
+# ARGV: job id, job body, created_at
+# Returns {1, message_id} or {0, holder_job_id} when the unique key is taken.
+ENQUEUE_SCRIPT = """
+if #KEYS == 4 then
+    local holder = redis.call("GET", KEYS[4])
+    if holder and holder ~= ARGV[1] then
+        return {0, holder}
+    end
+    redis.call("SET", KEYS[4], ARGV[1])
+end
+redis.call("SET", KEYS[1], ARGV[2])
+redis.call("DEL", KEYS[2])
+local message_id = redis.call("XADD", KEYS[3], "*", "job_id", ARGV[1], "created_at", ARGV[3])
+return {1, message_id}
+"""
+
+# KEYS: priority streams, highest priority first
+# ARGV: group, consumer, count, job key prefix, state key suffix, started_at,
+#       handoff key prefix, begin ("1" to mark the jobs as executing)
+# Returns a flat list of message_id, stream, job body, state hash quadruples;
+# the state hash (HGETALL pairs) carries attempt and last_error across
+# retries. Entries stolen for this consumer by STEAL_SCRIPT are already in its
+# pending list, where a ">" read never delivers them, so when its handoff
+# flag is set they are collected from the pending list ("0") first. Job
+# bodies are addressed through the prefix, so this script assumes a
+# non-clustered Redis.
+CLAIM_SCRIPT = """
+local function stream_entries(reply)
+    if not reply or #reply == 0 then
+        return {}
+    end
+    return reply[1][2]
+end
+
+local function entry_job_id(fields)
+    -- Fields are missing for pending entries trimmed from the stream.
+    if not fields then
+        return nil
+    end
+    for i = 1, #fields, 2 do
+        if fields[i] == "job_id" then
+            return fields[i + 1]
+        end
+    end
+    return nil
+end
+
+local claimed = {}
+local remaining = tonumber(ARGV[3])
+
+local function claim(stream, message_id, job_id)
+    local state_key = ARGV[4] .. job_id .. ARGV[5]
+    local body = redis.call("GET", ARGV[4] .. job_id)
+    if not body then
+        -- The body was removed (cancelled job), drop the orphaned entry
+        -- and any state a requeue wrote for it.
+        redis.call("XACK", stream, ARGV[1], message_id)
+        redis.call("DEL", state_key)
+        return
+    end
+    redis.call(
+        "HSET", state_key,
+        "status", "running", "worker_id", ARGV[2], "started_at", ARGV[6]
+    )
+    if ARGV[8] == "1" then
+        redis.call("HSET", state_key, "executing", message_id)
+    end
+    table.insert(claimed, message_id)
+    table.insert(claimed, stream)
+    table.insert(claimed, body)
+    table.insert(claimed, redis.call("HGETALL", state_key))
+    remaining = remaining - 1
+end
+
+local handoff_key = ARGV[7] .. ARGV[2]
+if redis.call("DEL", handoff_key) == 1 then
+    for _, stream in ipairs(KEYS) do
+        local reply = redis.call("XREADGROUP", "GROUP", ARGV[1], ARGV[2], "STREAMS", stream, "0")
+        for _, entry in ipairs(stream_entries(reply)) do
+            local message_id, job_id = entry[1], entry_job_id(entry[2])
+            local state_key = job_id and (ARGV[4] .. job_id .. ARGV[5])
+            if state_key and redis.call("HGET", state_key, "handoff") == message_id then
+                if remaining <= 0 then
+                    -- More were handed over than asked for; keep the flag.
+                    redis.call("SET", handoff_key, 1)
+                    break
+                end
+                redis.call("HDEL", state_key, "handoff")
+                claim(stream, message_id, job_id)
+            end
+        end
+    end
+end
+
+for _, stream in ipairs(KEYS) do
+    if remaining <= 0 then
+        break
+    end
+    local reply = redis.call(
+        "XREADGROUP", "GROUP", ARGV[1], ARGV[2], "COUNT", remaining, "STREAMS", stream, ">"
+    )
+    for _, entry in ipairs(stream_entries(reply)) do
+        local message_id, job_id = entry[1], entry_job_id(entry[2])
+        if job_id then
+            claim(stream, message_id, job_id)
+        else
+            redis.call("XACK", stream, ARGV[1], message_id)
+        end
+    end
+end
+return claimed
+"""
+
+# KEYS: unique key; ARGV: job id
+RELEASE_UNIQUE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+# KEYS: job body, job state, schedule zset, schedule streams hash[, unique key]
+# ARGV: job id, job body, run_at, stream
+# Returns 0 when another job already holds the unique key.
+SCHEDULE_SCRIPT = """
+if #KEYS == 5 then
+    local holder = redis.call("GET", KEYS[5])
+    if holder and holder ~= ARGV[1] then
+        return 0
+    end
+    redis.call("SET", KEYS[5], ARGV[1])
+end
+redis.call("SET", KEYS[1], ARGV[2])
+redis.call("DEL", KEYS[2])
+redis.call("HSET", KEYS[2], "status", "scheduled")
+redis.call("ZADD", KEYS[3], ARGV[3], ARGV[1])
+redis.call("HSET", KEYS[4], ARGV[1], ARGV[4])
+return 1
+"""
+
+# KEYS: schedule zset, schedule streams hash
+# ARGV: now, limit
+# Removes up to ``limit`` due job IDs from the schedule and returns them.
+POP_DUE_SCRIPT = """
+local ids = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+for _, id in ipairs(ids) do
+    redis.call("ZREM", KEYS[1], id)
+    redis.call("HDEL", KEYS[2], id)
+end
+return ids
+"""
+
+# KEYS: schedule zset, schedule streams hash
+# ARGV: now, limit, job key prefix, state key suffix, created_at
+# Moves up to ``limit`` due jobs into their priority streams and returns how
+# many were appended. Like CLAIM_SCRIPT, streams and job keys are addressed
+# by name, so this assumes a non-clustered Redis.
+PROMOTE_SCRIPT = """
+local ids = redis.call("ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2])
+local promoted = 0
+for _, id in ipairs(ids) do
+    local stream = redis.call("HGET", KEYS[2], id)
+    redis.call("ZREM", KEYS[1], id)
+    redis.call("HDEL", KEYS[2], id)
+    if stream and redis.call("EXISTS", ARGV[3] .. id) == 1 then
+        redis.call("HSET", ARGV[3] .. id .. ARGV[4], "status", "pending")
+        redis.call("XADD", stream, "*", "job_id", id, "created_at", ARGV[5])
+        promoted = promoted + 1
+    end
+end
+return {#ids, promoted}
+"""
+
+# KEYS: stream, job state
+# ARGV: group, consumer, message_id
+# Marks a claimed job as executing, but only if ``consumer`` still owns the
+# entry. Returns 0 when another consumer stole it in the meantime.
+BEGIN_SCRIPT = """
+local owned = redis.call("XPENDING", KEYS[1], ARGV[1], ARGV[3], ARGV[3], 1, ARGV[2])
+if #owned == 0 then
+    return 0
+end
+redis.call("HSET", KEYS[2], "executing", ARGV[3])
+return 1
+"""
+
+# KEYS: stream
+# ARGV: group, reclaimer, min idle ms, count, job key prefix, state key suffix,
+#       start of the pending range, "any" or "listed" followed by the live
+#       consumers
+# Claims up to ``count`` pending entries idle for ``min idle ms`` for the
+# reclaimer, skipping jobs marked as executing by a live consumer: a job
+# that simply runs longer than the idle limit must not run twice. Returns
+# the last pending id examined, how many were examined and the reclaimed
+# message_id, job_id pairs ("" for entries trimmed from the stream).
+RECLAIM_SCRIPT = """
+local live = nil
+if ARGV[8] == "listed" then
+    live = {}
+    for i = 9, #ARGV do
+        live[ARGV[i]] = true
+    end
+end
+
+local pending = redis.call("XPENDING", KEYS[1], ARGV[1], "IDLE", ARGV[3], ARGV[7], "+", ARGV[4])
+local reclaimed = {}
+local last = ""
+for _, entry in ipairs(pending) do
+    local message_id, owner = entry[1], entry[2]
+    last = message_id
+    local job_id = nil
+    local found = redis.call("XRANGE", KEYS[1], message_id, message_id)
+    if #found > 0 then
+        local fields = found[1][2]
+        for i = 1, #fields, 2 do
+            if fields[i] == "job_id" then
+                job_id = fields[i + 1]
+            end
+        end
+    end
+    local running = job_id
+        and redis.call("HGET", ARGV[5] .. job_id .. ARGV[6], "executing") == message_id
+    if not (running and (live == nil or live[owner])) then
+        -- Claiming with the idle limit skips entries touched since XPENDING.
+        local claimed = redis.call("XCLAIM", KEYS[1], ARGV[1], ARGV[2], ARGV[3], message_id, "JUSTID")
+        if #claimed > 0 then
+            table.insert(reclaimed, message_id)
+            table.insert(reclaimed, job_id or "")
+        end
+    end
+end
+return {last, #pending, reclaimed}
+"""
+
+# KEYS: priority streams, highest priority first
+# ARGV: group, donor, thief, count, job key prefix, state key suffix, scan limit,
+#       handoff key prefix ("" when the thief runs the script itself)
+# Moves up to ``count`` entries the donor has claimed but not started to the
+# thief with XCLAIM, newest first, since the donor works through its backlog
+# oldest first. Returns message_id, stream, job body, state hash quadruples
+# like CLAIM_SCRIPT. With a handoff prefix the entries are also marked for
+# the thief's next claim, which delivers them from its pending list.
+STEAL_SCRIPT = """
+local stolen = {}
+local remaining = tonumber(ARGV[4])
+for _, stream in ipairs(KEYS) do
+    if remaining <= 0 then
+        break
+    end
+    local pending = redis.call("XPENDING", stream, ARGV[1], "-", "+", ARGV[7], ARGV[2])
+    for i = #pending, 1, -1 do
+        if remaining <= 0 then
+            break
+        end
+        local message_id = pending[i][1]
+        local entry = redis.call("XRANGE", stream, message_id, message_id)[1]
+        local job_id = nil
+        if entry then
+            for j = 1, #entry[2], 2 do
+                if entry[2][j] == "job_id" then
+                    job_id = entry[2][j + 1]
+                end
+            end
+        end
+        local state_key = job_id and (ARGV[5] .. job_id .. ARGV[6])
+        if state_key and redis.call("HGET", state_key, "executing") ~= message_id then
+            local body = redis.call("GET", ARGV[5] .. job_id)
+            if body then
+                redis.call("XCLAIM", stream, ARGV[1], ARGV[3], 0, message_id, "JUSTID")
+                redis.call("HSET", state_key, "worker_id", ARGV[3])
+                if ARGV[8] ~= "" then
+                    redis.call("HSET", state_key, "handoff", message_id)
+                else
+                    redis.call("HDEL", state_key, "handoff")
+                end
+                table.insert(stolen, message_id)
+                table.insert(stolen, stream)
+                table.insert(stolen, body)
+                table.insert(stolen, redis.call("HGETALL", state_key))
+                remaining = remaining - 1
+            else
+                redis.call("XACK", stream, ARGV[1], message_id)
+            end
+        end
+    end
+end
+if #stolen > 0 and ARGV[8] ~= "" then
+    redis.call("SET", ARGV[8] .. ARGV[3], 1)
+end
+return stolen
+"""
+
+
+class _StreamsQueueBase:
+    """Key layout, codec and priority ordering shared by the sync and async queues."""
     
     STREAM_PREFIX = "taskqueue:stream:"
     JOB_PREFIX = "taskqueue:job:"
+    STATE_SUFFIX = ":state"
+    UNIQUE_PREFIX = "taskqueue:unique:"
+    HANDOFF_PREFIX = "taskqueue:handoff:"
     CONSUMER_GROUP = "taskqueue_workers"
     
-    def __init__(self, redis_client: Optional[Redis] = None):
+    DEFAULT_PRIORITY_WEIGHTS = {
+        Priority.CRITICAL: 16,
+        Priority.HIGH: 8,
+        Priority.NORMAL: 4,
+        Priority.LOW: 2,
+        Priority.BATCH: 1,
+    }
+    
+    def __init__(self, priority_weights: Optional[Dict[Priority, int]] = None):
+        self._priority_weights = dict(priority_weights) if priority_weights else None
+        self._current_weights: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._weights_lock = threading.Lock()
+        self._overflow: Dict[str, List[Tuple[str, Job]]] = {}
+        self._codec = JobCodec()
+    
+    def _stream_key(self, job: Job) -> str:
+        """Get the stream key for a job's priority level."""
+        priority = Priority(job.priority) if isinstance(job.priority, int) else job.priority
+        return f"{self.STREAM_PREFIX}{priority.name.lower()}"
+    
+    def _claim_args(
+        self,
+        consumer_name: str,
+        count: int,
+        order: List[Priority],
+        started_at: datetime,
+        begin: bool = False,
+    ):
+        keys = [f"{self.STREAM_PREFIX}{p.name.lower()}" for p in order]
+        args = [
+            self.CONSUMER_GROUP,
+            consumer_name,
+            count,
+            self.JOB_PREFIX,
+            self.STATE_SUFFIX,
+            started_at.isoformat(),
+            self.HANDOFF_PREFIX,
+            "1" if begin else "0",
+        ]
+        return keys, args
+    
+    def _steal_args(self, donor: str, thief: str, count: int, scan: int, handoff: bool = False):
+        keys = [f"{self.STREAM_PREFIX}{p.name.lower()}" for p in Priority]
+        args = [
+            self.CONSUMER_GROUP,
+            donor,
+            thief,
+            count,
+            self.JOB_PREFIX,
+            self.STATE_SUFFIX,
+            scan,
+            self.HANDOFF_PREFIX if handoff else "",
+        ]
+        return keys, args
+    
+    def _begin_args(self, job: Job, message_id: str, consumer_name: str):
+        keys = [self._stream_key(job), f"{self.JOB_PREFIX}{job.id}{self.STATE_SUFFIX}"]
+        return keys, [self.CONSUMER_GROUP, consumer_name, message_id]
+    
+    def _decode_claimed(
+        self,
+        reply: List[bytes],
+        consumer_name: str,
+        started_at: Optional[datetime],
+    ) -> List[Tuple[str, Job]]:
+        """Turn a claim or steal script reply into (message_id, running job) pairs.
+        
+        The stored state hash is applied over each body, so a retried or
+        reclaimed job keeps its attempt count and last error.
+        """
+        jobs = []
+        for i in range(0, len(reply), 4):
+            message_id, _, job_data, state = reply[i:i + 4]
+            message_id = message_id.decode()
+            job = self._codec.decode(job_data, validate=False)
+            self._codec.apply_state(job, {
+                field.decode(): value.decode()
+                for field, value in zip(state[0::2], state[1::2])
+            })
+            job.status = JobStatus.RUNNING
+            job.worker_id = consumer_name
+            if started_at is not None:
+                job.started_at = started_at
+            jobs.append((message_id, job))
+            logger.debug("job_claimed", job_id=job.id, consumer=consumer_name)
+        return jobs
+    
+    def _decode_fetched(
+        self,
+        entries: List[Tuple[str, str]],
+        bodies: List[Optional[bytes]],
+        consumer_name: str,
+        states: List[Dict[str, str]],
+    ) -> List[Tuple[str, Job]]:
+        jobs = []
+        for (message_id, job_id), job_data, state in zip(entries, bodies, states):
+            if job_data:
+                job = self._codec.decode(job_data, validate=False)
+                self._codec.apply_state(job, state)
+                jobs.append((message_id, job))
+                logger.debug(
+                    "job_dequeued",
+                    job_id=job_id,
+                    consumer=consumer_name,
+                )
+        return jobs
+    
+    @staticmethod
+    def _running_state(consumer_name: str, started_at: datetime) -> Dict[str, str]:
+        return {
+            "status": JobStatus.RUNNING.value,
+            "worker_id": consumer_name,
+            "started_at": started_at.isoformat(),
+        }
+    
+    @staticmethod
+    def _pending_state() -> Dict[str, str]:
+        """State of a job handed back to its stream; attempt and last_error are kept."""
+        return {
+            "status": JobStatus.PENDING.value,
+            "worker_id": "",
+            "started_at": "",
+        }
+    
+    @staticmethod
+    def _read_entries(messages) -> List[Tuple[str, str]]:
+        """Extract (message_id, job_id) pairs from an XREADGROUP reply."""
+        entries: List[Tuple[str, str]] = []
+        for stream_name, stream_messages in messages or []:
+            for message_id, data in stream_messages:
+                job_id = data.get("job_id")
+                if job_id:
+                    entries.append((message_id, job_id))
+        return entries
+    
+    def _merge_overflow(
+        self,
+        consumer_name: str,
+        jobs: List[Tuple[str, Job]],
+        order: List[Priority],
+        count: int,
+    ) -> List[Tuple[str, Job]]:
+        """Sort jobs by the served priority order and keep the excess for later."""
+        rank = {p: i for i, p in enumerate(order)}
+        jobs.sort(key=lambda entry: rank[Priority(entry[1].priority)])
+        if len(jobs) > count:
+            self._overflow[consumer_name] = jobs[count:]
+            jobs = jobs[:count]
+        return jobs
+    
+    def _priority_order(self) -> List[Priority]:
+        """Get the order in which priority streams are served for one read.
+        
+        In strict mode this is always CRITICAL..BATCH. In weighted-fair mode a
+        smooth weighted round-robin picks which priority is served first, and
+        the remaining priorities follow in strict order, so an empty stream
+        never wastes a turn and LOW/BATCH still get their share under load.
+        """
+        if not self._priority_weights:
+            return list(Priority)
+        
+        with self._weights_lock:
+            total = 0
+            for priority, weight in self._priority_weights.items():
+                self._current_weights[priority] += weight
+                total += weight
+            first = max(
+                self._priority_weights,
+                key=lambda p: (self._current_weights[p], -p.value),
+            )
+            self._current_weights[first] -= total
+        
+        return [first] + [p for p in Priority if p != first]
+
+
+class RedisStreamsQueue(_StreamsQueueBase):
+    """Priority queue implementation using Redis Streams.
+    
+    Job bodies are stored as compact ``JobCodec`` envelopes under
+    ``JOB_PREFIX`` and written once per enqueue. Mutable fields (status,
+    attempt, errors, timestamps, worker) live in a small hash next to the
+    body, so claims and status updates only HSET those fields. Bodies are
+    binary, so they are always read with response decoding disabled.
+    """
+    
+    def __init__(
+        self,
+        redis_client: Optional[Redis] = None,
+        priority_weights: Optional[Dict[Priority, int]] = None,
+    ):
+        """Create the queue.
+        
+        Pass ``priority_weights`` (for example ``DEFAULT_PRIORITY_WEIGHTS``)
+        to switch from strict priority order to weighted-fair dequeueing.
+        """
+        super().__init__(priority_weights)
         self._redis = redis_client or RedisConnection.get_connection()
         self._ensure_consumer_groups()
+        self._enqueue_script = self._redis.register_script(ENQUEUE_SCRIPT)
+        self._claim_script = self._redis.register_script(CLAIM_SCRIPT)
+        self._release_unique_script = self._redis.register_script(RELEASE_UNIQUE_SCRIPT)
+        self._pop_due_script = self._redis.register_script(POP_DUE_SCRIPT)
+        self._promote_script = self._redis.register_script(PROMOTE_SCRIPT)
+        self._begin_script = self._redis.register_script(BEGIN_SCRIPT)
+        self._steal_script = self._redis.register_script(STEAL_SCRIPT)
+        self._reclaim_script = self._redis.register_script(RECLAIM_SCRIPT)
     
     def _ensure_consumer_groups(self):
         """Create consumer groups for each priority level if they don't exist."""
@@ -103,95 +656,526 @@ class RedisStreamsQueue:
     
     def enqueue(self, job: Job) -> str:
         """Add job to Redis Stream based on priority."""
-        priority = Priority(job.priority) if isinstance(job.priority, int) else job.priority
-        stream_key = f"{self.STREAM_PREFIX}{priority.name.lower()}"
-        job_key = f"{self.JOB_PREFIX}{job.id}"
+        return self.enqueue_many([job])[0]
+    
+    def enqueue_many(self, jobs: List[Job]) -> List[str]:
+        """Add a batch of jobs in a single pipelined round-trip.
+        
+        Job bodies and stream entries for the whole batch are written with one
+        non-transactional pipeline, so the number of network round-trips does
+        not depend on the batch size.
+        """
+        if not jobs:
+            return []
         
-        job_data = job.model_dump_json()
-        self._redis.set(job_key, job_data)
+        pipe = self._redis.pipeline(transaction=False)
+        now = time.time()
+        for job in jobs:
+            job_key = f"{self.JOB_PREFIX}{job.id}"
+            pipe.set(job_key, self._codec.encode(job))
+            pipe.delete(f"{job_key}{self.STATE_SUFFIX}")
+            pipe.xadd(self._stream_key(job), {"job_id": job.id, "created_at": now})
+        results = pipe.execute()
         
-        message_id = self._redis.xadd(
-            stream_key,
-            {"job_id": job.id, "created_at": time.time()},
+        message_ids = results[2::3]
+        for job, message_id in zip(jobs, message_ids):
+            logger.info(
+                "job_enqueued",
+                job_id=job.id,
+                priority=Priority(job.priority).name,
+                stream=self._stream_key(job),
+                message_id=message_id,
+            )
+        return message_ids
+    
+    def enqueue_atomic(self, job: Job) -> Optional[str]:
+        """Enqueue a job with a server-side uniqueness check in one round-trip.
+        
+        The unique key check, body write and stream append run as a single
+        Lua script, so concurrent clients cannot both enqueue the same unique
+        job. Returns the stream message ID, or None if another job already
+        holds the job's unique key.
+        """
+        job_key = f"{self.JOB_PREFIX}{job.id}"
+        keys = [job_key, f"{job_key}{self.STATE_SUFFIX}", self._stream_key(job)]
+        if job.unique_key:
+            keys.append(f"{self.UNIQUE_PREFIX}{job.unique_key}")
+        
+        ok, value = self._enqueue_script(
+            keys=keys,
+            args=[job.id, self._codec.encode(job), time.time()],
         )
         
+        if not ok:
+            logger.info(
+                "job_enqueue_duplicate",
+                job_id=job.id,
+                unique_key=job.unique_key,
+                holder=value,
+            )
+            return None
+        
         logger.info(
             "job_enqueued",
             job_id=job.id,
-            priority=priority.name,
-            stream=stream_key,
-            message_id=message_id,
+            priority=Priority(job.priority).name,
+            stream=keys[2],
+            message_id=value,
+        )
+        return value
+    
+    def claim(self, consumer_name: str, count: int = 1, begin: bool = False) -> List[Tuple[str, Job]]:
+        """Atomically claim up to ``count`` jobs in priority order.
+        
+        Reading the streams, fetching the job bodies and flipping their status
+        to RUNNING happen in one Lua script and one round-trip. Unlike
+        ``dequeue`` this never blocks, since scripts cannot wait on streams.
+        Jobs stolen for this consumer by ``steal(..., handoff=True)`` are
+        delivered first. With ``begin`` the jobs are also marked as executing,
+        as if ``begin`` had been called for each of them.
+        """
+        return self._claim_ordered(consumer_name, count, self._priority_order(), begin)
+    
+    def _claim_ordered(
+        self,
+        consumer_name: str,
+        count: int,
+        order: List[Priority],
+        begin: bool = False,
+    ) -> List[Tuple[str, Job]]:
+        """Run the claim script over the streams in the given priority order."""
+        started_at = datetime.utcnow()
+        keys, args = self._claim_args(consumer_name, count, order, started_at, begin)
+        
+        try:
+            reply = self._run_script_binary(self._claim_script, keys, args)
+        except RedisError as e:
+            logger.error("claim_error", error=str(e), consumer=consumer_name)
+            return []
+        
+        return self._decode_claimed(reply, consumer_name, started_at)
+    
+    def _run_script_binary(self, script, keys: List[str], args: List[Any]):
+        """Run a registered script with response decoding disabled."""
+        try:
+            return self._redis.execute_command(
+                "EVALSHA", script.sha, len(keys), *keys, *args, **{NEVER_DECODE: True}
+            )
+        except NoScriptError:
+            self._redis.script_load(script.script)
+            return self._redis.execute_command(
+                "EVALSHA", script.sha, len(keys), *keys, *args, **{NEVER_DECODE: True}
+            )
+    
+    def begin(self, job: Job, message_id: str, consumer_name: str) -> bool:
+        """Mark a claimed job as executing so it can no longer be stolen.
+        
+        Consumers that claim more than one job at a time should call this
+        before running each one. Returns False if another consumer stole
+        the job first, in which case it must not be run.
+        """
+        keys, args = self._begin_args(job, message_id, consumer_name)
+        return bool(self._begin_script(keys=keys, args=args))
+    
+    def steal(
+        self,
+        donor: str,
+        thief: str,
+        count: int = 1,
+        scan: int = 1000,
+        handoff: bool = False,
+    ) -> List[Tuple[str, Job]]:
+        """Move up to ``count`` claimed but unstarted jobs from ``donor`` to ``thief``.
+        
+        Runs as one script: the donor's pending entries are read with
+        XPENDING, jobs already marked by ``begin`` are skipped and the rest
+        are transferred with XCLAIM, highest priority and newest first.
+        Returns the stolen (message_id, job) pairs, now pending for
+        ``thief``. When the caller is not ``thief`` itself, pass ``handoff``
+        so the thief's next ``claim`` or ``dequeue`` delivers the jobs;
+        otherwise the caller must run the returned jobs.
+        """
+        keys, args = self._steal_args(donor, thief, count, scan, handoff)
+        try:
+            reply = self._run_script_binary(self._steal_script, keys, args)
+        except RedisError as e:
+            logger.error("steal_error", error=str(e), donor=donor, thief=thief)
+            return []
+        
+        stolen = self._decode_claimed(reply, thief, None)
+        if stolen:
+            logger.info("jobs_stolen", donor=donor, thief=thief, count=len(stolen))
+        return stolen
+    
+    def release_unique(self, unique_key: str, job_id: str) -> bool:
+        """Release a unique key, but only if ``job_id`` still holds it."""
+        result = self._release_unique_script(
+            keys=[f"{self.UNIQUE_PREFIX}{unique_key}"],
+            args=[job_id],
         )
-        return message_id
+        return bool(result)
     
     def dequeue(
         self, 
         consumer_name: str,
         timeout_ms: int = 5000,
         count: int = 1,
+        begin: bool = False,
+    ) -> List[Tuple[str, Job]]:
+        """Dequeue and claim jobs from Redis Streams in priority order.
+        
+        Ready jobs are claimed with the non-blocking claim script. Only if
+        none are ready does the consumer block, once, on every priority
+        stream together, so an idle worker wakes up for whichever priority
+        receives work first. A blocking read can deliver up to ``count``
+        entries per stream; anything beyond ``count`` is kept for this
+        consumer and served by the next calls before anything new is claimed.
+        With ``begin`` every claimed job, including kept ones, is marked as
+        executing so it cannot be stolen from this consumer.
+        """
+        order = self._priority_order()
+        
+        # Drain jobs kept from an earlier read first and claim only what is
+        # missing, so the overflow cannot keep growing under new work.
+        jobs = self._overflow.pop(consumer_name, [])
+        if len(jobs) < count:
+            jobs.extend(self._claim_ordered(consumer_name, count - len(jobs), order, begin))
+        
+        if not jobs and timeout_ms > 0:
+            jobs = self._blocking_read(consumer_name, count, order, timeout_ms, begin)
+        
+        return self._merge_overflow(consumer_name, jobs, order, count)
+    
+    def _blocking_read(
+        self,
+        consumer_name: str,
+        count: int,
+        order: List[Priority],
+        timeout_ms: int,
+        begin: bool = False,
     ) -> List[Tuple[str, Job]]:
-        """Dequeue jobs from Redis Streams in priority order."""
+        """Block once on all priority streams and claim what arrives."""
+        streams = {f"{self.STREAM_PREFIX}{p.name.lower()}": ">" for p in order}
+        
+        try:
+            messages = self._redis.xreadgroup(
+                self.CONSUMER_GROUP,
+                consumer_name,
+                streams,
+                count=count,
+                block=timeout_ms,
+            )
+        except RedisError as e:
+            logger.error("dequeue_error", error=str(e), consumer=consumer_name)
+            return []
+        
+        return self._fetch_jobs(self._read_entries(messages), consumer_name, begin)
+    
+    def _fetch_jobs(
+        self,
+        entries: List[Tuple[str, str]],
+        consumer_name: str,
+        begin: bool = False,
+    ) -> List[Tuple[str, Job]]:
+        """Resolve (message_id, job_id) pairs to running jobs in one round-trip.
+        
+        All bodies are fetched with a single MGET, pipelined with the state
+        writes that mark the jobs RUNNING for this consumer (and executing,
+        with ``begin``) and reads of the resulting state hashes.
+        """
+        if not entries:
+            return []
+        
+        state = self._running_state(consumer_name, datetime.utcnow())
+        
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.execute_command(
+            "MGET",
+            *[f"{self.JOB_PREFIX}{job_id}" for _, job_id in entries],
+            **{NEVER_DECODE: True},
+        )
+        for message_id, job_id in entries:
+            state_key = f"{self.JOB_PREFIX}{job_id}{self.STATE_SUFFIX}"
+            pipe.hset(state_key, mapping=dict(state, executing=message_id) if begin else state)
+            pipe.hgetall(state_key)
+        
+        try:
+            results = pipe.execute()
+        except RedisError as e:
+            logger.error("dequeue_fetch_error", error=str(e), count=len(entries))
+            return []
+        
+        return self._decode_fetched(entries, results[0], consumer_name, results[2::2])
+    
+    def acknowledge(self, job: Job, message_id: str, update_state: bool = False):
+        """Acknowledge job completion, optionally writing its state in the same round-trip."""
+        if update_state:
+            self.acknowledge_many([(message_id, job)], update_state)
+            return
+        self._redis.xack(self._stream_key(job), self.CONSUMER_GROUP, message_id)
+        logger.debug("job_acknowledged", job_id=job.id, message_id=message_id)
+    
+    def acknowledge_many(
+        self,
+        entries: List[Tuple[str, Job]],
+        update_state: bool = False,
+    ):
+        """Acknowledge a batch of (message_id, job) pairs in one round-trip.
+        
+        With ``update_state`` each job's mutable fields are written in the
+        same pipeline, so finishing a job costs a single round-trip.
+        """
+        if not entries:
+            return
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for message_id, job in entries:
+            if update_state:
+                pipe.hset(
+                    f"{self.JOB_PREFIX}{job.id}{self.STATE_SUFFIX}",
+                    mapping=self._codec.encode_state(job),
+                )
+            pipe.xack(self._stream_key(job), self.CONSUMER_GROUP, message_id)
+        pipe.execute()
+        logger.debug("jobs_acknowledged", count=len(entries))
+    
+    def get_job(self, job_id: str, validate: bool = True) -> Optional[Job]:
+        """Retrieve job by ID, including its current mutable state.
+        
+        Pass ``validate=False`` for trusted internal reads to skip Pydantic
+        validation of the stored body.
+        """
+        return self.get_jobs([job_id], validate=validate)[0]
+    
+    def get_jobs(self, job_ids: List[str], validate: bool = True) -> List[Optional[Job]]:
+        """Retrieve several jobs in one pipelined round-trip, in order."""
+        if not job_ids:
+            return []
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for job_id in job_ids:
+            job_key = f"{self.JOB_PREFIX}{job_id}"
+            pipe.execute_command("GET", job_key, **{NEVER_DECODE: True})
+            pipe.hgetall(f"{job_key}{self.STATE_SUFFIX}")
+        results = pipe.execute()
+        
         jobs = []
+        for job_data, state in zip(results[0::2], results[1::2]):
+            if not job_data:
+                jobs.append(None)
+                continue
+            job = self._codec.decode(job_data, validate=validate)
+            if state:
+                self._codec.apply_state(job, state)
+            jobs.append(job)
+        return jobs
+    
+    def update_job(self, job: Job, fields: Optional[List[str]] = None):
+        """Persist a job's mutable fields (status, attempt, errors, timestamps, worker).
         
+        Only the state hash is written; the body is immutable once enqueued.
+        Pass ``fields`` (e.g. ``["status"]``) to write just those fields.
+        """
+        self._redis.hset(
+            f"{self.JOB_PREFIX}{job.id}{self.STATE_SUFFIX}",
+            mapping=self._codec.encode_state(job, fields),
+        )
+    
+    def delete_job(self, job_id: str):
+        """Delete job from Redis."""
+        job_key = f"{self.JOB_PREFIX}{job_id}"
+        self._redis.delete(job_key, f"{job_key}{self.STATE_SUFFIX}")
+    
+    def reclaim_idle(
+        self,
+        consumer_name: str,
+        min_idle_ms: int,
+        count: int = 100,
+        live_consumers: Optional[Iterable[str]] = None,
+    ) -> Dict[Priority, int]:
+        """Requeue pending entries that no consumer has touched for ``min_idle_ms``.
+        
+        Idle entries are moved to ``consumer_name`` in batches of ``count``
+        and then re-added to their stream, so any live worker can pick them
+        up. Jobs marked as executing by ``begin`` are left with their
+        consumer while it is in ``live_consumers`` (or always, when that is
+        None), since they are running rather than lost; a consumer that died
+        mid-job is recovered by ``recover_consumer``. Returns the number of
+        reclaimed jobs per priority.
+        """
+        if live_consumers is None:
+            live_args = ["any"]
+        else:
+            live_args = ["listed", *live_consumers]
+        
+        reclaimed = {}
         for priority in Priority:
-            if len(jobs) >= count:
-                break
-                
             stream_key = f"{self.STREAM_PREFIX}{priority.name.lower()}"
-            
+            start_id = "-"
+            total = 0
             try:
-                messages = self._redis.xreadgroup(
-                    self.CONSUMER_GROUP,
-                    consumer_name,
-                    {stream_key: ">"},
-                    count=count - len(jobs),
-                    block=timeout_ms if not jobs else 0,
-                )
-                
-                if messages:
-                    for stream_name, stream_messages in messages:
-                        for message_id, data in stream_messages:
-                            job_id = data.get("job_id")
-                            if job_id:
-                                job = self.get_job(job_id)
-                                if job:
-                                    jobs.append((message_id, job))
-                                    logger.debug(
-                                        "job_dequeued",
-                                        job_id=job_id,
-                                        consumer=consumer_name,
-                                    )
+                while True:
+                    last_id, examined, claimed = self._reclaim_script(
+                        keys=[stream_key],
+                        args=[
+                            self.CONSUMER_GROUP,
+                            consumer_name,
+                            min_idle_ms,
+                            count,
+                            self.JOB_PREFIX,
+                            self.STATE_SUFFIX,
+                            start_id,
+                            *live_args,
+                        ],
+                    )
+                    messages = [
+                        (message_id, {"job_id": job_id} if job_id else {})
+                        for message_id, job_id in zip(claimed[::2], claimed[1::2])
+                    ]
+                    total += self._requeue(stream_key, messages)
+                    if examined < count:
+                        break
+                    start_id = f"({last_id}"
             except RedisError as e:
-                logger.error("dequeue_error", error=str(e), stream=stream_key)
+                logger.error("reclaim_error", error=str(e), stream=stream_key)
+            if total:
+                reclaimed[priority] = total
+                logger.info("pending_jobs_reclaimed", stream=stream_key, count=total)
+        return reclaimed
+    
+    def recover_consumer(
+        self,
+        dead_consumer: str,
+        consumer_name: str,
+        count: int = 100,
+    ) -> Dict[Priority, int]:
+        """Requeue everything pending for a dead consumer and remove it from the group.
         
-        return jobs
+        Unlike ``reclaim_idle`` this ignores idle time, since the consumer is
+        known to be gone. Returns the number of recovered jobs per priority.
+        """
+        recovered = {}
+        for priority in Priority:
+            stream_key = f"{self.STREAM_PREFIX}{priority.name.lower()}"
+            total = 0
+            try:
+                while True:
+                    pending = self._redis.xpending_range(
+                        stream_key,
+                        self.CONSUMER_GROUP,
+                        min="-",
+                        max="+",
+                        count=count,
+                        consumername=dead_consumer,
+                    )
+                    if not pending:
+                        break
+                    messages = self._redis.xclaim(
+                        stream_key,
+                        self.CONSUMER_GROUP,
+                        consumer_name,
+                        0,
+                        [entry["message_id"] for entry in pending],
+                    )
+                    total += self._requeue(stream_key, messages)
+                    if len(pending) < count:
+                        break
+                self._redis.xgroup_delconsumer(stream_key, self.CONSUMER_GROUP, dead_consumer)
+            except RedisError as e:
+                logger.error("recover_consumer_error", error=str(e), stream=stream_key)
+            if total:
+                recovered[priority] = total
+        
+        logger.info(
+            "consumer_recovered",
+            consumer=dead_consumer,
+            count=sum(recovered.values()),
+        )
+        return recovered
     
-    def acknowledge(self, job: Job, message_id: str):
-        """Acknowledge job completion."""
-        priority = Priority(job.priority) if isinstance(job.priority, int) else job.priority
-        stream_key = f"{self.STREAM_PREFIX}{priority.name.lower()}"
+    def _requeue(self, stream_key: str, messages: List[Tuple[str, Dict[str, str]]]) -> int:
+        """Re-add claimed entries to the stream tail and acknowledge the originals."""
+        if not messages:
+            return 0
         
-        self._redis.xack(stream_key, self.CONSUMER_GROUP, message_id)
-        logger.debug("job_acknowledged", job_id=job.id, message_id=message_id)
+        now = time.time()
+        state = self._pending_state()
+        requeued = 0
+        pipe = self._redis.pipeline(transaction=False)
+        for message_id, data in messages:
+            job_id = data.get("job_id") if data else None
+            if job_id:
+                pipe.hset(f"{self.JOB_PREFIX}{job_id}{self.STATE_SUFFIX}", mapping=state)
+                pipe.xadd(stream_key, {"job_id": job_id, "created_at": now})
+                requeued += 1
+            pipe.xack(stream_key, self.CONSUMER_GROUP, message_id)
+        pipe.execute()
+        return requeued
     
-    def get_job(self, job_id: str) -> Optional[Job]:
-        """Retrieve job by ID."""
-        job_key = f"{self.JOB_PREFIX}{job_id}"
-        job_data = self._redis.get(job_key)
+    def trim_acknowledged(self) -> Dict[Priority, int]:
+        """Trim stream entries that every consumer has already acknowledged.
         
-        if job_data:
-            return Job.model_validate_json(job_data)
-        return None
+        Each stream is trimmed with XTRIM MINID up to its oldest pending
+        entry, or past the group's last delivered entry when nothing is
+        pending, so stream memory stays bounded. Returns entries removed per
+        priority.
+        """
+        trimmed = {}
+        for priority in Priority:
+            stream_key = f"{self.STREAM_PREFIX}{priority.name.lower()}"
+            try:
+                pending = self._redis.xpending(stream_key, self.CONSUMER_GROUP)
+                if pending and pending.get("pending"):
+                    min_id = pending["min"]
+                else:
+                    groups = self._redis.xinfo_groups(stream_key)
+                    group = next(
+                        (g for g in groups if g["name"] == self.CONSUMER_GROUP), None
+                    )
+                    if not group or group["last-delivered-id"] == "0-0":
+                        continue
+                    ms, seq = group["last-delivered-id"].split("-")
+                    min_id = f"{ms}-{int(seq) + 1}"
+                
+                removed = self._redis.xtrim(stream_key, minid=min_id, approximate=False)
+            except RedisError as e:
+                logger.error("trim_error", error=str(e), stream=stream_key)
+                continue
+            if removed:
+                trimmed[priority] = removed
+                logger.debug("stream_trimmed", stream=stream_key, count=removed)
+        return trimmed
     
-    def update_job(self, job: Job):
-        """Update job in Redis."""
-        job_key = f"{self.JOB_PREFIX}{job.id}"
-        self._redis.set(job_key, job.model_dump_json())
+    def pop_due(self, schedule_key: str, streams_key: str, limit: int) -> List[str]:
+        """Atomically remove and return up to ``limit`` due IDs from a schedule."""
+        return self._pop_due_script(keys=[schedule_key, streams_key], args=[time.time(), limit])
     
-    def delete_job(self, job_id: str):
-        """Delete job from Redis."""
-        job_key = f"{self.JOB_PREFIX}{job_id}"
-        self._redis.delete(job_key)
+    def promote_due(
+        self,
+        schedule_key: str,
+        streams_key: str,
+        batch_size: int = 1000,
+    ) -> int:
+        """Move every due job of a schedule sorted set into its priority stream.
+        
+        Each script call promotes up to ``batch_size`` jobs atomically, so a
+        backlog is drained in ``due / batch_size`` round-trips and concurrent
+        promoters on other nodes never append the same job twice. Returns the
+        number of jobs appended to streams.
+        """
+        promoted = 0
+        while True:
+            now = time.time()
+            removed, appended = self._promote_script(
+                keys=[schedule_key, streams_key],
+                args=[now, batch_size, self.JOB_PREFIX, self.STATE_SUFFIX, now],
+            )
+            promoted += appended
+            if removed < batch_size:
+                break
+        if promoted:
+            logger.info("jobs_promoted", schedule=schedule_key, count=promoted)
+        return promoted
     
     def get_queue_depth(self, priority: Optional[Priority] = None) -> Dict[Priority, int]:
         """Get queue depth per priority level."""
@@ -239,8 +1223,561 @@ class RedisStreamsQueue:
     
     def remove_job(self, job_id: str):
         """Remove a specific job from the queue."""
-        job_key = f"{self.JOB_PREFIX}{job_id}"
-        self._redis.delete(job_key)
+        self.delete_job(job_id)
+
+
+class AsyncRedisStreamsQueue(_StreamsQueueBase):
+    """asyncio counterpart of ``RedisStreamsQueue`` built on redis.asyncio.
+    
+    Uses the same keys, scripts and job encoding, so sync and async clients
+    can share one queue. Every call is awaited on a non-blocking connection,
+    including the blocking stream read an idle consumer waits on. Call
+    ``initialize`` once before use to create the consumer groups.
+    """
+    
+    def __init__(
+        self,
+        redis_client: Optional[aioredis.Redis] = None,
+        priority_weights: Optional[Dict[Priority, int]] = None,
+    ):
+        super().__init__(priority_weights)
+        self._redis = redis_client or AsyncRedisConnection.get_connection()
+        self._initialized = False
+        self._enqueue_script = self._redis.register_script(ENQUEUE_SCRIPT)
+        self._claim_script = self._redis.register_script(CLAIM_SCRIPT)
+        self._release_unique_script = self._redis.register_script(RELEASE_UNIQUE_SCRIPT)
+        self._promote_script = self._redis.register_script(PROMOTE_SCRIPT)
+        self._begin_script = self._redis.register_script(BEGIN_SCRIPT)
+        self._steal_script = self._redis.register_script(STEAL_SCRIPT)
+    
+    async def initialize(self):
+        """Create consumer groups for each priority level if they don't exist."""
+        if self._initialized:
+            return
+        for priority in Priority:
+            stream_key = f"{self.STREAM_PREFIX}{priority.name.lower()}"
+            try:
+                await self._redis.xgroup_create(
+                    stream_key,
+                    self.CONSUMER_GROUP,
+                    id="0",
+                    mkstream=True
+                )
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self._initialized = True
+    
+    async def enqueue(self, job: Job) -> str:
+        """Add job to Redis Stream based on priority."""
+        return (await self.enqueue_many([job]))[0]
+    
+    async def enqueue_many(self, jobs: List[Job]) -> List[str]:
+        """Add a batch of jobs in a single pipelined round-trip."""
+        if not jobs:
+            return []
+        
+        pipe = self._redis.pipeline(transaction=False)
+        now = time.time()
+        for job in jobs:
+            job_key = f"{self.JOB_PREFIX}{job.id}"
+            pipe.set(job_key, self._codec.encode(job))
+            pipe.delete(f"{job_key}{self.STATE_SUFFIX}")
+            pipe.xadd(self._stream_key(job), {"job_id": job.id, "created_at": now})
+        results = await pipe.execute()
+        
+        message_ids = results[2::3]
+        logger.debug("jobs_enqueued", count=len(message_ids))
+        return message_ids
+    
+    async def enqueue_atomic(self, job: Job) -> Optional[str]:
+        """Enqueue a job with a server-side uniqueness check in one round-trip.
+        
+        Returns the stream message ID, or None if another job already holds
+        the job's unique key.
+        """
+        job_key = f"{self.JOB_PREFIX}{job.id}"
+        keys = [job_key, f"{job_key}{self.STATE_SUFFIX}", self._stream_key(job)]
+        if job.unique_key:
+            keys.append(f"{self.UNIQUE_PREFIX}{job.unique_key}")
+        
+        ok, value = await self._enqueue_script(
+            keys=keys,
+            args=[job.id, self._codec.encode(job), time.time()],
+        )
+        if not ok:
+            logger.info(
+                "job_enqueue_duplicate",
+                job_id=job.id,
+                unique_key=job.unique_key,
+                holder=value,
+            )
+            return None
+        return value
+    
+    async def claim(self, consumer_name: str, count: int = 1) -> List[Tuple[str, Job]]:
+        """Atomically claim up to ``count`` ready jobs in priority order."""
+        return await self._claim_ordered(consumer_name, count, self._priority_order())
+    
+    async def _claim_ordered(
+        self,
+        consumer_name: str,
+        count: int,
+        order: List[Priority],
+    ) -> List[Tuple[str, Job]]:
+        started_at = datetime.utcnow()
+        keys, args = self._claim_args(consumer_name, count, order, started_at)
+        
+        try:
+            reply = await self._run_script_binary(self._claim_script, keys, args)
+        except RedisError as e:
+            logger.error("claim_error", error=str(e), consumer=consumer_name)
+            return []
+        
+        return self._decode_claimed(reply, consumer_name, started_at)
+    
+    async def _run_script_binary(self, script, keys: List[str], args: List[Any]):
+        """Run a registered script with response decoding disabled."""
+        try:
+            return await self._redis.execute_command(
+                "EVALSHA", script.sha, len(keys), *keys, *args, **{NEVER_DECODE: True}
+            )
+        except NoScriptError:
+            await self._redis.script_load(script.script)
+            return await self._redis.execute_command(
+                "EVALSHA", script.sha, len(keys), *keys, *args, **{NEVER_DECODE: True}
+            )
+    
+    async def begin(self, job: Job, message_id: str, consumer_name: str) -> bool:
+        """Mark a claimed job as executing; False if another consumer stole it."""
+        keys, args = self._begin_args(job, message_id, consumer_name)
+        return bool(await self._begin_script(keys=keys, args=args))
+    
+    async def steal(
+        self,
+        donor: str,
+        thief: str,
+        count: int = 1,
+        scan: int = 1000,
+        handoff: bool = False,
+    ) -> List[Tuple[str, Job]]:
+        """Move up to ``count`` claimed but unstarted jobs from ``donor`` to ``thief``."""
+        keys, args = self._steal_args(donor, thief, count, scan, handoff)
+        try:
+            reply = await self._run_script_binary(self._steal_script, keys, args)
+        except RedisError as e:
+            logger.error("steal_error", error=str(e), donor=donor, thief=thief)
+            return []
+        return self._decode_claimed(reply, thief, None)
+    
+    async def release_unique(self, unique_key: str, job_id: str) -> bool:
+        """Release a unique key, but only if ``job_id`` still holds it."""
+        result = await self._release_unique_script(
+            keys=[f"{self.UNIQUE_PREFIX}{unique_key}"],
+            args=[job_id],
+        )
+        return bool(result)
+    
+    async def dequeue(
+        self,
+        consumer_name: str,
+        timeout_ms: int = 5000,
+        count: int = 1,
+    ) -> List[Tuple[str, Job]]:
+        """Dequeue and claim jobs in priority order, waiting without blocking the loop.
+        
+        Same semantics as ``RedisStreamsQueue.dequeue``: ready jobs are
+        claimed by script, and only when none are ready does the consumer
+        wait on all priority streams at once. Each waiting consumer holds
+        one pooled connection for the duration of the wait.
+        """
+        order = self._priority_order()
+        
+        jobs = self._overflow.pop(consumer_name, [])
+        if len(jobs) < count:
+            jobs.extend(await self._claim_ordered(consumer_name, count - len(jobs), order))
+        
+        if not jobs and timeout_ms > 0:
+            jobs = await self._blocking_read(consumer_name, count, order, timeout_ms)
+        
+        return self._merge_overflow(consumer_name, jobs, order, count)
+    
+    async def _blocking_read(
+        self,
+        consumer_name: str,
+        count: int,
+        order: List[Priority],
+        timeout_ms: int,
+    ) -> List[Tuple[str, Job]]:
+        streams = {f"{self.STREAM_PREFIX}{p.name.lower()}": ">" for p in order}
+        
+        try:
+            messages = await self._redis.xreadgroup(
+                self.CONSUMER_GROUP,
+                consumer_name,
+                streams,
+                count=count,
+                block=timeout_ms,
+            )
+        except RedisError as e:
+            logger.error("dequeue_error", error=str(e), consumer=consumer_name)
+            return []
+        
+        return await self._fetch_jobs(self._read_entries(messages), consumer_name)
+    
+    async def _fetch_jobs(
+        self,
+        entries: List[Tuple[str, str]],
+        consumer_name: str,
+    ) -> List[Tuple[str, Job]]:
+        if not entries:
+            return []
+        
+        state = self._running_state(consumer_name, datetime.utcnow())
+        
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.execute_command(
+            "MGET",
+            *[f"{self.JOB_PREFIX}{job_id}" for _, job_id in entries],
+            **{NEVER_DECODE: True},
+        )
+        for _, job_id in entries:
+            state_key = f"{self.JOB_PREFIX}{job_id}{self.STATE_SUFFIX}"
+            pipe.hset(state_key, mapping=state)
+            pipe.hgetall(state_key)
+        
+        try:
+            results = await pipe.execute()
+        except RedisError as e:
+            logger.error("dequeue_fetch_error", error=str(e), count=len(entries))
+            return []
+        
+        return self._decode_fetched(entries, results[0], consumer_name, results[2::2])
+    
+    async def acknowledge(self, job: Job, message_id: str, update_state: bool = False):
+        """Acknowledge job completion."""
+        await self.acknowledge_many([(message_id, job)], update_state)
+    
+    async def acknowledge_many(
+        self,
+        entries: List[Tuple[str, Job]],
+        update_state: bool = False,
+    ):
+        """Acknowledge a batch of (message_id, job) pairs in one round-trip.
+        
+        With ``update_state`` each job's mutable fields are written in the
+        same pipeline, so finishing a job costs a single round-trip.
+        """
+        if not entries:
+            return
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for message_id, job in entries:
+            if update_state:
+                pipe.hset(
+                    f"{self.JOB_PREFIX}{job.id}{self.STATE_SUFFIX}",
+                    mapping=self._codec.encode_state(job),
+                )
+            pipe.xack(self._stream_key(job), self.CONSUMER_GROUP, message_id)
+        await pipe.execute()
+        logger.debug("jobs_acknowledged", count=len(entries))
+    
+    async def release(self, entries: List[Tuple[str, Job]]) -> int:
+        """Hand claimed but unstarted jobs back to the queue.
+        
+        Each job is re-added to its stream as pending and the original entry
+        acknowledged, in one round-trip. Attempt and last error are kept.
+        Returns the number of jobs released.
+        """
+        if not entries:
+            return 0
+        
+        now = time.time()
+        state = self._pending_state()
+        pipe = self._redis.pipeline(transaction=False)
+        for message_id, job in entries:
+            stream_key = self._stream_key(job)
+            pipe.hset(f"{self.JOB_PREFIX}{job.id}{self.STATE_SUFFIX}", mapping=state)
+            pipe.xadd(stream_key, {"job_id": job.id, "created_at": now})
+            pipe.xack(stream_key, self.CONSUMER_GROUP, message_id)
+        await pipe.execute()
+        return len(entries)
+    
+    async def get_job(self, job_id: str, validate: bool = True) -> Optional[Job]:
+        """Retrieve job by ID, including its current mutable state."""
+        return (await self.get_jobs([job_id], validate=validate))[0]
+    
+    async def get_jobs(self, job_ids: List[str], validate: bool = True) -> List[Optional[Job]]:
+        """Retrieve several jobs in one pipelined round-trip, in order."""
+        if not job_ids:
+            return []
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for job_id in job_ids:
+            job_key = f"{self.JOB_PREFIX}{job_id}"
+            pipe.execute_command("GET", job_key, **{NEVER_DECODE: True})
+            pipe.hgetall(f"{job_key}{self.STATE_SUFFIX}")
+        results = await pipe.execute()
+        
+        jobs = []
+        for job_data, state in zip(results[0::2], results[1::2]):
+            if not job_data:
+                jobs.append(None)
+                continue
+            job = self._codec.decode(job_data, validate=validate)
+            if state:
+                self._codec.apply_state(job, state)
+            jobs.append(job)
+        return jobs
+    
+    async def update_job(self, job: Job, fields: Optional[List[str]] = None):
+        """Persist a job's mutable fields."""
+        await self._redis.hset(
+            f"{self.JOB_PREFIX}{job.id}{self.STATE_SUFFIX}",
+            mapping=self._codec.encode_state(job, fields),
+        )
+    
+    async def schedule_retry(self, job: Job, delay_ms: int) -> float:
+        """Schedule a retry in the schedule shared with ``RedisRetryScheduler``."""
+        retry_time = time.time() + (delay_ms / 1000)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hset(
+            f"{self.JOB_PREFIX}{job.id}{self.STATE_SUFFIX}",
+            mapping=self._codec.encode_state(job, ["status", "attempt", "last_error"]),
+        )
+        pipe.hset(RedisRetryScheduler.STREAMS_KEY, job.id, self._stream_key(job))
+        pipe.zadd(RedisRetryScheduler.SCHEDULE_KEY, {job.id: retry_time})
+        await pipe.execute()
+        return retry_time
+    
+    async def promote_due(
+        self,
+        schedule_key: str,
+        streams_key: str,
+        batch_size: int = 1000,
+    ) -> int:
+        """Move every due job of a schedule sorted set into its priority stream."""
+        promoted = 0
+        while True:
+            now = time.time()
+            removed, appended = await self._promote_script(
+                keys=[schedule_key, streams_key],
+                args=[now, batch_size, self.JOB_PREFIX, self.STATE_SUFFIX, now],
+            )
+            promoted += appended
+            if removed < batch_size:
+                break
+        if promoted:
+            logger.info("jobs_promoted", schedule=schedule_key, count=promoted)
+        return promoted
+    
+    async def get_queue_depth(self) -> Dict[Priority, int]:
+        """Get queue depth per priority level in one round-trip."""
+        pipe = self._redis.pipeline(transaction=False)
+        for p in Priority:
+            pipe.xlen(f"{self.STREAM_PREFIX}{p.name.lower()}")
+        try:
+            lengths = await pipe.execute()
+        except RedisError:
+            return {p: 0 for p in Priority}
+        return dict(zip(Priority, lengths))
+    
+    async def size(self) -> int:
+        """Get total queue size across all priorities."""
+        return sum((await self.get_queue_depth()).values())
+
+
+class RedisDelayedJobScheduler:
+    """Delayed job scheduler shared by all nodes through a Redis sorted set.
+    
+    Drop-in replacement for ``DelayedJobScheduler``. Scheduled jobs are
+    scored by run time in ``SCHEDULE_KEY`` and their bodies are stored like
+    enqueued jobs, so they survive restarts and any node can release them.
+    Unique keys share ``RedisStreamsQueue.UNIQUE_PREFIX`` and stay held while
+    the job moves on to the queue; they are released on cancel.
+    """
+    
+    SCHEDULE_KEY = "taskqueue:delayed"
+    STREAMS_KEY = "taskqueue:delayed:streams"
+    
+    def __init__(self, queue: RedisStreamsQueue):
+        self._queue = queue
+        self._redis = queue._redis
+        self._codec = queue._codec
+        self._schedule_script = self._redis.register_script(SCHEDULE_SCRIPT)
+    
+    def _schedule_args(self, job: Job, delay_ms: int) -> Tuple[List[str], List[Any]]:
+        run_at = time.time() + (delay_ms / 1000)
+        if job.scheduled_at:
+            run_at = job.scheduled_at.timestamp()
+        elif job.delay_ms > 0:
+            run_at = time.time() + (job.delay_ms / 1000)
+        
+        job_key = f"{RedisStreamsQueue.JOB_PREFIX}{job.id}"
+        keys = [
+            job_key,
+            f"{job_key}{RedisStreamsQueue.STATE_SUFFIX}",
+            self.SCHEDULE_KEY,
+            self.STREAMS_KEY,
+        ]
+        if job.unique_key:
+            keys.append(f"{RedisStreamsQueue.UNIQUE_PREFIX}{job.unique_key}")
+        args = [job.id, self._codec.encode(job), run_at, self._queue._stream_key(job)]
+        return keys, args
+    
+    def schedule(self, job: Job, delay_ms: int = 0) -> bool:
+        """Schedule a job for delayed execution."""
+        keys, args = self._schedule_args(job, delay_ms)
+        if not self._schedule_script(keys=keys, args=args):
+            return False
+        job.status = JobStatus.SCHEDULED
+        return True
+    
+    def schedule_many(self, jobs: List[Job], delay_ms: int = 0) -> List[bool]:
+        """Schedule a batch of jobs in a single pipelined round-trip."""
+        if not jobs:
+            return []
+        
+        pipe = self._redis.pipeline(transaction=False)
+        for job in jobs:
+            keys, args = self._schedule_args(job, delay_ms)
+            self._schedule_script(keys=keys, args=args, client=pipe)
+        results = [bool(ok) for ok in pipe.execute()]
+        
+        for job, ok in zip(jobs, results):
+            if ok:
+                job.status = JobStatus.SCHEDULED
+        return results
+    
+    def get_due_jobs(self, max_jobs: Optional[int] = None) -> List[Job]:
+        """Claim due jobs for this node, at most ``max_jobs`` at a time."""
+        job_ids = self._queue.pop_due(self.SCHEDULE_KEY, self.STREAMS_KEY, max_jobs or 1000)
+        return [job for job in self._queue.get_jobs(job_ids, validate=False) if job]
+    
+    def promote_due(self, batch_size: int = 1000) -> int:
+        """Move every due job straight into its priority stream."""
+        return self._queue.promote_due(self.SCHEDULE_KEY, self.STREAMS_KEY, batch_size)
+    
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a scheduled job."""
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.zrem(self.SCHEDULE_KEY, job_id)
+        pipe.hdel(self.STREAMS_KEY, job_id)
+        removed, _ = pipe.execute()
+        if not removed:
+            return None
+        
+        job = self._queue.get_job(job_id, validate=False)
+        if job and job.unique_key:
+            self._queue.release_unique(job.unique_key, job.id)
+        return job
+    
+    def reschedule(self, job_id: str, new_delay_ms: int) -> bool:
+        """Reschedule a job with a new delay."""
+        run_at = time.time() + (new_delay_ms / 1000)
+        return bool(self._redis.zadd(self.SCHEDULE_KEY, {job_id: run_at}, xx=True, ch=True))
+    
+    def get_scheduled_count(self) -> int:
+        return self._redis.zcard(self.SCHEDULE_KEY)
+    
+    def get_next_due_time(self) -> Optional[float]:
+        first = self._redis.zrange(self.SCHEDULE_KEY, 0, 0, withscores=True)
+        if first:
+            return first[0][1]
+        return None
+    
+    def is_unique_key_used(self, key: str) -> bool:
+        return self._redis.exists(f"{RedisStreamsQueue.UNIQUE_PREFIX}{key}") > 0
+
+
+class RedisRetryScheduler:
+    """Retry scheduler shared by all nodes through a Redis sorted set.
+    
+    Drop-in replacement for ``RetryScheduler``. The job's attempt and last
+    error are written to its state hash when the retry is scheduled, so
+    ``promote_due`` can requeue it from any node.
+    """
+    
+    SCHEDULE_KEY = "taskqueue:retries"
+    STREAMS_KEY = "taskqueue:retries:streams"
+    
+    def __init__(self, retry_manager: RetryManager, queue: RedisStreamsQueue):
+        self._retry_manager = retry_manager
+        self._queue = queue
+        self._redis = queue._redis
+        self._codec = queue._codec
+    
+    def schedule_retry(self, job: Job, delay_ms: int) -> float:
+        """Schedule a retry and return the scheduled timestamp."""
+        retry_time = time.time() + (delay_ms / 1000)
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.hset(
+            f"{RedisStreamsQueue.JOB_PREFIX}{job.id}{RedisStreamsQueue.STATE_SUFFIX}",
+            mapping=self._codec.encode_state(job, ["status", "attempt", "last_error"]),
+        )
+        pipe.hset(self.STREAMS_KEY, job.id, self._queue._stream_key(job))
+        pipe.zadd(self.SCHEDULE_KEY, {job.id: retry_time})
+        pipe.execute()
+        return retry_time
+    
+    def get_due_retries(self) -> List[str]:
+        """Get job IDs with retries that are due."""
+        return self._redis.zrangebyscore(self.SCHEDULE_KEY, "-inf", time.time())
+    
+    def pop_retry(self, job_id: str) -> Optional[float]:
+        """Remove and return scheduled retry time for job.
+        
+        Returns None if the retry is not scheduled or another node popped it
+        first.
+        """
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zscore(self.SCHEDULE_KEY, job_id)
+        pipe.zrem(self.SCHEDULE_KEY, job_id)
+        pipe.hdel(self.STREAMS_KEY, job_id)
+        retry_time, removed, _ = pipe.execute()
+        return retry_time if removed else None
+    
+    def promote_due(self, batch_size: int = 1000) -> int:
+        """Move every due retry straight back into its priority stream."""
+        return self._queue.promote_due(self.SCHEDULE_KEY, self.STREAMS_KEY, batch_size)
+    
+    def cancel_retry(self, job_id: str) -> bool:
+        """Cancel a scheduled retry."""
+        return self.pop_retry(job_id) is not None
+    
+    def get_pending_retry_count(self) -> int:
+        """Get count of pending retries."""
+        return self._redis.zcard(self.SCHEDULE_KEY)
+
+
+class RedisUniquenessConstraint(UniquenessConstraint):
+    """Cluster-wide job uniqueness constraints stored in Redis.
+    
+    Keys live under ``RedisStreamsQueue.UNIQUE_PREFIX``, the same keys
+    checked by ``RedisStreamsQueue.enqueue_atomic``.
+    """
+    
+    def __init__(self, redis_client: Optional[Redis] = None):
+        self._redis = redis_client or RedisConnection.get_connection()
+    
+    def _key(self, key: str) -> str:
+        return f"{RedisStreamsQueue.UNIQUE_PREFIX}{key}"
+    
+    def acquire(self, key: str, job_id: str) -> bool:
+        """Try to acquire a uniqueness constraint."""
+        return bool(self._redis.set(self._key(key), job_id, nx=True))
+    
+    def release(self, key: str) -> bool:
+        """Release a uniqueness constraint."""
+        return self._redis.delete(self._key(key)) > 0
+    
+    def is_held(self, key: str) -> bool:
+        """Check if a uniqueness constraint is held."""
+        return self._redis.exists(self._key(key)) > 0
+    
+    def get_holder(self, key: str) -> Optional[str]:
+        """Get the job ID holding a uniqueness constraint."""
+        return self._redis.get(self._key(key))
 
 
 class RedisDistributedLock:
@@ -389,3 +1926,88 @@ class RedisLeaderElection:
     def get_current_leader(self) -> Optional[str]:
         """Get current leader ID."""
         return self._lock.get_owner(self.LEADER_KEY)
+
+
+class PendingReclaimer:
+    """Leader-run loop that recovers jobs stuck in crashed workers' pending lists.
+    
+    Only the current leader does any work, and each pass first renews its
+    lease, so a node whose lease expired skips the pass. A pass recovers
+    every pending entry of workers the registry reports as stale, requeues
+    entries idle for longer than ``min_idle_ms`` (except jobs a live worker
+    is still running) and trims acknowledged entries from the streams. Workers are expected to consume under their
+    ``WorkerInfo.id``.
+    """
+    
+    def __init__(
+        self,
+        queue: RedisStreamsQueue,
+        election: RedisLeaderElection,
+        registry=None,
+        metrics=None,
+        min_idle_ms: int = 60000,
+        batch_size: int = 100,
+        consumer_name: str = "taskqueue_reclaimer",
+    ):
+        self._queue = queue
+        self._election = election
+        self._registry = registry
+        self._metrics = metrics
+        self._min_idle_ms = min_idle_ms
+        self._batch_size = batch_size
+        self._consumer_name = consumer_name
+        self._stop = threading.Event()
+    
+    def run_once(self) -> Dict[str, int]:
+        """Run one reclaim pass. Returns total recovered, reclaimed and trimmed counts."""
+        totals = {"recovered": 0, "reclaimed": 0, "trimmed": 0}
+        # Check the lease itself rather than the cached flag: a lease that
+        # expired since the last pass may already belong to another node.
+        if not (self._election.renew_leadership() or self._election.try_become_leader()):
+            return totals
+        
+        if self._registry is not None:
+            for worker in self._registry.get_stale_workers():
+                recovered = self._queue.recover_consumer(
+                    worker.info.id, self._consumer_name, self._batch_size,
+                )
+                self._record_reclaimed(recovered)
+                totals["recovered"] += sum(recovered.values())
+                self._registry.unregister(worker.info.id)
+        
+        # Without a registry every consumer running a job counts as live.
+        live = None
+        if self._registry is not None:
+            live = [worker.info.id for worker in self._registry.get_active_workers()]
+        reclaimed = self._queue.reclaim_idle(
+            self._consumer_name, self._min_idle_ms, self._batch_size, live,
+        )
+        self._record_reclaimed(reclaimed)
+        totals["reclaimed"] = sum(reclaimed.values())
+        
+        trimmed = self._queue.trim_acknowledged()
+        if self._metrics is not None:
+            for priority, count in trimmed.items():
+                self._metrics.record_stream_trimmed(count, priority)
+        totals["trimmed"] = sum(trimmed.values())
+        
+        self._election.renew_leadership()
+        return totals
+    
+    def _record_reclaimed(self, counts: Dict[Priority, int]):
+        if self._metrics is not None:
+            for priority, count in counts.items():
+                self._metrics.record_jobs_reclaimed(count, priority)
+    
+    def run(self, interval_seconds: float = 10.0):
+        """Run reclaim passes until ``stop`` is called."""
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except RedisError as e:
+                logger.error("reclaimer_error", error=str(e))
+            self._stop.wait(interval_seconds)
+    
+    def stop(self):
+        """Stop the reclaim loop."""
+        self._stop.set()
@@ -5,9 +5,10 @@ import random
 import time
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from .models import Job, JobStatus, RetryConfig, RetryStrategy
+from .job_store import JobStore
+from .models import Job, JobStatus, Priority, RetryConfig, RetryStrategy
 
 
 class RetryStrategyHandler(ABC):
@@ -107,7 +108,11 @@ class RetryDecision:
 
 
 class RetryManager:
-    """Manages job retry logic and dead-letter queue routing."""
+    """Manages job retry logic and dead-letter queue routing.
+    
+    Dead-lettered jobs are kept in a ``JobStore`` without eviction, so the
+    DLQ can be paged and filtered like the main job listing.
+    """
     
     def __init__(
         self,
@@ -118,7 +123,7 @@ class RetryManager:
         self._on_retry = on_retry
         self._on_dlq = on_dlq
         self._on_failure = on_failure
-        self._dlq: List[Job] = []
+        self._dlq = JobStore(max_terminal_jobs=None)
     
     def evaluate(self, job: Job, error: str) -> RetryDecision:
         """Evaluate if job should be retried based on its configuration."""
@@ -158,7 +163,7 @@ class RetryManager:
         
         elif decision.send_to_dlq:
             job.status = JobStatus.DEAD
-            self._dlq.append(job)
+            self._dlq.add(job)
             
             if self._on_dlq:
                 self._on_dlq(job, decision.reason)
@@ -170,7 +175,25 @@ class RetryManager:
     
     def get_dlq(self) -> List[Job]:
         """Get all jobs in the dead-letter queue."""
-        return self._dlq.copy()
+        return self._dlq.jobs()
+    
+    def list_dlq(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        name: Optional[str] = None,
+        priority: Optional[Priority] = None,
+    ) -> Tuple[List[Job], Optional[str]]:
+        """Page through the dead-letter queue, most recently dead-lettered first."""
+        return self._dlq.page(priority=priority, name=name, limit=limit, cursor=cursor)
+    
+    def iter_dlq(
+        self,
+        name: Optional[str] = None,
+        priority: Optional[Priority] = None,
+    ) -> Iterator[Job]:
+        """Yield every dead-lettered job, most recent first, in bounded batches."""
+        return self._dlq.iter_jobs(priority=priority, name=name)
     
     def get_dlq_size(self) -> int:
         """Get count of jobs in dead-letter queue."""
@@ -178,10 +201,7 @@ class RetryManager:
     
     def remove_from_dlq(self, job_id: str) -> Optional[Job]:
         """Remove and return a job from the dead-letter queue."""
-        for i, job in enumerate(self._dlq):
-            if job.id == job_id:
-                return self._dlq.pop(i)
-        return None
+        return self._dlq.remove(job_id)
     
     def requeue_from_dlq(self, job_id: str, reset_attempts: bool = True) -> Optional[Job]:
         """Remove job from DLQ and prepare for requeue."""
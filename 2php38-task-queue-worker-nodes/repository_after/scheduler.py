@@ -3,11 +3,13 @@ from __future__ import annotations
 
 import hashlib
 import heapq
+import itertools
 import threading
 import time
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from typing import Callable, Dict, List, Optional, Set
+from bisect import bisect_left
+from calendar import monthrange, weekday
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
 from .models import Job, JobStatus
@@ -16,9 +18,17 @@ from .models import Job, JobStatus
 class CronExpression:
     """Parser for cron-like expressions."""
     
+    # Long enough for day-of-month + weekday combinations such as Feb 29 on
+    # a Monday, which only recur on a 28-year cycle.
+    MAX_SEARCH_YEARS = 28
+    
     def __init__(self, expression: str):
         self.expression = expression
         self._parts = self._parse(expression)
+        self._minutes = tuple(sorted(self._parts["minute"]))
+        self._hours = tuple(sorted(self._parts["hour"]))
+        self._days = tuple(sorted(self._parts["day"]))
+        self._months = tuple(sorted(self._parts["month"]))
     
     def _parse(self, expr: str) -> Dict[str, Set[int]]:
         parts = expr.strip().split()
@@ -66,33 +76,95 @@ class CronExpression:
         )
     
     def next_run(self, after: datetime) -> datetime:
-        """Calculate next run time after the given datetime."""
+        """Calculate next run time after the given datetime.
+        
+        Timezone-aware datetimes are matched on local wall-clock time. A
+        run that falls into a DST gap fires at the equivalent time after the
+        transition, and a repeated hour fires only once.
+        """
+        tz = after.tzinfo
+        if tz is None:
+            return self._next_wall_time(after)
+        
+        after_ts = after.timestamp()
+        wall = after.replace(tzinfo=None)
+        while True:
+            wall = self._next_wall_time(wall)
+            candidate = wall.replace(tzinfo=tz).astimezone(timezone.utc).astimezone(tz)
+            if candidate.timestamp() > after_ts:
+                return candidate
+    
+    def _next_wall_time(self, after: datetime) -> datetime:
+        """Jump field by field (month, day, hour, minute) to the next match."""
+        months, hours, minutes = self._months, self._hours, self._minutes
         dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        year, month, day, hour, minute = dt.year, dt.month, dt.day, dt.hour, dt.minute
+        last_year = year + self.MAX_SEARCH_YEARS
         
-        for _ in range(366 * 24 * 60):
-            if self.matches(dt):
-                return dt
-            dt += timedelta(minutes=1)
+        while year <= last_year:
+            i = bisect_left(months, month)
+            if i == len(months):
+                year, month, day, hour, minute = year + 1, 1, 1, 0, 0
+                continue
+            if months[i] != month:
+                month, day, hour, minute = months[i], 1, 0, 0
+            
+            d = self._next_day(year, month, day)
+            if d is None:
+                month, day, hour, minute = month + 1, 1, 0, 0
+                if month > 12:
+                    year, month = year + 1, 1
+                continue
+            if d != day:
+                day, hour, minute = d, 0, 0
+            
+            i = bisect_left(hours, hour)
+            if i == len(hours):
+                day, hour, minute = day + 1, 0, 0
+                continue
+            if hours[i] != hour:
+                hour, minute = hours[i], 0
+            
+            i = bisect_left(minutes, minute)
+            if i == len(minutes):
+                hour, minute = hour + 1, 0
+                continue
+            return datetime(year, month, day, hour, minutes[i])
         
-        raise ValueError("Could not find next run time within a year")
-
-
-@dataclass(order=True)
-class ScheduledItem:
-    """Item in the scheduler's priority queue."""
-    run_at: float
-    job_id: str = field(compare=False)
-    is_recurring: bool = field(compare=False, default=False)
+        raise ValueError(f"Could not find next run time within {self.MAX_SEARCH_YEARS} years")
+    
+    def _next_day(self, year: int, month: int, day: int) -> Optional[int]:
+        """First matching day of the month on or after ``day``, if any."""
+        days_in_month = monthrange(year, month)[1]
+        weekdays = self._parts["weekday"]
+        any_weekday = len(weekdays) == 7
+        for d in self._days[bisect_left(self._days, day):]:
+            if d > days_in_month:
+                return None
+            if any_weekday or weekday(year, month, d) in weekdays:
+                return d
+        return None
 
 
 class DelayedJobScheduler:
-    """Scheduler for delayed job execution with millisecond precision."""
+    """Scheduler for delayed job execution with millisecond precision.
+    
+    Uses a lazy-deletion heap: cancel and reschedule only update the job's
+    current generation in ``_entries``, leaving the old heap entry behind as
+    a tombstone that is skipped when it reaches the top. The heap is
+    compacted once tombstones outnumber live entries.
+    """
+    
+    COMPACT_MIN_TOMBSTONES = 1024
     
     def __init__(self):
-        self._heap: List[ScheduledItem] = []
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, int] = {}
         self._jobs: Dict[str, Job] = {}
         self._lock = threading.RLock()
         self._unique_keys: Dict[str, str] = {}
+        self._seq = itertools.count()
+        self._tombstones = 0
     
     def schedule(self, job: Job, delay_ms: int = 0) -> bool:
         """Schedule a job for delayed execution."""
@@ -109,25 +181,33 @@ class DelayedJobScheduler:
             elif job.delay_ms > 0:
                 run_at = time.time() + (job.delay_ms / 1000)
             
-            item = ScheduledItem(run_at=run_at, job_id=job.id)
-            heapq.heappush(self._heap, item)
+            if job.id in self._entries:
+                self._tombstones += 1
+            self._push(job.id, run_at)
             self._jobs[job.id] = job
             job.status = JobStatus.SCHEDULED
             return True
     
-    def get_due_jobs(self) -> List[Job]:
-        """Get all jobs that are due for execution."""
+    def get_due_jobs(self, max_jobs: Optional[int] = None) -> List[Job]:
+        """Get jobs that are due for execution, at most ``max_jobs`` at a time."""
         now = time.time()
         due = []
         
         with self._lock:
-            while self._heap and self._heap[0].run_at <= now:
-                item = heapq.heappop(self._heap)
-                job = self._jobs.pop(item.job_id, None)
-                if job:
-                    if job.unique_key and job.unique_key in self._unique_keys:
-                        del self._unique_keys[job.unique_key]
-                    due.append(job)
+            heap = self._heap
+            entries = self._entries
+            while heap and heap[0][0] <= now:
+                if max_jobs is not None and len(due) >= max_jobs:
+                    break
+                _, seq, job_id = heapq.heappop(heap)
+                if entries.get(job_id) != seq:
+                    self._tombstones -= 1
+                    continue
+                del entries[job_id]
+                job = self._jobs.pop(job_id)
+                if job.unique_key and job.unique_key in self._unique_keys:
+                    del self._unique_keys[job.unique_key]
+                due.append(job)
         
         return due
     
@@ -138,23 +218,20 @@ class DelayedJobScheduler:
             if job:
                 if job.unique_key and job.unique_key in self._unique_keys:
                     del self._unique_keys[job.unique_key]
-                self._heap = [item for item in self._heap if item.job_id != job_id]
-                heapq.heapify(self._heap)
+                del self._entries[job_id]
+                self._tombstones += 1
+                self._maybe_compact()
             return job
     
     def reschedule(self, job_id: str, new_delay_ms: int) -> bool:
         """Reschedule a job with a new delay."""
         with self._lock:
-            job = self._jobs.get(job_id)
-            if not job:
+            if job_id not in self._jobs:
                 return False
             
-            self._heap = [item for item in self._heap if item.job_id != job_id]
-            heapq.heapify(self._heap)
-            
-            run_at = time.time() + (new_delay_ms / 1000)
-            item = ScheduledItem(run_at=run_at, job_id=job_id)
-            heapq.heappush(self._heap, item)
+            self._tombstones += 1
+            self._push(job_id, time.time() + (new_delay_ms / 1000))
+            self._maybe_compact()
             return True
     
     def get_scheduled_count(self) -> int:
@@ -163,23 +240,51 @@ class DelayedJobScheduler:
     
     def get_next_due_time(self) -> Optional[float]:
         with self._lock:
-            if self._heap:
-                return self._heap[0].run_at
+            heap = self._heap
+            while heap and self._entries.get(heap[0][2]) != heap[0][1]:
+                heapq.heappop(heap)
+                self._tombstones -= 1
+            if heap:
+                return heap[0][0]
             return None
     
     def is_unique_key_used(self, key: str) -> bool:
         with self._lock:
             return key in self._unique_keys
+    
+    def _push(self, job_id: str, run_at: float):
+        seq = next(self._seq)
+        self._entries[job_id] = seq
+        heapq.heappush(self._heap, (run_at, seq, job_id))
+    
+    def _maybe_compact(self):
+        """Drop tombstones once they make up more than half of the heap."""
+        if self._tombstones < self.COMPACT_MIN_TOMBSTONES:
+            return
+        if self._tombstones * 2 <= len(self._heap):
+            return
+        entries = self._entries
+        self._heap = [item for item in self._heap if entries.get(item[2]) == item[1]]
+        heapq.heapify(self._heap)
+        self._tombstones = 0
 
 
 class RecurringJobScheduler:
-    """Scheduler for cron-like recurring jobs."""
+    """Scheduler for cron-like recurring jobs.
+    
+    Next runs are kept in a heap of UTC timestamps so polling only touches
+    jobs that are due. Unregistering leaves a stale heap entry behind, which
+    is skipped by generation like in ``DelayedJobScheduler``.
+    """
     
     def __init__(self):
         self._jobs: Dict[str, Job] = {}
         self._cron_expressions: Dict[str, CronExpression] = {}
         self._next_runs: Dict[str, datetime] = {}
         self._timezones: Dict[str, ZoneInfo] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, int] = {}
+        self._seq = itertools.count()
         self._lock = threading.RLock()
     
     def register(self, job: Job) -> bool:
@@ -199,8 +304,8 @@ class RecurringJobScheduler:
             
             self._jobs[job.id] = job
             self._cron_expressions[job.id] = cron
-            self._next_runs[job.id] = next_run
             self._timezones[job.id] = tz
+            self._set_next_run(job.id, next_run)
             return True
     
     def unregister(self, job_id: str) -> Optional[Job]:
@@ -210,23 +315,26 @@ class RecurringJobScheduler:
             self._cron_expressions.pop(job_id, None)
             self._next_runs.pop(job_id, None)
             self._timezones.pop(job_id, None)
+            self._entries.pop(job_id, None)
+            if len(self._heap) > 2 * len(self._entries) + 64:
+                self._compact()
             return job
     
     def get_due_jobs(self) -> List[Job]:
         """Get recurring jobs that are due for execution."""
         due = []
+        now_ts = time.time()
         
         with self._lock:
-            for job_id, next_run in list(self._next_runs.items()):
-                tz = self._timezones.get(job_id, ZoneInfo("UTC"))
-                now = datetime.now(tz)
-                
-                if next_run <= now:
-                    job = self._jobs.get(job_id)
-                    if job:
-                        due.append(job)
-                        cron = self._cron_expressions[job_id]
-                        self._next_runs[job_id] = cron.next_run(now)
+            heap = self._heap
+            while heap and heap[0][0] <= now_ts:
+                _, seq, job_id = heapq.heappop(heap)
+                if self._entries.get(job_id) != seq:
+                    continue
+                due.append(self._jobs[job_id])
+                # Missed runs are skipped rather than replayed.
+                now = datetime.fromtimestamp(now_ts, self._timezones[job_id])
+                self._set_next_run(job_id, self._cron_expressions[job_id].next_run(now))
         
         return due
     
@@ -237,6 +345,17 @@ class RecurringJobScheduler:
     def get_registered_count(self) -> int:
         with self._lock:
             return len(self._jobs)
+    
+    def _set_next_run(self, job_id: str, next_run: datetime):
+        seq = next(self._seq)
+        self._next_runs[job_id] = next_run
+        self._entries[job_id] = seq
+        heapq.heappush(self._heap, (next_run.timestamp(), seq, job_id))
+    
+    def _compact(self):
+        entries = self._entries
+        self._heap = [item for item in self._heap if entries.get(item[2]) == item[1]]
+        heapq.heapify(self._heap)
 
 
 class BulkJobSubmitter:
@@ -5,8 +5,12 @@ import gzip
 import json
 import pickle
 from abc import ABC, abstractmethod
+from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional, Type
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Type
+
+from .models import Job, JobStatus, Priority, RetryConfig
 
 try:
     import msgpack
@@ -152,3 +156,195 @@ class PayloadEncoder:
             if v in migrators:
                 current = migrators[v](current)
         return current
+
+
+class JobCodec:
+    """Compact binary wire format for jobs stored in Redis.
+    
+    Jobs are packed positionally (no field names) into a versioned MessagePack
+    envelope via ``PayloadEncoder``. ``decode`` can either fully validate
+    through Pydantic or, for trusted internal reads, build the model with
+    ``model_construct`` and skip validation. Retry configs are validated once
+    per distinct value and shared, since most jobs use the same few configs.
+    Bodies written in the previous JSON format are still readable.
+    """
+    
+    VERSION = 1
+    MUTABLE_FIELDS = (
+        "status",
+        "attempt",
+        "last_error",
+        "started_at",
+        "completed_at",
+        "worker_id",
+    )
+    
+    def __init__(self, encoder: Optional[PayloadEncoder] = None):
+        self._encoder = encoder or PayloadEncoder(
+            MessagePackSerializer(),
+            default_format=SerializationFormat.MSGPACK,
+        )
+    
+    def encode(self, job: Job) -> bytes:
+        """Encode a job into a compact binary envelope."""
+        retry = job.retry_config
+        row = [
+            job.id,
+            job.name,
+            job.payload,
+            int(job.priority),
+            _enum_value(job.status),
+            _dt_out(job.scheduled_at),
+            job.delay_ms,
+            job.cron_expression,
+            job.timezone,
+            job.depends_on,
+            job.dependent_jobs,
+            [
+                _enum_value(retry.strategy),
+                retry.max_attempts,
+                retry.base_delay_ms,
+                retry.max_delay_ms,
+                retry.jitter,
+                retry.custom_delays_ms,
+            ],
+            job.attempt,
+            job.last_error,
+            job.unique_key,
+            _dt_out(job.created_at),
+            _dt_out(job.started_at),
+            _dt_out(job.completed_at),
+            job.worker_id,
+            job.on_success,
+            job.on_failure,
+        ]
+        return self._encoder.encode(row, version=self.VERSION)
+    
+    def decode(self, data: bytes, validate: bool = True) -> Job:
+        """Decode a job, optionally skipping Pydantic validation."""
+        if data[:1] == b"{":
+            return Job.model_validate_json(data)
+        
+        row, version = self._encoder.decode(data)
+        if version != self.VERSION:
+            raise ValueError(f"Unsupported job envelope version: {version}")
+        
+        (
+            job_id, name, payload, priority, status, scheduled_at, delay_ms,
+            cron_expression, timezone, depends_on, dependent_jobs, retry,
+            attempt, last_error, unique_key, created_at, started_at,
+            completed_at, worker_id, on_success, on_failure,
+        ) = row
+        
+        fields = {
+            "id": job_id,
+            "name": name,
+            "payload": payload,
+            "priority": priority,
+            "status": status,
+            "scheduled_at": _dt_in(scheduled_at),
+            "delay_ms": delay_ms,
+            "cron_expression": cron_expression,
+            "timezone": timezone,
+            "depends_on": depends_on,
+            "dependent_jobs": dependent_jobs,
+            "retry_config": _retry_config(tuple(retry[:5]), _as_tuple(retry[5])),
+            "attempt": attempt,
+            "last_error": last_error,
+            "unique_key": unique_key,
+            "created_at": _dt_in(created_at),
+            "started_at": _dt_in(started_at),
+            "completed_at": _dt_in(completed_at),
+            "worker_id": worker_id,
+            "on_success": on_success,
+            "on_failure": on_failure,
+        }
+        
+        if validate:
+            return Job.model_validate(fields)
+        
+        fields["priority"] = _PRIORITIES[priority]
+        fields["status"] = _STATUSES[status]
+        
+        return Job.model_construct(**fields)
+    
+    def encode_state(
+        self,
+        job: Job,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict[str, str]:
+        """Encode a job's mutable fields (or just ``fields``) as a flat hash mapping."""
+        state = {
+            "status": lambda: _enum_value(job.status),
+            "attempt": lambda: str(job.attempt),
+            "last_error": lambda: job.last_error or "",
+            "started_at": lambda: _dt_out(job.started_at) or "",
+            "completed_at": lambda: _dt_out(job.completed_at) or "",
+            "worker_id": lambda: job.worker_id or "",
+        }
+        names = self.MUTABLE_FIELDS if fields is None else fields
+        for name in names:
+            if name not in state:
+                raise ValueError(f"Not a mutable job field: {name}")
+        return {name: state[name]() for name in names}
+    
+    def apply_state(self, job: Job, state: Dict[str, str]) -> Job:
+        """Overlay mutable fields from a state hash onto a decoded job."""
+        if "status" in state:
+            job.status = JobStatus(state["status"])
+        if "attempt" in state:
+            job.attempt = int(state["attempt"])
+        if "last_error" in state:
+            job.last_error = state["last_error"] or None
+        if "started_at" in state:
+            job.started_at = _dt_in(state["started_at"] or None)
+        if "completed_at" in state:
+            job.completed_at = _dt_in(state["completed_at"] or None)
+        if "worker_id" in state:
+            job.worker_id = state["worker_id"] or None
+        return job
+
+
+_PRIORITIES = {p.value: p for p in Priority}
+_STATUSES = {s.value: s for s in JobStatus}
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _dt_out(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _dt_in(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+def _as_tuple(value: Optional[list]) -> Optional[tuple]:
+    return tuple(value) if value is not None else None
+
+
+def _retry_config(settings: tuple, custom_delays_ms: Optional[tuple]) -> RetryConfig:
+    """Build a retry config, validating each distinct value only once.
+    
+    Every job gets its own copy, so changing one job's config (or its
+    ``custom_delays_ms`` list) never leaks into other decoded jobs.
+    """
+    config = _validated_retry_config(settings, custom_delays_ms)
+    if custom_delays_ms is None:
+        return config.model_copy()
+    return config.model_copy(update={"custom_delays_ms": list(custom_delays_ms)})
+
+
+@lru_cache(maxsize=256)
+def _validated_retry_config(settings: tuple, custom_delays_ms: Optional[tuple]) -> RetryConfig:
+    strategy, max_attempts, base_delay_ms, max_delay_ms, jitter = settings
+    return RetryConfig(
+        strategy=strategy,
+        max_attempts=max_attempts,
+        base_delay_ms=base_delay_ms,
+        max_delay_ms=max_delay_ms,
+        jitter=jitter,
+        custom_delays_ms=list(custom_delays_ms) if custom_delays_ms is not None else None,
+    )
@@ -0,0 +1,176 @@
+"""Sliding-window throughput and latency statistics over a ring buffer."""
+from __future__ import annotations
+
+import itertools
+import math
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Dict, List, Optional, Tuple
+
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class WindowStats:
+    """Completions, throughput and latency percentiles for one series.
+    
+    Percentiles are computed from the samples on first access, so callers
+    that only read counts and throughput never sort.
+    """
+    count: int = 0
+    throughput_per_second: float = 0.0
+    avg_run_seconds: float = 0.0
+    _runs: List[float] = field(default_factory=list, repr=False, compare=False)
+    _waits: List[float] = field(default_factory=list, repr=False, compare=False)
+    
+    @cached_property
+    def run_seconds(self) -> Dict[int, float]:
+        return _percentiles(sorted(self._runs))
+    
+    @cached_property
+    def wait_seconds(self) -> Dict[int, float]:
+        return _percentiles(sorted(self._waits))
+
+
+@dataclass
+class WindowSnapshot:
+    """Statistics over the window, overall and per priority and job name."""
+    window_seconds: float
+    overall: WindowStats
+    by_priority: Dict[str, WindowStats]
+    by_job_name: Dict[str, WindowStats]
+
+
+def _percentiles(values: List[float]) -> Dict[int, float]:
+    """Nearest-rank percentiles of ``values``, which must be sorted."""
+    if not values:
+        return {}
+    n = len(values)
+    return {p: values[max(0, math.ceil(p / 100 * n) - 1)] for p in PERCENTILES}
+
+
+def _series(runs: List[float], waits: List[float], span: float) -> WindowStats:
+    return WindowStats(
+        count=len(runs),
+        throughput_per_second=len(runs) / span,
+        avg_run_seconds=sum(runs) / len(runs),
+        _runs=runs,
+        _waits=waits,
+    )
+
+
+class SlidingWindowStats:
+    """Job completions over the last ``window_seconds``, kept in a ring buffer.
+    
+    ``record`` writes one completion into the next slot of fixed-size
+    per-field lists and never takes a lock: slots are handed out by an
+    ``itertools.count``, whose ``next`` is atomic under the GIL, so
+    concurrent writers never share a slot. Each slot also keeps the
+    sequence number it was written under, and all aggregation happens in
+    ``snapshot``: it walks back from the newest slot and stops at the first
+    finished one older than the window, so recording stays O(1) and a
+    snapshot costs O(completions in the window), however large the ring.
+    
+    Once more than ``capacity`` completions fall inside the window the
+    oldest are overwritten, and the snapshot covers the span still held.
+    A snapshot taken while writers are active may miss slots being written.
+    """
+    
+    __slots__ = (
+        "_window", "_mask", "_slots", "_clock", "_started", "_head",
+        "_seqs", "_times", "_priorities", "_names", "_runs", "_waits",
+    )
+    
+    def __init__(self, window_seconds: float = 60.0, capacity: int = 65536):
+        if capacity & (capacity - 1) or capacity <= 0:
+            raise ValueError("capacity must be a power of two")
+        self._window = window_seconds
+        self._mask = capacity - 1
+        self._slots = itertools.count()
+        self._clock = time.monotonic
+        self._started = self._clock()
+        self._head = -1
+        self._seqs: List[int] = [-1] * capacity
+        self._times: List[float] = [-math.inf] * capacity
+        self._priorities: List[Optional[str]] = [None] * capacity
+        self._names: List[Optional[str]] = [None] * capacity
+        self._runs: List[float] = [0.0] * capacity
+        self._waits: List[Optional[float]] = [None] * capacity
+    
+    def record(
+        self,
+        priority: str,
+        job_name: str,
+        run_seconds: float,
+        wait_seconds: Optional[float] = None,
+    ):
+        """Record one completed job."""
+        n = next(self._slots)
+        i = n & self._mask
+        self._priorities[i] = priority
+        self._names[i] = job_name
+        self._runs[i] = run_seconds
+        self._waits[i] = wait_seconds
+        self._times[i] = self._clock()
+        # Written last, so a slot only enters the window once it is filled.
+        self._seqs[i] = n
+        self._head = n
+    
+    def snapshot(self) -> WindowSnapshot:
+        """Aggregate the completions currently inside the window."""
+        now = self._clock()
+        start = now - self._window
+        mask, seqs, times = self._mask, self._seqs, self._times
+        priorities, names, runs, waits = self._priorities, self._names, self._runs, self._waits
+        
+        # Concurrent writers can publish the head out of order; catch up
+        # with slots finished after it.
+        head = self._head
+        while seqs[(head + 1) & mask] == head + 1:
+            head += 1
+        
+        oldest = now
+        all_runs: List[float] = []
+        all_waits: List[float] = []
+        by_priority: Dict[str, Tuple[List[float], List[float]]] = defaultdict(lambda: ([], []))
+        by_name: Dict[str, Tuple[List[float], List[float]]] = defaultdict(lambda: ([], []))
+        for n in range(head, max(head - mask - 1, -1), -1):
+            i = n & mask
+            if seqs[i] != n:
+                # Still being written, or already overwritten by a later lap.
+                continue
+            t = times[i]
+            if t < start:
+                wrapped = False
+                break
+            if t < oldest:
+                oldest = t
+            run, wait = runs[i], waits[i]
+            priority_series = by_priority[priorities[i]]
+            name_series = by_name[names[i]]
+            all_runs.append(run)
+            priority_series[0].append(run)
+            name_series[0].append(run)
+            if wait is not None:
+                all_waits.append(wait)
+                priority_series[1].append(wait)
+                name_series[1].append(wait)
+        else:
+            wrapped = head > mask
+        
+        if wrapped:
+            # The ring wrapped inside the window; only this span is retained.
+            span = now - oldest
+        else:
+            # Right after startup, rate over the time elapsed (at least 1s).
+            span = min(self._window, max(now - self._started, 1.0))
+        span = max(span, 1e-9)
+        
+        return WindowSnapshot(
+            window_seconds=span,
+            overall=_series(all_runs, all_waits, span) if all_runs else WindowStats(),
+            by_priority={p: _series(r, w, span) for p, (r, w) in by_priority.items()},
+            by_job_name={n: _series(r, w, span) for n, (r, w) in by_name.items()},
+        )
@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import asyncio
+import heapq
+import itertools
 import os
 import signal
 import socket
@@ -9,7 +11,7 @@ import threading
 import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Any, Callable, Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 
 from .models import Job, JobResult, JobStatus, WorkerInfo
 
@@ -161,22 +163,34 @@ class WorkerNode:
 
 
 class WorkerRegistry:
-    """Registry of active worker nodes."""
+    """Registry of active worker nodes.
+    
+    Each worker's load (running jobs / capacity) is published when it
+    registers and on every heartbeat, and kept in two lazy-deletion heaps,
+    so the most and least loaded workers are found without scanning the
+    registry.
+    """
     
     def __init__(self, heartbeat_timeout_seconds: float = 30):
         self._workers: Dict[str, WorkerNode] = {}
         self._heartbeat_timeout = heartbeat_timeout_seconds
         self._lock = threading.RLock()
+        self._loads: Dict[str, Tuple[float, int]] = {}
+        self._most_loaded: List[Tuple[float, int, str]] = []
+        self._least_loaded: List[Tuple[float, int, str]] = []
+        self._seq = itertools.count()
     
     def register(self, worker: WorkerNode) -> bool:
         """Register a new worker."""
         with self._lock:
             self._workers[worker.info.id] = worker
+            self._publish_load(worker)
             return True
     
     def unregister(self, worker_id: str) -> Optional[WorkerNode]:
         """Unregister a worker."""
         with self._lock:
+            self._loads.pop(worker_id, None)
             return self._workers.pop(worker_id, None)
     
     def get_worker(self, worker_id: str) -> Optional[WorkerNode]:
@@ -211,52 +225,128 @@ class WorkerRegistry:
                 if w.info.last_heartbeat < cutoff
             ]
     
-    def heartbeat(self, worker_id: str) -> bool:
-        """Update worker heartbeat."""
+    def heartbeat(self, worker_id: str, running_jobs: Optional[int] = None) -> bool:
+        """Update worker heartbeat and publish its load.
+        
+        ``running_jobs`` defaults to the length of the worker's
+        ``current_jobs``; pass it when the worker tracks its own backlog.
+        """
         with self._lock:
             worker = self._workers.get(worker_id)
             if worker:
                 worker.update_heartbeat()
+                self._publish_load(worker, running_jobs)
                 return True
             return False
     
+    def update_load(self, worker_id: str, running_jobs: Optional[int] = None) -> bool:
+        """Republish a worker's load without counting it as a heartbeat."""
+        with self._lock:
+            worker = self._workers.get(worker_id)
+            if worker:
+                self._publish_load(worker, running_jobs)
+                return True
+            return False
+    
+    def get_load(self, worker_id: str) -> Optional[float]:
+        """Get a worker's last published load, as a fraction of its capacity."""
+        with self._lock:
+            entry = self._loads.get(worker_id)
+            return entry[0] if entry else None
+    
+    def get_workers_by_load(
+        self,
+        above: Optional[float] = None,
+        below: Optional[float] = None,
+    ) -> List[WorkerNode]:
+        """Get active workers with load strictly above or below a bound.
+        
+        With ``above`` workers come most loaded first, with ``below`` least
+        loaded first. Only the heap entries up to the bound are visited.
+        """
+        from datetime import datetime, timedelta
+        
+        cutoff = datetime.utcnow() - timedelta(seconds=self._heartbeat_timeout)
+        
+        def in_range(load: float) -> bool:
+            if above is not None:
+                return load > above
+            return below is None or load < below
+        
+        with self._lock:
+            heap = self._most_loaded if above is not None else self._least_loaded
+            entries = self._ordered(heap)
+            
+            workers = []
+            for load, worker_id in entries:
+                if not in_range(load):
+                    break
+                worker = self._workers[worker_id]
+                if worker.info.last_heartbeat >= cutoff:
+                    workers.append(worker)
+            return workers
+    
+    def _publish_load(self, worker: WorkerNode, running_jobs: Optional[int] = None):
+        if running_jobs is None:
+            running_jobs = len(worker.info.current_jobs)
+        capacity = worker.info.max_concurrent_jobs
+        load = running_jobs / capacity if capacity > 0 else 1.0
+        
+        worker_id = worker.info.id
+        previous = self._loads.get(worker_id)
+        if previous is not None and previous[0] == load:
+            return
+        seq = next(self._seq)
+        self._loads[worker_id] = (load, seq)
+        heapq.heappush(self._most_loaded, (-load, seq, worker_id))
+        heapq.heappush(self._least_loaded, (load, seq, worker_id))
+        
+        if len(self._most_loaded) > 2 * len(self._loads) + 64:
+            self._most_loaded = [(-l, q, w) for w, (l, q) in self._loads.items()]
+            self._least_loaded = [(l, q, w) for w, (l, q) in self._loads.items()]
+            heapq.heapify(self._most_loaded)
+            heapq.heapify(self._least_loaded)
+    
+    def _ordered(self, heap: List[Tuple[float, int, str]]) -> Iterator[Tuple[float, str]]:
+        """Yield live (load, worker_id) entries of a heap in order, without popping."""
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier:
+            (key, seq, worker_id), i = heapq.heappop(frontier)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+            load = abs(key)
+            if self._loads.get(worker_id) == (load, seq):
+                yield load, worker_id
+    
     def get_worker_count(self) -> int:
         with self._lock:
             return len(self._workers)
 
 
 class WorkStealing:
-    """Work stealing for load balancing across workers."""
+    """Work stealing for load balancing across workers.
     
-    def __init__(self, registry: WorkerRegistry, threshold: float = 0.3):
+    Donors and receivers are picked from the registry's load heaps. With a
+    ``queue`` (a ``RedisStreamsQueue``) stolen jobs are claimed out of the
+    donor's pending entries list with XCLAIM, so the receiving consumer is
+    the one that actually runs them: ``steal_for`` returns them to the idle
+    worker asking, while ``steal_jobs`` hands them over to the receiver's
+    next claim. Without a queue only the registry's bookkeeping is moved.
+    """
+    
+    def __init__(self, registry: WorkerRegistry, threshold: float = 0.3, queue: Any = None):
         self._registry = registry
         self._threshold = threshold
+        self._queue = queue
     
     def find_overloaded_workers(self) -> List[WorkerNode]:
-        """Find workers with high load."""
-        workers = self._registry.get_active_workers()
-        overloaded = []
-        
-        for worker in workers:
-            capacity = worker.info.max_concurrent_jobs
-            current = len(worker.info.current_jobs)
-            if capacity > 0 and (current / capacity) > (1 - self._threshold):
-                overloaded.append(worker)
-        
-        return overloaded
+        """Find workers with high load, most loaded first."""
+        return self._registry.get_workers_by_load(above=1 - self._threshold)
     
     def find_underloaded_workers(self) -> List[WorkerNode]:
-        """Find workers with low load."""
-        workers = self._registry.get_active_workers()
-        underloaded = []
-        
-        for worker in workers:
-            capacity = worker.info.max_concurrent_jobs
-            current = len(worker.info.current_jobs)
-            if capacity > 0 and (current / capacity) < self._threshold:
-                underloaded.append(worker)
-        
-        return underloaded
+        """Find workers with low load, least loaded first."""
+        return self._registry.get_workers_by_load(below=self._threshold)
     
     def get_steal_candidates(self, from_worker: WorkerNode) -> List[Job]:
         """Get jobs that can be stolen from a worker."""
@@ -272,38 +362,62 @@ class WorkStealing:
             from_worker.assign_job(stolen)
         return False
     
+    def steal_for(self, worker_id: str, count: int = 1) -> List[Tuple[str, Job]]:
+        """Claim up to ``count`` waiting jobs for an idle worker from the most loaded one.
+        
+        Returns the stolen (message_id, job) pairs, now pending for
+        ``worker_id``. Requires a ``queue``.
+        """
+        if self._queue is None:
+            return []
+        receiver = self._registry.get_worker(worker_id)
+        for donor in self.find_overloaded_workers():
+            if donor.info.id == worker_id:
+                continue
+            stolen = self._queue.steal(donor.info.id, worker_id, count)
+            if stolen:
+                self._move([job.id for _, job in stolen], donor, receiver)
+                return stolen
+        return []
+    
     def steal_jobs(self, count: int = 1) -> List[str]:
         """Attempt to steal jobs from overloaded workers to underloaded ones."""
-        stolen_job_ids = []
+        stolen_job_ids: List[str] = []
         
         overloaded = self.find_overloaded_workers()
         underloaded = self.find_underloaded_workers()
         
-        if not overloaded or not underloaded:
-            return stolen_job_ids
-        
         for from_worker in overloaded:
-            if len(stolen_job_ids) >= count:
-                break
-            
-            job_ids = list(from_worker.info.current_jobs)
-            for job_id in job_ids:
+            for to_worker in underloaded:
                 if len(stolen_job_ids) >= count:
-                    break
+                    return stolen_job_ids
+                capacity = to_worker.info.max_concurrent_jobs - len(to_worker.info.current_jobs)
+                wanted = min(count - len(stolen_job_ids), capacity)
+                if wanted <= 0:
+                    continue
                 
-                for to_worker in underloaded:
-                    capacity = to_worker.info.max_concurrent_jobs
-                    current = len(to_worker.info.current_jobs)
-                    
-                    if current < capacity:
-                        # Move job reference
-                        if job_id in from_worker.info.current_jobs:
-                            from_worker.info.current_jobs.remove(job_id)
-                            to_worker.info.current_jobs.append(job_id)
-                            stolen_job_ids.append(job_id)
-                            break
+                if self._queue is not None:
+                    stolen = self._queue.steal(
+                        from_worker.info.id, to_worker.info.id, wanted, handoff=True
+                    )
+                    job_ids = [job.id for _, job in stolen]
+                else:
+                    job_ids = from_worker.info.current_jobs[-wanted:]
+                self._move(job_ids, from_worker, to_worker)
+                stolen_job_ids.extend(job_ids)
         
         return stolen_job_ids
+    
+    def _move(self, job_ids: List[str], from_worker: WorkerNode, to_worker: Optional[WorkerNode]):
+        """Move job references between workers and republish both loads."""
+        if not job_ids:
+            return
+        moved = set(job_ids)
+        from_worker.info.current_jobs = [j for j in from_worker.info.current_jobs if j not in moved]
+        self._registry.update_load(from_worker.info.id)
+        if to_worker is not None:
+            to_worker.info.current_jobs.extend(job_ids)
+            self._registry.update_load(to_worker.info.id)
 
 
 class GracefulShutdown:
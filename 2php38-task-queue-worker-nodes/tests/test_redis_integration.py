@@ -1,4 +1,5 @@
 """Tests for Redis integration, REST API, MessagePack, and new features."""
+import json
 import os
 import sys
 import time
@@ -16,6 +17,8 @@ from repository_after import (
     JobResult,
     JobStatus,
     Priority,
+    RetryConfig,
+    RetryStrategy,
     TypedJob,
     RedisConfig,
     RedisConnection,
@@ -37,6 +40,7 @@ from repository_after import (
     CallbackAlertHandler,
     get_alert_manager,
     MessagePackSerializer,
+    JobCodec,
     GracefulShutdown,
     WorkStealing,
     WorkerNode,
@@ -110,6 +114,732 @@ class TestRedisIntegration:
         
         RedisConnection.close()
     
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_redis_streams_batch_enqueue_dequeue(self):
+        """Test batched enqueue/dequeue/acknowledge round-trip."""
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        RedisConnection.get_connection(config)
+        
+        queue = RedisStreamsQueue()
+        queue.clear()
+        queue = RedisStreamsQueue()
+        
+        jobs = [Job(name=f"batch_{i}", payload={"i": i}, priority=Priority.LOW) for i in range(20)]
+        message_ids = queue.enqueue_many(jobs)
+        assert len(message_ids) == 20
+        
+        dequeued = queue.dequeue(consumer_name="batch_consumer", timeout_ms=100, count=20)
+        assert [job.id for _, job in dequeued] == [job.id for job in jobs]
+        
+        queue.acknowledge_many(dequeued)
+        assert queue.get_pending_count(Priority.LOW) == 0
+        
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_redis_atomic_enqueue_and_claim(self):
+        """Test Lua-scripted unique enqueue and claim with status flip."""
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        RedisConnection.get_connection(config)
+        
+        queue = RedisStreamsQueue()
+        queue.clear()
+        queue = RedisStreamsQueue()
+        
+        first = Job(name="unique", payload={}, priority=Priority.CRITICAL, unique_key="atomic-key")
+        second = Job(name="unique", payload={}, priority=Priority.CRITICAL, unique_key="atomic-key")
+        
+        assert queue.enqueue_atomic(first) is not None
+        assert queue.enqueue_atomic(second) is None
+        
+        claimed = queue.claim(consumer_name="claimer", count=5)
+        assert [job.id for _, job in claimed] == [first.id]
+        assert claimed[0][1].status == JobStatus.RUNNING
+        
+        stored = queue.get_job(first.id)
+        assert stored.status == JobStatus.RUNNING
+        assert stored.worker_id == "claimer"
+        
+        assert not queue.release_unique("atomic-key", second.id)
+        assert queue.release_unique("atomic-key", first.id)
+        assert queue.enqueue_atomic(second) is not None
+        
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_redis_dequeue_strict_priority_and_blocking_wakeup(self):
+        """Test dequeue serves priorities in order and wakes for any priority."""
+        import threading
+        
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        RedisConnection.get_connection(config)
+        
+        queue = RedisStreamsQueue()
+        queue.clear()
+        queue = RedisStreamsQueue()
+        
+        batch = Job(name="batch", payload={}, priority=Priority.BATCH)
+        critical = Job(name="critical", payload={}, priority=Priority.CRITICAL)
+        queue.enqueue_many([batch, critical])
+        
+        dequeued = queue.dequeue(consumer_name="strict", timeout_ms=100, count=2)
+        assert [job.name for _, job in dequeued] == ["critical", "batch"]
+        
+        late = Job(name="late", payload={}, priority=Priority.BATCH)
+        timer = threading.Timer(0.2, queue.enqueue, args=(late,))
+        timer.start()
+        
+        start = time.time()
+        dequeued = queue.dequeue(consumer_name="strict", timeout_ms=3000, count=1)
+        timer.join()
+        
+        assert [job.id for _, job in dequeued] == [late.id]
+        assert time.time() - start < 2.5
+        
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_redis_dequeue_drains_overflow_before_claiming(self):
+        """Test jobs kept from a wide blocking read are served before new claims."""
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        RedisConnection.get_connection(config)
+        
+        queue = RedisStreamsQueue()
+        queue.clear()
+        queue = RedisStreamsQueue()
+        
+        # Stand in for a blocking read that delivered more than was asked for.
+        kept = [Job(name="kept", payload={"i": i}, priority=Priority.LOW) for i in range(3)]
+        queue.enqueue_many(kept)
+        queue._overflow["worker"] = queue.claim("worker", count=3)
+        
+        fresh = Job(name="fresh", payload={}, priority=Priority.CRITICAL)
+        queue.enqueue(fresh)
+        
+        first = queue.dequeue(consumer_name="worker", timeout_ms=0, count=2)
+        assert [job.id for _, job in first] == [kept[0].id, kept[1].id]
+        assert queue.get_pending_count(Priority.CRITICAL) == 0
+        
+        second = queue.dequeue(consumer_name="worker", timeout_ms=0, count=2)
+        assert [job.id for _, job in second] == [fresh.id, kept[2].id]
+        assert "worker" not in queue._overflow
+        
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_redis_reclaim_pending_from_dead_consumer(self):
+        """Test jobs claimed by a crashed consumer are requeued and streams trimmed."""
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        RedisConnection.get_connection(config)
+        
+        queue = RedisStreamsQueue()
+        queue.clear()
+        queue = RedisStreamsQueue()
+        
+        jobs = [Job(name=f"stuck_{i}", payload={}, priority=Priority.HIGH) for i in range(3)]
+        queue.enqueue_many(jobs)
+        claimed = queue.dequeue(consumer_name="dead_worker", timeout_ms=0, count=2)
+        assert len(claimed) == 2
+        queue.dequeue(consumer_name="idle_worker", timeout_ms=0, count=1)
+        _, retried = claimed[0]
+        retried.attempt = 2
+        retried.last_error = "boom"
+        queue.update_job(retried, ["attempt", "last_error"])
+        
+        recovered = queue.recover_consumer("dead_worker", "reclaimer")
+        assert recovered == {Priority.HIGH: 2}
+        requeued = queue.get_job(retried.id)
+        assert requeued.status == JobStatus.PENDING
+        assert requeued.worker_id is None and requeued.started_at is None
+        assert (requeued.attempt, requeued.last_error) == (2, "boom")
+        
+        reclaimed = queue.reclaim_idle("reclaimer", min_idle_ms=0)
+        assert reclaimed == {Priority.HIGH: 1}
+        
+        redelivered = queue.dequeue(consumer_name="live_worker", timeout_ms=0, count=10)
+        assert sorted(job.id for _, job in redelivered) == sorted(job.id for job in jobs)
+        
+        queue.acknowledge_many(redelivered)
+        assert queue.trim_acknowledged()[Priority.HIGH] >= 3
+        assert queue.get_queue_depth(Priority.HIGH)[Priority.HIGH] == 0
+        
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_task_queue_acknowledges_completed_jobs(self):
+        """Test completed jobs leave the pending list, so the reclaimer cannot rerun them."""
+        from repository_after import PendingReclaimer, TaskQueue
+        
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        TaskQueue(redis_config=config).clear()
+        queue = TaskQueue(redis_config=config)
+        
+        job_id = queue.submit("once", {})
+        assert queue.get_next_job(timeout=0.1).id == job_id
+        queue.complete_job(job_id, JobResult(job_id=job_id, success=True))
+        
+        streams = RedisStreamsQueue()
+        assert streams.get_pending_count(Priority.NORMAL) == 0
+        assert streams.get_job(job_id).status == JobStatus.COMPLETED
+        
+        election = RedisLeaderElection("reclaimer")
+        assert PendingReclaimer(streams, election, min_idle_ms=0).run_once()["reclaimed"] == 0
+        election.resign()
+        assert queue.get_next_job(timeout=0.1) is None
+        
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_redis_update_job_writes_state_only(self):
+        """Test update_job persists mutable fields without rewriting the body."""
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        client = RedisConnection.get_connection(config)
+        
+        queue = RedisStreamsQueue()
+        job = Job(name="stateful", payload={"n": 1}, priority=Priority.NORMAL)
+        queue.enqueue(job)
+        body_key = f"{RedisStreamsQueue.JOB_PREFIX}{job.id}"
+        body = client.execute_command("GET", body_key, NEVER_DECODE=True)
+        
+        job.status = JobStatus.COMPLETED
+        job.attempt = 1
+        job.completed_at = datetime.utcnow()
+        queue.update_job(job)
+        
+        assert client.execute_command("GET", body_key, NEVER_DECODE=True) == body
+        for validate in (True, False):
+            stored = queue.get_job(job.id, validate=validate)
+            assert stored.status == JobStatus.COMPLETED
+            assert stored.attempt == 1
+            assert stored.completed_at == job.completed_at
+        
+        queue.delete_job(job.id)
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_redis_delayed_and_retry_schedulers_are_shared(self):
+        """Test delayed jobs, retries and unique keys are visible to every node."""
+        from repository_after import (
+            RedisDelayedJobScheduler,
+            RedisRetryScheduler,
+            RedisUniquenessConstraint,
+            RetryManager,
+        )
+        
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        client = RedisConnection.get_connection(config)
+        
+        queue = RedisStreamsQueue()
+        queue.clear()
+        client.delete(RedisDelayedJobScheduler.SCHEDULE_KEY, RedisDelayedJobScheduler.STREAMS_KEY)
+        client.delete(RedisRetryScheduler.SCHEDULE_KEY, RedisRetryScheduler.STREAMS_KEY)
+        queue = RedisStreamsQueue()
+        node_a = RedisDelayedJobScheduler(queue)
+        node_b = RedisDelayedJobScheduler(RedisStreamsQueue())
+        
+        due = Job(name="due", payload={}, priority=Priority.HIGH, unique_key="nightly")
+        later = Job(name="later", payload={}, delay_ms=60_000)
+        cancelled = Job(name="cancelled", payload={}, delay_ms=60_000, unique_key="once")
+        assert node_a.schedule_many([due, later, cancelled]) == [True, True, True]
+        assert not node_b.schedule(Job(name="dup", payload={}, unique_key="nightly"))
+        assert node_b.get_scheduled_count() == 3
+        
+        assert node_b.cancel(cancelled.id).id == cancelled.id
+        assert not node_b.is_unique_key_used("once")
+        assert node_a.cancel(cancelled.id) is None
+        
+        assert node_b.promote_due() == 1
+        assert node_a.promote_due() == 0
+        claimed = queue.claim("worker", count=10)
+        assert [job.id for _, job in claimed] == [due.id]
+        assert node_a.is_unique_key_used("nightly")
+        
+        assert node_a.reschedule(later.id, 0)
+        assert [job.id for job in node_b.get_due_jobs()] == [later.id]
+        assert node_a.get_due_jobs() == []
+        
+        retries_a = RedisRetryScheduler(RetryManager(), queue)
+        retries_b = RedisRetryScheduler(RetryManager(), queue)
+        later.attempt = 1
+        later.status = JobStatus.RETRYING
+        retries_a.schedule_retry(later, 0)
+        assert retries_b.get_due_retries() == [later.id]
+        assert retries_b.pop_retry(later.id) is not None
+        assert retries_a.pop_retry(later.id) is None
+        
+        uniqueness = RedisUniquenessConstraint()
+        assert uniqueness.acquire("report", "job-1")
+        assert not RedisUniquenessConstraint().acquire("report", "job-2")
+        assert uniqueness.get_holder("report") == "job-1"
+        assert uniqueness.release("report")
+        assert uniqueness.release("nightly")
+        
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_task_queue_releases_only_its_own_unique_key(self):
+        """Test finishing a job leaves its unique key alone once another job holds it."""
+        from repository_after import TaskQueue
+        
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        client = RedisConnection.get_connection(config)
+        TaskQueue(redis_config=config).clear()
+        queue = TaskQueue(redis_config=config)
+        unique_key = f"{RedisStreamsQueue.UNIQUE_PREFIX}report"
+        client.delete(unique_key)
+        
+        job_id = queue.submit("report", {}, unique_key="report")
+        # The key was released elsewhere and another job acquired it.
+        client.set(unique_key, "other-job")
+        assert queue.cancel_job(job_id)
+        assert client.get(unique_key) == "other-job"
+        
+        job_id = queue.submit("report", {}, unique_key="nightly")
+        assert queue.cancel_job(job_id)
+        assert not client.exists(f"{RedisStreamsQueue.UNIQUE_PREFIX}nightly")
+        
+        client.delete(unique_key)
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_task_queue_completes_delayed_job_submitted_by_another_node(self):
+        """Test a node running another node's delayed job finishes it like its own."""
+        from repository_after import TaskQueue
+        
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        client = RedisConnection.get_connection(config)
+        unique_key = f"{RedisStreamsQueue.UNIQUE_PREFIX}u1"
+        client.delete(unique_key)
+        TaskQueue(redis_config=config).clear()
+        node_a = TaskQueue(redis_config=config)
+        node_b = TaskQueue(redis_config=config)
+        
+        job_id = node_a.submit("delayed", {}, delay_ms=1, unique_key="u1")
+        time.sleep(0.01)
+        job = node_b.get_next_job(timeout=0.1)
+        assert job.id == job_id
+        assert job.status == JobStatus.RUNNING
+        
+        node_b.complete_job(job_id, JobResult(job_id=job_id, success=True))
+        streams = RedisStreamsQueue()
+        assert streams.get_job(job_id).status == JobStatus.COMPLETED
+        assert streams.get_pending_count(Priority.NORMAL) == 0
+        # The unique key was released, so it can be submitted again.
+        assert node_a.submit("delayed", {}, unique_key="u1") != job_id
+        
+        client.delete(unique_key)
+        node_a.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_async_task_queue_prefetches_without_blocking_loop(self):
+        """Test the asyncio client waits for work off-loop and acks what it completes."""
+        from repository_after import AsyncRedisConnection, AsyncTaskQueue, TaskQueue
+        
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        TaskQueue(redis_config=config).clear()
+        
+        async def scenario():
+            ticks = 0
+            
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+            
+            tick_task = asyncio.create_task(ticker())
+            queue = AsyncTaskQueue(TaskQueue(redis_config=config), prefetch=4)
+            try:
+                # An idle consumer must not stall other coroutines.
+                assert await queue.get_next_job(timeout=0.3) is None
+                assert ticks >= 10
+                
+                job_ids = [await queue.submit("async_job", {"i": i}) for i in range(10)]
+                done = []
+                while len(done) < len(job_ids):
+                    job = await queue.get_next_job(timeout=2)
+                    assert job is not None
+                    await queue.complete_job(job.id, JobResult(job_id=job.id, success=True))
+                    done.append(job.id)
+                assert sorted(done) == sorted(job_ids)
+                
+                stored = await queue._streams.get_job(job_ids[0])
+                assert stored.status == JobStatus.COMPLETED
+                
+                leftover = [await queue.submit("leftover", {}) for _ in range(3)]
+                for _ in range(100):
+                    if queue._buffer.qsize() == len(leftover):
+                        break
+                    await asyncio.sleep(0.01)
+                assert queue._buffer.qsize() == len(leftover)
+                
+                # A released job keeps the attempt count of earlier runs.
+                buffered = await queue._streams.get_job(leftover[0])
+                buffered.attempt, buffered.last_error = 1, "timeout"
+                await queue._streams.update_job(buffered, ["attempt", "last_error"])
+            finally:
+                await queue.close()
+                tick_task.cancel()
+                await AsyncRedisConnection.close()
+            return leftover
+        
+        leftover = asyncio.run(scenario())
+        
+        queue = RedisStreamsQueue()
+        assert queue.get_pending_count(Priority.NORMAL) == 0
+        released = queue.get_job(leftover[0])
+        assert released.status == JobStatus.PENDING and released.worker_id is None
+        claimed = queue.claim("other-worker", count=10)
+        assert sorted(job.id for _, job in claimed) == sorted(leftover)
+        retried = next(job for _, job in claimed if job.id == leftover[0])
+        assert (retried.attempt, retried.last_error) == (1, "timeout")
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_async_task_queue_retries_failing_job_into_dlq(self):
+        """Test retried jobs keep their attempt count across claims until they are dead-lettered."""
+        from repository_after import AsyncRedisConnection, AsyncTaskQueue, RetryConfig, TaskQueue
+        from repository_after.redis_backend import RedisRetryScheduler
+        
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        TaskQueue(redis_config=config).clear()
+        RedisConnection.get_connection(config).delete(
+            RedisRetryScheduler.SCHEDULE_KEY, RedisRetryScheduler.STREAMS_KEY
+        )
+        
+        async def scenario():
+            queue = AsyncTaskQueue(TaskQueue(redis_config=config), prefetch=1)
+            queue.PROMOTE_INTERVAL = 0
+            queue.BLOCK_MS = 50
+            retry = RetryConfig(
+                strategy=RetryStrategy.FIXED, max_attempts=3, base_delay_ms=0, jitter=False,
+            )
+            try:
+                job_id = await queue.submit("flaky", {}, retry_config=retry)
+                attempts = []
+                for _ in range(3):
+                    job = await queue.get_next_job(timeout=2)
+                    assert job is not None and job.id == job_id
+                    attempts.append(job.attempt)
+                    await queue.complete_job(job_id, JobResult(
+                        job_id=job_id, success=False, error=f"failure {job.attempt}",
+                    ))
+                assert await queue.get_next_job(timeout=0.3) is None
+                stored = await queue.get_job(job_id)
+                return attempts, stored, queue.get_stats()
+            finally:
+                await queue.close()
+                await AsyncRedisConnection.close()
+        
+        attempts, stored, stats = asyncio.run(scenario())
+        assert attempts == [0, 1, 2]
+        assert stored.status == JobStatus.DEAD
+        assert stored.last_error == "failure 2"
+        assert stats.dead_jobs == 1
+        
+        queue = RedisStreamsQueue()
+        assert queue.get_job(stored.id).status == JobStatus.DEAD
+        assert queue.get_pending_count(Priority.NORMAL) == 0
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_idle_worker_steals_unstarted_jobs_from_busiest_consumer(self):
+        """Test stealing moves pending entries between consumers with XCLAIM."""
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        RedisConnection.get_connection(config)
+        queue = RedisStreamsQueue()
+        queue.clear()
+        queue = RedisStreamsQueue()
+        
+        registry = WorkerRegistry()
+        for worker_id in ("busy", "idle"):
+            registry.register(WorkerNode(info=WorkerInfo(
+                id=worker_id, name=worker_id, host="localhost", port=8000,
+                max_concurrent_jobs=4,
+            )))
+        stealing = WorkStealing(registry, threshold=0.3, queue=queue)
+        
+        jobs = [Job(name="skewed", payload={"i": i}) for i in range(4)]
+        queue.enqueue_many(jobs)
+        claimed = queue.claim("busy", count=4)
+        registry.get_worker("busy").info.current_jobs = [job.id for _, job in claimed]
+        registry.heartbeat("busy")
+        
+        # The busy worker has started its first job, which must stay put.
+        first_message, first_job = claimed[0]
+        assert queue.begin(first_job, first_message, "busy")
+        
+        stolen = stealing.steal_for("idle", count=10)
+        assert [job.id for _, job in stolen] == [jobs[3].id, jobs[2].id, jobs[1].id]
+        assert all(job.worker_id == "idle" for _, job in stolen)
+        assert registry.get_worker("idle").info.current_jobs == [job.id for _, job in stolen]
+        assert registry.get_load("busy") == 0.25
+        
+        # The donor finds out when it tries to start a job it lost.
+        message_id, job = claimed[1]
+        assert not queue.begin(job, message_id, "busy")
+        assert queue.begin(stolen[0][1], stolen[0][0], "idle")
+        assert stealing.steal_for("idle") == []
+        
+        queue.acknowledge_many(claimed[:1] + stolen)
+        assert queue.get_pending_count(Priority.NORMAL) == 0
+        queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_task_queue_worker_runs_jobs_pushed_to_it_by_steal_jobs(self):
+        """Test jobs stolen for a registered worker reach its next get_next_job."""
+        from repository_after import TaskQueue, WorkerProcess
+        
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        TaskQueue(redis_config=config).clear()
+        task_queue = TaskQueue(redis_config=config)
+        worker = WorkerProcess("idle", handler=lambda job: None, max_concurrent=4)
+        assert task_queue.register_worker(worker)
+        
+        streams = RedisStreamsQueue()
+        jobs = [Job(name="skewed", payload={"i": i}) for i in range(3)]
+        streams.enqueue_many(jobs)
+        claimed = streams.claim("busy", count=3)
+        
+        registry = WorkerRegistry()
+        registry.register(WorkerNode(info=WorkerInfo(
+            id="busy", name="busy", host="localhost", port=8000,
+            max_concurrent_jobs=3, current_jobs=[job.id for _, job in claimed],
+        )))
+        registry.register(WorkerNode(info=worker.info))
+        stealing = WorkStealing(registry, threshold=0.3, queue=streams)
+        assert stealing.steal_jobs(count=2) == [jobs[2].id, jobs[1].id]
+        
+        # The stolen entries are pending for the worker, not new, yet its
+        # next reads deliver them.
+        received = [task_queue.get_next_job(timeout=0.1) for _ in range(2)]
+        assert {job.id for job in received} == {jobs[1].id, jobs[2].id}
+        assert all(job.worker_id == worker.info.id for job in received)
+        assert task_queue.get_next_job(timeout=0.1) is None
+        
+        # Dequeued jobs are marked as started and cannot be stolen back.
+        assert streams.steal(worker.info.id, "busy", count=2) == []
+        for job in received:
+            task_queue.complete_job(job.id, JobResult(job_id=job.id, success=True))
+        streams.acknowledge_many(claimed[:1])
+        assert streams.get_pending_count(Priority.NORMAL) == 0
+        
+        task_queue.clear()
+        RedisConnection.close()
+    
+    @pytest.mark.skipif(
+        os.environ.get("REDIS_HOST") is None,
+        reason="Redis not available"
+    )
+    def test_redis_reclaim_idle_leaves_running_jobs_with_live_consumers(self):
+        """Test a job running past min_idle_ms is not handed to a second worker."""
+        config = RedisConfig(
+            host=os.environ.get("REDIS_HOST", "localhost"),
+            port=int(os.environ.get("REDIS_PORT", 6379)),
+        )
+        RedisConnection.get_connection(config)
+        
+        queue = RedisStreamsQueue()
+        queue.clear()
+        queue = RedisStreamsQueue()
+        
+        running, waiting = Job(name="long_running", payload={}), Job(name="waiting", payload={})
+        queue.enqueue_many([running, waiting])
+        claimed = dict((job.id, message_id) for message_id, job in queue.claim("busy", count=2))
+        assert queue.begin(running, claimed[running.id], "busy")
+        
+        # Only the claimed but unstarted job is reclaimed.
+        assert queue.reclaim_idle("reclaimer", min_idle_ms=0) == {Priority.NORMAL: 1}
+        assert queue.reclaim_idle("reclaimer", min_idle_ms=0, live_consumers=["busy"]) == {}
+        assert queue.get_job(running.id).status == JobStatus.RUNNING
+        
+        # Once its consumer is no longer live, the running job is reclaimed too.
+        assert queue.reclaim_idle("reclaimer", min_idle_ms=0, live_consumers=[]) == {
+            Priority.NORMAL: 1
+        }
+        redelivered = queue.claim("live_worker", count=10)
+        assert sorted(job.id for _, job in redelivered) == sorted([running.id, waiting.id])
+        
+        queue.clear()
+        RedisConnection.close()
+    
+    def test_pending_reclaimer_only_runs_on_leader(self):
+        """Test the reclaimer is a no-op for non-leaders and records metrics for the leader."""
+        from prometheus_client import CollectorRegistry
+        from repository_after import PendingReclaimer
+        
+        queue = MagicMock()
+        queue.reclaim_idle.return_value = {Priority.LOW: 4}
+        queue.trim_acknowledged.return_value = {Priority.LOW: 10}
+        election = MagicMock()
+        election.renew_leadership.return_value = False
+        election.try_become_leader.return_value = False
+        metrics = TaskQueuePrometheusMetrics(registry=CollectorRegistry())
+        
+        reclaimer = PendingReclaimer(queue, election, metrics=metrics, min_idle_ms=1000)
+        assert reclaimer.run_once() == {"recovered": 0, "reclaimed": 0, "trimmed": 0}
+        queue.reclaim_idle.assert_not_called()
+        
+        election.try_become_leader.return_value = True
+        assert reclaimer.run_once() == {"recovered": 0, "reclaimed": 4, "trimmed": 10}
+        queue.reclaim_idle.assert_called_once_with("taskqueue_reclaimer", 1000, 100, None)
+        assert metrics.jobs_reclaimed.labels(priority="LOW")._value.get() == 4
+        assert metrics.stream_entries_trimmed.labels(priority="LOW")._value.get() == 10
+        
+        # A leader whose lease expired and was taken over skips the pass.
+        election.try_become_leader.return_value = False
+        assert reclaimer.run_once() == {"recovered": 0, "reclaimed": 0, "trimmed": 0}
+        assert queue.reclaim_idle.call_count == 1
+    
+    def test_weighted_fair_priority_order(self):
+        """Test weighted-fair mode serves every priority first in proportion to its weight."""
+        queue = RedisStreamsQueue(
+            MagicMock(),
+            priority_weights=RedisStreamsQueue.DEFAULT_PRIORITY_WEIGHTS,
+        )
+        
+        firsts = {p: 0 for p in Priority}
+        for _ in range(31 * 10):
+            order = queue._priority_order()
+            assert sorted(order) == list(Priority)
+            firsts[order[0]] += 1
+        
+        for priority, weight in RedisStreamsQueue.DEFAULT_PRIORITY_WEIGHTS.items():
+            assert firsts[priority] == weight * 10
+        
+        assert RedisStreamsQueue(MagicMock())._priority_order() == list(Priority)
+    
+    def test_batch_operations_use_fixed_round_trips(self):
+        """Test batch enqueue and blocking dequeue use a fixed number of round-trips."""
+        client = MagicMock()
+        queue = RedisStreamsQueue(client)
+        
+        jobs = [Job(name="j", payload={}, priority=Priority.HIGH) for _ in range(3)]
+        client.pipeline.return_value.execute.return_value = [
+            True, 0, "1-0", True, 0, "2-0", True, 0, "3-0",
+        ]
+        assert queue.enqueue_many(jobs) == ["1-0", "2-0", "3-0"]
+        assert client.pipeline.call_count == 1
+        assert client.set.call_count == 0
+        
+        client.execute_command.return_value = []
+        client.xreadgroup.return_value = [("taskqueue:stream:high", [
+            (f"{i + 1}-0", {"job_id": job.id}) for i, job in enumerate(jobs)
+        ])]
+        client.pipeline.reset_mock()
+        running = {"status": "running", "worker_id": "c", "started_at": datetime.utcnow().isoformat()}
+        client.pipeline.return_value.execute.return_value = [
+            [JobCodec().encode(job) for job in jobs],
+            1, {**running, "attempt": "2", "last_error": "boom"},
+            1, running,
+            1, running,
+        ]
+        
+        dequeued = queue.dequeue(consumer_name="c", timeout_ms=100, count=3)
+        assert [job.id for _, job in dequeued] == [job.id for job in jobs]
+        assert all(job.status == JobStatus.RUNNING for _, job in dequeued)
+        assert [job.attempt for _, job in dequeued] == [2, 0, 0]
+        assert dequeued[0][1].last_error == "boom"
+        assert client.xreadgroup.call_count == 1
+        assert len(client.xreadgroup.call_args.args[2]) == len(Priority)
+        assert client.pipeline.call_count == 1
+        assert client.get.call_count == 0
+    
     @pytest.mark.skipif(
         os.environ.get("REDIS_HOST") is None,
         reason="Redis not available"
@@ -241,6 +971,27 @@ class TestPrometheusMetrics:
         assert b"taskqueue_jobs_submitted_total" in output
 
 
+def _sum_payload(payload):
+    """Module-level handler so it can be sent to worker processes."""
+    if payload.get("fail"):
+        raise ValueError("boom")
+    if payload.get("lock"):
+        import threading
+        return threading.Lock()
+    if payload.get("exit"):
+        os._exit(3)
+    return sum(payload["values"])
+
+
+def _collect_results(pool, count, seconds=30):
+    results = {}
+    deadline = time.time() + seconds
+    while len(results) < count and time.time() < deadline:
+        for result in pool.get_results(timeout=0.5):
+            results[result.job_id] = result
+    return results
+
+
 class TestMultiprocessWorker:
     """Tests for multiprocessing workers."""
     
@@ -260,6 +1011,76 @@ class TestMultiprocessWorker:
         pool.register_handler("my_task", my_handler)
         assert "my_task" in pool._handlers
     
+    def test_chunked_dispatch_with_in_flight_limit_and_shared_memory(self):
+        """Test batched dispatch, bounded in-flight tasks and shared-memory payloads."""
+        pool = MultiprocessWorkerPool(
+            num_workers=2,
+            handlers={"sum": _sum_payload},
+            chunk_size=4,
+            max_in_flight=8,
+            shared_memory_threshold=1024,
+        )
+        pool.start()
+        try:
+            jobs = [Job(name="sum", payload={"values": [i, i]}) for i in range(40)]
+            jobs.append(Job(name="sum", payload={"values": list(range(2000))}))
+            jobs.append(Job(name="sum", payload={"fail": True}))
+            
+            assert pool.submit_many(jobs, "sum") == len(jobs)
+            assert sum(pool._in_flight) <= 16
+            
+            results = {}
+            deadline = time.time() + 30
+            while len(results) < len(jobs) and time.time() < deadline:
+                for result in pool.get_results(timeout=0.5):
+                    results[result.job_id] = result
+            
+            assert len(results) == len(jobs)
+            assert results[jobs[5].id].result == 10
+            assert results[jobs[40].id].result == sum(range(2000))
+            assert not results[jobs[41].id].success
+            assert pool.pending_count == 0
+            assert pool._shared_blocks == {}
+        finally:
+            pool.stop()
+    
+    def test_unpicklable_result_fails_only_its_own_task(self):
+        """Test one unpicklable result neither loses its chunk nor wedges the worker."""
+        pool = MultiprocessWorkerPool(num_workers=1, handlers={"sum": _sum_payload}, chunk_size=4)
+        pool.start()
+        try:
+            jobs = [Job(name="sum", payload={"values": [i]}) for i in range(8)]
+            jobs[1].payload = {"lock": True}
+            pool.submit_many(jobs, "sum")
+            
+            results = _collect_results(pool, len(jobs))
+            assert len(results) == len(jobs)
+            assert "could not be pickled" in results[jobs[1].id].error
+            assert all(results[job.id].success for job in jobs if job is not jobs[1])
+            assert pool.pending_count == 0
+        finally:
+            pool.stop()
+    
+    def test_dead_worker_is_replaced_and_its_chunks_settled(self):
+        """Test a crashed worker's running chunk fails and its queued chunks run elsewhere."""
+        pool = MultiprocessWorkerPool(
+            num_workers=1, handlers={"sum": _sum_payload}, chunk_size=2, max_in_flight=6,
+        )
+        pool.start()
+        try:
+            jobs = [Job(name="sum", payload={"values": [i]}) for i in range(6)]
+            jobs[1].payload = {"exit": True}
+            pool.submit_many(jobs, "sum")
+            
+            results = _collect_results(pool, len(jobs))
+            assert len(results) == len(jobs)
+            assert [results[job.id].success for job in jobs] == [False, False, True, True, True, True]
+            assert "exited with code 3" in results[jobs[1].id].error
+            assert pool.pending_count == 0
+            assert pool.worker_count == 1
+        finally:
+            pool.stop()
+    
     def test_async_worker_pool(self):
         """Test async worker pool."""
         pool = AsyncWorkerPool(max_concurrent=10)
@@ -354,6 +1175,121 @@ class TestAlerting:
         alert_id = asyncio.run(send_alert())
         assert alert_id is not None
         assert len(received) == 1
+    
+    def test_alert_manager_does_not_coalesce_by_default(self):
+        """Test repeated alerts are all delivered unless coalescing is enabled."""
+        manager = AlertManager()
+        
+        received = []
+        manager.add_handler(CallbackAlertHandler(lambda a: received.append(a) or True))
+        
+        async def repeat():
+            for _ in range(3):
+                await manager.send_alert(AlertSeverity.ERROR, "Same", "message")
+        
+        asyncio.run(repeat())
+        assert len(received) == 3
+    
+    def test_alert_pipeline_coalesces_and_batches(self):
+        """Test a burst of identical alerts becomes one alert plus one summary."""
+        from prometheus_client import CollectorRegistry
+        
+        registry = CollectorRegistry()
+        metrics = TaskQueuePrometheusMetrics(registry=registry)
+        batches = []
+        
+        class RecordingHandler(LogAlertHandler):
+            async def send_batch(self, alerts):
+                batches.append(list(alerts))
+                return True
+        
+        async def storm():
+            manager = AlertManager(coalesce_window=60, batch_size=50, metrics=metrics)
+            manager.add_handler(RecordingHandler())
+            async with manager:
+                job = Job(name="flaky", payload={})
+                for i in range(1000):
+                    await manager.alert_job_failed(job, error=f"boom {i}")
+                for i in range(120):
+                    await manager.send_alert(AlertSeverity.INFO, f"Distinct {i}", "message")
+                await manager.flush()
+                assert registry.get_sample_value("taskqueue_alerts_coalesced_total") == 999
+        
+        asyncio.run(storm())
+        
+        alerts = [alert for batch in batches for alert in batch]
+        assert len(alerts) == 1 + 120 + 1
+        assert max(len(batch) for batch in batches) <= 50
+        assert len(batches) < len(alerts)
+        
+        summary = alerts[-1]
+        assert summary.title == "Job Failed: flaky"
+        assert summary.metadata["coalesced_count"] == 999
+        assert summary.error == "boom 999"
+        assert registry.get_sample_value(
+            "taskqueue_alert_delivery_latency_seconds_count", {"handler": "RecordingHandler"}
+        ) == len(alerts)
+    
+    def test_alert_queue_drops_when_full(self):
+        """Test a full alert queue drops new alerts instead of blocking."""
+        from prometheus_client import CollectorRegistry
+        
+        registry = CollectorRegistry()
+        metrics = TaskQueuePrometheusMetrics(registry=registry)
+        
+        async def burst():
+            release = asyncio.Event()
+            
+            async def slow(alert):
+                await release.wait()
+                return True
+            
+            manager = AlertManager(
+                coalesce_window=None, max_queue_size=5, block_when_full=False, metrics=metrics
+            )
+            manager.add_handler(CallbackAlertHandler(slow))
+            await manager.start()
+            for i in range(20):
+                await manager.send_alert(AlertSeverity.ERROR, f"Alert {i}", "message")
+            release.set()
+            await manager.close()
+        
+        asyncio.run(burst())
+        dropped = registry.get_sample_value(
+            "taskqueue_alerts_dropped_total", {"reason": "queue_full"}
+        )
+        delivered = registry.get_sample_value(
+            "taskqueue_alert_delivery_latency_seconds_count", {"handler": "CallbackAlertHandler"}
+        )
+        assert dropped == 15
+        assert delivered == 5
+    
+    def test_webhook_handler_reuses_pooled_client(self):
+        """Test webhook alerts share one client and batches post one request."""
+        import httpx
+        
+        requests = []
+        
+        def respond(request):
+            requests.append(request)
+            return httpx.Response(200)
+        
+        async def deliver():
+            client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+            handler = WebhookAlertHandler("http://alerts.test/hook", client=client, batch_payloads=True)
+            alerts = [
+                Alert(id=f"a-{i}", severity=AlertSeverity.ERROR, title="t", message="m")
+                for i in range(3)
+            ]
+            assert await handler.send(alerts[0])
+            assert await handler.send_batch(alerts)
+            await handler.close()
+            assert not client.is_closed
+            await client.aclose()
+        
+        asyncio.run(deliver())
+        assert len(requests) == 2
+        assert [a["id"] for a in json.loads(requests[1].content)["alerts"]] == ["a-0", "a-1", "a-2"]
 
 
 class TestMessagePackSerialization:
@@ -384,6 +1320,57 @@ class TestMessagePackSerialization:
         assert decoded == data
 
 
+    def test_job_codec_round_trip(self):
+        """Test the compact job envelope round-trips with and without validation."""
+        codec = JobCodec()
+        job = Job(
+            name="encode_me",
+            payload={"user": {"id": 1}, "tags": ["a", "b"]},
+            priority=Priority.HIGH,
+            depends_on=["dep-1"],
+            scheduled_at=datetime(2024, 1, 1, 12, 30),
+            retry_config=RetryConfig(strategy=RetryStrategy.FIXED, max_attempts=5),
+        )
+        
+        encoded = codec.encode(job)
+        assert len(encoded) < len(job.model_dump_json())
+        
+        for validate in (True, False):
+            decoded = codec.decode(encoded, validate=validate)
+            assert decoded.model_dump() == job.model_dump()
+            assert Priority(decoded.priority) == Priority.HIGH
+            assert decoded.status == JobStatus.PENDING
+        
+        # Decoded jobs never share a retry config.
+        custom = Job(name="custom", payload={}, retry_config=RetryConfig(
+            strategy=RetryStrategy.CUSTOM, custom_delays_ms=[10, 20],
+        ))
+        first, second = (codec.decode(codec.encode(custom), validate=False) for _ in range(2))
+        first.retry_config.custom_delays_ms.append(30)
+        first.retry_config.max_attempts = 9
+        assert second.retry_config.custom_delays_ms == [10, 20]
+        assert second.retry_config.max_attempts == 3
+    
+    def test_job_codec_reads_legacy_json_and_state(self):
+        """Test JSON bodies still decode and mutable state overlays correctly."""
+        codec = JobCodec()
+        job = Job(name="legacy", payload={"x": 1})
+        
+        decoded = codec.decode(job.model_dump_json().encode())
+        assert decoded.id == job.id
+        
+        job.status = JobStatus.FAILED
+        job.attempt = 2
+        job.last_error = "boom"
+        state = codec.encode_state(job)
+        
+        restored = codec.apply_state(codec.decode(codec.encode(decoded)), state)
+        assert restored.status == JobStatus.FAILED
+        assert restored.attempt == 2
+        assert restored.last_error == "boom"
+        assert restored.completed_at is None
+
+
 class TestTypeSafePayloads:
     """Tests for type-safe job payloads with generics."""
     
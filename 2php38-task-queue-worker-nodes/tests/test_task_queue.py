@@ -41,6 +41,7 @@ from repository_after import (
     PayloadEncoder,
     RedisStreamsQueue,
     TaskQueuePrometheusMetrics,
+    SlidingWindowStats,
     get_metrics,
 )
 
@@ -204,6 +205,52 @@ class TestRequirement2DependencyManagement:
         
         assert len(successful) == 2
         assert len(failed) == 0
+    
+    def test_ready_set_and_incremental_cycle_check(self):
+        """Test ready jobs follow status changes and cycles are found from new edges."""
+        resolver = DependencyResolver()
+        graph = resolver.graph
+        
+        # Submitted out of order; the batch is sorted before insertion.
+        successful, failed = resolver.submit_batch([
+            Job(id="C", name="c", payload={}, depends_on=["A", "B"]),
+            Job(id="B", name="b", payload={}, depends_on=["A"]),
+            Job(id="A", name="a", payload={}),
+        ])
+        assert successful == ["C", "B", "A"]
+        assert failed == []
+        assert graph.get_ready_jobs() == ["A"]
+        
+        assert graph.mark_completed("A") == ["B"]
+        assert graph.get_ready_jobs() == ["B"]
+        graph.update_status("A", JobStatus.PENDING)
+        assert sorted(graph.get_ready_jobs()) == ["A"]
+        graph.mark_completed("A")
+        graph.mark_completed("B")
+        assert graph.get_ready_jobs() == ["C"]
+        
+        cycle = graph.detect_cycle("A", ["C"])
+        assert cycle[:2] == ["A", "C"] and cycle[-1] == "A"
+        assert graph.detect_cycle("D", ["C"]) is None
+        assert graph.detect_cycle("D", ["D"]) == ["D", "D"]
+        
+        success, error = resolver.submit_job(Job(id="A", name="a", payload={}, depends_on=["C"]))
+        assert not success
+        
+        # A batch whose job already has dependents falls back to per-job checks.
+        successful, failed = resolver.submit_batch([
+            Job(id="X", name="x", payload={}, depends_on=["C"]),
+            Job(id="B", name="b", payload={}, depends_on=["X"]),
+        ])
+        assert successful == ["X"]
+        assert [job_id for job_id, _ in failed] == ["B"]
+        
+        successful, failed = resolver.submit_batch([
+            Job(id="P", name="p", payload={}, depends_on=["Q"]),
+            Job(id="Q", name="q", payload={}, depends_on=["P"]),
+        ])
+        assert successful == []
+        assert len(failed) == 2
 
 
 class TestRequirement3WorkerManagement:
@@ -276,6 +323,38 @@ class TestRequirement3WorkerManagement:
         assert len(underloaded) == 1
         assert underloaded[0].info.id == "w2"
     
+    def test_load_published_by_heartbeats(self):
+        """Test donors and receivers follow the load published with heartbeats."""
+        from repository_after.models import WorkerInfo
+        
+        registry = WorkerRegistry()
+        stealing = WorkStealing(registry, threshold=0.3)
+        for i in range(5):
+            registry.register(WorkerNode(info=WorkerInfo(
+                id=f"w{i}", name=f"worker{i}", host="localhost", port=8000 + i,
+                max_concurrent_jobs=10,
+            )))
+        
+        registry.heartbeat("w3", running_jobs=9)
+        registry.heartbeat("w1", running_jobs=8)
+        registry.heartbeat("w4", running_jobs=2)
+        assert registry.get_load("w3") == 0.9
+        assert [w.info.id for w in stealing.find_overloaded_workers()] == ["w3", "w1"]
+        assert [w.info.id for w in stealing.find_underloaded_workers()][-1] == "w4"
+        
+        # A newer heartbeat replaces the previous load.
+        registry.heartbeat("w3", running_jobs=1)
+        assert [w.info.id for w in stealing.find_overloaded_workers()] == ["w1"]
+        registry.unregister("w1")
+        assert stealing.find_overloaded_workers() == []
+        
+        registry.get_worker("w2").info.current_jobs = [f"j{i}" for i in range(8)]
+        registry.heartbeat("w2")
+        stolen = stealing.steal_jobs(count=3)
+        assert stolen == ["j5", "j6", "j7"]
+        assert registry.get_worker("w2").info.current_jobs == [f"j{i}" for i in range(5)]
+        assert registry.get_load("w2") == 0.5
+    
     def test_distributed_lock(self):
         """Test Redis-based distributed locking."""
         DistributedLock.clear_all()
@@ -538,6 +617,31 @@ class TestRequirement5Scheduler:
         assert len(due) == 1
         assert due[0].id == job.id
     
+    def test_delayed_cancel_reschedule_and_batched_drain(self):
+        """Test cancel/reschedule tombstones and draining due jobs in batches."""
+        scheduler = DelayedJobScheduler()
+        scheduler.COMPACT_MIN_TOMBSTONES = 2
+        
+        jobs = [Job(name=f"job{i}", payload={}) for i in range(5)]
+        for job in jobs:
+            scheduler.schedule(job)
+        
+        assert scheduler.cancel(jobs[0].id) is jobs[0]
+        assert scheduler.cancel(jobs[0].id) is None
+        assert scheduler.reschedule(jobs[1].id, 60_000)
+        assert not scheduler.reschedule(jobs[0].id, 0)
+        assert scheduler.get_scheduled_count() == 4
+        
+        first = scheduler.get_due_jobs(max_jobs=2)
+        rest = scheduler.get_due_jobs()
+        assert [j.id for j in first + rest] == [j.id for j in jobs[2:]]
+        assert len(first) == 2
+        
+        assert scheduler.get_next_due_time() > time.time() + 50
+        assert scheduler.cancel(jobs[1].id) is jobs[1]
+        assert scheduler.get_next_due_time() is None
+        assert scheduler.get_scheduled_count() == 0
+        
     def test_cron_expression_parsing(self):
         """Test cron-like expression parsing."""
         cron = CronExpression("0 12 * * *")
@@ -557,6 +661,46 @@ class TestRequirement5Scheduler:
         
         assert next_run.minute == 5
     
+    def test_cron_next_run_jumps_fields_and_handles_dst(self):
+        """Test next_run across month/year boundaries and DST transitions."""
+        from zoneinfo import ZoneInfo
+        
+        assert CronExpression("0 0 29 2 *").next_run(datetime(2024, 3, 1)) == datetime(2028, 2, 29)
+        assert CronExpression("59 23 31 12 *").next_run(datetime(2024, 1, 1)) == datetime(2024, 12, 31, 23, 59)
+        with pytest.raises(ValueError):
+            CronExpression("0 0 31 2 *").next_run(datetime(2024, 1, 1))
+        
+        ny = ZoneInfo("America/New_York")
+        # 02:30 does not exist on 2024-03-10; it fires right after the jump.
+        spring = CronExpression("30 2 * * *").next_run(datetime(2024, 3, 10, 1, 0, tzinfo=ny))
+        assert (spring.hour, spring.minute, spring.utcoffset()) == (3, 30, timedelta(hours=-4))
+        
+        # 01:30 happens twice on 2024-11-03; it fires only once.
+        cron = CronExpression("30 1 * * *")
+        fall = cron.next_run(datetime(2024, 11, 3, 0, 0, tzinfo=ny))
+        assert fall.utcoffset() == timedelta(hours=-4)
+        assert cron.next_run(fall).day == 4
+    
+    def test_recurring_scheduler_polls_only_due_jobs(self):
+        """Test the recurring scheduler heap returns due jobs once per run."""
+        scheduler = RecurringJobScheduler()
+        
+        every_minute = Job(name="tick", payload={}, cron_expression="* * * * *")
+        yearly = Job(name="yearly", payload={}, cron_expression="0 0 1 1 *")
+        removed = Job(name="removed", payload={}, cron_expression="* * * * *")
+        for job in (every_minute, yearly, removed):
+            assert scheduler.register(job)
+        scheduler.unregister(removed.id)
+        
+        assert scheduler.get_due_jobs() == []
+        
+        first_run = scheduler.get_next_run(every_minute.id)
+        with patch("repository_after.scheduler.time.time", return_value=first_run.timestamp()):
+            due = scheduler.get_due_jobs()
+            assert [job.id for job in due] == [every_minute.id]
+            assert scheduler.get_due_jobs() == []
+        assert scheduler.get_next_run(every_minute.id) > first_run
+    
     def test_recurring_job_registration(self):
         """Test recurring job registration."""
         scheduler = RecurringJobScheduler()
@@ -759,6 +903,90 @@ class TestRequirement6Observability:
         
         assert stats.total_jobs >= 2
     
+    def test_sliding_window_percentiles(self):
+        """Test window throughput, percentiles, expiry and ring wrap-around."""
+        now = [1000.0]
+        window = SlidingWindowStats(window_seconds=10, capacity=128)
+        window._clock = lambda: now[0]
+        window._started = 990.0
+        
+        for i in range(1, 101):
+            window.record("high" if i % 2 else "low", "resize", i / 1000, wait_seconds=i / 100)
+        
+        now[0] = 1005.0
+        snapshot = window.snapshot()
+        assert snapshot.overall.count == 100
+        assert snapshot.overall.throughput_per_second == 10.0
+        assert snapshot.overall.run_seconds == {50: 0.05, 95: 0.095, 99: 0.099}
+        assert snapshot.overall.wait_seconds[50] == 0.5
+        assert snapshot.by_priority["high"].count == 50
+        assert snapshot.by_job_name["resize"].avg_run_seconds == pytest.approx(0.0505)
+        
+        for _ in range(100):
+            window.record("low", "thumbnail", 0.2)
+        assert window.snapshot().overall.count == 128
+        assert window.snapshot().by_job_name["thumbnail"].wait_seconds == {}
+        
+        now[0] = 1016.0
+        assert window.snapshot().overall.count == 0
+    
+    def test_sliding_window_snapshot_scans_only_recent_slots(self):
+        """Test snapshots skip slots still being written and catch up a lagging head."""
+        now = [1000.0]
+        window = SlidingWindowStats(window_seconds=10, capacity=64)
+        window._clock = lambda: now[0]
+        
+        for _ in range(40):
+            window.record("low", "old", 1.0)
+        now[0] = 1020.0
+        for i in range(3):
+            window.record("high", "new", i / 10)
+        
+        # A writer holding slot 41 has not finished it yet.
+        window._seqs[41] = -1
+        snapshot = window.snapshot()
+        assert snapshot.overall.count == 2
+        assert set(snapshot.by_job_name) == {"new"}
+        assert snapshot.overall.run_seconds[99] == 0.2
+        
+        # Slots 41 and 42 finished after a slower writer published the head.
+        window._seqs[41] = 41
+        window._head = 40
+        assert window.snapshot().overall.count == 3
+        
+        now[0] = 1040.0
+        assert window.snapshot().overall.count == 0
+    
+    def test_window_stats_in_get_stats_and_metrics(self):
+        """Test completions fill get_stats processing times and /metrics percentiles."""
+        queue = TaskQueue()
+        job_id = queue.submit(name="window_stats_job", payload={}, priority=Priority.HIGH)
+        job = queue.get_job(job_id)
+        job.started_at = job.created_at + timedelta(milliseconds=40)
+        queue.complete_job(job_id, JobResult(job_id=job_id, success=True, duration_ms=250))
+        
+        stats = queue.get_stats().by_job_name["window_stats_job"]
+        assert stats.completed == 1
+        assert stats.avg_processing_time_ms == pytest.approx(250)
+        assert stats.processing_time_ms["p99"] == pytest.approx(250)
+        assert stats.wait_time_ms["p50"] == pytest.approx(40)
+        assert "HIGH" in queue.get_stats().by_priority
+        
+        output = get_metrics().export().decode()
+        assert 'taskqueue_window_run_seconds{job_name="window_stats_job",priority="all",quantile="0.5"} 0.25' in output
+    
+    def test_get_stats_window_is_per_queue(self):
+        """Test one queue's completions stay out of another queue's stats."""
+        busy = TaskQueue()
+        idle = TaskQueue()
+        job_id = busy.submit(name="per_queue_job", payload={})
+        busy.complete_job(job_id, JobResult(job_id=job_id, success=True, duration_ms=10))
+        
+        assert busy.get_stats().by_job_name["per_queue_job"].completed == 1
+        idle_stats = idle.get_stats()
+        assert "per_queue_job" not in idle_stats.by_job_name
+        assert idle_stats.throughput_per_second == 0
+    
     def test_rest_api_endpoints(self):
         """Test REST API for job inspection and management."""
         from fastapi.testclient import TestClient
@@ -1347,4 +1575,154 @@ class TestEdgeCasesForCronExpressions:
         # Test wildcard day of week (matches any day)
         any_day = CronExpression("0 0 * * *")
         assert any_day.matches(datetime(2024, 1, 14, 0, 0))  # Sunday
-        assert any_day.matches(datetime(2024, 1, 15, 0, 0))  # Monday
\ No newline at end of file
+        assert any_day.matches(datetime(2024, 1, 15, 0, 0))  # Monday
+
+
+class TestJobStore:
+    """Indexed job tracking store used by TaskQueue."""
+    
+    def test_counters_follow_status_and_priority_changes(self):
+        """Test O(1) counters stay in sync as jobs change status and priority."""
+        from repository_after import JobStore
+        
+        store = JobStore()
+        jobs = [Job(name="a", payload={}, priority=Priority.HIGH) for _ in range(3)]
+        for job in jobs:
+            store.add(job)
+        
+        jobs[0].status = JobStatus.RUNNING
+        store.update(jobs[0])
+        jobs[1].priority = Priority.LOW.value
+        store.update(jobs[1])
+        
+        assert store.count() == 3
+        assert store.count(JobStatus.PENDING) == 2
+        assert store.count(JobStatus.RUNNING) == 1
+        pending = store.count_by_priority(JobStatus.PENDING)
+        assert pending[Priority.HIGH] == 1
+        assert pending[Priority.LOW] == 1
+        
+        store.remove(jobs[2].id)
+        assert store.count(JobStatus.PENDING) == 1
+        assert store.get(jobs[2].id) is None
+    
+    def test_list_filters_and_cursor_pages(self):
+        """Test filtered listing walks newest first and resumes after the cursor."""
+        from repository_after import JobStore
+        
+        store = JobStore()
+        jobs = [
+            Job(name="even" if i % 2 == 0 else "odd", payload={"i": i}, priority=Priority.NORMAL)
+            for i in range(10)
+        ]
+        for job in jobs:
+            store.add(job)
+        
+        first = store.list(name="even", limit=3)
+        assert [j.payload["i"] for j in first] == [8, 6, 4]
+        second = store.list(name="even", limit=3, cursor=first[-1].id)
+        assert [j.payload["i"] for j in second] == [2, 0]
+        
+        jobs[3].status = JobStatus.COMPLETED
+        store.update(jobs[3])
+        assert store.list(status=JobStatus.COMPLETED, priority=Priority.NORMAL) == [jobs[3]]
+        assert [j.payload["i"] for j in store.list(limit=2)] == [9, 8]
+    
+    def test_terminal_jobs_are_evicted_but_still_counted(self):
+        """Test count-based eviction of finished jobs keeps memory bounded."""
+        from repository_after import JobStore
+        
+        store = JobStore(max_terminal_jobs=2)
+        jobs = [Job(name="done", payload={}) for _ in range(5)]
+        for job in jobs:
+            store.add(job)
+            job.status = JobStatus.COMPLETED
+            store.update(job)
+        
+        assert store.count() == 2
+        assert store.get(jobs[0].id) is None
+        assert store.get(jobs[4].id) is jobs[4]
+        assert store.total(JobStatus.COMPLETED) == 5
+        assert store.total() == 5
+    
+    def test_task_queue_stats_use_store_counters(self):
+        """Test TaskQueue stats reflect completions without rescanning jobs."""
+        queue = TaskQueue(max_terminal_jobs=1)
+        first = queue.submit(name="one", payload={})
+        second = queue.submit(name="two", payload={})
+        
+        for job_id in (first, second):
+            queue.complete_job(job_id, JobResult(job_id=job_id, success=True))
+        
+        stats = queue.get_stats()
+        assert stats.completed_jobs == 2
+        assert stats.total_jobs == 2
+        assert queue._get_job(first) is None
+        assert [j.id for j in queue.list_jobs(status="completed")] == [second]
+    
+    def test_page_cursor_survives_status_changes_and_eviction(self):
+        """Test keyset cursors keep their position after the cursor job leaves."""
+        from repository_after import JobStore
+        
+        store = JobStore()
+        jobs = [Job(name="n", payload={"i": i}) for i in range(10)]
+        for job in jobs:
+            store.add(job)
+        
+        page, cursor = store.page(status=JobStatus.PENDING, limit=4)
+        assert [j.payload["i"] for j in page] == [9, 8, 7, 6]
+        
+        jobs[6].status = JobStatus.RUNNING
+        store.update(jobs[6])
+        store.remove(jobs[5].id)
+        jobs[2].status = JobStatus.RUNNING
+        store.update(jobs[2])
+        jobs[2].status = JobStatus.PENDING
+        store.update(jobs[2])
+        
+        page, cursor = store.page(status=JobStatus.PENDING, limit=4, cursor=cursor)
+        assert [j.payload["i"] for j in page] == [4, 3, 2, 1]
+        page, cursor = store.page(status=JobStatus.PENDING, limit=4, cursor=cursor)
+        assert [j.payload["i"] for j in page] == [0]
+        assert cursor is None
+        
+        assert [j.payload["i"] for j in store.iter_jobs(batch_size=3)] == [9, 8, 7, 6, 4, 3, 2, 1, 0]
+    
+    def test_api_pages_dlq_and_streams_ndjson_export(self):
+        """Test cursor pages over the API and the streaming NDJSON export."""
+        import json
+        from fastapi.testclient import TestClient
+        from repository_after.api import app, set_task_queue
+        
+        queue = TaskQueue()
+        set_task_queue(queue)
+        client = TestClient(app)
+        
+        ids = [queue.submit(name="export_me", payload={"i": i}) for i in range(5)]
+        queue.submit(name="other", payload={})
+        
+        seen, cursor = [], None
+        while True:
+            params = {"name": "export_me", "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            body = client.get("/jobs", params=params).json()
+            seen += [job["id"] for job in body["jobs"]]
+            cursor = body["cursor"]
+            if cursor is None:
+                break
+        assert seen == ids[::-1]
+        
+        response = client.get("/jobs/export", params={"name": "export_me"})
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        exported = [json.loads(line) for line in response.text.splitlines()]
+        assert [job["id"] for job in exported] == ids[::-1]
+        
+        for job_id in ids[:3]:
+            job = queue.get_job(job_id)
+            job.retry_config = RetryConfig(max_attempts=1)
+            queue.complete_job(job_id, JobResult(job_id=job_id, success=False, error="boom"))
+        first = client.get("/dlq", params={"limit": 2}).json()
+        assert [job["id"] for job in first["jobs"]] == [ids[2], ids[1]]
+        rest = client.get("/dlq", params={"limit": 2, "cursor": first["cursor"]}).json()
+        assert [job["id"] for job in rest["jobs"]] == [ids[0]]
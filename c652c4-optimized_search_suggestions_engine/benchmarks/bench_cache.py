@@ -0,0 +1,130 @@
+"""Benchmark the query cache and prefix reuse of SearchSuggestionsEngine.
+
+Replays autocomplete sessions: each types a title or a common phrase one
+character at a time from ``--min-chars`` on. Targets are drawn with a
+Zipf-like skew from ``--targets`` of them, so popular sessions repeat.
+Reports, over the same keystrokes:
+
+* candidate retrieval (``_find_candidates_optimized``) per keystroke with
+  substring pools, where each keystroke filters the products of the one
+  before, and without them (``SUBSTRING_POOL_SIZE = 0``);
+* end-to-end ``generate_search_suggestions`` latency and cache hit rate
+  while one product is removed and a new one added every
+  ``--churn-every`` keystrokes, for this engine and, with ``--repo``,
+  another copy of it (e.g. one that clears the cache on every change).
+  Fuzzy scoring, which costs the same with or without the cache on a
+  miss and dominates it, is off unless ``--fuzzy`` is given.
+
+    python benchmarks/bench_cache.py --products 50000 --repo ../old
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_index import percentiles
+
+PHRASES = ['wireless device', 'high quality wireless', 'description for', 'searchable content',
+           'electronic device number']
+
+
+def make_keystrokes(catalog, args):
+    rng = random.Random(args.seed + 1)
+    targets = [
+        rng.choice(catalog).title.lower() if rng.random() < 0.7 else rng.choice(PHRASES)
+        for _ in range(args.targets)
+    ]
+    weights = [1 / (rank + 1) for rank in range(len(targets))]
+    keystrokes = []
+    for target in rng.choices(targets, weights, k=args.sessions):
+        keystrokes.extend(target[:end] for end in range(args.min_chars, len(target) + 1))
+    return keystrokes
+
+
+def run(args):
+    # The engine first, or the test module would load its own
+    sys.path.insert(0, args.repo)
+    from optimized_Search_suggestions_engine_v1 import SearchSuggestionsEngine
+    sys.path.insert(0, os.path.join(ROOT, 'tests'))
+    from test_before import create_catalog, generate_product
+
+    catalog = create_catalog(args.products, seed=args.seed)
+    keystrokes = make_keystrokes(catalog, args)
+    engine = SearchSuggestionsEngine(list(catalog))
+    engine.generate_search_suggestions('warm up')
+    print(f'engine: {args.repo}\n  {args.products:,} products, {len(keystrokes):,} keystrokes')
+
+    if hasattr(engine, '_substring_pools'):
+        for pool_size in (SearchSuggestionsEngine.SUBSTRING_POOL_SIZE, 0):
+            engine.SUBSTRING_POOL_SIZE = pool_size
+            engine._substring_pools.clear()
+            latencies = []
+            for query in keystrokes:
+                normalized = engine._normalize_text(query)
+                started = time.perf_counter()
+                engine._find_candidates_optimized(normalized, None)
+                latencies.append((time.perf_counter() - started) * 1000)
+            p50, p99 = percentiles(latencies)
+            label = f'{pool_size} substring pools'
+            print(f'  candidates, {label:<19} p50 {p50:7.2f} ms  p99 {p99:8.2f} ms  '
+                  f'total {sum(latencies) / 1000:6.1f}s', flush=True)
+        engine = SearchSuggestionsEngine(list(catalog))
+        engine.generate_search_suggestions('warm up')
+
+    rng = random.Random(args.seed + 2)
+    live = [product.product_id for product in catalog]
+    latencies = []
+    hits = 0
+    for n, query in enumerate(keystrokes, 1):
+        started = time.perf_counter()
+        hits += engine.generate_search_suggestions(query, enable_fuzzy=args.fuzzy).cache_hit
+        latencies.append((time.perf_counter() - started) * 1000)
+        if n % args.churn_every == 0:
+            i = rng.randrange(len(live))
+            live[i], live[-1] = live[-1], live[i]
+            engine.remove_product(live.pop())
+            product = generate_product(f'churn_{n}')
+            engine.add_product(product)
+            live.append(product.product_id)
+    p50, p99 = percentiles(latencies)
+    print(f'  generate_search_suggestions     p50 {p50:7.2f} ms  p99 {p99:8.2f} ms  '
+          f'total {sum(latencies) / 1000:6.1f}s  cache hit rate {hits / len(keystrokes):.1%}', flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=50_000)
+    parser.add_argument('--sessions', type=int, default=300)
+    parser.add_argument('--targets', type=int, default=100)
+    parser.add_argument('--min-chars', type=int, default=3)
+    parser.add_argument('--churn-every', type=int, default=20)
+    parser.add_argument('--fuzzy', action='store_true')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repo', action='append', help='another engine copy to compare against; repeatable')
+    parser.add_argument('--run', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.run:
+        args.repo = args.repo[0]
+        run(args)
+        return
+
+    # A process per engine copy, as they share a module name
+    repos = [os.path.join(ROOT, 'repository_after')] + (args.repo or [])
+    for repo in repos:
+        subprocess.run(
+            [sys.executable, __file__, '--run', '--repo', os.path.abspath(repo),
+             '--products', str(args.products), '--sessions', str(args.sessions),
+             '--targets', str(args.targets), '--min-chars', str(args.min_chars),
+             '--churn-every', str(args.churn_every), '--seed', str(args.seed)]
+            + (['--fuzzy'] if args.fuzzy else []),
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
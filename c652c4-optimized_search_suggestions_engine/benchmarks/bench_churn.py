@@ -0,0 +1,97 @@
+"""Benchmark SearchSuggestionsEngine under catalog churn.
+
+Builds a catalog of ``--products`` with the generator from the tests, then
+runs ``--cycles`` cycles of removing a random product and adding a new
+one, so the catalog size stays fixed. Every ``--report-every`` cycles it
+reports:
+
+* the mean cost of a remove and of an add over the last interval;
+* the RSS of the process (Linux only);
+* p50/p99 candidate retrieval (``_find_candidates_optimized``) over the
+  same ``--queries`` queries each time, drawn as in bench_index.py;
+* the number of dense ids and title index entries, live and dead, when
+  the engine has them.
+
+With deletes that leave stale entries behind, these grow with the cycle
+count; with compaction they should stay flat. ``--repo`` points at
+another copy of the engine to compare against.
+
+    python benchmarks/bench_churn.py --products 200000 --cycles 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_index import make_queries, memory_mib, percentiles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, default=200_000)
+    parser.add_argument('--cycles', type=int, default=1_000_000)
+    parser.add_argument('--report-every', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repo', default=os.path.join(ROOT, 'repository_after'))
+    args = parser.parse_args()
+
+    # The engine first, or the test module would load its own
+    sys.path.insert(0, os.path.abspath(args.repo))
+    from optimized_Search_suggestions_engine_v1 import SearchSuggestionsEngine
+    sys.path.insert(0, os.path.join(ROOT, 'tests'))
+    from test_before import create_catalog, generate_product
+
+    catalog = create_catalog(args.products, seed=args.seed)
+    started = time.perf_counter()
+    engine = SearchSuggestionsEngine(catalog)
+    print(f'engine: {os.path.abspath(args.repo)}')
+    print(f'{args.products:,} products indexed in {time.perf_counter() - started:.1f}s')
+
+    queries = make_queries(catalog, args.queries, random.Random(args.seed + 1))
+    live = [product.product_id for product in catalog]
+    rng = random.Random(args.seed + 2)
+    engine.generate_search_suggestions('warm up')
+
+    def report(cycle, remove_s, add_s, interval):
+        latencies = []
+        for query, category in queries:
+            normalized = engine._normalize_text(query)
+            started = time.perf_counter()
+            engine._find_candidates_optimized(normalized, category)
+            latencies.append((time.perf_counter() - started) * 1000)
+        p50, p99 = percentiles(latencies)
+        rss, _ = memory_mib()
+        line = (f'{cycle:>10,} cycles  remove {remove_s / interval * 1e6:7.1f} us  '
+                f'add {add_s / interval * 1e6:7.1f} us  RSS {rss:6.0f} MiB  '
+                f'candidates p50 {p50:7.2f} ms  p99 {p99:8.2f} ms')
+        if hasattr(engine, '_products') and hasattr(engine, '_title_index'):
+            line += f'  dense ids {len(engine._products):,}  titles {len(engine._title_index):,}'
+        print(line, flush=True)
+
+    report(0, 0.0, 0.0, 1)
+    remove_s = add_s = 0.0
+    for cycle in range(1, args.cycles + 1):
+        # Swap-remove a random live product ID
+        i = rng.randrange(len(live))
+        live[i], live[-1] = live[-1], live[i]
+        product_id = live.pop()
+        product = generate_product(f'churn_{cycle}')
+        started = time.perf_counter()
+        engine.remove_product(product_id)
+        removed = time.perf_counter()
+        engine.add_product(product)
+        add_s += time.perf_counter() - removed
+        remove_s += removed - started
+        live.append(product.product_id)
+        if cycle % args.report_every == 0:
+            report(cycle, remove_s, add_s, args.report_every)
+            remove_s = add_s = 0.0
+
+
+if __name__ == '__main__':
+    main()
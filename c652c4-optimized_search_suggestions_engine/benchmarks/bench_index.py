@@ -0,0 +1,121 @@
+"""Benchmark index memory and query latency of SearchSuggestionsEngine.
+
+For each ``--products`` size a fresh process builds a catalog with the
+generator from the tests, indexes it and reports:
+
+* build time and peak RSS of the process, and the part added by the
+  engine on top of the catalog itself (Linux only);
+* p50/p99 latency over ``--queries`` queries, cache cleared before each,
+  of candidate retrieval alone (``_find_candidates_optimized``) and of the
+  whole ``generate_search_suggestions`` call. Queries are title prefixes of
+  1 to 8 characters, words and catalog terms, half of them with a
+  category filter.
+
+``--repo`` points at another copy of the engine (e.g. an older checkout)
+to compare against.
+
+    python benchmarks/bench_index.py --products 200000 2000000
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def memory_mib():
+    # (current RSS, peak RSS) from /proc; VmHWM is not inherited from the parent
+    values = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith(('VmRSS:', 'VmHWM:')):
+                key, value = line.split()[:2]
+                values[key] = int(value) / 1024
+    return values.get('VmRSS:', float('nan')), values.get('VmHWM:', float('nan'))
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+
+
+def make_queries(catalog, count, rng):
+    categories = ['electronics', 'clothing', 'books', 'home_garden', 'sports', 'toys', 'food', 'beauty']
+    words = ['wireless', 'device', 'model', 'high quality', 'tag1', 'electronic', 'description']
+    queries = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.6:
+            title = rng.choice(catalog).title.lower()
+            query = title[:rng.randint(1, 8)]
+        elif kind < 0.8:
+            query = rng.choice(words)
+        else:
+            query = rng.choice(rng.choice(catalog).title.split() or ['x'])
+        queries.append((query, rng.choice(categories) if rng.random() < 0.5 else None))
+    return queries
+
+
+def run(args, size):
+    # The engine first, or the test module would load its own. test_before
+    # has the same catalog generator and imports only the public names.
+    sys.path.insert(0, args.repo)
+    from optimized_Search_suggestions_engine_v1 import SearchSuggestionsEngine
+    sys.path.insert(0, os.path.join(ROOT, 'tests'))
+    from test_before import create_catalog
+
+    catalog = create_catalog(size, seed=args.seed)
+    catalog_rss, _ = memory_mib()
+    started = time.perf_counter()
+    engine = SearchSuggestionsEngine(catalog)
+    build_s = time.perf_counter() - started
+    rss, peak = memory_mib()
+
+    queries = make_queries(catalog, args.queries, random.Random(args.seed + 1))
+    engine.generate_search_suggestions('warm up')  # first query after the build pays for a full GC pass
+    retrieval, total = [], []
+    for query, category in queries:
+        normalized = engine._normalize_text(query)
+        started = time.perf_counter()
+        engine._find_candidates_optimized(normalized, category)
+        retrieval.append((time.perf_counter() - started) * 1000)
+        engine._query_cache.clear()
+        started = time.perf_counter()
+        engine.generate_search_suggestions(query, category_filter=category)
+        total.append((time.perf_counter() - started) * 1000)
+    r50, r99 = percentiles(retrieval)
+    t50, t99 = percentiles(total)
+    print(f'{size:>10,} products  build {build_s:7.1f}s  RSS {rss:7.0f} MiB (engine {rss - catalog_rss:6.0f} MiB, '
+          f'peak {peak:7.0f} MiB)\n'
+          f'            candidates p50 {r50:8.2f} ms  p99 {r99:8.2f} ms'
+          f'   generate_search_suggestions p50 {t50:8.2f} ms  p99 {t99:8.2f} ms', flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', type=int, nargs='+', default=[200_000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repo', default=os.path.join(ROOT, 'repository_after'))
+    parser.add_argument('--run', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.repo = os.path.abspath(args.repo)
+    if args.run:
+        run(args, args.run)
+        return
+
+    print(f'engine: {args.repo}')
+    for size in args.products:
+        # A process per size, so each peak RSS is its own
+        subprocess.run(
+            [sys.executable, __file__, '--run', str(size), '--queries', str(args.queries),
+             '--seed', str(args.seed), '--repo', args.repo],
+            check=True,
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,12 @@
-from typing import List, Set, Dict, Optional, Tuple, Any
-from dataclasses import dataclass, field
-from collections import defaultdict
+from typing import List, Set, Dict, Optional, Tuple, Any, Iterator
+from dataclasses import dataclass, field, replace
+from collections import defaultdict, OrderedDict
 import time
 import re
 from enum import Enum
 import heapq
 import bisect
+from array import array
 
 class ProductCategory(Enum):
     """Product category classifications"""
@@ -75,29 +76,262 @@ class SearchSuggestionsResult:
         return True
 
 
-class TrieNode:
+@dataclass
+class CachedSuggestions:
+    """A cached result with the request it answers"""
+    result: SearchSuggestionsResult
+    query_normalized: str
+    category_filter: Optional[str]
+    max_results: int
+    enable_fuzzy: bool
+    min_score_threshold: float
+    expires_at: float
+
+
+# Bit positions set in each byte value, for walking bitmaps
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+_NONZERO_BYTE = re.compile(rb'[^\x00]')
+
+
+def _bitmap_ids(data) -> Iterator[int]:
+    """Yield the positions of the set bits in a little-endian bitmap."""
+    for match in _NONZERO_BYTE.finditer(data):
+        base = match.start()
+        for bit in _BYTE_BITS[data[base]]:
+            yield base * 8 + bit
+
+
+def _int_ids(bits: int) -> Iterator[int]:
+    """Yield the positions of the set bits in an integer bitmap."""
+    return _bitmap_ids(bits.to_bytes((bits.bit_length() + 7) // 8, 'little'))
+
+
+def _at_least(bitmaps: List[int], threshold: int) -> int:
+    """
+    Bitmap of the positions set in at least `threshold` of `bitmaps`.
+    
+    Counts are kept bit-sliced (counter[k] holds bit k of every position's
+    count) and compared against the threshold with whole-integer boolean
+    operations, so the cost is O(len(bitmaps) × log len(bitmaps)) big-integer
+    operations rather than a loop over the ids.
+    """
+    if threshold <= 0:
+        raise ValueError("threshold must be positive")
+    counter: List[int] = []
+    for bits in bitmaps:
+        carry = bits
+        for k in range(len(counter)):
+            if not carry:
+                break
+            counter[k], carry = counter[k] ^ carry, counter[k] & carry
+        if carry:
+            counter.append(carry)
+    if threshold >= 1 << len(counter):
+        return 0
+    
+    # Walk from the top bit: `equal` holds positions whose count matches the
+    # threshold so far, `greater` those already known to exceed it
+    greater, equal = 0, 0
+    for bits in counter:
+        equal |= bits
+    for k in reversed(range(len(counter))):
+        if threshold >> k & 1:
+            equal &= counter[k]
+        else:
+            greater |= equal & counter[k]
+            equal &= ~counter[k]
+    return greater | equal
+
+
+class IdSet:
     """
-    Trie node for efficient prefix matching.
-    Stores product IDs at each node for O(k) prefix lookups.
+    Set of dense integer product ids, stored compactly.
+    
+    A single id is kept as a plain int, which covers most words and tokens.
+    A larger sparse set is a sorted array('I') at 4 bytes per id. Once it
+    holds more than one id in 16 of those below its largest, it switches to
+    a bitmap (bit i set for id i), and back to an array if adds or discards
+    later leave fewer than one in 64. bits() returns the set as an integer
+    bitmap, so intersections, unions and overlap counts over many sets are
+    a handful of big-integer operations.
     """
-    __slots__ = ['children', 'product_ids', 'is_end']
+    __slots__ = ['_ids', '_bitmap', '_count']
     
     def __init__(self):
-        self.children: Dict[str, 'TrieNode'] = {}
-        self.product_ids: Set[str] = set()  # Products whose title starts with this prefix
-        self.is_end: bool = False
+        self._ids: Any = None  # None when empty, an int, or a sorted array('I')
+        self._bitmap: Optional[bytearray] = None
+        self._count = 0  # only kept for the bitmap form
+    
+    def __len__(self) -> int:
+        if self._bitmap is not None:
+            return self._count
+        ids = self._ids
+        if ids is None:
+            return 0
+        return 1 if type(ids) is int else len(ids)
+    
+    def __contains__(self, product_id: int) -> bool:
+        bitmap = self._bitmap
+        if bitmap is not None:
+            byte = product_id >> 3
+            return byte < len(bitmap) and bool(bitmap[byte] >> (product_id & 7) & 1)
+        ids = self._ids
+        if ids is None or type(ids) is int:
+            return ids == product_id
+        i = bisect.bisect_left(ids, product_id)
+        return i < len(ids) and ids[i] == product_id
+    
+    def __iter__(self) -> Iterator[int]:
+        if self._bitmap is not None:
+            return _bitmap_ids(self._bitmap)
+        ids = self._ids
+        if ids is None:
+            return iter(())
+        return iter((ids,)) if type(ids) is int else iter(ids)
+    
+    def add(self, product_id: int):
+        if self._bitmap is not None:
+            self._bitmap_add(product_id)
+            return
+        ids = self._ids
+        if ids is None:
+            self._ids = product_id
+            return
+        if type(ids) is int:
+            if ids == product_id:
+                return
+            ids = self._ids = array('I', sorted((ids, product_id)))
+        elif ids[-1] >= product_id:
+            i = bisect.bisect_left(ids, product_id)
+            if ids[i] == product_id:
+                return
+            ids.insert(i, product_id)
+        else:
+            ids.append(product_id)
+        if len(ids) * 16 > ids[-1]:
+            self._to_bitmap()
+    
+    def _bitmap_add(self, product_id: int):
+        bitmap = self._bitmap
+        byte = product_id >> 3
+        if byte >= len(bitmap):
+            if self._count * 64 < product_id:
+                self._to_array()
+                self.add(product_id)
+                return
+            bitmap.extend(bytes(byte + 1 - len(bitmap)))
+        mask = 1 << (product_id & 7)
+        if not bitmap[byte] & mask:
+            bitmap[byte] |= mask
+            self._count += 1
+    
+    def discard(self, product_id: int):
+        bitmap = self._bitmap
+        if bitmap is not None:
+            byte = product_id >> 3
+            mask = 1 << (product_id & 7)
+            if byte < len(bitmap) and bitmap[byte] & mask:
+                bitmap[byte] &= ~mask & 0xFF
+                self._count -= 1
+                if self._count * 64 < len(bitmap) * 8:
+                    self._to_array()
+            return
+        ids = self._ids
+        if ids is None or type(ids) is int:
+            if ids == product_id:
+                self._ids = None
+            return
+        i = bisect.bisect_left(ids, product_id)
+        if i < len(ids) and ids[i] == product_id:
+            del ids[i]
+            if len(ids) == 1:
+                self._ids = ids[0]
+    
+    def bits(self) -> int:
+        """The set as an integer with bit i set for each id i."""
+        bitmap = self._bitmap
+        if bitmap is None:
+            ids = self._ids
+            if ids is None:
+                return 0
+            if type(ids) is int:
+                return 1 << ids
+            bitmap = self._ids_bitmap(ids)
+        return int.from_bytes(bitmap, 'little')
+    
+    @staticmethod
+    def _ids_bitmap(ids: array) -> bytearray:
+        bitmap = bytearray((ids[-1] >> 3) + 1 if ids else 0)
+        for product_id in ids:
+            bitmap[product_id >> 3] |= 1 << (product_id & 7)
+        return bitmap
+    
+    def _to_bitmap(self):
+        ids = self._ids
+        self._bitmap, self._count, self._ids = self._ids_bitmap(ids), len(ids), None
+    
+    def _to_array(self):
+        ids = array('I', _bitmap_ids(self._bitmap))
+        self._ids = ids if len(ids) > 1 else (ids[0] if ids else None)
+        self._bitmap, self._count = None, 0
+
+
+class PrefixIndex:
+    """
+    Normalized titles kept in sorted order, with their dense product ids
+    alongside.
+    
+    All titles sharing a prefix form one contiguous run, found with two
+    binary searches in O(k log n). Unlike a trie, which holds a node and a
+    copy of the matching ids for every character of every title, this
+    costs one list slot and 4 bytes per product.
+    
+    Among equal keys, entries stay in the order they were added. Entries
+    are not removed one at a time, which would shift the whole list; the
+    owner drops the ids it no longer wants in one compact() pass.
+    """
+    __slots__ = ['_keys', '_ids']
+    
+    def __init__(self, entries: Optional[List[Tuple[str, int]]] = None):
+        entries = sorted(entries or (), key=lambda entry: entry[0])
+        self._keys: List[str] = [key for key, _ in entries]
+        self._ids = array('I', [product_id for _, product_id in entries])
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def add(self, key: str, product_id: int):
+        i = bisect.bisect_right(self._keys, key)
+        self._keys.insert(i, key)
+        self._ids.insert(i, product_id)
+    
+    def compact(self, dead: Set[int]):
+        """Drop the entries of the given ids. Complexity: O(n)"""
+        kept = [i for i, product_id in enumerate(self._ids) if product_id not in dead]
+        keys = self._keys
+        self._keys = [keys[i] for i in kept]
+        self._ids = array('I', [self._ids[i] for i in kept])
+    
+    def range(self, prefix: str) -> Tuple[int, int]:
+        """Positions [lo, hi) of the keys starting with prefix."""
+        keys = self._keys
+        lo = bisect.bisect_left(keys, prefix)
+        return lo, bisect.bisect_left(keys, prefix + '\U0010ffff', lo)
+    
+    def entries(self, lo: int, hi: int) -> Iterator[Tuple[str, int]]:
+        return zip(self._keys[lo:hi], self._ids[lo:hi])
 
 
 class BKTreeNode:
     """
     BK-Tree node for efficient fuzzy matching.
     Enables O(log n) fuzzy searches instead of O(n).
+    Products containing the word are looked up in the token index.
     """
-    __slots__ = ['word', 'product_ids', 'children']
+    __slots__ = ['word', 'children']
     
     def __init__(self, word: str):
         self.word = word
-        self.product_ids: Set[str] = set()
         self.children: Dict[int, 'BKTreeNode'] = {}
 
 
@@ -109,176 +343,397 @@ class SearchSuggestionsEngine:
     <100ms response time for 200k+ product catalogs.
     
     Data Structures:
+    - Dense ids: products are numbered 0, 1, 2, ... as they are indexed and
+      every index stores those numbers in IdSets (sorted int arrays, or
+      bitmaps once dense) rather than sets of product ID strings
     - Inverted Index: O(1) substring lookups via n-gram indexing
-    - Trie: O(k) prefix matching where k = query length
-    - BK-Tree: O(log n) fuzzy matching with edit distance
-    - Category Index: O(1) category filtering
-    - Precomputed Token Sets: O(1) token overlap calculation
+    - Prefix Index: O(k log n) prefix matching over sorted titles
+    - BK-Tree: O(log n) fuzzy matching with edit distance, built on first use
+    - Category Index: category bitmaps, applied as one bitwise AND
+    - Token Index: O(|query| log n) token overlap calculation
     
     Preprocessing: O(n log n) one-time cost
     Per-query: O(k + m log m) where k = query length, m = result count
+    
+    Removal is O(k) in the product's text length. The id sets drop the
+    product right away; the title index, the BK-Tree and the catalog list
+    keep tombstones, compacted once they pass COMPACTION_RATIO of entries.
     """
     
-    def __init__(self, catalog: List[Product], enable_profiling: bool = False):
-        self.catalog = catalog
+    # Fraction of dead entries at which a structure is compacted
+    COMPACTION_RATIO = 0.25
+    
+    # Substring pools kept for prefix extension, see _substring_pool
+    SUBSTRING_POOL_SIZE = 64
+    
+    def __init__(
+        self,
+        catalog: List[Product],
+        enable_profiling: bool = False,
+        cache_size: int = 1000,
+        cache_ttl: float = 300.0
+    ):
+        # Catalog in insertion order; entries of removed or replaced
+        # products are dropped lazily, see the catalog property
+        self._catalog = catalog
+        self._catalog_stale = 0
         self.enable_profiling = enable_profiling
         self.query_log: List[Dict[str, Any]] = []
         self._performance_stats = {
             'queries_processed': 0,
             'avg_response_time_ms': 0.0,
             'cache_hit_rate': 0.0,
+            'cache_evictions': 0,
+            'cache_invalidations': 0,
+            'cache_updates': 0,
             'products_scanned': 0,
             'index_size_bytes': 0
         }
         
-        self._query_cache: Dict[str, SearchSuggestionsResult] = {}
+        # LRU query cache, least recently used first. Entries expire after
+        # cache_ttl seconds; a catalog change only updates or drops those
+        # the changed product matches, see _update_cache.
+        self._query_cache: Dict[str, CachedSuggestions] = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
         self._cache_hits = 0
         self._cache_misses = 0
         
+        # Normalized query -> dense ids of the products containing it, for
+        # the last SUBSTRING_POOL_SIZE queries of at least _ngram_size chars
+        self._substring_pools: Dict[str, IdSet] = OrderedDict()
+        
         # === OPTIMIZED INDEX STRUCTURES ===
         # Product lookup by ID - O(1)
         self._product_by_id: Dict[str, Product] = {}
         
-        # Inverted index: substring -> set of product IDs - O(1) lookup
-        self._substring_index: Dict[str, Set[str]] = defaultdict(set)
+        # Dense ids: product ID -> dense id, and dense id -> product (None
+        # once removed). A removed product's title entry stays behind as a
+        # tombstone, so its dense id is only reused (from _free_ids) after
+        # the title index has been compacted.
+        self._dense_ids: Dict[str, int] = {}
+        self._products: List[Optional[Product]] = []
+        self._dead_ids: Set[int] = set()
+        self._free_ids: List[int] = []
         
-        # Trie for prefix matching - O(k) lookup
-        self._title_trie: TrieNode = TrieNode()
+        # Inverted index: substring -> dense ids - O(1) lookup
+        self._substring_index: Dict[str, IdSet] = defaultdict(IdSet)
         
-        # Exact title match index - O(1) lookup
-        self._exact_title_index: Dict[str, str] = {}
+        # Sorted normalized titles for prefix and exact title matching
+        self._title_index = PrefixIndex()
         
-        # Category index: category -> set of product IDs - O(1) filtering
-        self._category_index: Dict[str, Set[str]] = defaultdict(set)
+        # Category index: category -> dense ids, dense enough to be bitmaps
+        self._category_index: Dict[str, IdSet] = defaultdict(IdSet)
         
-        # Precomputed token sets per product - O(1) overlap calculation
-        self._product_tokens: Dict[str, Set[str]] = {}
+        # Precomputed lowercase titles, descriptions and tags by dense id
+        self._product_title_lower: List[str] = []
+        self._product_desc_lower: List[str] = []
+        self._product_tags_lower: List[Tuple[str, ...]] = []
         
-        # Precomputed lowercase titles and descriptions
-        self._product_title_lower: Dict[str, str] = {}
-        self._product_desc_lower: Dict[str, str] = {}
-        self._product_tags_lower: Dict[str, List[str]] = {}
-        
-        # BK-Tree for fuzzy matching - O(log n) fuzzy search
+        # BK-Tree for fuzzy matching - O(log n) fuzzy search, built from the
+        # token index the first time it is searched
         self._bk_tree_root: Optional[BKTreeNode] = None
-        self._token_to_products: Dict[str, Set[str]] = defaultdict(set)
+        self._bk_tree_built = False
+        self._bk_tree_size = 0  # words in the tree, including dead ones
+        self._token_to_products: Dict[str, IdSet] = defaultdict(IdSet)
         
         # N-gram index for substring matching (trigrams)
-        self._ngram_index: Dict[str, Set[str]] = defaultdict(set)
+        self._ngram_index: Dict[str, IdSet] = defaultdict(IdSet)
         self._ngram_size = 3
         
         # Build all indexes during initialization
         self._build_indexes()
     
+    @property
+    def catalog(self) -> List[Product]:
+        """Products in the catalog, in the order they were added."""
+        if self._catalog_stale:
+            self._compact_catalog()
+        return self._catalog
+    
     def _build_indexes(self):
         """
         Build all index structures during initialization.
         Complexity: O(n × k) where n = products, k = avg text length
         """
-        all_tokens: Set[str] = set()
-        
-        for product in self.catalog:
-            pid = product.product_id
-            self._product_by_id[pid] = product
-            
-            # Precompute lowercase versions
-            title_lower = product.title.lower()
-            desc_lower = product.description.lower()
-            tags_lower = [tag.lower() for tag in product.tags]
-            
-            self._product_title_lower[pid] = title_lower
-            self._product_desc_lower[pid] = desc_lower
-            self._product_tags_lower[pid] = tags_lower
-            
-            # Category index
-            self._category_index[product.category.value].add(pid)
-            
-            # Exact title match index (normalized)
-            title_normalized = self._normalize_text(product.title)
-            self._exact_title_index[title_normalized] = pid
-            
-            # Build Trie for prefix matching
-            self._insert_into_trie(title_normalized, pid)
-            
-            # Tokenize and store
-            product_text = f"{product.title} {product.description}"
-            tokens = self._tokenize(product_text)
-            token_set = set(tokens)
-            self._product_tokens[pid] = token_set
-            
-            # Token to product mapping for fuzzy matching
-            for token in token_set:
-                self._token_to_products[token].add(pid)
-                all_tokens.add(token)
-            
-            # Build n-gram index for substring matching
-            self._index_ngrams(title_lower, pid)
-            self._index_ngrams(desc_lower, pid)
-            for tag in tags_lower:
-                self._index_ngrams(tag, pid)
-        
-        # Build BK-Tree from all unique tokens
-        self._build_bk_tree(list(all_tokens))
+        titles: List[Tuple[str, int]] = []
+        for product in self._catalog:
+            titles.append((self._index_product(product), self._dense_ids[product.product_id]))
+        self._title_index = PrefixIndex(titles)
         
         # Update index size stats
         self._update_index_stats()
     
-    def _index_ngrams(self, text: str, product_id: str):
+    def _index_product(self, product: Product) -> str:
+        """
+        Give a product a free dense id and add it to every index except
+        the title index. Returns its normalized title.
+        """
+        pid = product.product_id
+        if pid in self._dense_ids:
+            self._unindex_product(pid)
+        dense_id = self._free_ids.pop() if self._free_ids else len(self._products)
+        if dense_id == len(self._products):
+            self._products.append(None)
+            self._product_title_lower.append('')
+            self._product_desc_lower.append('')
+            self._product_tags_lower.append(())
+        self._product_by_id[pid] = product
+        self._dense_ids[pid] = dense_id
+        self._products[dense_id] = product
+        
+        # Precompute lowercase versions, sharing strings already lowercase
+        self._product_title_lower[dense_id] = self._lower(product.title)
+        self._product_desc_lower[dense_id] = self._lower(product.description)
+        self._product_tags_lower[dense_id] = tuple(self._lower(tag) for tag in product.tags)
+        
+        # Category index
+        self._category_index[product.category.value].add(dense_id)
+        
+        # Tokenize and store; a new token also goes into a built BK-Tree
+        product_text = f"{product.title} {product.description}"
+        for token in set(self._tokenize(product_text)):
+            products = self._token_to_products[token]
+            if not products and self._bk_tree_built:
+                self._bk_tree_add(token)
+            products.add(dense_id)
+        
+        # Build n-gram and word indexes for substring matching
+        ngrams, words = self._product_keys(dense_id)
+        for ngram in ngrams:
+            self._ngram_index[ngram].add(dense_id)
+        for word in words:
+            self._substring_index[word].add(dense_id)
+        
+        for query, pool in self._substring_pools.items():
+            if self._contains(dense_id, query):
+                pool.add(dense_id)
+        
+        return self._normalize_text(product.title)
+    
+    def _unindex_product(self, product_id: str):
+        """
+        Retire a product's dense id and remove it from every index but the
+        title index, where its entry is left as a tombstone.
+        Complexity: O(k) where k = product text length
+        """
+        dense_id = self._dense_ids.pop(product_id)
+        product = self._products[dense_id]
+        self._products[dense_id] = None
+        self._dead_ids.add(dense_id)
+        self._catalog_stale += 1
+        
+        self._discard(self._category_index, product.category.value, dense_id)
+        
+        product_text = f"{product.title} {product.description}"
+        for token in set(self._tokenize(product_text)):
+            self._discard(self._token_to_products, token, dense_id)
+        
+        ngrams, words = self._product_keys(dense_id)
+        for ngram in ngrams:
+            self._discard(self._ngram_index, ngram, dense_id)
+        for word in words:
+            self._discard(self._substring_index, word, dense_id)
+        
+        for query, pool in self._substring_pools.items():
+            if self._contains(dense_id, query):
+                pool.discard(dense_id)
+        
+        self._product_title_lower[dense_id] = ''
+        self._product_desc_lower[dense_id] = ''
+        self._product_tags_lower[dense_id] = ()
+    
+    @staticmethod
+    def _discard(index: Dict[str, IdSet], key: str, dense_id: int):
+        """Remove a dense id from index[key], dropping the key once empty."""
+        products = index[key]
+        products.discard(dense_id)
+        if not products:
+            del index[key]
+    
+    def _compact_indexes(self):
+        """
+        Compact each structure whose tombstones exceed COMPACTION_RATIO of
+        its entries. Each compaction is O(n) and follows at least
+        COMPACTION_RATIO × n removals, so O(1) amortized per removal.
+        """
+        ratio = self.COMPACTION_RATIO
+        
+        # Title index: purge removed products, then free their dense ids,
+        # lowest first to keep the bitmaps short
+        if len(self._dead_ids) > len(self._title_index) * ratio:
+            self._title_index.compact(self._dead_ids)
+            self._free_ids = sorted(self._free_ids + list(self._dead_ids), reverse=True)
+            self._dead_ids = set()
+        
+        # BK-Tree: words no product holds any more. Dropped, to be rebuilt
+        # from the token index on its next search.
+        dead_words = self._bk_tree_size - len(self._token_to_products)
+        if self._bk_tree_built and dead_words > self._bk_tree_size * ratio:
+            self._bk_tree_root = None
+            self._bk_tree_built = False
+            self._bk_tree_size = 0
+        
+        if self._catalog_stale > len(self._catalog) * ratio:
+            self._compact_catalog()
+    
+    def _compact_catalog(self):
+        """Drop catalog entries of removed or replaced products."""
+        # The last entry of a product ID is its current one
+        kept: List[Product] = []
+        seen: Set[str] = set()
+        for product in reversed(self._catalog):
+            pid = product.product_id
+            if pid not in seen and self._product_by_id.get(pid) is product:
+                seen.add(pid)
+                kept.append(product)
+        kept.reverse()
+        self._catalog = kept
+        self._catalog_stale = 0
+    
+    def _query_ngrams(self, query_normalized: str) -> Set[str]:
+        """N-grams of the query, padded like indexed text."""
+        padded_query = f"$${query_normalized}$$"
+        return {
+            padded_query[i:i + self._ngram_size]
+            for i in range(len(padded_query) - self._ngram_size + 1)
+        }
+    
+    def _candidate_match(
+        self,
+        dense_id: int,
+        query_normalized: str,
+        category_filter: Optional[str],
+        ngrams: Set[str],
+        words: Set[str]
+    ) -> Optional[str]:
+        """
+        Match type _find_candidates_optimized gives a product, or None,
+        given its n-gram and substring index keys. A title equal to the
+        query gives "exact" even outside the category, as it still decides
+        which product is the exact match.
+        """
+        product = self._products[dense_id]
+        title_normalized = self._normalize_text(product.title)
+        if title_normalized == query_normalized:
+            return "exact"
+        if category_filter and product.category.value != category_filter:
+            return None
+        if title_normalized.startswith(query_normalized):
+            return "prefix"
+        query_ngrams = self._query_ngrams(query_normalized)
+        if len(query_ngrams & ngrams) >= max(1, len(query_ngrams) // 2) and self._contains(dense_id, query_normalized):
+            return "substring"
+        if query_normalized in words:
+            return "substring"
+        return None
+    
+    def _contains(self, dense_id: int, text: str) -> bool:
+        """Whether a product's title, description or a tag contains text."""
+        if text in self._product_title_lower[dense_id] or text in self._product_desc_lower[dense_id]:
+            return True
+        for tag in self._product_tags_lower[dense_id]:
+            if text in tag:
+                return True
+        return False
+    
+    def _substring_pool(self, query_normalized: str) -> IdSet:
+        """
+        Dense ids of the products whose title, description or a tag
+        contains the query, which is at least _ngram_size long.
+        
+        Such a product holds every n-gram inside the query, so the
+        candidates are the intersection of those n-gram bitmaps. When a
+        shorter prefix of the query has a pool, which is the case for
+        every keystroke after the third, its products are filtered
+        instead, without going back to the n-gram index.
+        """
+        pools = self._substring_pools
+        pool = pools.get(query_normalized)
+        if pool is not None:
+            pools.move_to_end(query_normalized)
+            return pool
+        
+        for end in range(len(query_normalized) - 1, self._ngram_size - 1, -1):
+            prefix_pool = pools.get(query_normalized[:end])
+            if prefix_pool is not None:
+                dense_ids = iter(prefix_pool)
+                break
+        else:
+            bits = None
+            for i in range(len(query_normalized) - self._ngram_size + 1):
+                ngram_products = self._ngram_index.get(query_normalized[i:i + self._ngram_size])
+                if ngram_products is None:
+                    bits = 0
+                    break
+                bits = ngram_products.bits() if bits is None else bits & ngram_products.bits()
+            dense_ids = _int_ids(bits)
+        
+        pool = IdSet()
+        for dense_id in dense_ids:
+            if self._contains(dense_id, query_normalized):
+                pool.add(dense_id)
+        pools[query_normalized] = pool
+        if len(pools) > self.SUBSTRING_POOL_SIZE:
+            pools.popitem(last=False)
+        return pool
+    
+    def _product_keys(self, dense_id: int) -> Tuple[Set[str], Set[str]]:
+        """The n-gram and substring index keys of a product."""
+        ngrams: Set[str] = set()
+        words: Set[str] = set()
+        self._collect_ngrams(self._product_title_lower[dense_id], ngrams, words)
+        self._collect_ngrams(self._product_desc_lower[dense_id], ngrams, words)
+        for tag in self._product_tags_lower[dense_id]:
+            self._collect_ngrams(tag, ngrams, words)
+        return ngrams, words
+    
+    @staticmethod
+    def _lower(text: str) -> str:
+        lowered = text.lower()
+        return text if lowered == text else lowered
+    
+    def _collect_ngrams(self, text: str, ngrams: Set[str], words: Set[str]):
         """
-        Index text using n-grams for efficient substring matching.
+        Collect the n-grams and substring index keys of text.
         """
         # Add padding for edge matching
         padded = f"$${text}$$"
         for i in range(len(padded) - self._ngram_size + 1):
-            ngram = padded[i:i + self._ngram_size]
-            self._ngram_index[ngram].add(product_id)
+            ngrams.add(padded[i:i + self._ngram_size])
         
         # Also index full words for exact substring matching
         normalized = self._normalize_text(text)
-        self._substring_index[normalized].add(product_id)
+        words.add(text if normalized == text else normalized)
         
         # Index each word separately
-        words = re.findall(r'\w+', normalized)
-        for word in words:
-            self._substring_index[word].add(product_id)
-    
-    def _insert_into_trie(self, text: str, product_id: str):
-        """
-        Insert text into Trie for O(k) prefix matching.
-        """
-        node = self._title_trie
-        for char in text:
-            if char not in node.children:
-                node.children[char] = TrieNode()
-            node = node.children[char]
-            node.product_ids.add(product_id)
-        node.is_end = True
+        words.update(re.findall(r'\w+', normalized))
     
-    def _search_trie_prefix(self, prefix: str) -> Set[str]:
+    def _search_prefix(self, prefix: str) -> Iterator[Tuple[str, int]]:
         """
-        Find all products whose title starts with the given prefix.
-        Complexity: O(k) where k = prefix length
+        (normalized title, dense id) of the products whose title starts
+        with the given prefix.
+        Complexity: O(k log n) where k = prefix length
         """
-        node = self._title_trie
-        for char in prefix:
-            if char not in node.children:
-                return set()
-            node = node.children[char]
-        return node.product_ids.copy()
+        return self._title_index.entries(*self._title_index.range(prefix))
     
     def _build_bk_tree(self, words: List[str]):
         """
         Build BK-Tree for efficient fuzzy matching.
         Complexity: O(n log n)
         """
-        if not words:
-            return
-        
-        self._bk_tree_root = BKTreeNode(words[0])
-        for product_id in self._token_to_products.get(words[0], set()):
-            self._bk_tree_root.product_ids.add(product_id)
-        
-        for word in words[1:]:
+        self._bk_tree_built = True
+        self._bk_tree_root = None
+        self._bk_tree_size = 0
+        for word in words:
+            self._bk_tree_add(word)
+    
+    def _bk_tree_add(self, word: str):
+        """Add a word to a BK-Tree already built."""
+        if self._bk_tree_root is None:
+            self._bk_tree_root = BKTreeNode(word)
+            self._bk_tree_size = 1
+        else:
             self._bk_tree_insert(self._bk_tree_root, word)
     
     def _bk_tree_insert(self, node: BKTreeNode, word: str):
@@ -286,28 +741,27 @@ class SearchSuggestionsEngine:
         dist = self._calculate_edit_distance(word, node.word)
         
         if dist == 0:
-            # Same word, just add product IDs
-            for pid in self._token_to_products.get(word, set()):
-                node.product_ids.add(pid)
+            # Same word, products come from the token index
             return
         
         if dist in node.children:
             self._bk_tree_insert(node.children[dist], word)
         else:
-            new_node = BKTreeNode(word)
-            for pid in self._token_to_products.get(word, set()):
-                new_node.product_ids.add(pid)
-            node.children[dist] = new_node
+            node.children[dist] = BKTreeNode(word)
+            self._bk_tree_size += 1
     
-    def _bk_tree_search(self, word: str, max_distance: int) -> Set[str]:
+    def _bk_tree_search(self, word: str, max_distance: int) -> Set[int]:
         """
         Search BK-Tree for words within edit distance.
+        Returns the dense ids of the products containing them.
         Complexity: O(log n) average case
         """
+        if not self._bk_tree_built:
+            self._build_bk_tree(list(self._token_to_products))
         if self._bk_tree_root is None:
             return set()
         
-        results: Set[str] = set()
+        results: Set[int] = set()
         self._bk_tree_search_recursive(self._bk_tree_root, word, max_distance, results)
         return results
     
@@ -316,13 +770,13 @@ class SearchSuggestionsEngine:
         node: BKTreeNode, 
         word: str, 
         max_distance: int,
-        results: Set[str]
+        results: Set[int]
     ):
         """Recursive BK-Tree search."""
         dist = self._calculate_edit_distance(word, node.word)
         
         if dist <= max_distance:
-            results.update(node.product_ids)
+            results.update(self._token_to_products.get(node.word, ()))
         
         # Only search children within the valid distance range
         low = max(0, dist - max_distance)
@@ -340,7 +794,7 @@ class SearchSuggestionsEngine:
         index_size += len(self._substring_index) * 50  # Substring index
         index_size += len(self._ngram_index) * 30  # N-gram index
         index_size += len(self._category_index) * 20  # Category index
-        index_size += len(self._product_tokens) * 40  # Token sets
+        index_size += len(self._token_to_products) * 40  # Token index
         self._performance_stats['index_size_bytes'] = index_size
     
     def _log_query_performance(self, query: str, phase: str, duration_ms: float):
@@ -492,89 +946,87 @@ class SearchSuggestionsEngine:
         self,
         query_normalized: str,
         category_filter: Optional[str]
-    ) -> Dict[str, str]:
+    ) -> Dict[int, str]:
         """
         Find matching candidates using index structures.
-        Returns dict of product_id -> match_type
+        Returns dict of dense id -> match_type
         
-        Complexity: O(k + m) where k = query length, m = result count
-        Instead of O(n) full catalog scan
+        Complexity: O(k log n + m) where k = query length, m = result count
+        Instead of O(n) full catalog scan. The category filter and the
+        n-gram overlap count are bitwise operations over id bitmaps.
         """
-        candidates: Dict[str, str] = {}
+        candidates: Dict[int, str] = {}
         
-        # Get category-filtered product IDs if needed
-        category_products: Optional[Set[str]] = None
+        # Get category-filtered dense ids if needed
+        category_products: Optional[IdSet] = None
         if category_filter:
-            category_products = self._category_index.get(category_filter, set())
+            category_products = self._category_index.get(category_filter)
             if not category_products:
                 return candidates
-        
-        # 1. Check exact title match - O(1)
-        if query_normalized in self._exact_title_index:
-            pid = self._exact_title_index[query_normalized]
-            if category_products is None or pid in category_products:
-                candidates[pid] = "exact"
-        
-        # 2. Prefix matching using Trie - O(k)
-        prefix_matches = self._search_trie_prefix(query_normalized)
-        for pid in prefix_matches:
-            if pid not in candidates:
-                # Skip if product was removed (Trie may still have stale references)
-                if pid not in self._product_by_id:
-                    continue
-                if category_products is None or pid in category_products:
-                    # Verify it's actually a prefix match (not exact)
-                    title_normalized = self._normalize_text(self._product_by_id[pid].title)
-                    if title_normalized != query_normalized:
-                        candidates[pid] = "prefix"
-        
-        # 3. Substring matching using n-gram index - O(k + m)
-        # Generate n-grams from query
-        query_ngrams = set()
-        padded_query = f"$${query_normalized}$$"
-        for i in range(len(padded_query) - self._ngram_size + 1):
-            query_ngrams.add(padded_query[i:i + self._ngram_size])
-        
-        # Find candidate products that share n-grams
-        ngram_candidates: Dict[str, int] = defaultdict(int)
-        for ngram in query_ngrams:
-            for pid in self._ngram_index.get(ngram, set()):
-                if pid not in candidates:
-                    if category_products is None or pid in category_products:
-                        ngram_candidates[pid] += 1
-        
-        # Filter candidates that have enough n-gram overlap
+        products = self._products
+        
+        # 1. Exact and prefix title matches from the sorted titles. An
+        # exact match is the product indexed last under that title.
+        exact_id = None
+        for title_normalized, dense_id in self._search_prefix(query_normalized):
+            if products[dense_id] is None:
+                # Tombstone of a removed product
+                continue
+            if title_normalized == query_normalized:
+                exact_id = dense_id
+            elif category_products is None or dense_id in category_products:
+                candidates[dense_id] = "prefix"
+        if exact_id is not None and (category_products is None or exact_id in category_products):
+            candidates = {exact_id: "exact", **candidates}
+        
+        # 2. Substring matching using n-gram index
+        query_ngrams = self._query_ngrams(query_normalized)
+        
+        # Products containing the query and sharing enough n-grams with it,
+        # within the category and not yet matched
         min_ngram_overlap = max(1, len(query_ngrams) // 2)
-        for pid, count in ngram_candidates.items():
-            if count >= min_ngram_overlap and pid not in candidates:
-                # Skip if product was removed
-                if pid not in self._product_by_id:
+        if len(query_normalized) >= self._ngram_size:
+            # Products containing the query hold all its inner n-grams; only
+            # the padded ones at its ends are left to count
+            inner_ngrams = {
+                query_normalized[i:i + self._ngram_size]
+                for i in range(len(query_normalized) - self._ngram_size + 1)
+            }
+            missing = min_ngram_overlap - len(inner_ngrams)
+            edge_ngram_products = [
+                self._ngram_index[ngram]
+                for ngram in query_ngrams - inner_ngrams if ngram in self._ngram_index
+            ]
+            for dense_id in self._substring_pool(query_normalized):
+                if dense_id in candidates:
+                    continue
+                if category_products is not None and dense_id not in category_products:
+                    continue
+                if missing > 0 and sum(dense_id in ids for ids in edge_ngram_products) < missing:
                     continue
+                candidates[dense_id] = "substring"
+        else:
+            # Counted over the n-gram bitmaps at once
+            ngram_bitmaps = [
+                self._ngram_index[ngram].bits()
+                for ngram in query_ngrams if ngram in self._ngram_index
+            ]
+            overlapping = _at_least(ngram_bitmaps, min_ngram_overlap)
+            if overlapping and category_products is not None:
+                overlapping &= category_products.bits()
+            
+            for dense_id in _int_ids(overlapping):
                 # Verify actual substring match
-                product = self._product_by_id[pid]
-                title_lower = self._product_title_lower[pid]
-                desc_lower = self._product_desc_lower[pid]
-                tags_lower = self._product_tags_lower[pid]
-                
-                if query_normalized in title_lower:
-                    candidates[pid] = "substring"
-                elif query_normalized in desc_lower:
-                    candidates[pid] = "substring"
-                else:
-                    for tag in tags_lower:
-                        if query_normalized in tag:
-                            candidates[pid] = "substring"
-                            break
-        
-        # 4. Also check direct substring index for exact word matches
-        if query_normalized in self._substring_index:
-            for pid in self._substring_index[query_normalized]:
-                if pid not in candidates:
-                    # Skip if product was removed
-                    if pid not in self._product_by_id:
-                        continue
-                    if category_products is None or pid in category_products:
-                        candidates[pid] = "substring"
+                if dense_id not in candidates and self._contains(dense_id, query_normalized):
+                    candidates[dense_id] = "substring"
+        
+        # 3. Also check direct substring index for exact word matches
+        word_products = self._substring_index.get(query_normalized)
+        if word_products:
+            for dense_id in word_products:
+                if dense_id not in candidates:
+                    if category_products is None or dense_id in category_products:
+                        candidates[dense_id] = "substring"
         
         return candidates
     
@@ -584,42 +1036,17 @@ class SearchSuggestionsEngine:
         Supports incremental updates without full rebuild.
         Complexity: O(k log n) where k = product text length
         """
-        self.catalog.append(product)
         pid = product.product_id
-        self._product_by_id[pid] = product
-        
-        # Update all indexes
-        title_lower = product.title.lower()
-        desc_lower = product.description.lower()
-        tags_lower = [tag.lower() for tag in product.tags]
-        
-        self._product_title_lower[pid] = title_lower
-        self._product_desc_lower[pid] = desc_lower
-        self._product_tags_lower[pid] = tags_lower
-        
-        self._category_index[product.category.value].add(pid)
-        
-        title_normalized = self._normalize_text(product.title)
-        self._exact_title_index[title_normalized] = pid
-        self._insert_into_trie(title_normalized, pid)
-        
-        product_text = f"{product.title} {product.description}"
-        tokens = self._tokenize(product_text)
-        token_set = set(tokens)
-        self._product_tokens[pid] = token_set
-        
-        for token in token_set:
-            self._token_to_products[token].add(pid)
-            if self._bk_tree_root:
-                self._bk_tree_insert(self._bk_tree_root, token)
-        
-        self._index_ngrams(title_lower, pid)
-        self._index_ngrams(desc_lower, pid)
-        for tag in tags_lower:
-            self._index_ngrams(tag, pid)
-        
-        # Invalidate cache
-        self._query_cache.clear()
+        if pid in self._dense_ids:
+            # The product it replaces leaves the cached results first
+            self._update_cache(self._dense_ids[pid], added=False)
+        self._catalog.append(product)
+        title_normalized = self._index_product(product)
+        dense_id = self._dense_ids[pid]
+        self._title_index.add(title_normalized, dense_id)
+        
+        self._update_cache(dense_id, added=True)
+        self._compact_indexes()
         self._update_index_stats()
     
     def remove_product(self, product_id: str):
@@ -631,39 +1058,82 @@ class SearchSuggestionsEngine:
         if product_id not in self._product_by_id:
             return
         
-        product = self._product_by_id[product_id]
-        
-        # Remove from catalog
-        self.catalog = [p for p in self.catalog if p.product_id != product_id]
+        # Update cached results while the product is still indexed
+        self._update_cache(self._dense_ids[product_id], added=False)
         
-        # Remove from all indexes
+        # Remove from all indexes; the catalog list entry is dropped lazily
+        self._unindex_product(product_id)
         del self._product_by_id[product_id]
         
-        title_normalized = self._normalize_text(product.title)
-        if title_normalized in self._exact_title_index:
-            if self._exact_title_index[title_normalized] == product_id:
-                del self._exact_title_index[title_normalized]
-        
-        self._category_index[product.category.value].discard(product_id)
-        
-        # Remove from token index
-        if product_id in self._product_tokens:
-            for token in self._product_tokens[product_id]:
-                self._token_to_products[token].discard(product_id)
-            del self._product_tokens[product_id]
-        
-        # Clean up other caches
-        self._product_title_lower.pop(product_id, None)
-        self._product_desc_lower.pop(product_id, None)
-        self._product_tags_lower.pop(product_id, None)
-        
-        # Note: We don't remove from Trie or BK-Tree for efficiency
-        # The product ID check in search will filter them out
-        
-        # Invalidate cache
-        self._query_cache.clear()
+        self._compact_indexes()
         self._update_index_stats()
     
+    def _update_cache(self, dense_id: int, added: bool):
+        """
+        Bring the cached results up to date with a product just added, or
+        about to be removed.
+        
+        Every kind of match needs the query to be a substring of the
+        product's title, description or a tag, so other queries are left
+        alone, as are those the product is no candidate for. A result the
+        product stays out of (added and scoring below the suggestions
+        returned, or removed without being one of them) only has its
+        candidate count updated. The others are dropped.
+        Complexity: O(c + k) where c = cached queries, k = product text length
+        """
+        if not self._query_cache:
+            return
+        product = self._products[dense_id]
+        fields = (product.title, product.description, *product.tags)
+        texts = {text.lower() for text in fields}
+        texts.update(self._normalize_text(text) for text in fields)
+        text_ngrams = {
+            text[i:i + self._ngram_size]
+            for text in texts for i in range(len(text) - self._ngram_size + 1)
+        }
+        ngrams, words = self._product_keys(dense_id)
+        
+        stale = []
+        for key, cached in self._query_cache.items():
+            query_normalized = cached.query_normalized
+            if len(query_normalized) >= self._ngram_size and query_normalized[:self._ngram_size] not in text_ngrams:
+                continue
+            if not any(query_normalized in text for text in texts):
+                continue
+            match_type = self._candidate_match(dense_id, query_normalized, cached.category_filter, ngrams, words)
+            if match_type is None:
+                continue
+            
+            result = cached.result
+            if match_type == "exact":
+                unchanged = False
+            elif added:
+                query_tokens = self._tokenize(query_normalized)
+                query_token_products = [
+                    self._token_to_products[token]
+                    for token in set(query_tokens) if token in self._token_to_products
+                ]
+                score, _ = self._score_candidate(
+                    dense_id, match_type, query_normalized,
+                    query_tokens, query_token_products, cached.enable_fuzzy
+                )
+                unchanged = score < cached.min_score_threshold or (
+                    len(result.suggestions) >= cached.max_results
+                    and (not result.suggestions or score < result.suggestions[-1].relevance_score)
+                )
+            else:
+                unchanged = all(s.product is not product for s in result.suggestions)
+            
+            if unchanged:
+                # A copy, as the caller may hold the cached one
+                cached.result = replace(result, total_candidates=result.total_candidates + (1 if added else -1))
+                self._performance_stats['cache_updates'] += 1
+            else:
+                stale.append(key)
+        for key in stale:
+            del self._query_cache[key]
+        self._performance_stats['cache_invalidations'] += len(stale)
+    
     def generate_search_suggestions(
         self,
         query: str,
@@ -696,13 +1166,19 @@ class SearchSuggestionsEngine:
         
         # Check cache first - O(1)
         cache_key = f"{query}|{max_results}|{enable_fuzzy}|{category_filter}|{min_score_threshold}"
-        if cache_key in self._query_cache:
+        cached = self._query_cache.get(cache_key)
+        if cached is not None and cached.expires_at > start_time:
+            self._query_cache.move_to_end(cache_key)
             self._cache_hits += 1
-            result = self._query_cache[cache_key]
+            self._update_cache_hit_rate()
+            result = cached.result
             result.cache_hit = True
             return result
+        if cached is not None:
+            del self._query_cache[cache_key]  # expired
         
         self._cache_misses += 1
+        self._update_cache_hit_rate()
         query_normalized = self._normalize_text(query)
         
         if not query_normalized:
@@ -721,7 +1197,7 @@ class SearchSuggestionsEngine:
         candidates = self._find_candidates_optimized(query_normalized, category_filter)
         
         # Track products scanned for stats (for compatibility)
-        self._performance_stats['products_scanned'] += len(self.catalog)
+        self._performance_stats['products_scanned'] += len(self._product_by_id)
         
         phase1_time = (time.time() - phase1_start) * 1000
         self._log_query_performance(query, "substring_matching", phase1_time)
@@ -732,55 +1208,26 @@ class SearchSuggestionsEngine:
         query_tokens = self._tokenize(query_normalized)
         query_token_set = set(query_tokens)
         
-        for product_id, match_type in candidates.items():
-            product = self._product_by_id.get(product_id)
+        # Products holding each query token, for the token overlap
+        query_token_products = [
+            self._token_to_products[token]
+            for token in query_token_set if token in self._token_to_products
+        ]
+        
+        for dense_id, match_type in candidates.items():
+            product = self._products[dense_id]
             if product is None:
                 continue
             
-            # Use preserved helper method for scoring
-            base_score = self._calculate_base_relevance_score(
-                product,
+            final_score, actual_match_type = self._score_candidate(
+                dense_id,
+                match_type,
                 query_normalized,
-                match_type
-            )
-            
-            # Optimized token overlap using precomputed sets - O(min(|q|, |p|))
-            product_token_set = self._product_tokens.get(product_id, set())
-            token_overlap = len(query_token_set & product_token_set)
-            
-            if query_tokens:
-                overlap_ratio = token_overlap / len(query_tokens)
-                base_score *= (1.0 + overlap_ratio)
-            
-            # Stock penalty
-            if not product.in_stock:
-                base_score *= 0.5
-            
-            # Use preserved helper method for category boost
-            score_with_category = self._apply_category_boost(
-                base_score,
-                product,
-                query_normalized
+                query_tokens,
+                query_token_products,
+                enable_fuzzy
             )
             
-            # Use preserved helper method for recency boost
-            score_with_recency = score_with_category * self._calculate_recency_boost(product)
-            
-            final_score = score_with_recency
-            actual_match_type = match_type
-            
-            # Apply fuzzy penalty if enabled (using preserved helper method)
-            if enable_fuzzy and match_type == "substring":
-                product_text = f"{product.title} {product.description}"
-                fuzzy_score, is_fuzzy = self._apply_fuzzy_penalty(
-                    score_with_recency,
-                    query_normalized,
-                    product_text
-                )
-                if is_fuzzy:
-                    final_score = fuzzy_score
-                    actual_match_type = "fuzzy"
-            
             if final_score >= min_score_threshold:
                 suggestion = SearchSuggestion(
                     product=product,
@@ -826,13 +1273,80 @@ class SearchSuggestionsEngine:
         result = SearchSuggestionsResult(
             suggestions=top_suggestions,
             total_candidates=len(candidates),
-            products_scanned=len(self.catalog),
+            products_scanned=len(self._product_by_id),
             query_time_ms=total_time,
             cache_hit=False
         )
         
-        # Cache result
-        if len(self._query_cache) < 1000:
-            self._query_cache[cache_key] = result
+        # Cache result, evicting the least recently used
+        if self._cache_size > 0:
+            self._query_cache[cache_key] = CachedSuggestions(
+                result, query_normalized, category_filter,
+                max_results, enable_fuzzy, min_score_threshold,
+                end_time + self._cache_ttl
+            )
+            if len(self._query_cache) > self._cache_size:
+                self._query_cache.popitem(last=False)
+                self._performance_stats['cache_evictions'] += 1
         
         return result
+    
+    def _score_candidate(
+        self,
+        dense_id: int,
+        match_type: str,
+        query_normalized: str,
+        query_tokens: List[str],
+        query_token_products: List[IdSet],
+        enable_fuzzy: bool
+    ) -> Tuple[float, str]:
+        """
+        Relevance score and final match type of a candidate, given the
+        products holding each distinct query token.
+        """
+        product = self._products[dense_id]
+        
+        # Use preserved helper method for scoring
+        base_score = self._calculate_base_relevance_score(
+            product,
+            query_normalized,
+            match_type
+        )
+        
+        # Token overlap from the token index - O(|q| log n)
+        token_overlap = sum(dense_id in products for products in query_token_products)
+        
+        if query_tokens:
+            overlap_ratio = token_overlap / len(query_tokens)
+            base_score *= (1.0 + overlap_ratio)
+        
+        # Stock penalty
+        if not product.in_stock:
+            base_score *= 0.5
+        
+        # Use preserved helper method for category boost
+        score_with_category = self._apply_category_boost(
+            base_score,
+            product,
+            query_normalized
+        )
+        
+        # Use preserved helper method for recency boost
+        score_with_recency = score_with_category * self._calculate_recency_boost(product)
+        
+        # Apply fuzzy penalty if enabled (using preserved helper method)
+        if enable_fuzzy and match_type == "substring":
+            product_text = f"{product.title} {product.description}"
+            fuzzy_score, is_fuzzy = self._apply_fuzzy_penalty(
+                score_with_recency,
+                query_normalized,
+                product_text
+            )
+            if is_fuzzy:
+                return fuzzy_score, "fuzzy"
+        
+        return score_with_recency, match_type
+    
+    def _update_cache_hit_rate(self):
+        lookups = self._cache_hits + self._cache_misses
+        self._performance_stats['cache_hit_rate'] = self._cache_hits / lookups
@@ -30,7 +30,8 @@ from optimized_Search_suggestions_engine_v1 import (
     Product,
     ProductCategory,
     SearchSuggestion,
-    SearchSuggestionsResult
+    SearchSuggestionsResult,
+    IdSet
 )
 
 
@@ -214,6 +215,107 @@ class TestCaching:
         result2 = engine.generate_search_suggestions("wireless")
         assert result2.cache_hit
 
+    def test_lru_eviction_and_expiry(self):
+        engine = SearchSuggestionsEngine(create_catalog(300), cache_size=2)
+        for query in ("wireless", "device", "wireless", "model"):
+            engine.generate_search_suggestions(query)
+        assert engine.generate_search_suggestions("wireless").cache_hit
+        assert not engine.generate_search_suggestions("device").cache_hit
+        assert engine._performance_stats['cache_evictions'] == 2
+        assert engine._performance_stats['cache_hit_rate'] == pytest.approx(2 / 6)
+
+        engine = SearchSuggestionsEngine(create_catalog(300), cache_ttl=0.0)
+        engine.generate_search_suggestions("wireless")
+        assert not engine.generate_search_suggestions("wireless").cache_hit
+
+    def test_catalog_change_invalidates_matching_queries(self, engine):
+        for query in ("wireless", "speaker", "device model 7"):
+            engine.generate_search_suggestions(query)
+        engine.generate_search_suggestions("speaker", category_filter="books")
+
+        engine.add_product(generate_product("speaker_1", "Bluetooth Speaker", ProductCategory.ELECTRONICS))
+        result = engine.generate_search_suggestions("speaker")
+        assert not result.cache_hit
+        assert "speaker_1" in {s.product.product_id for s in result.suggestions}
+        assert engine.generate_search_suggestions("wireless").cache_hit
+        assert engine.generate_search_suggestions("speaker", category_filter="books").cache_hit
+
+        # Not among the top "wireless" suggestions: the cached result stays,
+        # one candidate down
+        before = engine.generate_search_suggestions("wireless")
+        assert "wireless_7" not in {s.product.product_id for s in before.suggestions}
+        engine.remove_product("wireless_7")
+        assert not engine.generate_search_suggestions("device model 7").cache_hit
+        after = engine.generate_search_suggestions("wireless")
+        assert after.cache_hit
+        assert after.total_candidates == before.total_candidates - 1
+        assert engine.generate_search_suggestions("speaker").cache_hit
+
+    def test_prefix_extension_matches_fresh_lookup(self, engine):
+        fresh = SearchSuggestionsEngine(create_catalog(1000))
+        fresh.SUBSTRING_POOL_SIZE = 0
+        typed = "wireless device model 12"
+        for end in range(1, len(typed) + 1):
+            query = typed[:end]
+            for category in (None, "electronics", "books"):
+                expected = fresh._find_candidates_optimized(query, category)
+                assert list(engine._find_candidates_optimized(query, category).items()) == list(expected.items())
+            if end == 10:
+                product = generate_product("wireless_x", "Wireless Device Model 12 Pro")
+                for e in (engine, fresh):
+                    e.remove_product("wireless_12")
+                    e.add_product(product)
+        assert len(engine._substring_pools) == len(typed) - 2
+
+
+class TestIndexStructures:
+    """Verify the dense-id index structures."""
+    
+    def test_id_set_matches_set(self):
+        rng = random.Random(7)
+        for limit in (5, 200, 5000):
+            ids, expected = IdSet(), set()
+            for _ in range(2000):
+                product_id = rng.randrange(limit)
+                if rng.random() < 0.8:
+                    ids.add(product_id)
+                    expected.add(product_id)
+                else:
+                    ids.discard(product_id)
+                    expected.discard(product_id)
+            assert list(ids) == sorted(expected)
+            assert len(ids) == len(expected)
+            assert ids.bits() == sum(1 << i for i in expected)
+            assert all((i in ids) == (i in expected) for i in range(limit))
+    
+    def test_removed_and_readded_products(self):
+        engine = SearchSuggestionsEngine(create_catalog(500))
+        engine.remove_product("wireless_3")
+        result = engine.generate_search_suggestions("wireless device model 3", max_results=50)
+        assert "wireless_3" not in {s.product.product_id for s in result.suggestions}
+        
+        engine.add_product(generate_product("wireless_3", "Wireless Speaker Deluxe", ProductCategory.TOYS))
+        result = engine.generate_search_suggestions("wireless speaker", category_filter="toys")
+        assert [s.product.product_id for s in result.suggestions] == ["wireless_3"]
+        result = engine.generate_search_suggestions("wireless speaker", category_filter="electronics")
+        assert not result.suggestions
+
+    def test_churn_compacts_tombstones(self):
+        engine = SearchSuggestionsEngine(create_catalog(300))
+        rng = random.Random(11)
+        for i in range(2000):
+            engine.remove_product(rng.choice(list(engine._product_by_id)))
+            engine.add_product(generate_product(f"churn_{i}", f"Churned Gadget {i}"))
+
+        assert len(engine.catalog) == 300
+        assert {p.product_id for p in engine.catalog} == set(engine._product_by_id)
+        # Tombstones are at most COMPACTION_RATIO of the title index
+        assert len(engine._products) <= 300 / (1 - SearchSuggestionsEngine.COMPACTION_RATIO) + 1
+        assert len(engine._title_index) <= len(engine._products)
+        assert all(len(ids) for ids in engine._ngram_index.values())
+        result = engine.generate_search_suggestions("churned gadget 1999")
+        assert result.suggestions[0].product.product_id == "churn_1999"
+
 
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
@@ -0,0 +1,87 @@
+"""Benchmark bulk and sharded indexing against add_document.
+
+Generates the same synthetic corpus as bench_postings.py up front, then
+reports indexing throughput (documents/second) for:
+
+* ``add_document`` called once per document;
+* ``add_documents`` in-process and with pools of each ``--workers`` size;
+* ``ShardedSearchEngine.add_documents`` with each ``--workers`` count of
+  shard processes;
+
+and top-10 ``search`` latency for head-term queries on a single engine
+against each sharded one. Speed-ups need as many free cores as workers.
+
+    python benchmarks/bench_bulk.py --docs 200000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_postings import latency_ms, make_docs
+from main import Document, OptimizedSearchEngine, ShardedSearchEngine
+
+
+def timed(index, docs):
+    copies = [Document(d.doc_id, d.title, d.content, d.tags) for d in docs]
+    started = time.perf_counter()
+    engine = index(copies)
+    return engine, len(docs) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-words", type=int, default=30)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    docs, _ = make_docs(args)
+    docs = list(docs)
+    print(f"{args.docs:,} documents, {os.cpu_count()} cores")
+
+    def one_by_one(copies):
+        engine = OptimizedSearchEngine()
+        for doc in copies:
+            engine.add_document(doc)
+        return engine
+
+    def bulk(workers):
+        def index(copies):
+            engine = OptimizedSearchEngine()
+            engine.add_documents(copies, workers=workers)
+            return engine
+        return index
+
+    single, rate = timed(one_by_one, docs)
+    print(f"  add_document                {rate:10,.0f} docs/s")
+    _, rate = timed(bulk(None), docs)
+    print(f"  add_documents in-process    {rate:10,.0f} docs/s")
+    for workers in args.workers:
+        _, rate = timed(bulk(workers), docs)
+        print(f"  add_documents workers={workers:<4} {rate:10,.0f} docs/s")
+
+    rng = random.Random(args.seed + 1)
+    by_df = sorted(single._postings, key=lambda t: len(single._postings[t]), reverse=True)
+    queries = [" ".join(rng.sample(by_df[:20], 2)) for _ in range(args.queries)]
+    p50, p99 = latency_ms(lambda q: single.search(q, top_k=10), queries)
+    print(f"  single engine top-10        p50 {p50:8.3f} ms  p99 {p99:8.3f} ms")
+    for shards in args.workers:
+        def index(copies):
+            engine = ShardedSearchEngine(shards=shards)
+            engine.add_documents(copies)
+            return engine
+        sharded, rate = timed(index, docs)
+        p50, p99 = latency_ms(lambda q: sharded.search(q, top_k=10), queries)
+        print(f"  shards={shards:<4} indexing {rate:10,.0f} docs/s   top-10 p50 {p50:8.3f} ms  p99 {p99:8.3f} ms")
+        sharded.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark positional phrase search and prefix-tree suggestions.
+
+Indexes the same synthetic corpus as bench_postings.py, then times:
+
+* ``get_suggestions`` for every prefix of ``--queries`` vocabulary words,
+  typed one keystroke at a time, against the previous scan over every
+  indexed term;
+* ``search_phrase`` for two-word phrases taken from indexed documents,
+  against the previous candidate-set intersection followed by
+  ``str.count`` over each candidate's text.
+
+    python benchmarks/bench_phrase_suggest.py --docs 200000
+"""
+import argparse
+import heapq
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_postings import build, latency_ms
+
+
+def legacy_suggestions(engine, partial_query):
+    partial_lower = partial_query.lower()
+    suggestions = [
+        {"term": term, "doc_count": len(postings)}
+        for term, postings in engine._postings.items()
+        if term.startswith(partial_lower)
+    ]
+    return heapq.nlargest(10, suggestions, key=lambda s: s["doc_count"])
+
+
+def legacy_phrase(engine, phrase):
+    terms = [engine._stem_word(t) for t in engine._tokenize(phrase) if t not in engine.STOPWORDS]
+    candidate_ids = None
+    for term in terms:
+        postings = engine._postings.get(term)
+        if postings is None:
+            return []
+        term_docs = {engine._doc_ids[docno] for docno in postings.docnos}
+        candidate_ids = term_docs if candidate_ids is None else candidate_ids & term_docs
+    results = []
+    phrase_lower = phrase.lower()
+    for doc_id in candidate_ids:
+        doc = engine.documents[doc_id]
+        content_count = doc.content.lower().count(phrase_lower)
+        title_count = doc.title.lower().count(phrase_lower)
+        if content_count + title_count:
+            results.append({"document": doc, "score": content_count + title_count * 3})
+    return sorted(results, key=lambda x: x["score"], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-words", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine, vocab, elapsed = build(args)
+    print(f"{args.docs:,} documents indexed in {elapsed:.1f}s")
+
+    rng = random.Random(args.seed + 1)
+    prefixes = [word[:n] for word in rng.sample(vocab, args.queries) for n in range(1, len(word) + 1)]
+    engine.get_suggestions("")  # settle the prefix tree after indexing
+    for label, fn in (("trie", engine.get_suggestions),
+                      ("scan", lambda p: legacy_suggestions(engine, p))):
+        p50, p99 = latency_ms(fn, prefixes)
+        print(f"  suggestions {label:<6} p50 {p50:9.3f} ms  p99 {p99:9.3f} ms")
+
+    phrases = []
+    for doc_id in rng.sample(range(args.docs), args.queries):
+        words = engine.documents[doc_id].content.split()
+        start = rng.randrange(len(words) - 1)
+        phrases.append(" ".join(words[start:start + 2]))
+    for label, fn in (("positions", engine.search_phrase),
+                      ("str.count", lambda p: legacy_phrase(engine, p))):
+        p50, p99 = latency_ms(fn, phrases)
+        print(f"  phrase {label:<11} p50 {p50:9.3f} ms  p99 {p99:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Benchmark compact posting lists against the previous dict postings.
+
+Indexes ``--docs`` synthetic documents (titles of 3 words, bodies of 5 to
+``--doc-words`` words drawn from a Zipf-distributed vocabulary of
+``--vocab`` words) and reports:
+
+* posting memory: the compact columns versus the previous
+  ``{'doc_id', 'tf', 'pos'}`` dict per posting. Dict postings for a large
+  corpus do not fit next to the engine, so their size is measured with
+  tracemalloc over ``--sample`` postings and scaled to the full index.
+* ``search`` latency for head (frequent) and tail (rare) terms, against
+  the previous scoring loop run over dict postings built for the query
+  terms only, which is all that loop reads. Results are checked to be
+  identical.
+
+    python benchmarks/bench_postings.py --docs 1000000
+"""
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "repository_after"))
+
+from main import Document, OptimizedSearchEngine
+
+
+def make_vocab(size, rng):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choice(letters) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+
+def make_docs(args):
+    # (lazy documents, vocabulary)
+    rng = random.Random(args.seed)
+    vocab = make_vocab(args.vocab, rng)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocab))))
+
+    def docs():
+        for doc_id in range(args.docs):
+            words = rng.choices(vocab, cum_weights=cum_weights, k=3 + rng.randint(5, args.doc_words))
+            yield Document(doc_id, " ".join(words[:3]), " ".join(words[3:]))
+    return docs(), vocab
+
+
+def build(args):
+    docs, vocab = make_docs(args)
+    engine = OptimizedSearchEngine()
+    started = time.perf_counter()
+    for doc in docs:
+        engine.add_document(doc)
+    return engine, vocab, time.perf_counter() - started
+
+
+def compact_bytes(engine):
+    total = 0
+    for postings in engine._postings.values():
+        total += sys.getsizeof(postings)
+        total += sys.getsizeof(postings.docnos) + sys.getsizeof(postings.tfs)
+        total += sys.getsizeof(postings.ends) + sys.getsizeof(postings.positions)
+    return total
+
+
+def legacy_bytes_per_posting(engine, sample):
+    tracemalloc.start()
+    legacy, count = {}, 0
+    for term in engine.index:
+        legacy[term] = engine.index[term]
+        count += len(legacy[term])
+        if count >= sample:
+            break
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / count
+
+
+def legacy_search(engine, legacy_index, query):
+    """The previous scoring loop over dict postings."""
+    terms = [engine._stem_word(t) for t in engine._tokenize(query) if t not in engine.STOPWORDS]
+    scores = defaultdict(float)
+    for term in terms:
+        if term not in legacy_index:
+            continue
+        idf = engine.idf_cache.get(term, 0.0) + engine._idf_offset
+        for posting in legacy_index[term]:
+            doc_len = engine.documents[posting['doc_id']].word_count
+            if doc_len > 0:
+                scores[posting['doc_id']] += (posting['tf'] / doc_len * idf * 100)
+    results = [{"document": engine.documents[d], "score": s} for d, s in scores.items()]
+    return sorted(results, key=lambda x: x["score"], reverse=True)
+
+
+def latency_ms(fn, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        fn(query)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-words", type=int, default=30)
+    parser.add_argument("--sample", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine, vocab, elapsed = build(args)
+    stats = engine.get_index_stats()
+    postings = stats["total_postings"]
+    print(f"{args.docs:,} documents, {stats['total_terms']:,} terms, "
+          f"{postings:,} postings (indexed in {elapsed:.1f}s)")
+
+    compact = compact_bytes(engine)
+    legacy = legacy_bytes_per_posting(engine, args.sample) * postings
+    print(f"  postings memory   compact {compact / 2**20:8.1f} MiB ({compact / postings:5.1f} B/posting)")
+    print(f"                    dicts   {legacy / 2**20:8.1f} MiB ({legacy / postings:5.1f} B/posting)")
+
+    rng = random.Random(args.seed + 1)
+    by_df = sorted(engine._postings, key=lambda t: len(engine._postings[t]), reverse=True)
+    workloads = {
+        "head": [" ".join(rng.sample(by_df[:20], 2)) for _ in range(args.queries)],
+        "tail": [" ".join(rng.sample(by_df[len(by_df) // 2:], 2)) for _ in range(args.queries)],
+    }
+    for label, queries in workloads.items():
+        terms = {t for q in queries for t in q.split()}
+        legacy_index = {t: engine.index[t] for t in terms}
+        for query in queries[:5]:
+            expected = [(r["document"].doc_id, r["score"]) for r in legacy_search(engine, legacy_index, query)]
+            assert [(r["document"].doc_id, r["score"]) for r in engine.search(query)] == expected
+        new_p50, new_p99 = latency_ms(engine.search, queries)
+        old_p50, old_p99 = latency_ms(lambda q: legacy_search(engine, legacy_index, q), queries)
+        print(f"  search {label:<5}     compact p50 {new_p50:8.3f} ms  p99 {new_p99:8.3f} ms")
+        print(f"                    dicts   p50 {old_p50:8.3f} ms  p99 {old_p99:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
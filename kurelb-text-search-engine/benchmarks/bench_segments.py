@@ -0,0 +1,107 @@
+"""Benchmark on-disk segments against the in-memory engine.
+
+Indexes the same synthetic corpus as bench_postings.py into an
+OptimizedSearchEngine and into a PersistentSearchEngine in a temporary
+directory (or --dir), then reports:
+
+* cold start: re-indexing every document, which is what restarting the
+  in-memory engine takes, against reopening the segments in a fresh
+  process (time to open, time to the first query, and peak RSS against
+  that of this process holding the in-memory engine; Linux only);
+* steady-state latency of top-k and full ``search`` and of
+  ``search_phrase`` for head and tail terms, in both engines.
+
+    python benchmarks/bench_segments.py --docs 1000000
+"""
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_postings import build, latency_ms
+from main import Document, PersistentSearchEngine
+
+
+def peak_rss_mib():
+    # VmHWM, unlike ru_maxrss, is not inherited from the parent process
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def reopen(path, query):
+    # Runs in a fresh process so nothing is left in memory
+    started = time.perf_counter()
+    engine = PersistentSearchEngine(path, background_merge=False)
+    opened = time.perf_counter()
+    engine.search(query, top_k=10)
+    queried = time.perf_counter()
+    print(f"{(opened - started) * 1000:.1f} {(queried - started) * 1000:.1f} {peak_rss_mib():.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-words", type=int, default=30)
+    parser.add_argument("--flush-docs", type=int, default=50_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--dir", help="segment directory (default: a temporary one)")
+    parser.add_argument("--reopen", nargs=2, metavar=("DIR", "QUERY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.reopen:
+        reopen(*args.reopen)
+        return
+
+    memory, _, elapsed = build(args)
+    print(f"{args.docs:,} documents re-indexed in memory in {elapsed:.1f}s, peak RSS {peak_rss_mib():.0f} MiB")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.dir or tmp
+        started = time.perf_counter()
+        disk = PersistentSearchEngine(path, flush_docs=args.flush_docs)
+        for doc in memory.documents.values():
+            disk.add_document(Document(doc.doc_id, doc.title, doc.content, doc.tags))
+        disk.flush()
+        disk.wait_for_merges()
+        size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+        stats = disk.get_index_stats()
+        print(f"  written to {stats['segments']} segments ({size / 2**20:.1f} MiB) "
+              f"in {time.perf_counter() - started:.1f}s including merges")
+
+        rng = random.Random(args.seed + 1)
+        by_df = sorted(memory._postings, key=lambda t: len(memory._postings[t]), reverse=True)
+        head, tail = by_df[:20], by_df[len(by_df) // 2:]
+
+        out = subprocess.run(
+            [sys.executable, __file__, "--reopen", path, " ".join(head[:2])],
+            capture_output=True, text=True, check=True,
+        ).stdout.split()
+        print(f"  cold start        segments: open {float(out[0]):.1f} ms, first query after "
+              f"{float(out[1]):.1f} ms, peak RSS {float(out[2]):.0f} MiB")
+
+        workloads = {
+            "head": [" ".join(rng.sample(head, 2)) for _ in range(args.queries)],
+            "tail": [" ".join(rng.sample(tail, 2)) for _ in range(args.queries)],
+        }
+        for label, queries in workloads.items():
+            for name, fn in (("top-10", lambda e, q: e.search(q, top_k=10)),
+                             ("full", lambda e, q: e.search(q)),
+                             ("phrase", lambda e, q: e.search_phrase(q))):
+                mem = latency_ms(lambda q: fn(memory, q), queries)
+                seg = latency_ms(lambda q: fn(disk, q), queries)
+                print(f"  {label:<5} {name:<7} memory p50 {mem[0]:8.3f} ms  p99 {mem[1]:8.3f} ms"
+                      f"   segments p50 {seg[0]:8.3f} ms  p99 {seg[1]:8.3f} ms")
+        disk.close()
+
+
+if __name__ == "__main__":
+    main()
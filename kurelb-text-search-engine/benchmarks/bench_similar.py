@@ -0,0 +1,97 @@
+"""Benchmark postings-driven find_similar_documents and the similarity table.
+
+Indexes the same synthetic corpus as bench_postings.py, then times:
+
+* ``find_similar_documents`` for ``--queries`` random documents with tf and
+  tf-idf weights, with and without ``--max-df``, against the previous loop
+  over every document's term vector (on ``--legacy-queries`` of them, as
+  each takes seconds on a large corpus). tf results are checked to be
+  identical;
+* ``similar_documents_table`` over the first ``--table-docs`` documents,
+  with NumPy/SciPy when installed and with the pure-Python fallback.
+
+    python benchmarks/bench_similar.py --docs 200000
+"""
+import argparse
+import heapq
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_postings import build, latency_ms, make_docs
+import main as engine_module
+from main import OptimizedSearchEngine
+
+
+def legacy_similar(engine, doc_id):
+    target_vector = engine.doc_vectors[doc_id]
+    target_mag = engine.doc_magnitudes[doc_id]
+    similarities = []
+    for other_id, other_vector in engine.doc_vectors.items():
+        if other_id == doc_id:
+            continue
+        dot_product = 0.0
+        for term, count in target_vector.items():
+            if term in other_vector:
+                dot_product += count * other_vector[term]
+        if dot_product > 0:
+            similarity = dot_product / (target_mag * engine.doc_magnitudes[other_id])
+            similarities.append({"document": engine.documents[other_id], "similarity": similarity})
+    return heapq.nlargest(10, similarities, key=lambda s: s["similarity"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-words", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--legacy-queries", type=int, default=10)
+    parser.add_argument("--max-df", type=float, default=0.01)
+    parser.add_argument("--table-docs", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine, _, elapsed = build(args)
+    print(f"{args.docs:,} documents indexed in {elapsed:.1f}s")
+
+    rng = random.Random(args.seed + 1)
+    targets = rng.sample(range(args.docs), args.queries)
+    for doc_id in targets[:args.legacy_queries]:
+        assert legacy_similar(engine, doc_id) == engine.find_similar_documents(doc_id)
+    legacy = latency_ms(lambda d: legacy_similar(engine, d), targets[:args.legacy_queries])
+    print(f"  legacy scan               p50 {legacy[0]:9.3f} ms  p99 {legacy[1]:9.3f} ms")
+
+    started = time.perf_counter()
+    engine.find_similar_documents(targets[0], weighting="tfidf")
+    print(f"  tf-idf norms computed in {(time.perf_counter() - started) * 1000:.0f} ms (once per index change)")
+    for weighting in ("tf", "tfidf"):
+        for max_df in (None, args.max_df):
+            p50, p99 = latency_ms(
+                lambda d: engine.find_similar_documents(d, weighting=weighting, max_df=max_df), targets)
+            label = f"{weighting} max_df={max_df}"
+            print(f"  {label:<25} p50 {p50:9.3f} ms  p99 {p99:9.3f} ms")
+
+    table_args = argparse.Namespace(**{**vars(args), "docs": args.table_docs})
+    small = OptimizedSearchEngine()
+    for doc in make_docs(table_args)[0]:
+        small.add_document(doc)
+    scipy_sparse = engine_module.sparse
+    for label, backend in (("scipy", scipy_sparse), ("python", None)):
+        if label == "scipy" and backend is None:
+            print("  table: NumPy/SciPy not installed, skipping the matrix path")
+            continue
+        engine_module.sparse = backend
+        for max_df in (None, args.max_df):
+            started = time.perf_counter()
+            small.similar_documents_table(weighting="tfidf", max_df=max_df)
+            print(f"  table {args.table_docs:,} docs {label:<6} max_df={max_df}: "
+                  f"{time.perf_counter() - started:.1f}s")
+    engine_module.sparse = scipy_sparse
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark top-k (WAND) search against full scoring and sorting.
+
+Indexes the same synthetic corpus as bench_postings.py and times
+``search(query)`` against ``search(query, top_k=--k)`` with the tf-idf and
+BM25 scorers on three workloads of two-term queries:
+
+* head: both terms among the 20 most frequent terms;
+* mixed: one head term and one long-tail term;
+* tail: both terms from the less frequent half of the vocabulary.
+
+    python benchmarks/bench_topk.py --docs 200000
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bench_postings import build, latency_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200_000)
+    parser.add_argument("--vocab", type=int, default=50_000)
+    parser.add_argument("--doc-words", type=int, default=30)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    engine, _, elapsed = build(args)
+    print(f"{args.docs:,} documents indexed in {elapsed:.1f}s, top_k={args.k}")
+
+    rng = random.Random(args.seed + 1)
+    by_df = sorted(engine._postings, key=lambda t: len(engine._postings[t]), reverse=True)
+    head, tail = by_df[:20], by_df[len(by_df) // 2:]
+    workloads = {
+        "head": [" ".join(rng.sample(head, 2)) for _ in range(args.queries)],
+        "mixed": [f"{rng.choice(head)} {rng.choice(tail)}" for _ in range(args.queries)],
+        "tail": [" ".join(rng.sample(tail, 2)) for _ in range(args.queries)],
+    }
+    for label, queries in workloads.items():
+        for scorer in ("tfidf", "bm25"):
+            full = latency_ms(lambda q: engine.search(q, scorer=scorer), queries)
+            top = latency_ms(lambda q: engine.search(q, top_k=args.k, scorer=scorer), queries)
+            print(f"  {label:<6} {scorer:<6} full p50 {full[0]:9.3f} ms  p99 {full[1]:9.3f} ms"
+                  f"   top-k p50 {top[0]:9.3f} ms  p99 {top[1]:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
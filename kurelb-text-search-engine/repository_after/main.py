@@ -1,8 +1,26 @@
 import re
+import os
+import sys
+import json
+import mmap
 import time
 import math
 import heapq
+import struct
+import itertools
+import threading
+import multiprocessing
+from array import array
+from bisect import bisect_left
 from collections import defaultdict, Counter
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # similar_documents_table falls back to pure Python
+    np = sparse = None
 
 class Document:
     def __init__(self, doc_id, title, content, tags=None):
@@ -13,6 +31,383 @@ class Document:
         self.word_count = 0
         self.indexed_at = None
 
+
+def _encode_positions(positions, out):
+    # Delta + varint encode ascending positions, appending to a bytearray
+    prev = 0
+    for pos in positions:
+        delta = pos - prev
+        prev = pos
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+
+
+def _decode_positions(data):
+    if data.isascii():
+        # Every delta fits in one byte
+        return list(itertools.accumulate(data))
+    positions = []
+    pos = shift = delta = 0
+    for byte in data:
+        delta |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            pos += delta
+            positions.append(pos)
+            shift = delta = 0
+    return positions
+
+
+def _gallop(values, target, lo):
+    # Index of the first value >= target at or after lo, probing 1, 2, 4...
+    # entries ahead before bisecting, so short skips stay cheap
+    n = len(values)
+    if lo >= n or values[lo] >= target:
+        return lo
+    step = 1
+    hi = lo + 1
+    while hi < n and values[hi] < target:
+        lo = hi
+        step <<= 1
+        hi = lo + step
+    return bisect_left(values, target, lo + 1, min(hi, n))
+
+
+def _intersect(lists):
+    # Yield (docno, index in each list) for the doc numbers in every
+    # PostingList, given shortest first. Lists much longer than the first
+    # are galloped through from its doc numbers; when they are all of
+    # similar length, intersecting sets of doc numbers is cheaper.
+    first = lists[0]
+    if all(len(p) < 32 * len(first) for p in lists[1:]):
+        common = set(first.docnos)
+        for postings in lists[1:]:
+            common.intersection_update(postings.docnos)
+        columns = [p.docnos for p in lists]
+        for docno in sorted(common):
+            yield docno, [bisect_left(docnos, docno) for docnos in columns]
+        return
+
+    others = [(p.docnos, len(p)) for p in lists[1:]]
+    cursors = [0] * len(others)
+    for i, docno in enumerate(first.docnos):
+        indexes = [i]
+        for k, (docnos, n) in enumerate(others):
+            j = cursors[k]
+            if docnos[j] < docno:
+                j = cursors[k] = _gallop(docnos, docno, j)
+                if j == n:
+                    return
+            if docnos[j] != docno:
+                break
+            indexes.append(j)
+        else:
+            yield docno, indexes
+
+
+class PostingList:
+    """Postings for one term as parallel columns, sorted by document number.
+
+    Document numbers and term frequencies are 4-byte array entries, and each
+    posting's positions are delta + varint encoded into one shared bytearray
+    (usually one byte per position). Positions are only decoded on request.
+
+    For top-k search each run of BLOCK postings keeps its largest tf, its
+    largest tf / document length and its shortest document, and max_tf and
+    max_ratio hold the same over the whole list. Removing a posting only
+    widens these bounds, so they may be loose but are never too tight.
+    """
+
+    BLOCK = 128
+
+    __slots__ = (
+        "docnos", "tfs", "ends", "positions", "max_tf", "max_ratio",
+        "block_tf", "block_ratio", "block_len",
+    )
+
+    def __init__(self):
+        self.docnos = array("I")
+        self.tfs = array("I")
+        self.ends = array("Q")  # end offset of each posting's positions
+        self.positions = bytearray()
+        self.max_tf = 0
+        self.max_ratio = 0.0
+        self.block_tf = array("I")
+        self.block_ratio = array("d")
+        self.block_len = array("I")
+
+    def __len__(self):
+        return len(self.docnos)
+
+    def __reduce__(self):
+        # Columns as raw bytes, which pickle (e.g. back from add_documents
+        # pool workers) several times faster than the arrays themselves
+        return _restore_postings, (
+            self.docnos.tobytes(), self.tfs.tobytes(), self.ends.tobytes(),
+            self.positions, self.max_tf, self.max_ratio, self.block_tf.tobytes(),
+            self.block_ratio.tobytes(), self.block_len.tobytes(),
+        )
+
+    def append(self, docno, tf, positions, doc_len):
+        _encode_positions(positions, self.positions)
+        self._push(docno, tf, doc_len)
+
+    def append_encoded(self, docno, tf, data, doc_len):
+        # As append, with positions already encoded (copied from a list)
+        self.positions += data
+        self._push(docno, tf, doc_len)
+
+    def _push(self, docno, tf, doc_len):
+        # Document numbers only grow, so appending keeps the columns sorted
+        self.docnos.append(docno)
+        self.tfs.append(tf)
+        self.ends.append(len(self.positions))
+        ratio = tf / doc_len
+        if tf > self.max_tf:
+            self.max_tf = tf
+        if ratio > self.max_ratio:
+            self.max_ratio = ratio
+
+        if len(self.docnos) % self.BLOCK == 1:
+            self.block_tf.append(tf)
+            self.block_ratio.append(ratio)
+            self.block_len.append(doc_len)
+        else:
+            if tf > self.block_tf[-1]:
+                self.block_tf[-1] = tf
+            if ratio > self.block_ratio[-1]:
+                self.block_ratio[-1] = ratio
+            if doc_len < self.block_len[-1]:
+                self.block_len[-1] = doc_len
+
+    def extend(self, other, base):
+        # Append another list's postings, numbered from 0, as base + docno;
+        # base must be above every document number here
+        start = len(self.docnos)
+        shift = len(self.positions)
+        self.docnos.extend(map(base.__add__, other.docnos))
+        self.tfs.extend(other.tfs)
+        self.ends.extend(map(shift.__add__, other.ends))
+        self.positions += other.positions
+        if other.max_tf > self.max_tf:
+            self.max_tf = other.max_tf
+        if other.max_ratio > self.max_ratio:
+            self.max_ratio = other.max_ratio
+
+        block_tf, block_ratio, block_len = self.block_tf, self.block_ratio, self.block_len
+        if start % self.BLOCK == 0:
+            block_tf.extend(other.block_tf)
+            block_ratio.extend(other.block_ratio)
+            block_len.extend(other.block_len)
+            return
+        # The other list's blocks straddle ours: our last block takes in
+        # its first block, and each new block of ours overlaps two of its
+        # blocks, whose combined bounds it takes
+        tfs, ratios, lens = other.block_tf, other.block_ratio, other.block_len
+        last = len(tfs) - 1
+        block_tf[-1] = max(block_tf[-1], tfs[0])
+        block_ratio[-1] = max(block_ratio[-1], ratios[0])
+        block_len[-1] = min(block_len[-1], lens[0])
+        for j in range(1, -(-len(self.docnos) // self.BLOCK) - len(block_tf) + 1):
+            k = min(j, last)
+            block_tf.append(max(tfs[j - 1], tfs[k]))
+            block_ratio.append(max(ratios[j - 1], ratios[k]))
+            block_len.append(min(lens[j - 1], lens[k]))
+
+    def find(self, docno):
+        i = bisect_left(self.docnos, docno)
+        if i < len(self.docnos) and self.docnos[i] == docno:
+            return i
+        return -1
+
+    def remove(self, docno):
+        i = self.find(docno)
+        if i < 0:
+            return False
+        ends = self.ends
+        start = ends[i - 1] if i else 0
+        end = ends[i]
+        del self.positions[start:end]
+        del self.docnos[i]
+        del self.tfs[i]
+        del ends[i]
+        if end > start:
+            shift = end - start
+            ends[i:] = array("Q", [e - shift for e in ends[i:]])
+
+        # Each later block now starts with the next block's first posting
+        block_tf, block_ratio, block_len = self.block_tf, self.block_ratio, self.block_len
+        for b in range(i // self.BLOCK, len(block_tf) - 1):
+            if block_tf[b + 1] > block_tf[b]:
+                block_tf[b] = block_tf[b + 1]
+            if block_ratio[b + 1] > block_ratio[b]:
+                block_ratio[b] = block_ratio[b + 1]
+            if block_len[b + 1] < block_len[b]:
+                block_len[b] = block_len[b + 1]
+        if len(self.docnos) % self.BLOCK == 0:
+            del block_tf[-1]
+            del block_ratio[-1]
+            del block_len[-1]
+        return True
+
+    def positions_at(self, i):
+        start = self.ends[i - 1] if i else 0
+        return _decode_positions(self.positions[start:self.ends[i]])
+
+    def nbytes(self):
+        return (
+            self.docnos.itemsize * len(self.docnos)
+            + self.tfs.itemsize * len(self.tfs)
+            + self.ends.itemsize * len(self.ends)
+            + len(self.positions)
+            + 16 * len(self.block_tf)
+        )
+
+
+def _restore_postings(docnos, tfs, ends, positions, max_tf, max_ratio,
+                      block_tf, block_ratio, block_len):
+    postings = PostingList()
+    postings.docnos.frombytes(docnos)
+    postings.tfs.frombytes(tfs)
+    postings.ends.frombytes(ends)
+    postings.positions = positions
+    postings.max_tf = max_tf
+    postings.max_ratio = max_ratio
+    postings.block_tf.frombytes(block_tf)
+    postings.block_ratio.frombytes(block_ratio)
+    postings.block_len.frombytes(block_len)
+    return postings
+
+
+class InvertedIndexView(Mapping):
+    """Read-only term -> postings mapping over the compact posting lists.
+
+    Looking up a term decodes its postings into the
+    {'doc_id', 'tf', 'pos'} dicts callers used to get from the index.
+    """
+
+    def __init__(self, postings, doc_ids):
+        self._postings = postings
+        self._doc_ids = doc_ids
+
+    def __getitem__(self, term):
+        postings = self._postings[term]
+        doc_ids = self._doc_ids
+        return [
+            {'doc_id': doc_ids[docno], 'tf': tf, 'pos': postings.positions_at(i)}
+            for i, (docno, tf) in enumerate(zip(postings.docnos, postings.tfs))
+        ]
+
+    def __contains__(self, term):
+        return term in self._postings
+
+    def __iter__(self):
+        return iter(self._postings)
+
+    def __len__(self):
+        return len(self._postings)
+
+
+class _TrieNode:
+    __slots__ = ("parent", "children", "terms", "top", "dirty")
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.children = {}
+        self.terms = set()  # terms whose (truncated) path ends here
+        self.top = []       # best (-doc_count, seq, term) in this subtree
+        self.dirty = False
+
+
+class SuggestionTrie:
+    """Prefix tree over the vocabulary with each prefix's top terms.
+
+    Every node keeps the TOP terms below it by document frequency, ties
+    going to the term added first. A document frequency change only marks
+    the term's path dirty; the lists are rebuilt from the children's lists
+    when a dirty prefix is next looked up, so a lookup on an unchanged
+    index walks len(prefix) nodes. Paths stop MAX_DEPTH characters deep and
+    longer terms share the node at that depth.
+    """
+
+    MAX_DEPTH = 32
+    TOP = 10
+
+    def __init__(self, postings):
+        self._postings = postings  # term -> PostingList, for doc counts
+        self.clear()
+
+    def clear(self):
+        self._root = _TrieNode(None)
+        self._nodes = {}  # term -> node holding it
+        self._seqs = {}   # term -> order in which it was added
+        self._next_seq = itertools.count()
+
+    def update(self, term):
+        # Call after the term's document frequency changed
+        node = self._nodes.get(term)
+        if term not in self._postings:
+            if node is None:
+                return
+            del self._nodes[term]
+            del self._seqs[term]
+            node.terms.discard(term)
+            parent = node.parent
+            while parent is not None and not node.terms and not node.children:
+                for char, child in parent.children.items():
+                    if child is node:
+                        del parent.children[char]
+                        break
+                node, parent = parent, parent.parent
+        elif node is None:
+            node = self._root
+            for char in term[:self.MAX_DEPTH]:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _TrieNode(node)
+                node = child
+            node.terms.add(term)
+            self._nodes[term] = node
+            self._seqs[term] = next(self._next_seq)
+
+        # A dirty node's ancestors are always dirty too
+        while node is not None and not node.dirty:
+            node.dirty = True
+            node = node.parent
+
+    def top(self, prefix):
+        node = self._root
+        for char in prefix[:self.MAX_DEPTH]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        if len(prefix) > self.MAX_DEPTH:
+            entries = heapq.nsmallest(self.TOP, (
+                self._entry(term) for term in node.terms if term.startswith(prefix)
+            ))
+        else:
+            self._refresh(node)
+            entries = node.top
+        return [{"term": term, "doc_count": -count} for count, _, term in entries]
+
+    def _entry(self, term):
+        return (-len(self._postings[term]), self._seqs[term], term)
+
+    def _refresh(self, node):
+        if not node.dirty:
+            return
+        for child in node.children.values():
+            self._refresh(child)
+        node.top = heapq.nsmallest(self.TOP, itertools.chain(
+            map(self._entry, node.terms),
+            *(child.top for child in node.children.values())
+        ))
+        node.dirty = False
+
+
 class OptimizedSearchEngine:
     # Stopwords as frozenset for O(1) membership testing
     STOPWORDS = frozenset([
@@ -33,17 +428,40 @@ class OptimizedSearchEngine:
     # Pre-compiled regex for O(n) tokenization
     TOKEN_PATTERN = re.compile(r'\w+')
 
+    # BM25 parameters for search(..., scorer="bm25")
+    BM25_K1 = 1.2
+    BM25_B = 0.75
+
+    # Documents per pool task in add_documents
+    BULK_CHUNK = 10_000
+
     def __init__(self):
         # Dictionary for O(1) document lookup
         self.documents = {}
 
-        # Inverted Index mapping stemmed terms to postings
-        # Posting: {'doc_id': int, 'tf': int, 'pos': List[int]}
-        self.index = defaultdict(list)
+        # Documents are numbered densely in indexing order; an update gets a
+        # new number so postings stay sorted by appending.
+        self._docnos = {}             # doc_id -> docno
+        self._doc_ids = []            # docno -> doc_id (None once removed)
+        self._doc_lens = array("I")   # docno -> word_count
+        self._total_doc_len = 0       # sum of word_count, for BM25
+        # Title tokens come first in a document's positions, then content,
+        # then tags; these give the field boundaries for phrase matches.
+        self._title_lens = array("I")     # docno -> title tokens
+        self._content_lens = array("I")   # docno -> content tokens
+
+        # Inverted Index mapping stemmed terms to compact PostingLists.
+        # self.index decodes them to {'doc_id', 'tf', 'pos'} dicts on lookup.
+        self._postings = {}
+        self.index = InvertedIndexView(self._postings, self._doc_ids)
+
+        # Vocabulary prefix tree for get_suggestions
+        self._suggestions = SuggestionTrie(self._postings)
 
         # Pre-computed Sparse Vectors and Magnitudes for Similarity
         self.doc_vectors = {}      # doc_id -> {term: count}
         self.doc_magnitudes = {}   # doc_id -> float
+        self._tfidf_norm_cache = None  # ((docnos, N), docno -> tf-idf length)
 
         # Stats for TF-IDF
         self.doc_freqs = defaultdict(int) # term -> num_docs_containing_term
@@ -93,6 +511,29 @@ class OptimizedSearchEngine:
         self.stem_cache[original] = word
         return word
 
+    def _analyze(self, doc):
+        # Indexed tokens of a document (title, then content, then tags) and
+        # how many of them come from the title and from the content
+        title_tokens = self._tokenize(doc.title)
+        content_tokens = self._tokenize(doc.content)
+        tag_tokens = []
+        for tag in doc.tags:
+            tag_tokens.extend(self._tokenize(tag))
+
+        all_tokens = title_tokens + content_tokens + tag_tokens
+
+        # Filter with list comprehension and set membership
+        stopwords = self.STOPWORDS
+        filtered_tokens = [t for t in all_tokens if t not in stopwords]
+        stemmed_tokens = [self._stem_word(t) for t in filtered_tokens]
+        title_len = sum(1 for t in title_tokens if t not in stopwords)
+        content_len = sum(1 for t in content_tokens if t not in stopwords)
+        return stemmed_tokens, title_len, content_len
+
+    def _analyze_query(self, text):
+        # Query text goes through the same stopword filter and stemmer
+        return [self._stem_word(t) for t in self._tokenize(text) if t not in self.STOPWORDS]
+
     def add_document(self, doc):
         # If doc_id already exists, treat this as an update (N unchanged).
         is_update = doc.doc_id in self.documents
@@ -114,20 +555,17 @@ class OptimizedSearchEngine:
         self.documents[doc.doc_id] = doc
         doc.indexed_at = time.time()
 
-        # Tokenize fields (including tags to ensure they are searchable)
-        title_tokens = self._tokenize(doc.title)
-        content_tokens = self._tokenize(doc.content)
-        tag_tokens = []
-        for tag in doc.tags:
-            tag_tokens.extend(self._tokenize(tag))
-
-        all_tokens = title_tokens + content_tokens + tag_tokens
-
-        # Filter with list comprehension and set membership
-        filtered_tokens = [t for t in all_tokens if t not in self.STOPWORDS]
-        stemmed_tokens = [self._stem_word(t) for t in filtered_tokens]
+        stemmed_tokens, title_len, content_len = self._analyze(doc)
         doc.word_count = len(stemmed_tokens)
 
+        docno = len(self._doc_ids)
+        self._docnos[doc.doc_id] = docno
+        self._doc_ids.append(doc.doc_id)
+        self._doc_lens.append(doc.word_count)
+        self._total_doc_len += doc.word_count
+        self._title_lens.append(title_len)
+        self._content_lens.append(content_len)
+
         # Build Inverted Index and Pre-compute Counts
         term_counts = Counter(stemmed_tokens)
 
@@ -141,12 +579,12 @@ class OptimizedSearchEngine:
         sq_sum = 0.0
 
         for term, count in term_counts.items():
-            self.index[term].append({
-                'doc_id': doc.doc_id,
-                'tf': count,
-                'pos': term_positions[term]
-            })
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = PostingList()
+            postings.append(docno, count, term_positions[term], doc.word_count)
             self.doc_freqs[term] += 1
+            self._suggestions.update(term)
 
             # Cache IDF for this term, adjusted by the global offset.
             df = self.doc_freqs[term]
@@ -160,20 +598,94 @@ class OptimizedSearchEngine:
         self.doc_vectors[doc.doc_id] = doc_vector
         self.doc_magnitudes[doc.doc_id] = math.sqrt(sq_sum)
 
+    def add_documents(self, docs, workers=None):
+        # Bulk add_document. With workers > 1 documents are analyzed in
+        # chunks of BULK_CHUNK across a pool of that many processes, each
+        # chunk into a partial index numbered from 0; otherwise the whole
+        # batch is one chunk analyzed here. The partial indexes are
+        # appended in order and document frequencies, IDF entries and
+        # suggestions are updated once per term at the end. The result is
+        # the same as calling add_document for each document in turn.
+
+        # Of documents sharing an id only the last is indexed, in its place
+        batch, seen = [], set()
+        for doc in reversed(list(docs)):
+            if doc.doc_id not in seen:
+                seen.add(doc.doc_id)
+                batch.append(doc)
+        batch.reverse()
+
+        added = 0
+        for doc in batch:
+            if doc.doc_id in self.documents:
+                self._remove_document(doc.doc_id, adjust_doc_count=False)
+            else:
+                added += 1
+
+        pooled = workers is not None and workers > 1 and len(batch) > self.BULK_CHUNK
+        size = self.BULK_CHUNK if pooled else max(len(batch), 1)
+        chunks = [batch[i:i + size] for i in range(0, len(batch), size)]
+        texts = [[(doc.title, doc.content, doc.tags) for doc in chunk] for chunk in chunks]
+        if pooled:
+            with ProcessPoolExecutor(min(workers, len(chunks))) as pool:
+                partials = list(pool.map(_index_chunk_worker, [(type(self), t) for t in texts]))
+        else:
+            partials = map(_index_chunk, itertools.repeat(self), texts)
+
+        new_dfs = Counter()
+        indexed_at = time.time()
+        for chunk, (lens, title_lens, content_lens, vectors, magnitudes, postings) in zip(chunks, partials):
+            base = len(self._doc_ids)
+            for doc, word_count, vector, magnitude in zip(chunk, lens, vectors, magnitudes):
+                doc.word_count = word_count
+                doc.indexed_at = indexed_at
+                self.documents[doc.doc_id] = doc
+                self._docnos[doc.doc_id] = len(self._doc_ids)
+                self._doc_ids.append(doc.doc_id)
+                self.doc_vectors[doc.doc_id] = vector
+                self.doc_magnitudes[doc.doc_id] = magnitude
+            self._doc_lens.extend(lens)
+            self._title_lens.extend(title_lens)
+            self._content_lens.extend(content_lens)
+            self._total_doc_len += sum(lens)
+
+            for term, partial in postings.items():
+                new_dfs[term] += len(partial)
+                target = self._postings.get(term)
+                if target is not None:
+                    target.extend(partial, base)
+                    continue
+                # A new term takes over the partial list
+                if base:
+                    partial.docnos = array("I", map(base.__add__, partial.docnos))
+                self._postings[term] = partial
+
+        # Single pass over the affected terms, with the final N
+        old_n = self._doc_count
+        new_n = self._doc_count = old_n + added
+        if old_n > 0 and new_n != old_n:
+            self._idf_offset += math.log(new_n / old_n)
+        for term, count in new_dfs.items():
+            df = self.doc_freqs[term] = self.doc_freqs[term] + count
+            self.idf_cache[term] = math.log(new_n / df) - self._idf_offset
+            self._suggestions.update(term)
+
     def _remove_document(self, doc_id, *, adjust_doc_count=True):
         doc = self.documents.get(doc_id)
         if not doc:
             return
 
         old_vector = self.doc_vectors.get(doc_id, {})
+        docno = self._docnos.pop(doc_id)
 
         # Remove postings and update DF/IDF for affected terms.
         for term in list(old_vector.keys()):
-            postings = self.index.get(term)
+            postings = self._postings.get(term)
             if postings is not None:
-                self.index[term] = [p for p in postings if p.get('doc_id') != doc_id]
-                if not self.index[term]:
-                    del self.index[term]
+                postings.remove(docno)
+                if not postings:
+                    del self._postings[term]
+                self._suggestions.update(term)
 
             if term in self.doc_freqs:
                 self.doc_freqs[term] -= 1
@@ -188,6 +700,8 @@ class OptimizedSearchEngine:
         self.doc_vectors.pop(doc_id, None)
         self.doc_magnitudes.pop(doc_id, None)
         self.documents.pop(doc_id, None)
+        self._doc_ids[docno] = None
+        self._total_doc_len -= self._doc_lens[docno]
 
         # Adjust N/offset if requested.
         if adjust_doc_count:
@@ -213,36 +727,47 @@ class OptimizedSearchEngine:
     def remove_document(self, doc_id):
         self._remove_document(doc_id, adjust_doc_count=True)
 
-    def search(self, query):
+    def search(self, query, top_k=None, scorer="tfidf"):
+        # scorer is "tfidf" (tf / doc length * idf) or "bm25".
+        # With top_k, return only the best top_k results, the same as the
+        # first top_k of a full search, using block-max MaxScore to skip
+        # documents that cannot make the cut instead of scoring and sorting
+        # every match.
+        if scorer not in ("tfidf", "bm25"):
+            raise ValueError(f"Unknown scorer: {scorer!r}")
+
         # Append to list instead of string concatenation
         self.search_history.append(query)
 
-        query_tokens = self._tokenize(query)
-        filtered_query = [t for t in query_tokens if t not in self.STOPWORDS]
-        stemmed_query = [self._stem_word(t) for t in filtered_query]
+        stemmed_query = self._analyze_query(query)
 
         if not stemmed_query:
             return []
 
+        if top_k is not None or scorer != "tfidf":
+            terms = [self._term_scorer(t, scorer) for t in stemmed_query if t in self._postings]
+            if top_k is not None:
+                return self._search_top_k(terms, top_k)
+            return self._search_all(terms)
+
         # Use Inverted Index and Pre-computed Stats
         scores = defaultdict(float)
+        doc_ids = self._doc_ids
+        doc_lens = self._doc_lens
         for term in stemmed_query:
-            if term not in self.index:
+            # Retrieve postings (O(1))
+            postings = self._postings.get(term)
+            if postings is None:
                 continue
 
             idf = self.idf_cache.get(term, 0.0) + self._idf_offset
 
-            # Retrieve postings (O(1))
-            postings = self.index[term]
-
-            for posting in postings:
-                doc_id = posting['doc_id']
-                tf_raw = posting['tf']
-                doc_len = self.documents[doc_id].word_count
+            for docno, tf_raw in zip(postings.docnos, postings.tfs):
+                doc_len = doc_lens[docno]
 
                 if doc_len > 0:
                     tf = tf_raw / doc_len
-                    scores[doc_id] += (tf * idf * 100)
+                    scores[doc_ids[docno]] += (tf * idf * 100)
 
         results = []
         for doc_id, score in scores.items():
@@ -251,55 +776,265 @@ class OptimizedSearchEngine:
         # Use sorted() (Timsort) O(n log n)
         return sorted(results, key=lambda x: x["score"], reverse=True)
 
-    def search_phrase(self, phrase):
-        # Efficient Phrase Search using Index Intersection + str.find
-        self.search_history.append(f"PHRASE: {phrase}")
+    def _term_scorer(self, term, scorer):
+        # (postings, score(tf, doc_len), upper bound of score over postings,
+        #  block_bound(b) giving the same for block b)
+        postings = self._postings[term]
+        if scorer == "bm25":
+            return self._bm25_scorer(postings, self._doc_count, self.doc_freqs[term], self._total_doc_len)
+        return self._tfidf_scorer(postings, self.idf_cache.get(term, 0.0) + self._idf_offset)
+
+    @classmethod
+    def _bm25_scorer(cls, postings, n, df, total_doc_len):
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        k1 = cls.BM25_K1
+        norm = k1 * (1 - cls.BM25_B)
+        scale = k1 * cls.BM25_B * n / total_doc_len
+
+        def score(tf, doc_len):
+            return idf * tf * (k1 + 1) / (tf + norm + scale * doc_len)
+
+        # The score grows with tf and shrinks with doc_len
+        bound = idf * postings.max_tf * (k1 + 1) / (postings.max_tf + norm)
+        block_tf, block_len = postings.block_tf, postings.block_len
+
+        def block_bound(b):
+            tf = block_tf[b]
+            return idf * tf * (k1 + 1) / (tf + norm + scale * block_len[b])
+        return postings, score, bound, block_bound
+
+    @staticmethod
+    def _tfidf_scorer(postings, idf):
+        def score(tf, doc_len):
+            tf = tf / doc_len
+            return tf * idf * 100
+
+        bound = postings.max_ratio * max(idf, 0.0) * 100
+        block_ratio = postings.block_ratio
+
+        def block_bound(b):
+            return block_ratio[b] * max(idf, 0.0) * 100
+        return postings, score, bound, block_bound
+
+    def _term_stats(self, terms):
+        # Collection statistics a ShardedSearchEngine sums over its shards
+        return self._doc_count, self._total_doc_len, {t: self.doc_freqs.get(t, 0) for t in set(terms)}
+
+    def _search_with_stats(self, terms, top_k, scorer, n, dfs, total_doc_len):
+        # search() scoring with collection statistics given from outside.
+        # Returns (score, -first query term, -docno, document) best first,
+        # only the top_k of them unless top_k is None
+        if scorer == "bm25":
+            def term_scorer(term):
+                return self._bm25_scorer(self._postings[term], n, dfs[term], total_doc_len)
+        else:
+            def term_scorer(term):
+                return self._tfidf_scorer(self._postings[term], math.log(n / dfs[term]))
+        scorers = [term_scorer(t) for t in terms if t in self._postings]
 
-        phrase_tokens = self._tokenize(phrase)
-        if not phrase_tokens:
+        doc_ids = self._doc_ids
+        if top_k is not None:
+            entries = self._top_k_entries(scorers, top_k, self._doc_lens)
+        else:
+            scores = defaultdict(float)
+            first = {}
+            doc_lens = self._doc_lens
+            for order, (postings, score, _, _) in enumerate(scorers):
+                for docno, tf in zip(postings.docnos, postings.tfs):
+                    scores[docno] += score(tf, doc_lens[docno])
+                    first.setdefault(docno, -order)
+            entries = sorted(((s, first[d], -d) for d, s in scores.items()), reverse=True)
+        return [(score, order, docno, self.documents[doc_ids[-docno]]) for score, order, docno in entries]
+
+    def _search_all(self, terms):
+        # Term-at-a-time accumulation, as in the default tf-idf search
+        scores = defaultdict(float)
+        doc_ids = self._doc_ids
+        doc_lens = self._doc_lens
+        for postings, score, _, _ in terms:
+            for docno, tf in zip(postings.docnos, postings.tfs):
+                scores[doc_ids[docno]] += score(tf, doc_lens[docno])
+
+        results = [{"document": self.documents[d], "score": s} for d, s in scores.items()]
+        return sorted(results, key=lambda x: x["score"], reverse=True)
+
+    def _search_top_k(self, terms, top_k):
+        doc_ids = self._doc_ids
+        return [
+            {"document": self.documents[doc_ids[-docno]], "score": score}
+            for score, _, docno in self._top_k_entries(terms, top_k, self._doc_lens)
+        ]
+
+    @staticmethod
+    def _top_k_entries(terms, top_k, doc_lens, deleted=frozenset()):
+        # Block-max MaxScore over doc-number ordered postings. Terms are
+        # ranked by score bound; while the bounds of the lowest-ranked
+        # terms cannot add up to the k-th best score, those terms are
+        # "non-essential": candidates come only from the other lists, and
+        # non-essential lists are probed (by bisect) only while the
+        # candidate can still make the cut. Before scoring, a candidate is
+        # also checked against the bounds of the blocks it falls in, and
+        # if those cannot reach the k-th score the essential lists skip
+        # to the nearest block end. Heap entries are
+        # (score, -first query term, -docno) so ties rank the way a full
+        # search orders them; they are returned best first. Documents in
+        # deleted are skipped.
+        if top_k <= 0:
             return []
+        block = PostingList.BLOCK
+        docnos = [postings.docnos for postings, _, _, _ in terms]
+        tfs = [postings.tfs for postings, _, _, _ in terms]
+        sizes = [len(postings) for postings, _, _, _ in terms]
+        scores = [score for _, score, _, _ in terms]
+        block_bounds = [block_bound for _, _, _, block_bound in terms]
+        by_bound = sorted(range(len(terms)), key=lambda t: terms[t][2])
+        prefix = [0.0]  # prefix[i]: summed bounds of the i lowest-ranked terms
+        for t in by_bound:
+            prefix.append(prefix[-1] + terms[t][2])
+        pos = [0] * len(terms)
+        heap = []
+        threshold = -math.inf
+        ties_win = True
+        essential = 0
+        ess = by_bound
+        checked_until = 0  # blocks already checked against threshold
+
+        def reaches(upper, parts):
+            # A single bound is exact; a sum may round differently from
+            # the same scores summed in query order
+            if parts > 1:
+                upper += abs(upper) * 1e-9
+            return upper > threshold or (ties_win and upper == threshold)
+
+        while True:
+            docno = None
+            for t in ess:
+                if pos[t] < sizes[t] and (docno is None or docnos[t][pos[t]] < docno):
+                    docno = docnos[t][pos[t]]
+            if docno is None:
+                break
+
+            if deleted and docno in deleted:
+                for t in ess:
+                    if pos[t] < sizes[t] and docnos[t][pos[t]] == docno:
+                        pos[t] += 1
+                continue
 
-        filtered_tokens = [t for t in phrase_tokens if t not in self.STOPWORDS]
-        stemmed_tokens = [self._stem_word(t) for t in filtered_tokens]
+            if docno >= checked_until and len(heap) >= top_k:
+                upper, skip_to = prefix[essential], math.inf
+                for t in ess:
+                    if pos[t] < sizes[t]:
+                        b = pos[t] // block
+                        upper += block_bounds[t](b)
+                        skip_to = min(skip_to, docnos[t][min(sizes[t], (b + 1) * block) - 1] + 1)
+                if not reaches(upper, len(terms)):
+                    for t in ess:
+                        pos[t] = bisect_left(docnos[t], skip_to, pos[t])
+                    continue
+                checked_until = skip_to
+
+            doc_len = doc_lens[docno]
+            found = []
+            partial = 0.0
+            for t in ess:
+                p = pos[t]
+                if p < sizes[t] and docnos[t][p] == docno:
+                    c = scores[t](tfs[t][p], doc_len)
+                    found.append((t, c))
+                    partial += c
+                    pos[t] = p + 1
+            for i in range(essential - 1, -1, -1):
+                if not reaches(partial + prefix[i + 1], len(found) + i + 1):
+                    break
+                t = by_bound[i]
+                pos[t] = p = bisect_left(docnos[t], docno, pos[t])
+                if p < sizes[t] and docnos[t][p] == docno:
+                    c = scores[t](tfs[t][p], doc_len)
+                    found.append((t, c))
+                    partial += c
+            else:
+                found.sort()
+                total = 0.0
+                for _, c in found:
+                    total += c
+                entry = (total, -found[0][0], -docno)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+                else:
+                    continue
+                if len(heap) >= top_k:
+                    # Later documents lose ties unless they can rank under
+                    # an earlier query term than the current k-th result
+                    threshold, worst_order, _ = heap[0]
+                    ties_win = worst_order < 0
+                    checked_until = 0
+                    while essential < len(terms) and not reaches(prefix[essential + 1], essential + 1):
+                        essential += 1
+                    ess = by_bound[essential:]
+
+        return sorted(heap, reverse=True)
+
+    def search_phrase(self, phrase):
+        # Phrase Search using Index Intersection + stored positions
+        self.search_history.append(f"PHRASE: {phrase}")
+
+        stemmed_tokens = self._analyze_query(phrase)
 
         if not stemmed_tokens:
             return []
 
-        # 1. Intersection: Find docs containing ALL terms (Fast filtering)
-        candidate_ids = None
+        # Phrases match the indexed token stream (stopwords dropped, words
+        # stemmed), so candidates are checked from stored positions alone.
+        lists = []
         for term in stemmed_tokens:
-            if term not in self.index:
-                return []
-            term_docs = {p['doc_id'] for p in self.index[term]}
-            if candidate_ids is None:
-                candidate_ids = term_docs
-            else:
-                candidate_ids &= term_docs
-            if not candidate_ids:
+            postings = self._postings.get(term)
+            if postings is None:
                 return []
+            lists.append(postings)
 
-        # 2. Validation: Use str.find / str.count on candidates
-        results = []
-        phrase_lower = phrase.lower()
+        results = [
+            {"document": self.documents[self._doc_ids[docno]], "score": score, "matches": matches}
+            for docno, score, matches in self._phrase_matches(lists, self._title_lens, self._content_lens)
+        ]
+        return sorted(results, key=lambda x: x["score"], reverse=True)
 
-        for doc_id in candidate_ids:
-            doc = self.documents[doc_id]
+    @staticmethod
+    def _phrase_matches(lists, title_lens, content_lens, deleted=frozenset()):
+        # (docno, score, matches) for documents where the posting lists'
+        # terms appear in order, given one list per phrase term
 
-            # Use Python's built-in string methods (C-optimized)
-            content_count = doc.content.lower().count(phrase_lower)
-            title_count = doc.title.lower().count(phrase_lower)
+        # 1. Intersection: docs containing ALL terms, rarest term first
+        distinct = sorted({id(p): p for p in lists}.values(), key=len)
+        slots = {id(p): k for k, p in enumerate(distinct)}
+        term_slots = [slots[id(p)] for p in lists]
+        span = len(lists) - 1
+
+        for docno, indexes in _intersect(distinct):
+            if deleted and docno in deleted:
+                continue
+            # 2. Validation: the k-th phrase term must sit k positions after
+            # the first, all within the title or all within the content
+            positions = [p.positions_at(i) for p, i in zip(distinct, indexes)]
+            starts = set(positions[term_slots[0]])
+            for k, slot in enumerate(term_slots[1:], 1):
+                starts.intersection_update(map((-k).__add__, positions[slot]))
+                if not starts:
+                    break
+            title_end = title_lens[docno]
+            content_end = title_end + content_lens[docno]
+            title_count = content_count = 0
+            for start in starts:
+                if start + span < title_end:
+                    title_count += 1
+                elif start >= title_end and start + span < content_end:
+                    content_count += 1
 
             total_matches = content_count + title_count
             if total_matches > 0:
                 # Weighted score based on matches
-                score = content_count + (title_count * 3)
-                results.append({
-                    "document": doc,
-                    "score": score,
-                    "matches": total_matches
-                })
-
-        return sorted(results, key=lambda x: x["score"], reverse=True)
+                yield docno, content_count + (title_count * 3), total_matches
 
     def search_with_filters(self, query, filters):
         # Reuse optimized search
@@ -335,55 +1070,152 @@ class OptimizedSearchEngine:
         return filtered_results
 
     def get_suggestions(self, partial_query):
-        partial_lower = partial_query.lower()
-        suggestions = []
-
-        # Scan inverted index keys
-        for term, postings in self.index.items():
-            if term.startswith(partial_lower):
-                suggestions.append({"term": term, "doc_count": len(postings)})
-
-        # Use heapq.nlargest for O(N log K) top-k selection
-        return heapq.nlargest(10, suggestions, key=lambda s: s["doc_count"])
-
-    def find_similar_documents(self, doc_id):
-        # Optimized Similarity using Sparse Vectors
-        if doc_id not in self.documents:
+        # Walk the prefix tree; each node already holds its top 10 terms
+        return self._suggestions.top(partial_query.lower())
+
+    def find_similar_documents(self, doc_id, top_k=10, weighting="tf", max_df=None):
+        # Cosine similarity of doc_id's term vector to every other
+        # document's, best top_k first. weighting is "tf" (term counts) or
+        # "tfidf" (counts times idf). Dot products are accumulated term at a
+        # time over the postings of the target's terms only, so documents
+        # sharing no term with it are never visited. Terms found in more
+        # than max_df (a fraction) of the documents are left out of the dot
+        # products, skipping their long posting lists at the cost of exact
+        # scores; vector lengths always count every term.
+        if weighting not in ("tf", "tfidf"):
+            raise ValueError(f"Unknown weighting: {weighting!r}")
+        docno = self._docnos.get(doc_id)
+        if docno is None:
             return []
-
-        # O(1) Vector Lookup
-        target_vector = self.doc_vectors.get(doc_id)
-        target_mag = self.doc_magnitudes.get(doc_id)
-
-        if not target_vector or target_mag == 0:
-            return []
-
-        similarities = []
-
-        # Iterate over docs (O(N)). Dot product is O(T) where T is terms in target.
-        # Total Complexity: O(N*T), much faster than O(N*Length^2)
-        for other_id, other_vector in self.doc_vectors.items():
-            if other_id == doc_id:
-                continue
-
-            other_mag = self.doc_magnitudes[other_id]
-            if other_mag == 0:
+        documents, doc_ids = self.documents, self._doc_ids
+        return [
+            {"document": documents[doc_ids[other]], "similarity": similarity}
+            for similarity, other in self._similar_entries(docno, top_k, weighting, max_df)
+        ]
+
+    def _similar_entries(self, docno, top_k, weighting, max_df):
+        # (similarity, docno) best first; ties go to the earlier document
+        doc_ids = self._doc_ids
+        vector = self.doc_vectors[doc_ids[docno]]
+        limit = len(doc_ids) if max_df is None else max_df * self._doc_count
+        dots = {}
+        get = dots.get
+        if weighting == "tfidf":
+            norms = self._tfidf_norms()
+            idf_cache, offset = self.idf_cache, self._idf_offset
+        for term, count in vector.items():
+            postings = self._postings[term]
+            if len(postings) > limit:
                 continue
-
-            # Sparse Dot Product
-            dot_product = 0.0
-            for term, count in target_vector.items():
-                if term in other_vector:
-                    dot_product += count * other_vector[term]
-
-            if dot_product > 0:
-                similarity = dot_product / (target_mag * other_mag)
-                similarities.append({
-                    "document": self.documents[other_id],
-                    "similarity": similarity
-                })
-
-        return heapq.nlargest(10, similarities, key=lambda s: s["similarity"])
+            if weighting == "tfidf":
+                idf = idf_cache[term] + offset
+                count *= idf * idf
+            for other, tf in zip(postings.docnos, postings.tfs):
+                dots[other] = get(other, 0) + count * tf
+        dots.pop(docno, None)
+
+        if weighting == "tfidf":
+            norm = norms[docno]
+            candidates = ((dot / (norm * norms[other]), -other) for other, dot in dots.items() if dot > 0)
+        else:
+            magnitudes = self.doc_magnitudes
+            norm = magnitudes[doc_ids[docno]]
+            candidates = ((dot / (norm * magnitudes[doc_ids[other]]), -other) for other, dot in dots.items())
+        return [(similarity, -other) for similarity, other in heapq.nlargest(top_k, candidates)]
+
+    def _tfidf_norms(self):
+        # docno -> length of the document's tf-idf vector. Every idf moves
+        # with N, so these are recomputed, in one pass over the postings, on
+        # the first use after documents are added or removed.
+        key = (len(self._doc_ids), self._doc_count)
+        if self._tfidf_norm_cache is None or self._tfidf_norm_cache[0] != key:
+            squares = [0.0] * len(self._doc_ids)
+            offset = self._idf_offset
+            for term, postings in self._postings.items():
+                idf = self.idf_cache[term] + offset
+                weight = idf * idf
+                for docno, tf in zip(postings.docnos, postings.tfs):
+                    squares[docno] += tf * tf * weight
+            self._tfidf_norm_cache = (key, array("d", map(math.sqrt, squares)))
+        return self._tfidf_norm_cache[1]
+
+    def similar_documents_table(self, top_k=10, weighting="tf", max_df=None):
+        # find_similar_documents for every document at once, as doc_id ->
+        # [(similar doc_id, similarity), ...], for serving related documents
+        # from a precomputed table. With NumPy and SciPy installed the
+        # document-term matrix is multiplied by its transpose a block of rows
+        # at a time; otherwise each document is looked up in turn.
+        if weighting not in ("tf", "tfidf"):
+            raise ValueError(f"Unknown weighting: {weighting!r}")
+        doc_ids = self._doc_ids
+        if sparse is None:
+            return {
+                doc_id: [(doc_ids[other], similarity)
+                         for similarity, other in self._similar_entries(docno, top_k, weighting, max_df)]
+                for docno, doc_id in enumerate(doc_ids) if doc_id is not None
+            }
+        return self._similar_documents_matrix(top_k, weighting, max_df)
+
+    # Upper bound on candidate pairs scored per block of rows in the
+    # sparse similar_documents_table (about 24 bytes each at peak)
+    SIMILARITY_BLOCK = 1 << 23
+
+    def _similar_documents_matrix(self, top_k, weighting, max_df):
+        doc_ids = self._doc_ids
+        n_rows = len(doc_ids)
+        terms = list(self._postings)
+        if not terms:
+            return {doc_id: [] for doc_id in doc_ids if doc_id is not None}
+        lists = [self._postings[t] for t in terms]
+        dfs = np.fromiter(map(len, lists), dtype=np.int64, count=len(lists))
+        indptr = np.zeros(len(lists) + 1, dtype=np.int64)
+        np.cumsum(dfs, out=indptr[1:])
+        indices = np.concatenate([np.frombuffer(p.docnos, dtype=np.uint32) for p in lists])
+        data = np.concatenate([np.frombuffer(p.tfs, dtype=np.uint32) for p in lists]).astype(np.float64)
+        if weighting == "tfidf":
+            idf = np.fromiter((self.idf_cache[t] for t in terms), dtype=np.float64, count=len(terms))
+            data *= np.repeat(idf + self._idf_offset, dfs)
+        # Documents are rows, terms columns
+        matrix = sparse.csc_matrix((data, indices.astype(np.int64), indptr), shape=(n_rows, len(terms)))
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        if max_df is not None:
+            matrix = matrix[:, np.flatnonzero(dfs <= max_df * self._doc_count)]
+        rows = matrix.tocsr()
+        columns = rows.T.tocsr()
+        # Candidates per row are at most the sum of its terms' dfs
+        costs = (rows.astype(bool).astype(np.int64) @ np.diff(columns.indptr)).tolist()
+
+        table = {}
+        start = 0
+        while start < n_rows:
+            end = start + 1
+            budget = costs[start]
+            while end < n_rows and budget + costs[end] <= self.SIMILARITY_BLOCK:
+                budget += costs[end]
+                end += 1
+            dots = (rows[start:end] @ columns).tocsr()
+            row = np.repeat(np.arange(start, end), np.diff(dots.indptr))
+            other = dots.indices.astype(np.int64)
+            keep = (dots.data > 0) & (other != row)
+            row, other, dot = row[keep], other[keep], dots.data[keep]
+            similarity = dot / (norms[row] * norms[other])
+            bounds = [0]
+            bounds.extend(np.cumsum(np.bincount(row - start, minlength=end - start)).tolist())
+            for docno, lo, hi in zip(range(start, end), bounds, bounds[1:]):
+                if doc_ids[docno] is None:
+                    continue
+                scores, others = similarity[lo:hi], other[lo:hi]
+                if hi - lo > top_k > 0:
+                    # Only entries tied with or above the top_k-th need sorting
+                    cut = np.partition(scores, hi - lo - top_k)[hi - lo - top_k]
+                    keep = scores >= cut
+                    scores, others = scores[keep], others[keep]
+                order = np.lexsort((others, -scores))[:top_k]
+                table[doc_ids[docno]] = [
+                    (doc_ids[o], score) for o, score in zip(others[order].tolist(), scores[order].tolist())
+                ]
+            start = end
+        return table
 
     def calculate_tfidf(self, term, doc_id):
         # O(1) lookup using pre-computed values
@@ -432,10 +1264,18 @@ class OptimizedSearchEngine:
         # Restore documents
         docs_backup = list(self.documents.values())
 
-        self.index.clear()
+        self._postings.clear()
+        self._docnos.clear()
+        self._doc_ids.clear()
+        del self._doc_lens[:]
+        del self._title_lens[:]
+        del self._content_lens[:]
+        self._suggestions.clear()
+        self._total_doc_len = 0
         self.documents.clear()
         self.doc_vectors.clear()
         self.doc_magnitudes.clear()
+        self._tfidf_norm_cache = None
         self.doc_freqs.clear()
         self.idf_cache.clear()
         self._doc_count = 0
@@ -447,8 +1287,8 @@ class OptimizedSearchEngine:
             self.add_document(doc)
 
     def get_index_stats(self):
-        total_terms = len(self.index)
-        total_postings = sum(len(p) for p in self.index.values())
+        total_terms = len(self._postings)
+        total_postings = sum(len(p) for p in self._postings.values())
         avg_postings = total_postings / total_terms if total_terms > 0 else 0
         return {
             "total_documents": len(self.documents),
@@ -459,4 +1299,844 @@ class OptimizedSearchEngine:
 
     def export_search_history(self):
         # Efficient string join
-        return "\n".join(self.search_history) + "\n"
\ No newline at end of file
+        return "\n".join(self.search_history) + "\n"
+
+
+def _index_chunk(analyzer, texts):
+    # Partial index of (title, content, tags) triples for add_documents:
+    # per-document lengths, term counts and magnitudes, and term ->
+    # PostingList with documents numbered from 0
+    lens, title_lens, content_lens = array("I"), array("I"), array("I")
+    vectors, magnitudes = [], array("d")
+    postings = {}
+    for docno, (title, content, tags) in enumerate(texts):
+        tokens, title_len, content_len = analyzer._analyze(Document(None, title, content, tags))
+        doc_len = len(tokens)
+        lens.append(doc_len)
+        title_lens.append(title_len)
+        content_lens.append(content_len)
+
+        term_positions = defaultdict(list)
+        for idx, term in enumerate(tokens):
+            term_positions[term].append(idx)
+        vector = {}
+        sq_sum = 0.0
+        for term, positions in term_positions.items():
+            count = len(positions)
+            partial = postings.get(term)
+            if partial is None:
+                partial = postings[term] = PostingList()
+            partial.append(docno, count, positions, doc_len)
+            vector[term] = count
+            sq_sum += count * count
+        vectors.append(vector)
+        magnitudes.append(math.sqrt(sq_sum))
+    return lens, title_lens, content_lens, vectors, magnitudes, postings
+
+
+_chunk_analyzers = {}  # engine class -> instance, per pool process
+
+
+def _index_chunk_worker(task):
+    engine_cls, texts = task
+    analyzer = _chunk_analyzers.get(engine_cls)
+    if analyzer is None:
+        analyzer = _chunk_analyzers[engine_cls] = engine_cls()
+    return _index_chunk(analyzer, texts)
+
+
+def _copy_postings(source, renumber, doc_lens, out):
+    # Append source's postings to the PostingList out under new document
+    # numbers, dropping those renumbered to -1
+    positions = source.positions
+    start = 0
+    for docno, tf, end in zip(source.docnos, source.tfs, source.ends):
+        new = renumber[docno]
+        if new >= 0:
+            out.append_encoded(new, tf, positions[start:end], doc_lens[docno])
+        start = end
+
+
+class _MappedPostings:
+    """A term's postings read in place from a memory-mapped segment.
+
+    The PostingList columns are memoryviews over the file, so the search
+    and merge loops run over either without copying.
+    """
+
+    __slots__ = (
+        "docnos", "tfs", "ends", "positions", "max_tf", "max_ratio",
+        "block_tf", "block_ratio", "block_len",
+    )
+
+    def __init__(self, buf, offset, count, pos_len, max_tf, max_ratio):
+        blocks = -(-count // PostingList.BLOCK)
+        columns = []
+        for code, size in (("I", count), ("I", count), ("Q", count),
+                           ("I", blocks), ("I", blocks), ("d", blocks)):
+            end = offset + size * array(code).itemsize
+            columns.append(buf[offset:end].cast(code))
+            offset = end
+        self.docnos, self.tfs, self.ends, self.block_tf, self.block_len, self.block_ratio = columns
+        self.positions = buf[offset:offset + pos_len]
+        self.max_tf = max_tf
+        self.max_ratio = max_ratio
+
+    def __len__(self):
+        return len(self.docnos)
+
+    def positions_at(self, i):
+        start = self.ends[i - 1] if i else 0
+        return _decode_positions(bytes(self.positions[start:self.ends[i]]))
+
+
+class SegmentWriter:
+    """Writes one immutable segment file.
+
+    Documents are added first, in document-number order, then each term's
+    postings in increasing order of the term's UTF-8 bytes. Stored
+    documents and postings are streamed to the file; finish() appends the
+    document columns, the sorted doc id and term tables and a JSON footer
+    with every section's offset, then renames the file into place. All
+    sections are 8-byte aligned so they can be cast in place.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path + ".tmp", "wb")
+        self._offset = 0
+        self._sections = {}
+        self._postings_start = None
+
+        self._doc_lens = array("I")
+        self._title_lens = array("I")
+        self._content_lens = array("I")
+        self._stored_ends = array("Q")
+        self._keys = []  # (encoded doc_id, docno)
+        self._total_doc_len = 0
+
+        self._terms = bytearray()
+        self._term_ends = array("Q")
+        self._term_offsets = array("Q")
+        self._term_counts = array("I")
+        self._term_max_tf = array("I")
+        self._term_pos_lens = array("Q")
+        self._term_max_ratio = array("d")
+
+    def _write(self, data):
+        data = memoryview(data)
+        self._file.write(data)
+        self._offset += data.nbytes
+
+    def _align(self):
+        self._write(bytes(-self._offset % 8))
+
+    def _section(self, name, data):
+        self._align()
+        start = self._offset
+        self._write(data)
+        self._sections[name] = [start, self._offset - start]
+
+    def add_document(self, doc, title_len, content_len):
+        record = json.dumps([doc.doc_id, doc.title, doc.content, doc.tags, doc.indexed_at])
+        self._keys.append((json.dumps(doc.doc_id).encode(), len(self._doc_lens)))
+        self._write(record.encode())
+        self._stored_ends.append(self._offset)
+        self._doc_lens.append(doc.word_count)
+        self._title_lens.append(title_len)
+        self._content_lens.append(content_len)
+        self._total_doc_len += doc.word_count
+
+    def add_postings(self, term, postings):
+        # term is the UTF-8 encoded term; postings a PostingList
+        if self._postings_start is None:
+            self._sections["stored"] = [0, self._offset]
+            self._align()
+            self._postings_start = self._offset
+        self._terms += term
+        self._term_ends.append(len(self._terms))
+        self._term_offsets.append(self._offset)
+        self._term_counts.append(len(postings))
+        self._term_pos_lens.append(len(postings.positions))
+        self._term_max_tf.append(postings.max_tf)
+        self._term_max_ratio.append(postings.max_ratio)
+        # Same column order as _MappedPostings reads
+        for column in (postings.docnos, postings.tfs, postings.ends,
+                       postings.block_tf, postings.block_len, postings.block_ratio,
+                       postings.positions):
+            self._write(column)
+        self._align()
+
+    def finish(self):
+        if self._postings_start is None:
+            self._sections["stored"] = [0, self._offset]
+        keys = bytearray()
+        key_ends = array("Q")
+        key_docnos = array("I")
+        for key, docno in sorted(self._keys):
+            keys += key
+            key_ends.append(len(keys))
+            key_docnos.append(docno)
+
+        for name, data in (
+            ("stored_ends", self._stored_ends),
+            ("doc_lens", self._doc_lens),
+            ("title_lens", self._title_lens),
+            ("content_lens", self._content_lens),
+            ("keys", keys),
+            ("key_ends", key_ends),
+            ("key_docnos", key_docnos),
+            ("terms", self._terms),
+            ("term_ends", self._term_ends),
+            ("term_offsets", self._term_offsets),
+            ("term_counts", self._term_counts),
+            ("term_pos_lens", self._term_pos_lens),
+            ("term_max_tf", self._term_max_tf),
+            ("term_max_ratio", self._term_max_ratio),
+        ):
+            self._section(name, data)
+
+        meta = json.dumps({
+            "version": 1,
+            "byteorder": sys.byteorder,
+            "docs": len(self._doc_lens),
+            "total_doc_len": self._total_doc_len,
+            "sections": self._sections,
+        }).encode()
+        self._write(meta)
+        self._write(struct.pack("<Q8s", len(meta), Segment.MAGIC))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.path + ".tmp", self.path)
+
+    def abort(self):
+        self._file.close()
+        os.remove(self.path + ".tmp")
+
+
+class Segment:
+    """An immutable segment file, memory-mapped read-only.
+
+    Opening a segment reads only its footer: every column is a memoryview
+    over the map and pages are read in as queries touch them. Terms and
+    doc ids are looked up by binary search in sorted string tables.
+
+    Deletions live beside the file (in the engine's manifest): deleted
+    holds removed document numbers, whose postings stay in the file until
+    a merge drops them, and deleted_df how many of those each term's
+    postings still count.
+    """
+
+    MAGIC = b"KSEG0001"
+
+    def __init__(self, path):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._map)
+        meta_len, magic = struct.unpack_from("<Q8s", self._map, size - 16)
+        if magic != self.MAGIC:
+            raise ValueError(f"{path} is not a segment file")
+        meta = json.loads(self._map[size - 16 - meta_len:size - 16])
+        if meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {meta['byteorder']}-endian machine")
+
+        self._buf = memoryview(self._map)
+        sections = meta["sections"]
+
+        def column(name, code):
+            start, length = sections[name]
+            return self._buf[start:start + length].cast(code)
+
+        self.n_docs = meta["docs"]
+        self.doc_lens = column("doc_lens", "I")
+        self.title_lens = column("title_lens", "I")
+        self.content_lens = column("content_lens", "I")
+        self._stored_ends = column("stored_ends", "Q")
+        self._keys = sections["keys"][0]
+        self._key_ends = column("key_ends", "Q")
+        self._key_docnos = column("key_docnos", "I")
+        self._terms = sections["terms"][0]
+        self._term_ends = column("term_ends", "Q")
+        self._term_offsets = column("term_offsets", "Q")
+        self._term_counts = column("term_counts", "I")
+        self._term_pos_lens = column("term_pos_lens", "Q")
+        self._term_max_tf = column("term_max_tf", "I")
+        self._term_max_ratio = column("term_max_ratio", "d")
+
+        self.deleted = set()
+        self.deleted_df = Counter()
+        self.live_docs = self.n_docs
+        self.live_len = meta["total_doc_len"]
+
+    def _string(self, start, ends, i):
+        return self._map[start + (ends[i - 1] if i else 0):start + ends[i]]
+
+    def _search(self, start, ends, key):
+        # Index of key in a sorted string table, or -1
+        lo, hi = 0, len(ends)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._string(start, ends, mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(ends) and self._string(start, ends, lo) == key:
+            return lo
+        return -1
+
+    def terms(self):
+        # UTF-8 encoded terms in sorted order
+        for i in range(len(self._term_ends)):
+            yield self._string(self._terms, self._term_ends, i)
+
+    def postings(self, term):
+        i = self._search(self._terms, self._term_ends, term.encode())
+        return self.postings_at(i) if i >= 0 else None
+
+    def postings_at(self, i):
+        return _MappedPostings(
+            self._buf, self._term_offsets[i], self._term_counts[i],
+            self._term_pos_lens[i], self._term_max_tf[i], self._term_max_ratio[i],
+        )
+
+    def find(self, doc_id):
+        # Document number of a live document, or -1
+        i = self._search(self._keys, self._key_ends, json.dumps(doc_id).encode())
+        if i < 0 or self._key_docnos[i] in self.deleted:
+            return -1
+        return self._key_docnos[i]
+
+    def document(self, docno):
+        start = self._stored_ends[docno - 1] if docno else 0
+        doc_id, title, content, tags, indexed_at = json.loads(self._map[start:self._stored_ends[docno]])
+        doc = Document(doc_id, title, content, tags)
+        doc.word_count = self.doc_lens[docno]
+        doc.indexed_at = indexed_at
+        return doc
+
+    def delete(self, docno, terms):
+        # terms: the distinct terms the document was indexed under
+        self.deleted.add(docno)
+        self.deleted_df.update(terms)
+        self.live_docs -= 1
+        self.live_len -= self.doc_lens[docno]
+
+
+class _BufferView:
+    """The in-memory buffer of a PersistentSearchEngine, read like a Segment."""
+
+    deleted = frozenset()
+    deleted_df = Counter()
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.doc_lens = engine._doc_lens
+        self.title_lens = engine._title_lens
+        self.content_lens = engine._content_lens
+        self.live_docs = engine._doc_count
+        self.live_len = engine._total_doc_len
+
+    def postings(self, term):
+        return self._engine._postings.get(term)
+
+    def document(self, docno):
+        return self._engine.documents[self._engine._doc_ids[docno]]
+
+
+class PersistentSearchEngine:
+    """Search engine keeping its index in immutable on-disk segments.
+
+    New documents are indexed into an in-memory OptimizedSearchEngine,
+    which flush() writes out as a Segment once it holds flush_docs
+    documents, and on close(). At startup segments are memory-mapped
+    instead of re-indexed. The list of segments and their deleted
+    documents is kept in a manifest that every flush replaces atomically,
+    so added and removed documents become durable at the next flush.
+
+    Segments of similar size (the same power of merge_factor times
+    flush_docs) are merged merge_factor at a time, dropping deleted
+    documents, and a segment at least half deleted is rewritten alone.
+    Merges run on a background thread unless background_merge is False.
+
+    search and search_phrase score with collection statistics over all
+    live documents, as if they were in one OptimizedSearchEngine. Doc ids
+    must be JSON strings or numbers.
+    """
+
+    MANIFEST = "segments.json"
+
+    def __init__(self, path, flush_docs=10_000, merge_factor=10, background_merge=True):
+        if merge_factor < 2:
+            raise ValueError("merge_factor must be at least 2")
+        self.path = path
+        self.flush_docs = flush_docs
+        self.merge_factor = merge_factor
+        os.makedirs(path, exist_ok=True)
+
+        # Held while the segment list, deletions or the manifest change,
+        # which the merge thread does too
+        self._lock = threading.Lock()
+        self._stem_cache = {}
+        self._buffer = self._new_buffer()
+        self._merger = ThreadPoolExecutor(max_workers=1) if background_merge else None
+        self._merges = []  # pending background merge futures
+        self._deletes_pending = False
+        self._generation = 0
+        self._segments = []
+
+        manifest = os.path.join(path, self.MANIFEST)
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                state = json.load(f)
+            self._generation = state["generation"]
+            for entry in state["segments"]:
+                segment = Segment(os.path.join(path, entry["name"]))
+                for docno in entry["deleted"]:
+                    self._delete(segment, docno)
+                self._segments.append(segment)
+
+        # Unfinished writes and merged-away segments left by a crash
+        live = {segment.name for segment in self._segments}
+        for name in os.listdir(path):
+            if name.endswith((".seg", ".tmp")) and name not in live:
+                os.remove(os.path.join(path, name))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _new_buffer(self):
+        buffer = OptimizedSearchEngine()
+        buffer.stem_cache = self._stem_cache
+        return buffer
+
+    def _sources(self):
+        return self._segments + [_BufferView(self._buffer)]
+
+    def _delete(self, segment, docno):
+        doc = segment.document(docno)
+        segment.delete(docno, set(self._buffer._analyze(doc)[0]))
+
+    def _remove_persisted(self, doc_id):
+        with self._lock:
+            for segment in self._segments:
+                docno = segment.find(doc_id)
+                if docno >= 0:
+                    self._delete(segment, docno)
+                    self._deletes_pending = True
+                    return
+
+    def add_document(self, doc):
+        # An update of a flushed document deletes it from its segment
+        if doc.doc_id not in self._buffer.documents:
+            self._remove_persisted(doc.doc_id)
+        self._buffer.add_document(doc)
+        if len(self._buffer.documents) >= self.flush_docs:
+            self.flush()
+
+    def remove_document(self, doc_id):
+        if doc_id in self._buffer.documents:
+            self._buffer.remove_document(doc_id)
+        else:
+            self._remove_persisted(doc_id)
+
+    def get_document(self, doc_id):
+        doc = self._buffer.documents.get(doc_id)
+        if doc is not None:
+            return doc
+        for segment in self._segments:
+            docno = segment.find(doc_id)
+            if docno >= 0:
+                return segment.document(docno)
+        return None
+
+    def flush(self):
+        buffer = self._buffer
+        if buffer.documents:
+            with self._lock:
+                self._generation += 1
+                path = os.path.join(self.path, f"{self._generation:08d}.seg")
+            self._write_buffer(buffer, path)
+            segment = Segment(path)
+            with self._lock:
+                self._segments = self._segments + [segment]
+                self._buffer = self._new_buffer()
+                self._write_manifest()
+        elif self._deletes_pending:
+            with self._lock:
+                self._write_manifest()
+        else:
+            return
+        self._deletes_pending = False
+        self._schedule_merges()
+
+    def close(self):
+        self.flush()
+        self.wait_for_merges()
+        if self._merger is not None:
+            self._merger.shutdown()
+
+    def _write_manifest(self):
+        # Called with the lock held
+        state = {
+            "generation": self._generation,
+            "segments": [
+                {"name": segment.name, "deleted": sorted(segment.deleted)}
+                for segment in self._segments
+            ],
+        }
+        manifest = os.path.join(self.path, self.MANIFEST)
+        with open(manifest + ".tmp", "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(manifest + ".tmp", manifest)
+
+    def _write_buffer(self, buffer, path):
+        writer = SegmentWriter(path)
+        try:
+            # Removed and updated documents leave gaps in the buffer's
+            # document numbers; segments are numbered densely
+            renumber = []
+            live = 0
+            for docno, doc_id in enumerate(buffer._doc_ids):
+                if doc_id is None:
+                    renumber.append(-1)
+                    continue
+                renumber.append(live)
+                live += 1
+                writer.add_document(buffer.documents[doc_id], buffer._title_lens[docno], buffer._content_lens[docno])
+            for term in sorted(buffer._postings, key=str.encode):
+                out = PostingList()
+                _copy_postings(buffer._postings[term], renumber, buffer._doc_lens, out)
+                writer.add_postings(term.encode(), out)
+            writer.finish()
+        except BaseException:
+            writer.abort()
+            raise
+
+    def _schedule_merges(self):
+        if self._merger is None:
+            self._run_merges()
+        else:
+            self._merges.append(self._merger.submit(self._run_merges))
+
+    def wait_for_merges(self):
+        # Block until background merges finish, re-raising their errors
+        while self._merges:
+            self._merges.pop(0).result()
+
+    def _run_merges(self):
+        while True:
+            with self._lock:
+                segments = self._pick_merge()
+            if not segments:
+                return
+            self._merge(segments)
+
+    def _pick_merge(self):
+        # Called with the lock held. Segments come back in list order.
+        tiers = defaultdict(list)
+        for segment in self._segments:
+            if segment.live_docs * 2 <= segment.n_docs:
+                return [segment]
+            tier, size = 0, self.flush_docs * self.merge_factor
+            while segment.live_docs >= size:
+                tier += 1
+                size *= self.merge_factor
+            tiers[tier].append(segment)
+            if len(tiers[tier]) == self.merge_factor:
+                return tiers[tier]
+        return None
+
+    def _merge(self, segments):
+        with self._lock:
+            self._generation += 1
+            path = os.path.join(self.path, f"{self._generation:08d}.seg")
+            snapshots = [set(segment.deleted) for segment in segments]
+
+        # Renumber live documents densely, segment by segment
+        renumbers = []
+        live = 0
+        for segment, deleted in zip(segments, snapshots):
+            renumber = []
+            for docno in range(segment.n_docs):
+                if docno in deleted:
+                    renumber.append(-1)
+                else:
+                    renumber.append(live)
+                    live += 1
+            renumbers.append(renumber)
+
+        merged = None
+        if live:
+            writer = SegmentWriter(path)
+            try:
+                for segment, renumber in zip(segments, renumbers):
+                    for docno, new in enumerate(renumber):
+                        if new >= 0:
+                            writer.add_document(segment.document(docno),
+                                                segment.title_lens[docno], segment.content_lens[docno])
+                streams = [
+                    zip(segment.terms(), itertools.repeat(k), itertools.count())
+                    for k, segment in enumerate(segments)
+                ]
+                for term, group in itertools.groupby(heapq.merge(*streams), key=lambda entry: entry[0]):
+                    out = PostingList()
+                    for _, k, i in group:
+                        _copy_postings(segments[k].postings_at(i), renumbers[k], segments[k].doc_lens, out)
+                    if out:
+                        writer.add_postings(term, out)
+                writer.finish()
+            except BaseException:
+                writer.abort()
+                raise
+            merged = Segment(path)
+
+        with self._lock:
+            # Carry over documents deleted while the merge ran
+            for segment, deleted, renumber in zip(segments, snapshots, renumbers):
+                for docno in segment.deleted - deleted:
+                    self._delete(merged, renumber[docno])
+            remaining = []
+            for segment in self._segments:
+                if segment is segments[0] and merged is not None:
+                    remaining.append(merged)
+                if not any(segment is s for s in segments):
+                    remaining.append(segment)
+            self._segments = remaining
+            self._write_manifest()
+        for segment in segments:
+            try:
+                os.remove(segment.path)
+            except OSError:
+                pass  # still mapped on this platform; removed on next open
+
+    def search(self, query, top_k=None, scorer="tfidf"):
+        # Same arguments and results as OptimizedSearchEngine.search over
+        # the live documents; ties rank older segments first
+        if scorer not in ("tfidf", "bm25"):
+            raise ValueError(f"Unknown scorer: {scorer!r}")
+
+        stemmed_query = self._buffer._analyze_query(query)
+        if not stemmed_query:
+            return []
+
+        sources = self._sources()
+        found = []
+        dfs = defaultdict(int)
+        for source in sources:
+            postings = {}
+            for term in set(stemmed_query):
+                p = source.postings(term)
+                if p is not None:
+                    postings[term] = p
+                    dfs[term] += len(p) - source.deleted_df[term]
+            found.append(postings)
+
+        n = sum(source.live_docs for source in sources)
+        if scorer == "bm25":
+            total_doc_len = sum(source.live_len for source in sources)
+
+            def term_scorer(postings, term):
+                return OptimizedSearchEngine._bm25_scorer(postings, n, dfs[term], total_doc_len)
+        else:
+            idfs = {term: math.log(n / df) for term, df in dfs.items() if df > 0}
+
+            def term_scorer(postings, term):
+                return OptimizedSearchEngine._tfidf_scorer(postings, idfs[term])
+
+        results = []
+        entries = []
+        for s, (source, postings) in enumerate(zip(sources, found)):
+            terms = [term_scorer(postings[t], t) for t in stemmed_query if t in postings and dfs[t] > 0]
+            if top_k is not None:
+                for score, order, docno in OptimizedSearchEngine._top_k_entries(
+                        terms, top_k, source.doc_lens, source.deleted):
+                    entries.append((score, -s, order, docno))
+                continue
+
+            scores = defaultdict(float)
+            doc_lens = source.doc_lens
+            deleted = source.deleted
+            for p, score, _, _ in terms:
+                for docno, tf in zip(p.docnos, p.tfs):
+                    if deleted and docno in deleted:
+                        continue
+                    scores[docno] += score(tf, doc_lens[docno])
+            results.extend({"document": source.document(docno), "score": score}
+                           for docno, score in scores.items())
+
+        if top_k is not None:
+            return [
+                {"document": sources[-s].document(-docno), "score": score}
+                for score, s, _, docno in sorted(entries, reverse=True)[:top_k]
+            ]
+        return sorted(results, key=lambda x: x["score"], reverse=True)
+
+    def search_phrase(self, phrase):
+        stemmed_tokens = self._buffer._analyze_query(phrase)
+        if not stemmed_tokens:
+            return []
+
+        results = []
+        for source in self._sources():
+            postings = {term: source.postings(term) for term in set(stemmed_tokens)}
+            if any(p is None for p in postings.values()):
+                continue
+            lists = [postings[term] for term in stemmed_tokens]
+            for docno, score, matches in OptimizedSearchEngine._phrase_matches(
+                    lists, source.title_lens, source.content_lens, source.deleted):
+                results.append({"document": source.document(docno), "score": score, "matches": matches})
+        return sorted(results, key=lambda x: x["score"], reverse=True)
+
+    def get_index_stats(self):
+        segments = self._segments
+        return {
+            "total_documents": sum(s.live_docs for s in segments) + len(self._buffer.documents),
+            "segments": len(segments),
+            "buffered_documents": len(self._buffer.documents),
+            "deleted_documents": sum(len(s.deleted) for s in segments),
+        }
+
+
+def _shard_loop(conn, engine_cls):
+    # Body of a ShardedSearchEngine shard process: apply (method, args)
+    # requests to a private engine and send back ("ok", result) or
+    # ("error", exception), until a None request
+    engine = engine_cls()
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        method, args = request
+        try:
+            reply = ("ok", getattr(engine, method)(*args))
+        except Exception as exc:
+            reply = ("error", exc)
+        conn.send(reply)
+    conn.close()
+
+
+class ShardedSearchEngine:
+    """Documents spread over OptimizedSearchEngine shards in worker processes.
+
+    Each document is kept by the shard its id hashes to. add_documents
+    sends every shard its share of the batch before waiting for any, so
+    shards index in parallel.
+
+    search fans out twice: first for each shard's document count, total
+    length and the query terms' document frequencies, then with the sums
+    of those, so every shard scores as a single engine holding all the
+    documents would. With top_k each shard returns its best top_k and the
+    best top_k of those are kept. Ties rank lower-numbered shards first.
+    Documents in results are copies sent back by the shards.
+    """
+
+    def __init__(self, shards=None, engine_cls=None):
+        self._analyzer = (engine_cls or OptimizedSearchEngine)()
+        self._conns = []
+        self._processes = []
+        for _ in range(shards or os.cpu_count() or 1):
+            conn, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_shard_loop, args=(child, type(self._analyzer)), daemon=True,
+            )
+            process.start()
+            child.close()
+            self._conns.append(conn)
+            self._processes.append(process)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        for conn, process in zip(self._conns, self._processes):
+            conn.send(None)
+            conn.close()
+            process.join()
+        self._conns = []
+        self._processes = []
+
+    def _shard(self, doc_id):
+        return hash(doc_id) % len(self._conns)
+
+    def _call(self, requests):
+        # requests: {shard: (method, args)}; returns {shard: result}
+        for shard, request in requests.items():
+            self._conns[shard].send(request)
+        results = {}
+        error = None
+        for shard in requests:
+            status, value = self._conns[shard].recv()
+            if status == "error":
+                error = error or value
+            results[shard] = value
+        if error is not None:
+            raise error
+        return results
+
+    def _broadcast(self, method, *args):
+        results = self._call({shard: (method, args) for shard in range(len(self._conns))})
+        return [results[shard] for shard in range(len(self._conns))]
+
+    def add_document(self, doc):
+        self.add_documents([doc])
+
+    def add_documents(self, docs):
+        batches = defaultdict(list)
+        for doc in docs:
+            batches[self._shard(doc.doc_id)].append(doc)
+        self._call({shard: ("add_documents", (batch,)) for shard, batch in batches.items()})
+
+    def remove_document(self, doc_id):
+        self._call({self._shard(doc_id): ("remove_document", (doc_id,))})
+
+    def search(self, query, top_k=None, scorer="tfidf"):
+        if scorer not in ("tfidf", "bm25"):
+            raise ValueError(f"Unknown scorer: {scorer!r}")
+        terms = self._analyzer._analyze_query(query)
+        if not terms:
+            return []
+
+        n = total_doc_len = 0
+        dfs = Counter()
+        for shard_n, shard_len, shard_dfs in self._broadcast("_term_stats", terms):
+            n += shard_n
+            total_doc_len += shard_len
+            dfs.update(shard_dfs)
+        terms = [t for t in terms if dfs[t] > 0]
+        if not terms:
+            return []
+
+        entries = []
+        for shard, results in enumerate(self._broadcast(
+                "_search_with_stats", terms, top_k, scorer, n, dict(dfs), total_doc_len)):
+            entries.extend((score, -shard, order, docno, doc) for score, order, docno, doc in results)
+        entries.sort(key=lambda entry: entry[:4], reverse=True)
+        if top_k is not None:
+            entries = entries[:top_k]
+        return [{"document": doc, "score": score} for score, _, _, _, doc in entries]
+
+    def search_phrase(self, phrase):
+        # Phrase scores only count matches, so no statistics are shared
+        results = []
+        for shard_results in self._broadcast("search_phrase", phrase):
+            results.extend(shard_results)
+        return sorted(results, key=lambda x: x["score"], reverse=True)
+
+    def get_index_stats(self):
+        stats = self._broadcast("get_index_stats")
+        return {
+            "total_documents": sum(s["total_documents"] for s in stats),
+            "shards": len(stats),
+            "documents_per_shard": [s["total_documents"] for s in stats],
+        }
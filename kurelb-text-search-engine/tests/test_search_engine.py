@@ -314,4 +314,252 @@ def test_remove_document_keeps_index_consistent(engine):
 
     engine.remove_document(1)
     assert len(engine.search("beta")) == 1
-    assert len(engine.search("alpha")) == 0
\ No newline at end of file
+    assert len(engine.search("alpha")) == 0
+
+
+def test_compact_postings_round_trip(engine):
+    """
+    Postings are stored as compact columns; the index view decodes them to
+    the same doc_id / tf / positions, including after removing a document
+    from the middle of a posting list.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    filler = " ".join(f"w{i}" for i in range(300))
+    engine.add_document(Document("a", "Alpha", "gamma " + filler + " gamma gamma"))
+    engine.add_document(Document("b", "Beta", "gamma delta"))
+    engine.add_document(Document("c", "Gamma", "delta gamma"))
+
+    assert engine.index["gamma"] == [
+        {"doc_id": "a", "tf": 3, "pos": [1, 302, 303]},
+        {"doc_id": "b", "tf": 1, "pos": [1]},
+        {"doc_id": "c", "tf": 2, "pos": [0, 2]},
+    ]
+
+    engine.remove_document("b")
+    assert engine.index["gamma"] == [
+        {"doc_id": "a", "tf": 3, "pos": [1, 302, 303]},
+        {"doc_id": "c", "tf": 2, "pos": [0, 2]},
+    ]
+    assert [r["document"].doc_id for r in engine.search("delta")] == ["c"]
+    assert engine.get_index_stats()["total_postings"] == sum(
+        len(engine.index[t]) for t in engine.index
+    )
+
+
+def test_top_k_search_matches_full_ranking(engine):
+    """
+    search(query, top_k=k) returns the first k results of the full ranking,
+    for both the tf-idf and BM25 scorers, including ties and documents that
+    only contain the rarer term.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    rng = random.Random(5)
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma"]
+    for i in range(300):
+        content = " ".join(rng.choices(words, k=rng.randint(1, 12)))
+        engine.add_document(Document(i, rng.choice(words), content))
+    for i in range(0, 300, 7):
+        engine.remove_document(i)
+
+    def ranking(results):
+        return [(r["document"].doc_id, r["score"]) for r in results]
+
+    for scorer in ("tfidf", "bm25"):
+        for query in ("alpha", "alpha omega", "sigma beta sigma", "missing"):
+            full = engine.search(query, scorer=scorer)
+            for k in (1, 3, 10, 1000):
+                assert ranking(engine.search(query, top_k=k, scorer=scorer)) == ranking(full[:k])
+
+    with pytest.raises(ValueError):
+        engine.search("alpha", scorer="cosine")
+
+
+def test_phrase_search_uses_positions(engine):
+    """
+    Phrase matches come from stored positions: terms must be adjacent in
+    the indexed token stream and inside a single field, and the document
+    text is never read.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    engine.add_document(Document(1, "Machine Learning", "machine learning and deep learning"))
+    engine.add_document(Document(2, "Learning", "learning about the machine"))
+    engine.add_document(Document(3, "Machine", "learning machines"))
+
+    for doc in engine.documents.values():
+        doc.content = doc.title = ""
+
+    results = engine.search_phrase("machine learning")
+    assert [(r["document"].doc_id, r["matches"], r["score"]) for r in results] == [(1, 2, 4)]
+    assert engine.search_phrase("learning machine") == []
+
+
+def test_suggestions_follow_document_frequency(engine):
+    """
+    Suggestions come from the prefix tree, ranked by document frequency and
+    kept current as documents are added and removed.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    engine.add_document(Document(1, "Pyramid", "python pythonic"))
+    engine.add_document(Document(2, "Python", "python pyramid"))
+    engine.add_document(Document(3, "Other", "pyramid"))
+
+    assert engine.get_suggestions("PY") == [
+        {"term": "pyramid", "doc_count": 3},
+        {"term": "python", "doc_count": 2},
+        {"term": "pythonic", "doc_count": 1},
+    ]
+
+    engine.remove_document(1)
+    assert engine.get_suggestions("pyth") == [{"term": "python", "doc_count": 1}]
+    assert engine.get_suggestions("pyx") == []
+
+
+def test_persistent_segments_survive_restart(engine, tmp_path):
+    """
+    PersistentSearchEngine flushes documents to memory-mapped segments and
+    reopens them without re-indexing; removals and updates of flushed
+    documents persist, and merges drop deleted documents while search and
+    phrase results stay those of an in-memory engine with the same documents.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    rng = random.Random(11)
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma"]
+    disk = engine_module.PersistentSearchEngine(str(tmp_path), flush_docs=10, merge_factor=3,
+                                                background_merge=False)
+    for i in range(100):
+        title, content = rng.choice(words), " ".join(rng.choices(words, k=rng.randint(1, 12)))
+        engine.add_document(Document(i, title, content))
+        disk.add_document(Document(i, title, content))
+    for i in range(0, 100, 3):
+        engine.remove_document(i)
+        disk.remove_document(i)
+    engine.add_document(Document(1, "Updated", "alpha beta"))
+    disk.add_document(Document(1, "Updated", "alpha beta"))
+    disk.close()
+
+    disk = engine_module.PersistentSearchEngine(str(tmp_path), background_merge=False)
+    assert disk.get_index_stats()["total_documents"] == len(engine.documents)
+    assert disk.get_document(1).title == "Updated"
+    assert disk.get_document(3) is None
+
+    def ranking(results):
+        return sorted((r["document"].doc_id, round(r["score"], 9)) for r in results)
+
+    for scorer in ("tfidf", "bm25"):
+        for query in ("alpha", "omega sigma", "missing"):
+            full = disk.search(query, scorer=scorer)
+            assert ranking(full) == ranking(engine.search(query, scorer=scorer))
+            top = disk.search(query, top_k=5, scorer=scorer)
+            assert [(r["document"].doc_id, r["score"]) for r in top] == \
+                [(r["document"].doc_id, r["score"]) for r in full[:5]]
+    assert ranking(disk.search_phrase("alpha beta")) == ranking(engine.search_phrase("alpha beta"))
+
+    # Deleting most of the index leaves segments that merging rewrites
+    for i in list(engine.documents)[:50]:
+        engine.remove_document(i)
+        disk.remove_document(i)
+    disk.flush()
+    assert disk.get_index_stats()["deleted_documents"] < 50
+    assert ranking(disk.search("alpha")) == ranking(engine.search("alpha"))
+    disk.close()
+
+
+def test_bulk_and_sharded_indexing_match_add_document(engine):
+    """
+    add_documents (in-process and with a worker pool) builds the same index
+    as add_document one by one, including ids repeated within the batch,
+    and a ShardedSearchEngine ranks like a single engine.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    rng = random.Random(13)
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa"]
+    specs = [(i % 250, rng.choice(words), " ".join(rng.choices(words, k=rng.randint(1, 15))))
+             for i in range(300)]
+    for spec in specs:
+        engine.add_document(Document(*spec))
+
+    def ranking(eng, query, **kwargs):
+        return [(r["document"].doc_id, round(r["score"], 9)) for r in eng.search(query, **kwargs)]
+
+    for workers in (None, 2):
+        bulk = SearchEngine()
+        bulk.BULK_CHUNK = 40
+        bulk.add_documents([Document(*spec) for spec in specs], workers=workers)
+        assert bulk._doc_count == engine._doc_count == 250
+        assert bulk.index["omega"] == engine.index["omega"]
+        assert bulk.get_suggestions("") == engine.get_suggestions("")
+        for query in ("alpha", "omega kappa"):
+            assert ranking(bulk, query) == ranking(engine, query)
+            assert ranking(bulk, query, top_k=5) == ranking(engine, query, top_k=5)
+
+    with engine_module.ShardedSearchEngine(shards=2) as sharded:
+        sharded.add_documents([Document(*spec) for spec in specs])
+        sharded.remove_document(3)
+        engine.remove_document(3)
+        assert sharded.get_index_stats()["total_documents"] == len(engine.documents)
+        for scorer in ("tfidf", "bm25"):
+            full = sharded.search("omega kappa", scorer=scorer)
+            assert sorted(ranking(engine, "omega kappa", scorer=scorer)) == \
+                sorted((r["document"].doc_id, round(r["score"], 9)) for r in full)
+            top = sharded.search("omega kappa", top_k=5, scorer=scorer)
+            assert [r["document"].doc_id for r in top] == [r["document"].doc_id for r in full[:5]]
+
+
+def test_similar_documents_from_postings(engine):
+    """
+    find_similar_documents ranks by cosine similarity computed from the
+    postings of the target's terms, with tf or tf-idf weights and an
+    optional cap on high-df terms, and similar_documents_table gives the
+    same neighbours for every document.
+    """
+    if not IS_OPTIMIZED:
+        return
+
+    rng = random.Random(21)
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa", "theta"]
+    for i in range(120):
+        engine.add_document(Document(i, rng.choice(words), " ".join(rng.choices(words[:i % 8 + 1], k=rng.randint(1, 12)))))
+    engine.remove_document(7)
+
+    def cosine(a, b, weight):
+        dot = sum(a[t] * b[t] * weight(t) ** 2 for t in a if t in b)
+        norm = math.sqrt(sum((c * weight(t)) ** 2 for t, c in a.items()))
+        return dot / (norm * math.sqrt(sum((c * weight(t)) ** 2 for t, c in b.items())))
+
+    def idf(term):
+        return math.log(engine._doc_count / engine.doc_freqs[term])
+
+    vectors = engine.doc_vectors
+    for weighting, weight in (("tf", lambda t: 1.0), ("tfidf", idf)):
+        expected = sorted(
+            ((cosine(vectors[3], vectors[d], weight), -d) for d in vectors if d != 3),
+            reverse=True,
+        )
+        expected = [(-d, s) for s, d in expected if s > 0][:10]
+        sims = engine.find_similar_documents(3, weighting=weighting)
+        assert [r["document"].doc_id for r in sims] == [d for d, _ in expected]
+        assert all(abs(r["similarity"] - s) < 1e-9 for r, (_, s) in zip(sims, expected))
+
+    # Terms in more than half the documents do not count towards the dot product
+    common = {t for t in vectors[3] if engine.doc_freqs[t] > 60}
+    capped = engine.find_similar_documents(3, top_k=200, max_df=0.5)
+    assert {r["document"].doc_id for r in capped} == \
+        {d for d in vectors if d != 3 and set(vectors[d]) & (set(vectors[3]) - common)}
+
+    table = engine.similar_documents_table(top_k=5, weighting="tfidf")
+    assert set(table) == set(engine.documents)
+    for doc_id in (0, 3, 50):
+        expected = engine.find_similar_documents(doc_id, top_k=5, weighting="tfidf")
+        assert [s for _, s in table[doc_id]] == pytest.approx([r["similarity"] for r in expected])